@@ -1,6 +1,8 @@
-from interface.routers.rest import router as rest_router
+from interface.routers.rest import router as rest_router, job_manager
+from infrastructure.solvers.gurobi_env_pool import close_env_pools
 import uvicorn
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from pythonjsonlogger import jsonlogger
 
@@ -26,7 +28,19 @@ def setup_logging():
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリケーションの起動・終了処理"""
+    yield
+    # 編成ジョブのワーカーを終了する
+    job_manager.shutdown()
+    # Gurobiの環境を破棄する（ライセンスのセッションを解放する）
+    close_env_pools()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="時間割最適化API",
     description="""
     ## 概要
@@ -35,6 +49,7 @@ app = FastAPI(
     ## 機能
     - 年次データの取得
     - 年次時間割の最適化実行
+    - 年次時間割の最適化ジョブの投入・状態取得・結果取得
     
     ## データモデル
     すべてのエンティティはIDベースで管理されています。
@@ -46,7 +61,8 @@ app = FastAPI(
     - **ブロック (Block)**: ブロックID + 名称
     
     ## 最適化エンジン
-    Gurobi Optimizerを使用して線形計画問題を解きます。
+    Gurobi Optimizerを使用して線形計画問題を解きます（環境変数SOLVERでHiGHS・CBCに切り替え可能）。
+    Gurobiのライセンスを取得できない場合はCBCで解きます。
     """,
     version="1.0.0",
     contact={
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, Hashable, List
 from application.models.dto import (
     CourseDto, CurriculumDto, HomeroomDto,
     InstructorDto, SchoolDayDto, AnnualDataDto
@@ -8,33 +8,102 @@ from domain.vo.annual_data import (
     HomeroomId, DayOfWeek, Period, CourseId, InstructorId,
     HomeroomDay, AttendanceDay, Curriculum
 )
+from domain.vo.id_labels import IdLabelsVo
 
 
-def create_annual_data(dto: AnnualDataDto) -> AnnualDataVo:
+def create_annual_data(dto: AnnualDataDto, intern_ids: bool = True) -> AnnualDataVo:
     """
     年次データDTOからドメイン用の年次データを生成する。
 
+    学級・曜日・講座・教員のIDは0始まりの整数IDに変換し、元のIDは対応表として保持する。
+
     Args:
         dto (AnnualDataDTO): 年次データDTO
+        intern_ids (bool): Falseの場合はIDを変換しない（変数名を元のIDで確認したい場合など）
 
     Returns:
         AnnualData: 年次データ
     """
+    if not intern_ids:
+        return AnnualDataVo(
+            H=_get_H(dto.homerooms),
+            D=_get_D(dto.school_days),
+            P=_get_P(dto.school_days),
+            C=_get_C(dto.courses),
+            I=_get_I(dto.instructors),
+            homeroom_day_dict=_get_periods(dto.homerooms),
+            curriculum_dict=_get_curriculums(dto.curriculums),
+            credit_dict=_get_credits(dto.courses),
+            course_details_dict=_get_course_details(dto.courses),
+            school_day_dict=_get_school_days(dto.school_days),
+            attendance_day_dict=_get_attendances(dto.instructors)
+        )
+
+    # 整数IDはH, D, C, Iの順序どおりに0から振る
+    homerooms = _Interner(_get_H(dto.homerooms))
+    days = _Interner(_get_D(dto.school_days))
+    courses = _Interner(_get_C(dto.courses))
+    instructors = _Interner(_get_I(dto.instructors))
+
     return AnnualDataVo(
-        H=_get_H(dto.homerooms),
-        D=_get_D(dto.school_days),
+        H=list(range(len(homerooms))),
+        D=list(range(len(days))),
         P=_get_P(dto.school_days),
-        C=_get_C(dto.courses),
-        I=_get_I(dto.instructors),
-        homeroom_day_dict=_get_periods(dto.homerooms),
-        curriculum_dict=_get_curriculums(dto.curriculums),
-        credit_dict=_get_credits(dto.courses),
-        course_details_dict=_get_course_details(dto.courses),
-        school_day_dict=_get_school_days(dto.school_days),
-        attendance_day_dict=_get_attendances(dto.instructors)
+        C=list(range(len(courses))),
+        I=list(range(len(instructors))),
+        homeroom_day_dict={
+            homerooms(h): {days(d): periods for d, periods in homeroom_day.items()}
+            for h, homeroom_day in _get_periods(dto.homerooms).items()
+        },
+        curriculum_dict={
+            homerooms(h): [[[courses(c) for c in lane] for lane in block] for block in curriculum]
+            for h, curriculum in _get_curriculums(dto.curriculums).items()
+        },
+        credit_dict={
+            courses(c): credit for c, credit in _get_credits(dto.courses).items()
+        },
+        course_details_dict={
+            courses(c): [
+                detail.model_copy(update={"instructor_id": instructors(detail.instructor_id)})
+                for detail in details
+            ]
+            for c, details in _get_course_details(dto.courses).items()
+        },
+        school_day_dict={
+            days(d): school_day for d, school_day in _get_school_days(dto.school_days).items()
+        },
+        attendance_day_dict={
+            instructors(i): {days(d): periods for d, periods in attendance_day.items()}
+            for i, attendance_day in _get_attendances(dto.instructors).items()
+        },
+        labels=IdLabelsVo(
+            homerooms=homerooms.labels,
+            days=days.labels,
+            courses=courses.labels,
+            instructors=instructors.labels
+        )
     )
 
 
+class _Interner:
+    """元のID -> 整数ID の変換表。未知のIDには次の連番を振る。"""
+
+    def __init__(self, labels: List[Hashable]):
+        self.labels: List[Hashable] = []
+        self.ids: Dict[Hashable, int] = {}
+        for label in labels:
+            self(label)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __call__(self, label: Hashable) -> int:
+        if (id_ := self.ids.get(label)) is None:
+            id_ = self.ids[label] = len(self.labels)
+            self.labels.append(label)
+        return id_
+
+
 def _get_D(school_days: List[SchoolDayDto]) -> List[DayOfWeek]:
     """学校曜日時限リストから曜日リストを取得する。"""
     return list(
@@ -4,10 +4,16 @@
 ドメインデータ（年次LPモデル）-> Pydanticモデル（年次時間割編成結果）変換のための関数群
 """
 
-from typing import List
-from common.constants import BINARY_ONE
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import pulp
+from common.constants import SolveStatus
 from application.models.dto import (
+    AnnualTimetableResultDto,
+    ApplierProfileDto,
+    BuildProfileDto,
     ConstraintViolationDto,
+    SolveProgressDto,
+    SolveResultDto,
     V1ConstraintViolationDto,
     V2ConstraintViolationDto,
     V3ConstraintViolationDto,
@@ -15,6 +21,9 @@ from application.models.dto import (
     TimetableEntryDto
 )
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.id_labels import IdLabelsVo
+from domain.vo.solve_progress import SolveProgressVo
+from domain.vo.solve_result import relative_gap
 
 
 def create_timetable_entries(model: AnnualLpModel) -> List[TimetableEntryDto]:
@@ -27,12 +36,13 @@ def create_timetable_entries(model: AnnualLpModel) -> List[TimetableEntryDto]:
     Returns:
         List[TimetableEntry]: 時間割エントリのリスト
     """
+    homeroom_of, day_of, course_of, _ = _get_decoders(model.data.labels)
     return [
         TimetableEntryDto(
-            homeroom=h,
-            day=d,
+            homeroom=homeroom_of(h),
+            day=day_of(d),
             period=p,
-            course=c
+            course=course_of(c)
         )
         for h in model.data.H
         for d in model.data.D
@@ -40,7 +50,7 @@ def create_timetable_entries(model: AnnualLpModel) -> List[TimetableEntryDto]:
         for b in model.data.curriculum_dict[h]
         for l in b
         for c in l
-        if model.x[h, d, p, c].value() == 1
+        if _is_one(model.x[h, d, p, c])
     ]
 
 
@@ -55,44 +65,216 @@ def create_constraint_violations(model: AnnualLpModel) -> List[ConstraintViolati
         List[ConstraintViolation]: 制約違反
     """
     violations: List[ConstraintViolationDto] = []
+    _, day_of, course_of, instructor_of = _get_decoders(model.data.labels)
 
     # V1: 午前午後制約違反（講座IDのリスト）
     v1_keys = [
-        c for c in model.data.C
-        if hasattr(model, 'v1') and c in model.v1 and model.v1[c].value() == BINARY_ONE
+        course_of(c) for c in model.data.C
+        if model.has_family("v1") and c in model.v1 and _is_one(model.v1[c])
     ]
     if v1_keys:
         violations.append(V1ConstraintViolationDto(violation_keys=v1_keys))
 
     # V2: 連続曜日制約違反（講座IDのリスト）
     v2_keys = [
-        c for c in model.data.C
-        if hasattr(model, 'v2') and c in model.v2 and model.v2[c].value() == BINARY_ONE
+        course_of(c) for c in model.data.C
+        if model.has_family("v2") and c in model.v2 and _is_one(model.v2[c])
     ]
     if v2_keys:
         violations.append(V2ConstraintViolationDto(violation_keys=v2_keys))
 
     # V3: 教員コマ数（１日）制約違反（(曜日, 教員ID)のタプルのリスト）
     v3_keys = []
-    if hasattr(model, 'v3'):
+    if model.has_family("v3"):
         v3_keys = [
-            (d, i) for d in model.data.D
+            (day_of(d), instructor_of(i))
+            for d in model.data.D
             for i in model.data.I
-            if (d, i) in model.v3 and model.v3[d, i].value() == BINARY_ONE
+            if (d, i) in model.v3 and _is_one(model.v3[d, i])
         ]
     if v3_keys:
         violations.append(V3ConstraintViolationDto(violation_keys=v3_keys))
 
     # V4: 教員連続コマ数制約違反（(曜日, 時限, 教員ID)のタプルのリスト）
     v4_keys = []
-    if hasattr(model, 'v4'):
+    if model.has_family("v4"):
         v4_keys = [
-            (d, p, i) for d in model.data.D
+            (day_of(d), p, instructor_of(i))
+            for d in model.data.D
             for p in model.data.P
             for i in model.data.I
-            if (d, p, i) in model.v4 and model.v4[d, p, i].value() == BINARY_ONE
+            if (d, p, i) in model.v4 and _is_one(model.v4[d, p, i])
         ]
     if v4_keys:
         violations.append(V4ConstraintViolationDto(violation_keys=v4_keys))
 
     return violations
+
+
+def create_build_profile(model: AnnualLpModel) -> Optional[BuildProfileDto]:
+    """
+    LPモデル構築の計測結果を生成する
+
+    Args:
+        model (AnnualLpModel): 年次LPモデル
+
+    Returns:
+        Optional[BuildProfileDto]: 計測結果。構築していない場合はNone
+    """
+    if model.build_profile is None:
+        return None
+    profile = model.build_profile
+    return BuildProfileDto(
+        appliers=[ApplierProfileDto(**p.model_dump()) for p in profile.appliers],
+        variables=profile.variables,
+        columns=profile.columns,
+        elapsed_seconds=profile.elapsed_seconds,
+        rows=profile.rows,
+        nonzeros=profile.nonzeros
+    )
+
+
+def create_solve_progress(model: AnnualLpModel, progress: SolveProgressVo) -> SolveProgressDto:
+    """
+    求解の進捗を生成する
+
+    暫定解の値が含まれる場合は、モデルの変数に書き込んで時間割エントリを生成する。
+
+    Args:
+        model (AnnualLpModel): 年次LPモデル
+        progress (SolveProgressVo): ソルバーから通知された進捗
+
+    Returns:
+        SolveProgressDto: 求解の進捗
+    """
+    entries = None
+    if progress.values is not None:
+        model.columns.assign_values(progress.values)
+        entries = create_timetable_entries(model)
+    return SolveProgressDto(**progress.model_dump(exclude={"values"}), entries=entries)
+
+
+def create_solve_result(model: AnnualLpModel) -> Optional[SolveResultDto]:
+    """
+    求解結果を生成する
+
+    Args:
+        model (AnnualLpModel): 年次LPモデル
+
+    Returns:
+        Optional[SolveResultDto]: 求解結果。求解していない場合はNone
+    """
+    if model.solve_result is None:
+        return None
+    return SolveResultDto(**model.solve_result.model_dump())
+
+
+def merge_timetable_results(results: List[AnnualTimetableResultDto]) -> AnnualTimetableResultDto:
+    """
+    分割して解いた年次データの部分ごとの編成結果を、1つの編成結果にまとめる
+
+    部分どうしは学級・講座・教員を共有しないため、時間割エントリと制約違反は連結し、
+    目的関数値・下界は合計する。求解ステータスは、すべて最適の場合のみOPTIMAL、
+    一部の制約を満たさない部分がある場合はINCOMPLETE、それ以外はFEASIBLEとする。
+
+    Args:
+        results (List[AnnualTimetableResultDto]): 部分ごとの編成結果
+
+    Returns:
+        AnnualTimetableResultDto: まとめた編成結果
+    """
+    violations: Dict[str, ConstraintViolationDto] = {}
+    for violation in (v for result in results for v in result.violations):
+        if (merged := violations.get(violation.violation_code)) is None:
+            violations[violation.violation_code] = violation.model_copy(
+                update={"violation_keys": list(violation.violation_keys)}
+            )
+        else:
+            merged.violation_keys.extend(violation.violation_keys)
+
+    return AnnualTimetableResultDto(
+        entries=[entry for result in results for entry in result.entries],
+        violations=[violations[code] for code in sorted(violations)],
+        solve_result=_merge_solve_results([r.solve_result for r in results]),
+        build_profile=_merge_build_profiles([r.build_profile for r in results])
+    )
+
+
+def _merge_solve_results(solve_results: List[Optional[SolveResultDto]]) -> Optional[SolveResultDto]:
+    """部分ごとの求解結果をまとめる。求解していない部分がある場合はNone。"""
+    if not solve_results or any(r is None for r in solve_results):
+        return None
+
+    def total(values: List[Optional[float]]) -> Optional[float]:
+        return None if any(v is None for v in values) else sum(values)
+
+    statuses = {r.status for r in solve_results}
+    if statuses == {SolveStatus.OPTIMAL}:
+        status = SolveStatus.OPTIMAL
+    elif SolveStatus.INCOMPLETE in statuses:
+        status = SolveStatus.INCOMPLETE
+    else:
+        status = SolveStatus.FEASIBLE
+    objective = total([r.objective for r in solve_results])
+    bound = total([r.bound for r in solve_results])
+    build_seconds = [r.build_seconds for r in solve_results if r.build_seconds is not None]
+    backends = [r.backend for r in solve_results if r.backend is not None]
+    return SolveResultDto(
+        status=status,
+        objective=objective,
+        bound=bound,
+        gap=relative_gap(objective, bound),
+        # 部分は並列に解くため、最も時間のかかった部分の時間とする
+        elapsed_seconds=max(r.elapsed_seconds for r in solve_results),
+        build_seconds=max(build_seconds) if build_seconds else None,
+        backend=",".join(dict.fromkeys(backends)) or None,
+        unsatisfied_rows=total([r.unsatisfied_rows for r in solve_results])
+    )
+
+
+def _merge_build_profiles(profiles: List[Optional[BuildProfileDto]]) -> Optional[BuildProfileDto]:
+    """部分ごとの計測結果を、制約定義クラスごと・変数族ごとに合計する。計測していない部分がある場合はNone。"""
+    if not profiles or any(p is None for p in profiles):
+        return None
+    appliers: Dict[str, ApplierProfileDto] = {}
+    variables: Dict[str, int] = {}
+    for profile in profiles:
+        for applier in profile.appliers:
+            if (merged := appliers.get(applier.applier)) is None:
+                appliers[applier.applier] = applier.model_copy()
+                continue
+            peaks = [p for p in (merged.memory_peak_bytes, applier.memory_peak_bytes) if p is not None]
+            appliers[applier.applier] = merged.model_copy(update={
+                "elapsed_seconds": merged.elapsed_seconds + applier.elapsed_seconds,
+                "memory_peak_bytes": max(peaks) if peaks else None,
+                "rows": merged.rows + applier.rows,
+                "nonzeros": merged.nonzeros + applier.nonzeros
+            })
+        for name, count in profile.variables.items():
+            variables[name] = variables.get(name, 0) + count
+    return BuildProfileDto(
+        appliers=list(appliers.values()),
+        variables=variables,
+        columns=sum(p.columns for p in profiles),
+        elapsed_seconds=sum(p.elapsed_seconds for p in profiles),
+        rows=sum(p.rows for p in profiles),
+        nonzeros=sum(p.nonzeros for p in profiles)
+    )
+
+
+def _get_decoders(labels: Optional[IdLabelsVo]) -> Tuple[Callable[[Hashable], Hashable], ...]:
+    """整数ID -> 元のID の変換関数（学級、曜日、講座、教員）を取得する。対応表がない場合は恒等関数。"""
+    if labels is None:
+        return (lambda id_: id_,) * 4
+    return (
+        labels.homerooms.__getitem__,
+        labels.days.__getitem__,
+        labels.courses.__getitem__,
+        labels.instructors.__getitem__,
+    )
+
+
+def _is_one(variable: pulp.LpVariable) -> bool:
+    """バイナリ変数の値が1かどうか。ソルバーの許容誤差による端数（0.9999999など）を含めて判定する。"""
+    value = variable.value()
+    return value is not None and value > 0.5
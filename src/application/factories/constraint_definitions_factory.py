@@ -1,17 +1,37 @@
-from typing import List
+from typing import Dict, List, Optional, Union
 from application.models.dto import ConstraintDefinitionDto
+from common.constants import COURSE_PARAMETER_KEYS
 from domain.vo.constraint_definition import ConstraintDefinitionVo
+from domain.vo.id_labels import IdLabelsVo
 
 
-def create_constraint_definitions(dtos: List[ConstraintDefinitionDto]) -> List[ConstraintDefinitionVo]:
+def create_constraint_definitions(
+    dtos: List[ConstraintDefinitionDto],
+    labels: Optional[IdLabelsVo] = None
+) -> List[ConstraintDefinitionVo]:
     """
     制約定義DTOリストからドメイン用の制約定義リストを生成する。
+
+    対応表が指定された場合は、講座IDのパラメータを整数IDに変換する。
     """
     return [
         ConstraintDefinitionVo(
             code=dto.constraint_definition_code,
             soft_flag=dto.soft_flag,
             penalty_weight=dto.penalty_weight,
-            parameters={item.key: item.value for item in dto.parameters}
+            parameters=_get_parameters(dto, labels)
         ) for dto in dtos
     ]
+
+
+def _get_parameters(dto: ConstraintDefinitionDto, labels: Optional[IdLabelsVo]) -> Dict[str, Union[str, int]]:
+    """制約定義DTOからパラメータ辞書を取得する。"""
+    parameters: Dict[str, Union[str, int]] = {item.key: item.value for item in dto.parameters}
+    if labels is None:
+        return parameters
+
+    course_ids = {course: c for c, course in enumerate(labels.courses)}
+    for key in COURSE_PARAMETER_KEYS:
+        if key in parameters and parameters[key] in course_ids:
+            parameters[key] = course_ids[parameters[key]]
+    return parameters
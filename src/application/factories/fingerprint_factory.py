@@ -0,0 +1,54 @@
+"""
+最適化リクエストのフィンガープリントのファクトリ
+
+同じ内容のリクエストを同一視するため、要素の並び順に依存しない正規形のハッシュを生成する。
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from application.models.dto import LnsSettingsDto, OptimiseAnnualTimetableDto, SolverSettingsDto
+
+# 並び順に意味があるため並べ替えないリスト（学校曜日の順序は連続曜日の判定に使われる）
+ORDERED_KEYS = frozenset({"schoolDays"})
+
+
+def create_fingerprint(dto: OptimiseAnnualTimetableDto) -> str:
+    """
+    年次データ・制約定義・ソルバー・ソルバー設定から、並び順に依存しないフィンガープリントを生成する。
+
+    ttid・debugは結果に影響しないため含めない。ソルバー設定の省略は、すべての項目の省略と同一視する。
+    解の初期値は打ち切られた場合の解に影響するため含める（ジョブIDで指定した場合は、解決済みの時間割エントリ）。
+
+    Args:
+        dto (OptimiseAnnualTimetableDto): 年次時間割編成DTO
+
+    Returns:
+        str: フィンガープリント（SHA-256の16進文字列）
+    """
+    payload = {
+        "annualData": dto.annual_data.model_dump(by_alias=True),
+        "constraintDefinitions": [d.model_dump(by_alias=True) for d in dto.constraint_definitions],
+        "solver": dto.solver,
+        "solverSettings": (dto.solver_settings or SolverSettingsDto()).model_dump(by_alias=True, mode="json"),
+        "warmStart": [e.model_dump() for e in dto.warm_start or []],
+        "mode": dto.mode,
+        "lnsSettings": (dto.lns_settings or LnsSettingsDto()).model_dump(by_alias=True, mode="json"),
+    }
+    return hashlib.sha256(_dumps(_canonicalize(payload)).encode("utf-8")).hexdigest()
+
+
+def _canonicalize(value: Any, ordered: bool = False) -> Any:
+    """リストの要素を正規形の文字列順に並べ替える。ordered=Trueのリストは並び順を保つ。"""
+    if isinstance(value, dict):
+        return {k: _canonicalize(v, k in ORDERED_KEYS) for k, v in value.items()}
+    if isinstance(value, list):
+        items = [_canonicalize(v) for v in value]
+        return items if ordered else sorted(items, key=_dumps)
+    return value
+
+
+def _dumps(value: Any) -> str:
+    """キー順を固定したJSON文字列に変換する。"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
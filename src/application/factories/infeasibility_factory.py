@@ -0,0 +1,41 @@
+"""
+入力の矛盾のファクトリ
+
+ドメインデータ（入力の矛盾）-> Pydanticモデル（入力の矛盾DTO）変換のための関数群
+"""
+
+from typing import List, Optional
+
+from application.models.dto import InfeasibilityDto
+from domain.vo.id_labels import IdLabelsVo
+from domain.vo.infeasibility import InfeasibilityVo
+
+
+def create_infeasibilities(
+    infeasibilities: List[InfeasibilityVo],
+    labels: Optional[IdLabelsVo] = None
+) -> List[InfeasibilityDto]:
+    """
+    入力の矛盾DTOのリストを生成する
+
+    Args:
+        infeasibilities (List[InfeasibilityVo]): 入力の矛盾のリスト
+        labels (Optional[IdLabelsVo]): 整数ID -> 元のID の対応表。Noneの場合はIDをそのまま文字列にする
+
+    Returns:
+        List[InfeasibilityDto]: 入力の矛盾DTOのリスト（IDは元のID）
+    """
+    def decode(ids, names: Optional[List[str]]) -> List[str]:
+        return [names[id_] if names is not None else str(id_) for id_ in ids]
+
+    return [
+        InfeasibilityDto(
+            kind=i.kind,
+            homerooms=decode(i.homerooms, labels.homerooms if labels else None),
+            courses=decode(i.courses, labels.courses if labels else None),
+            instructors=decode(i.instructors, labels.instructors if labels else None),
+            required=i.required,
+            available=i.available
+        )
+        for i in infeasibilities
+    ]
@@ -0,0 +1,20 @@
+from typing import Optional
+from application.models.dto import LnsSettingsDto
+from common.constants import DEFAULT_TIME_LIMIT
+from domain.vo.lns_settings import LnsSettingsVo
+from domain.vo.solver_settings import SolverSettingsVo
+
+
+def create_lns_settings(dto: Optional[LnsSettingsDto], solver_settings: SolverSettingsVo) -> LnsSettingsVo:
+    """
+    LNS設定DTOとソルバー設定から、ドメイン用のLNS設定を生成する。
+
+    探索全体のタイムリミットと乱数シードはソルバー設定の値を使う（タイムリミットの既定値はDEFAULT_TIME_LIMIT）。
+    DTOで省略された項目はLnsSettingsVoの既定値を使う。
+    """
+    values = dto.model_dump(exclude_none=True) if dto is not None else {}
+    return LnsSettingsVo(
+        time_limit=solver_settings.time_limit if solver_settings.time_limit is not None else DEFAULT_TIME_LIMIT,
+        seed=solver_settings.seed,
+        **values
+    )
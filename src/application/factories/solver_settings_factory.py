@@ -0,0 +1,14 @@
+from typing import Optional
+from application.models.dto import SolverSettingsDto
+from domain.vo.solver_settings import SolverSettingsVo
+
+
+def create_solver_settings(dto: Optional[SolverSettingsDto]) -> SolverSettingsVo:
+    """
+    ソルバー設定DTOからドメイン用のソルバー設定を生成する。
+
+    DTOが指定されない場合は、すべての項目がソルバーの既定値の設定を返す。
+    """
+    if dto is None:
+        return SolverSettingsVo()
+    return SolverSettingsVo(**dto.model_dump())
@@ -0,0 +1,42 @@
+"""
+解の初期値のファクトリ
+
+Pydanticモデル（前回の時間割エントリ）-> ドメインデータ（解の初期値）変換のための関数群
+"""
+
+from typing import Dict, Hashable, List, Optional
+from application.models.dto import TimetableEntryDto
+from domain.vo.id_labels import IdLabelsVo
+from domain.vo.warm_start import WarmStartVo
+
+
+def create_warm_start(entries: List[TimetableEntryDto], labels: Optional[IdLabelsVo] = None) -> WarmStartVo:
+    """
+    前回の時間割エントリリストから解の初期値を生成する。
+
+    対応表が指定された場合は、学級・曜日・講座のIDを整数IDに変換する。
+    対応表にないID（前回から削除された講座など）を含むエントリは除く。
+
+    Args:
+        entries (List[TimetableEntryDto]): 前回の時間割エントリリスト
+        labels (Optional[IdLabelsVo]): 整数IDの対応表
+
+    Returns:
+        WarmStartVo: 解の初期値
+    """
+    if labels is None:
+        return WarmStartVo(assignments=frozenset((e.homeroom, e.day, e.period, e.course) for e in entries))
+
+    homeroom_ids = _get_ids(labels.homerooms)
+    day_ids = _get_ids(labels.days)
+    course_ids = _get_ids(labels.courses)
+    return WarmStartVo(assignments=frozenset(
+        (homeroom_ids[e.homeroom], day_ids[e.day], e.period, course_ids[e.course])
+        for e in entries
+        if e.homeroom in homeroom_ids and e.day in day_ids and e.course in course_ids
+    ))
+
+
+def _get_ids(labels: List[Hashable]) -> Dict[Hashable, int]:
+    """元のID -> 整数ID の辞書を取得する。"""
+    return {label: id_ for id_, label in enumerate(labels)}
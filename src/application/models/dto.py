@@ -4,10 +4,14 @@ Application DTOs (Data Transfer Objects)
 このファイルには、アプリケーション層で使用される全てのDTOクラスが定義されています。
 """
 
-from typing import Any, Generic, List, Optional, Tuple, TypeVar
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
 from pydantic import BaseModel, ConfigDict, Field
 
-from common.constants import ViolationCode
+from common.constants import (
+    InfeasibilityKind, JobStatus, LnsNeighbourhood, OptimisationMode, SolverBackend, SolverEmphasis, SolveStatus,
+    ViolationCode
+)
 
 T = TypeVar("T")
 
@@ -262,6 +266,23 @@ class V4ConstraintViolationDto(ConstraintViolationDto[Tuple[str, int, str]]):
     violation_code: str = ViolationCode.V4.value
 
 
+class InfeasibilityDto(BaseModel):
+    """入力の矛盾DTO"""
+    kind: InfeasibilityKind = Field(
+        ...,
+        description=(
+            "矛盾の種類（HOMEROOM_PERIODS: 学級の時限を埋める単位数が足りない / "
+            "COURSE_CREDITS: 講座の単位数が開講できる時限数を超える / "
+            "BLOCK_LANES: ブロックのレーンの単位数が異なる / INSTRUCTOR_LOAD: 教員の担当コマ数が出勤時限数を超える）"
+        )
+    )
+    homerooms: List[str] = Field([], description="関係する学級IDリスト", examples=[["1"]])
+    courses: List[str] = Field([], description="関係する講座IDリスト", examples=[["101"]])
+    instructors: List[str] = Field([], description="関係する教員IDリスト", examples=[["1"]])
+    required: int = Field(..., description="必要なコマ数（BLOCK_LANESの場合はレーンの単位数の最大値）")
+    available: int = Field(..., description="使えるコマ数（BLOCK_LANESの場合はレーンの単位数の最小値）")
+
+
 # ===== Timetable DTOs =====
 
 class TimetableEntryDto(BaseModel):
@@ -283,10 +304,85 @@ class TimetableEntryDto(BaseModel):
     )
 
 
+class ApplierProfileDto(BaseModel):
+    """制約適用の計測結果DTO"""
+    applier: str = Field(..., description="制約定義クラス名", examples=["HomeroomConstraint"])
+    elapsed_seconds: float = Field(..., description="適用にかかった時間（秒）")
+    memory_peak_bytes: Optional[int] = Field(None, description="適用中のメモリ使用量の増分のピーク（バイト）")
+    rows: int = Field(..., description="追加した制約数")
+    nonzeros: int = Field(..., description="追加した非ゼロ要素数")
+
+
+class BuildProfileDto(BaseModel):
+    """LPモデル構築の計測結果DTO"""
+    appliers: List[ApplierProfileDto] = Field(..., description="制約適用の計測結果リスト（適用順）")
+    variables: Dict[str, int] = Field(
+        ..., description="変数族名 -> 変数の数（制約で使用し、定義した変数族のみ）", examples=[{"x": 1200, "y": 300}]
+    )
+    columns: int = Field(..., description="列数")
+    elapsed_seconds: float = Field(..., description="制約の適用にかかった時間の合計（秒）")
+    rows: int = Field(..., description="制約数の合計")
+    nonzeros: int = Field(..., description="非ゼロ要素数の合計")
+
+
+class LnsImprovementDto(BaseModel):
+    """LNSの改善曲線の点DTO"""
+    iteration: int = Field(..., description="部分問題を解いた回数（初期解は0）")
+    elapsed_seconds: float = Field(..., description="探索開始からの経過時間（秒）")
+    objective: float = Field(..., description="最良解の目的関数値")
+    neighbourhood: Optional[LnsNeighbourhood] = Field(
+        None, description="改善した部分問題の近傍（DAY / HOMEROOMS / INSTRUCTORS）。初期解の場合はnull"
+    )
+
+
+class SolveResultDto(BaseModel):
+    """求解結果DTO"""
+    status: SolveStatus = Field(
+        ...,
+        description=(
+            "求解ステータス（OPTIMAL: 最適解 / FEASIBLE: 時間制限などで打ち切られた実行可能解、"
+            "またはfastモードで全制約を満たす解 / INCOMPLETE: fastモードで一部の制約を満たさない解）"
+        )
+    )
+    objective: Optional[float] = Field(None, description="目的関数値（ソフト制約のペナルティの合計）")
+    bound: Optional[float] = Field(None, description="目的関数値の下界。取得できない場合はnull")
+    gap: Optional[float] = Field(None, description="相対ギャップ。計算できない場合はnull", examples=[0.05])
+    elapsed_seconds: float = Field(..., description="求解にかかった時間（秒）")
+    build_seconds: Optional[float] = Field(None, description="制約の適用にかかった時間（秒）")
+    backend: Optional[str] = Field(
+        None,
+        description="解いたソルバー（フォールバックした場合は代わりのソルバー。fastモードの場合はHEURISTIC）",
+        examples=["GUROBI"]
+    )
+    unsatisfied_rows: Optional[int] = Field(
+        None, description="満たさない制約行の数（fastモードの場合のみ）", examples=[0]
+    )
+    improvements: Optional[List[LnsImprovementDto]] = Field(
+        None, description="最良解が改善した時点の記録（改善曲線。LNSモードの場合のみ）"
+    )
+
+
+class SolveProgressDto(BaseModel):
+    """求解の進捗DTO"""
+    elapsed_seconds: float = Field(..., description="求解開始からの経過時間（秒）")
+    objective: Optional[float] = Field(None, description="暫定解の目的関数値。暫定解がない場合はnull")
+    bound: Optional[float] = Field(None, description="目的関数値の下界。取得できない場合はnull")
+    gap: Optional[float] = Field(None, description="相対ギャップ。計算できない場合はnull", examples=[0.05])
+    nodes: Optional[int] = Field(None, description="探索済みの分枝限定法のノード数。取得できない場合はnull")
+    backend: Optional[str] = Field(None, description="解いているソルバー", examples=["HIGHS"])
+    entries: Optional[List[TimetableEntryDto]] = Field(
+        None, description="暫定解の時間割エントリリスト（新しい暫定解が見つかった時点のみ）"
+    )
+
+
 class AnnualTimetableResultDto(BaseModel):
     """年次時間割編成結果DTO"""
     entries: List[TimetableEntryDto] = Field(..., description="時間割エントリリスト")
     violations: List[ConstraintViolationDto[Any]] = Field(..., description="制約違反リスト")
+    solve_result: Optional[SolveResultDto] = Field(None, description="求解結果")
+    build_profile: Optional[BuildProfileDto] = Field(
+        None, description="LPモデル構築の計測結果（debugがtrueの場合のみ）"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -294,12 +390,26 @@ class AnnualTimetableResultDto(BaseModel):
                 "entries": [
                     {"homeroom": "1", "day": "mon", "period": 1, "course": "101"}
                 ],
-                "violations": []
+                "violations": [],
+                "solve_result": {
+                    "status": "OPTIMAL", "objective": 0.0, "bound": 0.0, "gap": 0.0,
+                    "elapsed_seconds": 0.12, "build_seconds": 0.03, "backend": "GUROBI"
+                }
             }
         }
     )
 
 
+class OptimisationJobDto(BaseModel):
+    """年次時間割編成ジョブDTO"""
+    job_id: str = Field(..., description="ジョブID", examples=["3f2c1e9a-8b7d-4c6e-9a1f-2b3c4d5e6f70"])
+    status: JobStatus = Field(..., description="ジョブの状態（PENDING / RUNNING / SUCCEEDED / FAILED / CANCELLED）")
+    submitted_at: datetime = Field(..., description="投入日時")
+    started_at: Optional[datetime] = Field(None, description="実行開始日時")
+    finished_at: Optional[datetime] = Field(None, description="終了日時")
+    error: Optional[str] = Field(None, description="エラー内容（FAILEDの場合）、またはキャンセルの理由（CANCELLEDの場合）")
+
+
 # ===== Main DTOs =====
 
 class AnnualDataDto(BaseModel):
@@ -314,6 +424,54 @@ class AnnualDataDto(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class SolverSettingsDto(BaseModel):
+    """ソルバー設定DTO"""
+    time_limit: Optional[float] = Field(
+        None, alias="timeLimit", gt=0, description="タイムリミット（秒）。省略時はソルバーの既定値", examples=[30]
+    )
+    mip_gap: Optional[float] = Field(
+        None, alias="mipGap", ge=0, description="相対ギャップの許容値。これ以下になったら打ち切る", examples=[0.05]
+    )
+    mip_gap_abs: Optional[float] = Field(
+        None, alias="mipGapAbs", ge=0, description="絶対ギャップの許容値。これ以下になったら打ち切る", examples=[1.0]
+    )
+    threads: Optional[int] = Field(None, ge=1, description="スレッド数", examples=[4])
+    seed: Optional[int] = Field(None, ge=0, description="乱数シード", examples=[0])
+    emphasis: Optional[SolverEmphasis] = Field(
+        None,
+        description="探索の重点（BALANCED / FEASIBILITY: 実行可能解の発見 / OPTIMALITY: 最適性の証明 / BOUND: 下界の改善）"
+    )
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "timeLimit": 30,
+                "mipGap": 0.05,
+                "threads": 4,
+                "seed": 0,
+                "emphasis": "FEASIBILITY"
+            }
+        }
+    )
+
+
+class LnsSettingsDto(BaseModel):
+    """LNS設定DTO"""
+    sub_time_limit: Optional[float] = Field(
+        None, alias="subTimeLimit", gt=0, description="部分問題1回あたりのタイムリミット（秒）。省略時は10", examples=[10]
+    )
+    neighbourhoods: Optional[List[LnsNeighbourhood]] = Field(
+        None,
+        min_length=1,
+        description="順に使う近傍（DAY: 1日 / HOMEROOMS: 学級群 / INSTRUCTORS: 教員の担当講座）。省略時はすべて"
+    )
+    homerooms: Optional[int] = Field(None, ge=1, description="HOMEROOMSで解放する学級数。省略時は4", examples=[4])
+    instructors: Optional[int] = Field(None, ge=1, description="INSTRUCTORSで解放する教員数。省略時は3", examples=[3])
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 class OptimiseAnnualTimetableDto(BaseModel):
     """年次時間割編成DTO"""
     ttid: str = Field(..., description="時間割ID（TTID）", examples=["550e8400-e29b-41d4-a716-446655440000"])
@@ -321,6 +479,34 @@ class OptimiseAnnualTimetableDto(BaseModel):
     constraint_definitions: List[ConstraintDefinitionDto] = Field(
         ..., alias="constraintDefinitions", description="制約定義リスト"
     )
+    solver: Optional[SolverBackend] = Field(
+        None, description="ソルバー（GUROBI / GUROBI_NATIVE / HIGHS / CBC / PORTFOLIO）。省略時は環境変数SOLVERの値"
+    )
+    solver_settings: Optional[SolverSettingsDto] = Field(
+        None, alias="solverSettings", description="ソルバー設定。省略時はソルバーの既定値"
+    )
+    warm_start: Optional[List[TimetableEntryDto]] = Field(
+        None,
+        alias="warmStart",
+        description="解の初期値とする前回の時間割エントリリスト。年次データにない学級・講座などのエントリは無視する"
+    )
+    warm_start_job_id: Optional[str] = Field(
+        None,
+        alias="warmStartJobId",
+        description="解の初期値とする前回の編成ジョブのID（warmStartの代わりに指定する。成功したジョブのみ）"
+    )
+    mode: OptimisationMode = Field(
+        OptimisationMode.EXACT,
+        description=(
+            "編成モード（EXACT: ソルバーで求解する / FAST: 求解せず、貪欲法で構築した時間割"
+            "（warmStartを指定した場合はその時間割）をそのまま返す / LNS: 近傍を解放した部分問題を"
+            "solverSettingsのタイムリミットまで繰り返し解いて改善する）"
+        )
+    )
+    lns_settings: Optional[LnsSettingsDto] = Field(
+        None, alias="lnsSettings", description="LNS設定（任意。modeがLNSの場合のみ使う）"
+    )
+    debug: bool = Field(False, description="trueの場合、LPモデル構築の計測結果（メモリ使用量を含む）を返す")
 
     model_config = ConfigDict(
         populate_by_name=True,
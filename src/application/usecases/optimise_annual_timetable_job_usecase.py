@@ -0,0 +1,166 @@
+import threading
+from typing import Any, Callable, Iterator, Optional, Union
+from application.factories.fingerprint_factory import create_fingerprint
+from application.models.dto import (
+    AnnualTimetableResultDto, OptimisationJobDto, OptimiseAnnualTimetableDto, SolveProgressDto
+)
+from application.usecases.optimise_annual_timetable_usecase import OptimiseAnnualTimetableUsecase
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+from infrastructure.jobs.job_manager import Job, JobManager
+
+# 進捗の通知がない場合に、接続を維持するためにNoneを返す間隔（秒）
+KEEPALIVE_SECONDS = 15.0
+# APIからキャンセルした場合の理由
+CANCELLED_BY_REQUEST = "キャンセルが要求されました"
+
+
+class OptimiseAnnualTimetableJobUsecase:
+    """年次時間割編成ジョブユースケース。
+
+    編成をジョブとして別プロセスで実行し、状態と結果を後から取得できるようにする。
+    """
+
+    def __init__(
+        self,
+        job_manager: JobManager,
+        cache: Optional[TtlLruCache[AnnualTimetableResultDto]] = None
+    ):
+        """イニシャライザ。
+
+        Args:
+            job_manager (JobManager): ジョブ管理
+            cache (Optional[TtlLruCache[AnnualTimetableResultDto]]):
+                フィンガープリント -> 編成結果 のキャッシュ。Noneの場合はキャッシュしない
+        """
+        self.job_manager = job_manager
+        self.cache = cache
+
+    def submit(self, dto: OptimiseAnnualTimetableDto) -> OptimisationJobDto:
+        """編成ジョブを投入する。
+
+        同じ内容のリクエストの結果がキャッシュにあれば、求解せずに成功済みのジョブを返す。
+        入力に必須制約を満たせない矛盾がある場合は、ジョブを投入しない。
+
+        Args:
+            dto (OptimiseAnnualTimetableDto): 年次時間割編成DTO
+
+        Returns:
+            OptimisationJobDto: 投入したジョブ
+
+        Raises:
+            InfeasibleInputError: 入力に矛盾がある場合
+        """
+        if self.cache is None or dto.debug:
+            OptimiseAnnualTimetableUsecase(dto).check()
+            return _to_dto(self.job_manager.submit(optimise_annual_timetable, dto))
+
+        key = create_fingerprint(dto)
+        if (result := self.cache.get(key)) is not None:
+            return _to_dto(self.job_manager.add_finished(result))
+
+        OptimiseAnnualTimetableUsecase(dto).check()
+        job = self.job_manager.submit(
+            optimise_annual_timetable, dto, on_success=lambda result: self.cache.put(key, result)
+        )
+        return _to_dto(job)
+
+    def resolve_warm_start(self, dto: OptimiseAnnualTimetableDto) -> Optional[OptimiseAnnualTimetableDto]:
+        """warmStartJobIdで指定されたジョブの時間割エントリを、解の初期値（warmStart）に置き換える。
+
+        Args:
+            dto (OptimiseAnnualTimetableDto): 年次時間割編成DTO
+
+        Returns:
+            Optional[OptimiseAnnualTimetableDto]:
+                置き換えたDTO（warmStartJobIdがない場合はそのまま）。ジョブが存在しない、または成功していない場合はNone
+        """
+        if dto.warm_start_job_id is None:
+            return dto
+        if (result := self.get_result(dto.warm_start_job_id)) is None:
+            return None
+        return dto.model_copy(update={"warm_start": result.entries, "warm_start_job_id": None})
+
+    def get_job(self, job_id: str) -> Optional[OptimisationJobDto]:
+        """ジョブの状態を取得する。存在しない場合はNone。"""
+        job = self.job_manager.get(job_id)
+        return _to_dto(job) if job is not None else None
+
+    def get_result(self, job_id: str) -> Optional[AnnualTimetableResultDto]:
+        """ジョブの編成結果を取得する。存在しない、または成功していない場合はNone。"""
+        job = self.job_manager.get(job_id)
+        return job.result if job is not None else None
+
+    def cancel(self, job_id: str, reason: str = CANCELLED_BY_REQUEST) -> Optional[OptimisationJobDto]:
+        """ジョブをキャンセルする。
+
+        待機中のジョブはすぐにCANCELLEDになり、実行中のジョブは求解を中断してからCANCELLEDになる。
+
+        Args:
+            job_id (str): ジョブID
+            reason (str): キャンセルの理由
+
+        Returns:
+            Optional[OptimisationJobDto]: キャンセルを要求した時点のジョブ。存在しない場合はNone
+        """
+        job = self.job_manager.cancel(job_id, reason)
+        return _to_dto(job) if job is not None else None
+
+    def watch(
+        self,
+        job_id: str,
+        include_entries: bool = False,
+        keepalive_seconds: float = KEEPALIVE_SECONDS
+    ) -> Iterator[Union[SolveProgressDto, OptimisationJobDto, None]]:
+        """ジョブが終了するまで、求解の進捗を順に返す。
+
+        進捗が通知されるたびにSolveProgressDtoを返し、最後にジョブの状態（OptimisationJobDto）を返す。
+        keepalive_secondsの間に通知がない場合はNoneを返す。
+        接続前に通知された進捗は最新のもののみ返す。
+
+        Args:
+            job_id (str): ジョブID
+            include_entries (bool): 進捗に暫定解の時間割エントリを含めるかどうか
+            keepalive_seconds (float): Noneを返す間隔（秒）
+        """
+        seq = 0
+        while (job := self.job_manager.wait(job_id, seq, keepalive_seconds)) is not None:
+            updated = job.progress_seq > seq
+            if updated:
+                seq = job.progress_seq
+                progress: SolveProgressDto = job.progress
+                yield progress if include_entries else progress.model_copy(update={"entries": None})
+            if job.finished:
+                yield _to_dto(job)
+                return
+            if not updated:
+                yield None
+
+
+def optimise_annual_timetable(
+    dto: OptimiseAnnualTimetableDto,
+    progress: Callable[[SolveProgressDto], None],
+    cancelled: Any
+) -> AnnualTimetableResultDto:
+    """年次時間割編成を実行する（ジョブの子プロセスで呼び出す）。
+
+    cancelled（multiprocessing.Event）が設定された場合は、求解を中断する。
+    """
+    usecase = OptimiseAnnualTimetableUsecase(dto, progress=progress)
+
+    def cancel_when_requested() -> None:
+        cancelled.wait()
+        usecase.cancel(CANCELLED_BY_REQUEST)
+
+    threading.Thread(target=cancel_when_requested, name="job-cancel-watcher", daemon=True).start()
+    return usecase.execute()
+
+
+def _to_dto(job: Job) -> OptimisationJobDto:
+    return OptimisationJobDto(
+        job_id=job.job_id,
+        status=job.status,
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+    )
@@ -1,48 +1,285 @@
-from typing import List
+import math
+import time
+from typing import Callable, Dict, List, Optional
+from common.constants import CacheStatus, DEFAULT_TIME_LIMIT, OptimisationMode
 from application.factories.annual_data_factory import create_annual_data
-from application.factories.annual_timetable_result_factory import create_timetable_entries, create_constraint_violations
+from application.factories.annual_timetable_result_factory import (
+    create_build_profile, create_solve_progress, create_solve_result, create_timetable_entries,
+    create_constraint_violations, merge_timetable_results
+)
 from application.factories.constraint_definitions_factory import create_constraint_definitions
+from application.factories.fingerprint_factory import create_fingerprint
+from application.factories.lns_settings_factory import create_lns_settings
+from application.factories.solver_settings_factory import create_solver_settings
+from application.factories.warm_start_factory import create_warm_start
 from application.models.dto import (
     AnnualTimetableResultDto, TimetableEntryDto,
-    OptimiseAnnualTimetableDto, ConstraintViolationDto
+    OptimiseAnnualTimetableDto, ConstraintViolationDto, SolveProgressDto
 )
+from domain.exceptions.exceptions import InfeasibleInputError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.services.annual_data_decomposer import AnnualDataDecomposer
 from domain.services.annual_lp_service import AnnualLpService
+from domain.services.feasibility_checker import FeasibilityChecker
+from domain.services.timetable_constructor import TimetableConstructor
 from domain.vo.annual_data import AnnualDataVo
 from domain.models.annual_lp_model import AnnualLpModel
 from domain.vo.constraint_definition import ConstraintDefinitionVo
-from infrastructure.solvers.gurobi_solver import GurobiSolver
+from domain.vo.solve_result import relative_gap
+from domain.vo.warm_start import WarmStartVo
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+from infrastructure.jobs.process_pool import ProcessPool, create_process_pool
+from infrastructure.solvers.solver_registry import create_solver
+
+# 分割した年次データの部分ごとに割り当てるタイムリミットの下限（秒）
+PART_MIN_TIME_LIMIT = 1.0
 
 
 class OptimiseAnnualTimetableUsecase:
     """年次時間割編成ユースケース"""
 
-    def __init__(self, dto: OptimiseAnnualTimetableDto):
+    def __init__(
+        self,
+        dto: OptimiseAnnualTimetableDto,
+        cache: Optional[TtlLruCache[AnnualTimetableResultDto]] = None,
+        progress: Optional[Callable[[SolveProgressDto], None]] = None
+    ):
         """イニシャライザ。
 
         Args:
             dto (OptimiseAnnualTimetableDTO): 年次時間割編成DTO
+            cache (Optional[TtlLruCache[AnnualTimetableResultDto]]):
+                フィンガープリント -> 編成結果 のキャッシュ。Noneの場合はキャッシュしない
+            progress (Optional[Callable[[SolveProgressDto], None]]):
+                求解中の進捗を受け取る関数。Noneの場合は通知しない
         """
         self.dto = dto
+        self.cache = cache
+        self.progress = progress
+        # 直近のexecuteでのキャッシュの利用状況
+        self.cache_status = CacheStatus.BYPASS
+        # 中断の理由。中断していない場合はNone
+        self.cancel_reason: Optional[str] = None
+        self._solver: Optional[SolverInterface] = None
+        self._pool: Optional[ProcessPool] = None
 
     def execute(self) -> AnnualTimetableResultDto:
         """年次時間割編成を実行する。
 
+        同じ内容のリクエストの結果がキャッシュにあれば、求解せずに返す。
+        debugの場合は計測結果を返すため、キャッシュを使わない。
+
         Returns:
             AnnualTimetableResult: 年次時間割編成結果
         """
+        if self.cache is None or self.dto.debug:
+            self.cache_status = CacheStatus.BYPASS
+            return self._optimise()
+
+        key = create_fingerprint(self.dto)
+        if (result := self.cache.get(key)) is not None:
+            self.cache_status = CacheStatus.HIT
+            return result
+
+        result = self._optimise()
+        self.cache.put(key, result)
+        self.cache_status = CacheStatus.MISS
+        return result
+
+    def cancel(self, reason: str) -> None:
+        """実行中の編成を中断する（executeを呼び出したスレッドとは別のスレッドから呼び出す）。
+
+        中断されたexecuteはOptimizationCancelledErrorを送出する。求解前に呼び出した場合は求解を開始しない。
+
+        Args:
+            reason (str): 中断する理由（ログに出力する）
+        """
+        self.cancel_reason = reason
+        if (solver := self._solver) is not None:
+            solver.cancel(reason)
+        if (pool := self._pool) is not None:
+            pool.cancel(reason)
+
+    def check(self) -> None:
+        """求解する前に、入力に必須制約を満たせない矛盾がないかを検査する（ジョブの投入時など）。
+
+        Raises:
+            InfeasibleInputError: 求解するモード（fast以外）で、入力に矛盾がある場合
+        """
+        self._check(create_annual_data(self.dto.annual_data))
+
+    def _check(self, annual_data: AnnualDataVo) -> None:
+        """LPモデルを構築する前に、明らかに実行不可能な入力を検出する。
+
+        fastモードは求解しないため検査せず、満たさない制約がある時間割をINCOMPLETEとして返す。
+        """
+        if self.dto.mode == OptimisationMode.FAST:
+            return
+        if infeasibilities := FeasibilityChecker.check(annual_data):
+            raise InfeasibleInputError(infeasibilities, annual_data.labels)
+
+    def _optimise(self) -> AnnualTimetableResultDto:
+        """年次時間割編成を求解する。
+
+        年次データが互いに影響しない部分（学年・校舎など）に分かれる場合は、部分ごとに別のLPモデルとして
+        プロセスプールで並列に解き、結果をまとめる。並列に実行できない場合（編成ジョブの中など）は、部分を順に解く。
+        全体の求解時間がタイムリミットに収まるように、部分ごとのタイムリミットを割り当てる。
+        並列に解く場合は同時に解く組の数でタイムリミットを等分し、順に解く場合は残り時間をまだ解いていない部分で等分する。
+
+        Raises:
+            InfeasibleInputError: 求解するモード（fast以外）で、入力に必須制約を満たせない矛盾がある場合
+        """
         annual_data: AnnualDataVo = create_annual_data(self.dto.annual_data)
+        self._check(annual_data)
         constraint_definitions: List[ConstraintDefinitionVo] = create_constraint_definitions(
-            self.dto.constraint_definitions
+            self.dto.constraint_definitions, annual_data.labels
         )
-        solver = GurobiSolver()  # todo ここで注入しますか？
-        model = AnnualLpModel(annual_data, constraint_definitions, solver)
+        warm_start = None
+        if self.dto.warm_start is not None:
+            warm_start = create_warm_start(self.dto.warm_start, annual_data.labels)
+
+        parts = AnnualDataDecomposer.decompose(annual_data)
+        if len(parts) == 1:
+            return self._solve(annual_data, constraint_definitions, warm_start, self.progress)
+
+        time_limit = create_solver_settings(self.dto.solver_settings).time_limit
+        if time_limit is None:
+            time_limit = DEFAULT_TIME_LIMIT
+        progress = self._merge_progress(len(parts))
+        pool = self._pool = create_process_pool()
+        if self.cancel_reason is not None:
+            pool.cancel(self.cancel_reason)
+        if pool.available:
+            rounds = math.ceil(len(parts) / pool.max_workers)
+            return merge_timetable_results(pool.map(
+                _solve_part,
+                [
+                    (
+                        self.dto,
+                        part,
+                        AnnualDataDecomposer.restrict_definitions(part, constraint_definitions),
+                        warm_start,
+                        max(time_limit / rounds, PART_MIN_TIME_LIMIT),
+                        self.progress is not None
+                    )
+                    for part in parts
+                ],
+                on_progress=progress
+            ))
+
+        deadline = time.perf_counter() + time_limit
+        results = []
+        for index, part in enumerate(parts):
+            remaining = deadline - time.perf_counter()
+            results.append(self._solve(
+                part,
+                AnnualDataDecomposer.restrict_definitions(part, constraint_definitions),
+                warm_start,
+                lambda p, index=index: progress(index, p),
+                time_limit=max(remaining / (len(parts) - index), PART_MIN_TIME_LIMIT)
+            ))
+        return merge_timetable_results(results)
 
-        AnnualLpService.solve(model)
+    def _solve(
+        self,
+        annual_data: AnnualDataVo,
+        constraint_definitions: List[ConstraintDefinitionVo],
+        warm_start: Optional[WarmStartVo],
+        progress: Optional[Callable[[SolveProgressDto], None]],
+        time_limit: Optional[float] = None
+    ) -> AnnualTimetableResultDto:
+        """年次データを1つのLPモデルとして求解する。
+
+        time_limitを指定した場合は、リクエストのタイムリミットの代わりに使う（分割した部分を解く場合）。
+        """
+        solver_settings = create_solver_settings(self.dto.solver_settings)
+        if time_limit is not None:
+            solver_settings = solver_settings.model_copy(update={"time_limit": time_limit})
+        solver = self._solver = create_solver(self.dto.solver, solver_settings)
+        if self.cancel_reason is not None:
+            solver.cancel(self.cancel_reason)
+        # 前回の時間割がない場合は、貪欲法で構築した時間割を解の初期値とする
+        if warm_start is None:
+            warm_start = TimetableConstructor(annual_data).construct()
+        model = AnnualLpModel(annual_data, constraint_definitions, solver, warm_start=warm_start)
+        if progress is not None:
+            solver.progress = lambda p: progress(create_solve_progress(model, p))
+
+        if self.dto.mode == OptimisationMode.FAST:
+            AnnualLpService.evaluate_start(model, trace_memory=self.dto.debug)
+        elif self.dto.mode == OptimisationMode.LNS:
+            # 部分問題ごとに、タイムリミットを置き換えたソルバーを生成する（solverは中断の受け付けに使う）
+            AnnualLpService.solve_lns(
+                model,
+                lambda time_limit: create_solver(
+                    self.dto.solver, solver_settings.model_copy(update={"time_limit": time_limit})
+                ),
+                create_lns_settings(self.dto.lns_settings, solver_settings),
+                trace_memory=self.dto.debug
+            )
+        else:
+            AnnualLpService.solve(model, trace_memory=self.dto.debug)
 
         entries: List[TimetableEntryDto] = create_timetable_entries(model)
         violations: List[ConstraintViolationDto] = create_constraint_violations(model)
 
         return AnnualTimetableResultDto(
             entries=entries,
-            violations=violations
+            violations=violations,
+            solve_result=create_solve_result(model),
+            build_profile=create_build_profile(model) if self.dto.debug else None
         )
+
+    def _merge_progress(self, parts: int) -> Callable[[int, SolveProgressDto], None]:
+        """部分ごとの進捗を、全体の進捗にまとめて通知する関数を生成する。
+
+        目的関数値・下界は部分ごとの最新の値の合計とし、すべての部分の値が揃うまではnullとする。
+        暫定解の時間割エントリは部分ごとにしか得られないため、まとめた進捗には含めない。
+        """
+        latest: Dict[int, SolveProgressDto] = {}
+
+        def report(index: int, progress: SolveProgressDto) -> None:
+            if self.progress is None:
+                return
+            latest[index] = progress
+
+            def total(values: List[Optional[float]]) -> Optional[float]:
+                if len(values) < parts or any(v is None for v in values):
+                    return None
+                return sum(values)
+
+            objective = total([p.objective for p in latest.values()])
+            bound = total([p.bound for p in latest.values()])
+            nodes = [p.nodes for p in latest.values() if p.nodes is not None]
+            self.progress(SolveProgressDto(
+                elapsed_seconds=max(p.elapsed_seconds for p in latest.values()),
+                objective=objective,
+                bound=bound,
+                gap=relative_gap(objective, bound),
+                nodes=sum(nodes) if nodes else None,
+                backend=progress.backend
+            ))
+
+        return report
+
+
+def _solve_part(
+    dto: OptimiseAnnualTimetableDto,
+    annual_data: AnnualDataVo,
+    constraint_definitions: List[ConstraintDefinitionVo],
+    warm_start: Optional[WarmStartVo],
+    time_limit: float,
+    report: bool,
+    progress: Callable[[SolveProgressDto], None]
+) -> AnnualTimetableResultDto:
+    """プロセスプールの子プロセスで、分割した年次データの部分をtime_limit（秒）以内に求解する。
+
+    reportがTrueの場合は、進捗を（まとめた進捗に含めない時間割エントリを除いて）親プロセスに送る。
+    """
+    return OptimiseAnnualTimetableUsecase(dto)._solve(
+        annual_data,
+        constraint_definitions,
+        warm_start,
+        (lambda p: progress(p.model_copy(update={"entries": None}))) if report else None,
+        time_limit=time_limit
+    )
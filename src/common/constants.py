@@ -3,9 +3,78 @@ from enum import Enum
 BINARY_ZERO = 0
 BINARY_ONE = 1
 
+# ソルバーのタイムリミットの既定値（秒）
+DEFAULT_TIME_LIMIT = 1200
+
+# 求解せずに解の初期値を解とした場合の、求解結果のソルバーの種類
+HEURISTIC_BACKEND = "HEURISTIC"
+
+# LNSで部分問題1回あたりのタイムリミットの既定値（秒）
+DEFAULT_LNS_SUB_TIME_LIMIT = 10
+
+# 制約定義のパラメータのうち、講座IDを値にとるキー
+COURSE_PARAMETER_KEYS = ("courseId", "course")
+
 
 class ViolationCode(str, Enum):
     V1 = "v1"
     V2 = "v2"
     V3 = "v3"
     V4 = "v4"
+
+
+class CacheStatus(str, Enum):
+    HIT = "HIT"
+    MISS = "MISS"
+    BYPASS = "BYPASS"
+
+
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class SolveStatus(str, Enum):
+    OPTIMAL = "OPTIMAL"
+    FEASIBLE = "FEASIBLE"
+    INFEASIBLE = "INFEASIBLE"
+    UNBOUNDED = "UNBOUNDED"
+    NOT_SOLVED = "NOT_SOLVED"
+    INCOMPLETE = "INCOMPLETE"
+
+
+class OptimisationMode(str, Enum):
+    EXACT = "EXACT"
+    FAST = "FAST"
+    LNS = "LNS"
+
+
+class LnsNeighbourhood(str, Enum):
+    DAY = "DAY"
+    HOMEROOMS = "HOMEROOMS"
+    INSTRUCTORS = "INSTRUCTORS"
+
+
+class InfeasibilityKind(str, Enum):
+    HOMEROOM_PERIODS = "HOMEROOM_PERIODS"
+    COURSE_CREDITS = "COURSE_CREDITS"
+    BLOCK_LANES = "BLOCK_LANES"
+    INSTRUCTOR_LOAD = "INSTRUCTOR_LOAD"
+
+
+class SolverEmphasis(str, Enum):
+    BALANCED = "BALANCED"
+    FEASIBILITY = "FEASIBILITY"
+    OPTIMALITY = "OPTIMALITY"
+    BOUND = "BOUND"
+
+
+class SolverBackend(str, Enum):
+    GUROBI = "GUROBI"
+    GUROBI_NATIVE = "GUROBI_NATIVE"
+    HIGHS = "HIGHS"
+    CBC = "CBC"
+    PORTFOLIO = "PORTFOLIO"
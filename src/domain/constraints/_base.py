@@ -1,8 +1,34 @@
 from abc import ABC, abstractmethod
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 
 
 class ConstraintApplierBase(ABC):
     @abstractmethod
     def apply(self, model: AnnualLpModel) -> AnnualLpModel:
         raise NotImplementedError()
+
+
+class SparseConstraintApplierBase(ConstraintApplierBase):
+    """制約を三つ組バッファに書き出す制約定義の基底クラス。
+
+    emitで列インデックスと係数を直接書き出す。
+    applyはPuLPで解く場合のアダプタとして、書き出した行をPuLPの制約に変換して追加する。
+    """
+
+    @abstractmethod
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行と目的関数の項を書き出す。
+
+        Args:
+            model (AnnualLpModel): LPモデル
+            rows (SparseRows): 書き出し先の三つ組バッファ
+        """
+        raise NotImplementedError()
+
+    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
+        """LPモデルに制約を追加して返却する"""
+        rows = SparseRows()
+        self.emit(model, rows)
+        rows.add_to_problem(model.problem, model.columns)
+        return model
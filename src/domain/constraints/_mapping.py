@@ -46,3 +46,8 @@ CONSTRAINT_DEFINITIONS_BUILT_IN = {
     "TEACHER_CONSECUTIVE_LESSONS": ConsecutivePeriodInstructorConstraint,  # 教員の連続コマ数 → レビュー必要
     "SPECIFIC_DAY_PERIOD": SpecificDayPeriodConstraint,  # 曜日時限指定 → レビュー必要
 }
+
+# 複数の制約定義を1つの制約定義クラスでまとめて適用する組み込み制約（コード -> パラメータのリストから生成する関数）
+CONSTRAINT_DEFINITIONS_BATCHED = {
+    "CONSECUTIVE_PERIOD": ConsecutivePeriodConstraint.batch,  # ２コマ連続開講
+}
@@ -1,16 +1,16 @@
-from typing import List, override
-from domain.logics.constraint_logic import is_enrolled
-from domain.constraints._base import ConstraintApplierBase
+from typing import override
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class AfternoonConstraint(ConstraintApplierBase):
+class AfternoonConstraint(SparseConstraintApplierBase):
     """午前午後制約の制約定義クラス。"""
 
     @override
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する。"""
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行と目的関数の項を書き出す。"""
 
         def get_capability_in_afternoon(c: str) -> int:
             """講座cの、午後に配置可能なコマ数を取得する。"""
@@ -23,31 +23,29 @@ class AfternoonConstraint(ConstraintApplierBase):
 
         def get_h0(c: str) -> str:  # todo: ドメインロジック切り出し→マッピング
             """講座cを履修する学級を1つ取得する。"""
-            return next(
-                (h for h in model.data.H if is_enrolled(model.data, h, c)), None
-            )
+            return next(iter(model.data.index.course_homerooms.get(c, ())), None)
 
         def get_first_pm_period(d: str) -> int:
             """午後の先頭時限を取得する。"""
             return model.data.school_day_dict[d].am_periods + 1
 
-        constraints: List[pulp.LpConstraint] = [
-            pulp.lpSum(terms) <= get_capability_in_afternoon(c) + get_big_M(c) * model.v1[c]
-            for c in model.data.C
-            if (h0 := get_h0(c)) is not None
-            if (terms := [
-                model.x[h0, d, p, c]
+        for c in model.data.C:
+            if (h0 := get_h0(c)) is None:
+                continue
+            cols = [
+                model.x.col((h0, d, p, c))
                 for d in model.data.D
                 for p in model.data.homeroom_day_dict[h0][d]
                 if p >= get_first_pm_period(d)
-            ])
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        model.problem += (
-            1 * pulp.lpSum(model.v1[c] for c in model.data.C)
-        ), "V1"
-
-        return model
+            ]
+            if cols:
+                # 午後のコマ数 - M * v1 <= 午後に配置可能なコマ数
+                rows.add_row(
+                    [*cols, model.v1.col(c)],
+                    [1] * len(cols) + [-get_big_M(c)],
+                    pulp.LpConstraintLE,
+                    get_capability_in_afternoon(c)
+                )
+
+        v1_cols = [model.v1.col(c) for c in model.data.C]
+        rows.add_objective(v1_cols, [1] * len(v1_cols))
@@ -1,32 +1,32 @@
-from typing import List, override
-from domain.constraints._base import ConstraintApplierBase
+from typing import override
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class BlockConstraint(ConstraintApplierBase):
+class BlockConstraint(SparseConstraintApplierBase):
     """ブロック制約の制約定義クラス。"""
 
     @override
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する"""
-        constraints: List[pulp.LpConstraint] = [
-            lane_sums[0] == lane_sum
-            for h in model.data.H
-            for d in model.data.D
-            for p in model.data.homeroom_day_dict[h][d]
-            for block in model.data.curriculum_dict[h]
-            if len(block) > 1
-            and (
-                lane_sums := [
-                    pulp.lpSum([model.x[h, d, p, c] for c in lane])
-                    for lane in block
-                ]
-            )
-            for lane_sum in lane_sums[1:]
-        ]
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行を書き出す"""
+        for h in model.data.H:
+            for d in model.data.D:
+                for p in model.data.homeroom_day_dict[h][d]:
+                    for block in model.data.curriculum_dict[h]:
+                        if len(block) <= 1:
+                            continue
 
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+                        lane_cols = [
+                            [model.x.col((h, d, p, c)) for c in lane]
+                            for lane in block
+                        ]
+                        # 先頭レーンの和 - 各レーンの和 == 0
+                        for cols in lane_cols[1:]:
+                            rows.add_row(
+                                [*lane_cols[0], *cols],
+                                [1] * len(lane_cols[0]) + [-1] * len(cols),
+                                pulp.LpConstraintEQ,
+                                0
+                            )
@@ -2,16 +2,17 @@ import logging
 import pulp
 from typing import List, override
 from domain.logics.constraint_logic import get_enrolled_homeroom
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 
 
-class ConsecutiveDayConstraint(ConstraintApplierBase):
+class ConsecutiveDayConstraint(SparseConstraintApplierBase):
     """連続曜日制約の制約定義クラス。"""
 
     @override
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する。"""
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行と目的関数の項を書き出す。"""
         logging.info("連続曜日制約の適用を開始します")
 
         def get_big_M() -> int:
@@ -34,24 +35,28 @@ class ConsecutiveDayConstraint(ConstraintApplierBase):
 
             return patterns
 
-        constraints: List[pulp.LpConstraint] = [
-            pulp.lpSum(
-                model.x[h0, d, p, c]
-                for d in pattern
-                for p in model.data.homeroom_day_dict[h0][d]
-            ) <= (len(pattern) - 1) + get_big_M() * model.v2[c]  # ペナルティ変数を追加
-            for c in model.data.C
-            if model.data.credit_dict[c] >= 2
-            if (h0 := get_enrolled_homeroom(model.data, c)) is not None
-            for pattern in get_patterns(c)
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        model.problem += (
-            1 * pulp.lpSum(model.v2[c] for c in model.data.C)
-        ), "V2"
-
-        logging.info(f"連続曜日制約の適用を完了しました（制約数: {len(constraints)}）")
-        return model
+        num_constraints = len(rows)
+        for c in model.data.C:
+            if model.data.credit_dict[c] < 2:
+                continue
+            if (h0 := get_enrolled_homeroom(model.data, c)) is None:
+                continue
+            for pattern in get_patterns(c):
+                cols = [
+                    model.x.col((h0, d, p, c))
+                    for d in pattern
+                    for p in model.data.homeroom_day_dict[h0][d]
+                ]
+                # ペナルティ変数を追加
+                rows.add_row(
+                    [*cols, model.v2.col(c)],
+                    [1] * len(cols) + [-get_big_M()],
+                    pulp.LpConstraintLE,
+                    len(pattern) - 1
+                )
+        num_constraints = len(rows) - num_constraints
+
+        v2_cols = [model.v2.col(c) for c in model.data.C]
+        rows.add_objective(v2_cols, [1] * len(v2_cols))
+
+        logging.info(f"連続曜日制約の適用を完了しました（制約数: {num_constraints}）")
@@ -1,49 +1,77 @@
-from domain.logics.constraint_logic import is_enrolled
-from domain.constraints._base import ConstraintApplierBase
+from typing import Dict, List, Optional, Union
+from common.constants import COURSE_PARAMETER_KEYS
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 import math
 
 
-class ConsecutivePeriodConstraint(ConstraintApplierBase):
-    """2コマ連続開講制約の制約定義クラス。"""
+class ConsecutivePeriodConstraint(SparseConstraintApplierBase):
+    """2コマ連続開講制約の制約定義クラス。
 
-    def __init__(self, courseId: str):
-        self.course: str = courseId
+    複数の講座の制約定義は、batchで生成した1つのインスタンスでまとめて書き出す。
+    講座を履修する学級とwの添字は、年次データとLPモデルの講座ごとの索引から取得する。
+    """
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
+    def __init__(self, courseId: Optional[str] = None, courseIds: Optional[List[str]] = None):
+        """
+        Args:
+            courseId: 講座ID
+            courseIds: まとめて適用する講座IDのリスト
+        """
+        courses = ([courseId] if courseId is not None else []) + list(courseIds or [])
+        # 同じ講座の制約定義が重複する場合は1回だけ書き出す
+        self.courses: List[str] = list(dict.fromkeys(courses))
 
-        triple_constraints = [
-            self._generate_triple_consecutive_constraint(model, h, d, p1, p2, p3)
-            for h in model.data.H
-            if is_enrolled(model.data, h, self.course)
-            for d in model.data.D
-            for p1, p2, p3 in zip(model.data.homeroom_day_dict[h][d], model.data.homeroom_day_dict[h][d][1:], model.data.homeroom_day_dict[h][d][2:])
-        ]
+    @classmethod
+    def batch(cls, parameters_list: List[Dict[str, Union[str, int]]]) -> "ConsecutivePeriodConstraint":
+        """複数の制約定義のパラメータから、すべての講座をまとめて適用するインスタンスを生成する。
 
-        credit_constraint = pulp.lpSum(
-            model.w[h, d, p1, p2, c]
-            for (h, d, p1, p2, c) in model.w.keys()
-            if c == self.course
-        ) == math.floor(model.data.credit_dict[self.course] / 2)
+        Args:
+            parameters_list: 制約定義ごとのパラメータ（講座IDを courseId または course に持つ）
 
-        for constraint in triple_constraints:
-            model.problem += constraint
+        Returns:
+            ConsecutivePeriodConstraint: すべての講座をまとめて適用するインスタンス
+        """
+        return cls(courseIds=[
+            next(parameters[key] for key in COURSE_PARAMETER_KEYS if key in parameters)
+            for parameters in parameters_list
+        ])
 
-        model.problem += credit_constraint
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        homeroom_order = {h: n for n, h in enumerate(model.data.H)}
+        for course in self.courses:
+            homerooms = sorted(model.data.index.course_homerooms.get(course, ()), key=homeroom_order.get)
+            for h in homerooms:
+                for d in model.data.D:
+                    periods = model.data.homeroom_day_dict[h][d]
+                    for p1, p2, p3 in zip(periods, periods[1:], periods[2:]):
+                        self._emit_triple_consecutive_constraint(model, rows, course, h, d, p1, p2, p3)
 
-        return model
+            w_cols = [model.w.col(key) for key in model.w_keys(course)]
+            rows.add_row(
+                w_cols,
+                [1] * len(w_cols),
+                pulp.LpConstraintEQ,
+                math.floor(model.data.credit_dict[course] / 2)
+            )
 
-    def _generate_triple_consecutive_constraint(
+    def _emit_triple_consecutive_constraint(
         self,
         model: AnnualLpModel,
+        rows: SparseRows,
+        course: str,
         h: str,
         d: str,
         p1: int,
         p2: int,
         p3: int
-    ) -> pulp.LpConstraint:
-        """3時限連続を拒否する制約を生成する"""
-        return (
-            model.x[h, d, p1, self.course] + model.x[h, d, p2, self.course] + model.x[h, d, p3, self.course] <= 2
+    ) -> None:
+        """3時限連続を拒否する制約を書き出す"""
+        rows.add_row(
+            [model.x.col((h, d, p, course)) for p in (p1, p2, p3)],
+            [1, 1, 1],
+            pulp.LpConstraintLE,
+            2
         )
@@ -1,10 +1,11 @@
-from typing import List, override
-from domain.constraints._base import ConstraintApplierBase
+from typing import override
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class ConsecutivePeriodInstructorConstraint(ConstraintApplierBase):
+class ConsecutivePeriodInstructorConstraint(SparseConstraintApplierBase):
     """教員の連続コマ数制約
 
     教員が連続して授業を担当するコマ数が、設定した上限値以下である。
@@ -18,8 +19,8 @@ class ConsecutivePeriodInstructorConstraint(ConstraintApplierBase):
         self.max_consecutive_lessons = max_consecutive_lessons
 
     @override
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する"""
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行と目的関数の項を書き出す"""
 
         def get_big_M() -> int:
             """Big-M値として、1日の最大時限数を取得"""
@@ -28,8 +29,6 @@ class ConsecutivePeriodInstructorConstraint(ConstraintApplierBase):
 
         big_M = get_big_M()
 
-        constraints: List[pulp.LpConstraint] = []
-
         # 各教員、各曜日、各時限から始まる連続コマ数をチェック
         for d in model.data.D:
             for i in model.data.I:
@@ -45,18 +44,14 @@ class ConsecutivePeriodInstructorConstraint(ConstraintApplierBase):
 
                     # max_consecutive_lessons + 1 個の連続する時限がある場合のみ制約を追加
                     if len(consecutive_periods) >= self.max_consecutive_lessons + 1:
-                        constraint = (
-                            pulp.lpSum(model.y[d, p, i] for p in consecutive_periods)
-                            <= self.max_consecutive_lessons + big_M * model.v4[d, start_p, i]
+                        cols = [model.y.col((d, p, i)) for p in consecutive_periods]
+                        rows.add_row(
+                            [*cols, model.v4.col((d, start_p, i))],
+                            [1] * len(cols) + [-big_M],
+                            pulp.LpConstraintLE,
+                            self.max_consecutive_lessons
                         )
-                        constraints.append(constraint)
-
-        for constraint in constraints:
-            model.problem += constraint
 
         # ペナルティをコストに追加
-        model.problem += (
-            1 * pulp.lpSum(model.v4[d, p, i] for d in model.data.D for p in model.data.P for i in model.data.I)
-        ), "V4"
-
-        return model
+        v4_cols = [model.v4.col((d, p, i)) for d in model.data.D for p in model.data.P for i in model.data.I]
+        rows.add_objective(v4_cols, [1] * len(v4_cols))
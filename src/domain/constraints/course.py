@@ -1,27 +1,27 @@
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
+import pulp
 
 
-class CourseConstraint(ConstraintApplierBase):
+class CourseConstraint(SparseConstraintApplierBase):
     """講座制約の制約定義クラス。"""
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        constraints = [
-            model.x[enrolled_homerooms[0], d, p, c] == model.x[enrolled_homeroom, d, p, c]
-            for c in model.data.C
-            for d in model.data.D
-            for p in model.data.P
-            if (
-                #  cを受講しているhのリスト
-                enrolled_homerooms := [
-                    h for h in model.data.H
-                    if (h, d, p, c) in model.x  # cがあるかと、d, pがあるかのチェック
-                ]
-            ) and len(enrolled_homerooms) > 1
-            for enrolled_homeroom in enrolled_homerooms[1:]
-        ]
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        for c in model.data.C:
+            for d in model.data.D:
+                for p in model.data.P:
+                    #  d, pにcを受講しているhのリスト
+                    enrolled_homerooms = [
+                        h for h in model.data.index.course_homerooms[c]
+                        if p in model.data.index.homeroom_day_periods.get((h, d), ())
+                    ]
+                    if len(enrolled_homerooms) <= 1:
+                        continue
 
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+                    x0 = model.x.col((enrolled_homerooms[0], d, p, c))
+                    for enrolled_homeroom in enrolled_homerooms[1:]:
+                        xh = model.x.col((enrolled_homeroom, d, p, c))
+                        # 共有変数にまとめられている場合は同一変数のため制約不要
+                        if x0 != xh:
+                            rows.add_row([x0, xh], [1, -1], pulp.LpConstraintEQ, 0)
@@ -1,12 +1,13 @@
 from typing import Set
 
-from domain.logics.constraint_logic import get_enrolled_homeroom
-from domain.constraints._base import ConstraintApplierBase
+from domain.logics.constraint_logic import get_enrolled_homeroom, get_parameter_course
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class CoursesPerDayConstraint(ConstraintApplierBase):
+class CoursesPerDayConstraint(SparseConstraintApplierBase):
     """同日開講制約の制約定義クラス。
 
     各講座について、1日あたりの開講数を制限する。
@@ -17,23 +18,16 @@ class CoursesPerDayConstraint(ConstraintApplierBase):
         # パラメータは使用しない（後方互換性のためkwargsを受け取る）
         pass
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
         # 連続時限制約が設定されている講座IDを抽出
         twice_course_set = self._extract_consecutive_period_courses(model)
 
-        constraints = [
-            pulp.lpSum(
-                model.x[h, d, p, c] for p in model.data.homeroom_day_dict[h][d]
-            ) <= self._get_max(c, twice_course_set)
-            for c in model.data.C
-            if (h := get_enrolled_homeroom(model.data, c)) is not None
-            for d in model.data.homeroom_day_dict[h]
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+        for c in model.data.C:
+            if (h := get_enrolled_homeroom(model.data, c)) is None:
+                continue
+            for d in model.data.homeroom_day_dict[h]:
+                cols = [model.x.col((h, d, p, c)) for p in model.data.homeroom_day_dict[h][d]]
+                rows.add_row(cols, [1] * len(cols), pulp.LpConstraintLE, self._get_max(c, twice_course_set))
 
     def _extract_consecutive_period_courses(self, model: AnnualLpModel) -> Set[str]:
         """連続時限（講座）制約から講座IDを抽出する。
@@ -46,10 +40,11 @@ class CoursesPerDayConstraint(ConstraintApplierBase):
         """
         course_ids: Set[str] = set()
         for cd in model.constraint_definitions:
-            if cd.code.upper() == "CONSECUTIVE_PERIOD" and cd.parameters:
-                course_id = cd.parameters.get("courseId") or cd.parameters.get("course")
-                if course_id:
-                    course_ids.add(course_id)
+            if cd.code.upper() != "CONSECUTIVE_PERIOD":
+                continue
+            # 整数IDに変換した講座ID 0 も講座IDとして扱う
+            if (course_id := get_parameter_course(cd.parameters)) is not None:
+                course_ids.add(course_id)
         return course_ids
 
     def _get_max(self, course: str, twice_course_set: Set[str]) -> int:
@@ -1,10 +1,11 @@
-from typing import List, override
-from domain.constraints._base import ConstraintApplierBase
+from typing import override
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class CoursesPerDayInstructorConstraint(ConstraintApplierBase):
+class CoursesPerDayInstructorConstraint(SparseConstraintApplierBase):
     """教員の1日あたりのコマ数制約
 
     教員の1日あたりの担当コマ数が、設定した上限値以下である。
@@ -18,8 +19,8 @@ class CoursesPerDayInstructorConstraint(ConstraintApplierBase):
         self.max_daily_lessons = max_daily_lessons
 
     @override
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する"""
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行と目的関数の項を書き出す"""
 
         def get_big_M() -> int:
             """Big-M値として、教員が1日に担当可能な最大コマ数を取得"""
@@ -28,20 +29,16 @@ class CoursesPerDayInstructorConstraint(ConstraintApplierBase):
 
         big_M = get_big_M()
 
-        constraints: List[pulp.LpConstraint] = [
-            pulp.lpSum(model.y[d, p, i] for p in model.data.P)
-            <= self.max_daily_lessons + big_M * model.v3[d, i]
-            for d in model.data.D
-            for i in model.data.I
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
+        for d in model.data.D:
+            for i in model.data.I:
+                cols = [model.y.col((d, p, i)) for p in model.data.P]
+                rows.add_row(
+                    [*cols, model.v3.col((d, i))],
+                    [1] * len(cols) + [-big_M],
+                    pulp.LpConstraintLE,
+                    self.max_daily_lessons
+                )
 
         # ペナルティをコストに追加
-        model.problem += (
-            1 * pulp.lpSum(model.v3[d, i] for d in model.data.D for i in model.data.I)
-        ), "V3"
-
-        return model
-
+        v3_cols = [model.v3.col((d, i)) for d in model.data.D for i in model.data.I]
+        rows.add_objective(v3_cols, [1] * len(v3_cols))
@@ -1,23 +1,20 @@
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class CreditConstraint(ConstraintApplierBase):
+class CreditConstraint(SparseConstraintApplierBase):
     """単位数制約の制約定義クラス。"""
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        constraints = [
-            pulp.lpSum(
-                [model.x[h, d, p, c] for d in model.data.D for p in model.data.homeroom_day_dict[h][d]]
-            ) == model.data.credit_dict[c]
-            for h in model.data.H
-            for block in model.data.curriculum_dict[h]
-            for lane in block
-            for c in lane
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        for h in model.data.H:
+            for block in model.data.curriculum_dict[h]:
+                for lane in block:
+                    for c in lane:
+                        cols = [
+                            model.x.col((h, d, p, c))
+                            for d in model.data.D
+                            for p in model.data.homeroom_day_dict[h][d]
+                        ]
+                        rows.add_row(cols, [1] * len(cols), pulp.LpConstraintEQ, model.data.credit_dict[c])
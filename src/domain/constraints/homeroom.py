@@ -1,28 +1,21 @@
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class HomeroomConstraint(ConstraintApplierBase):
+class HomeroomConstraint(SparseConstraintApplierBase):
     """学級制約の制約定義クラス。"""
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する"""
-        constraints = [
-            pulp.lpSum(
-                [
-                    model.x[h, d, p, c]
-                    for block in model.data.curriculum_dict[h]
-                    for lane in block
-                    for c in lane
-                ]
-            ) >= 1
-            for h in model.data.H
-            for d in model.data.D
-            for p in model.data.homeroom_day_dict[h][d]
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行を書き出す"""
+        for h in model.data.H:
+            for d in model.data.D:
+                for p in model.data.homeroom_day_dict[h][d]:
+                    cols = [
+                        model.x.col((h, d, p, c))
+                        for block in model.data.curriculum_dict[h]
+                        for lane in block
+                        for c in lane
+                    ]
+                    rows.add_row(cols, [1] * len(cols), pulp.LpConstraintGE, 1)
@@ -1,25 +1,23 @@
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
+import pulp
 
 
-class InstructorConstraint(ConstraintApplierBase):
+class InstructorConstraint(SparseConstraintApplierBase):
     """教員制約の制約定義クラス。"""
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
         def is_available(d, p, i) -> bool:
             instructor_days = model.data.attendance_day_dict.get(i, {})
             unavailable_periods = instructor_days.get(d, [])
             return p not in unavailable_periods
 
-        constraints = [
-            (model.y[d, p, i] <= 1) if is_available(d, p, i)
-            else (model.y[d, p, i] == 0)
-            for d in model.data.D
-            for p in model.data.P
-            for i in model.data.I
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+        for d in model.data.D:
+            for p in model.data.P:
+                for i in model.data.I:
+                    y = model.y.col((d, p, i))
+                    if is_available(d, p, i):
+                        rows.add_row([y], [1], pulp.LpConstraintLE, 1)
+                    else:
+                        rows.add_row([y], [1], pulp.LpConstraintEQ, 0)
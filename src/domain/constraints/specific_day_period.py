@@ -1,9 +1,11 @@
 from typing import Dict, List
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
+import pulp
 
 
-class SpecificDayPeriodConstraint(ConstraintApplierBase):
+class SpecificDayPeriodConstraint(SparseConstraintApplierBase):
     """曜日時限指定制約
 
     開講曜日時限を指定する（先入れ）。
@@ -19,10 +21,8 @@ class SpecificDayPeriodConstraint(ConstraintApplierBase):
         """
         self.fixed_assignments = fixed_assignments
 
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        """LPモデルに制約を追加して返却する"""
-        constraints = []
-
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        """制約行を書き出す"""
         for assignment in self.fixed_assignments:
             h = assignment.get("homeroom")
             c = assignment.get("course")
@@ -39,10 +39,4 @@ class SpecificDayPeriodConstraint(ConstraintApplierBase):
 
                 if (h, d, p, c) in model.x:
                     # 指定された割り当てを固定（x[h, d, p, c] = 1）
-                    constraint = model.x[h, d, p, c] == 1
-                    constraints.append(constraint)
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+                    rows.add_row([model.x.col((h, d, p, c))], [1], pulp.LpConstraintEQ, 1)
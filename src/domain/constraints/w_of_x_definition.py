@@ -1,33 +1,28 @@
-from typing import List
-from domain.constraints._base import ConstraintApplierBase
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 import pulp
 
 
-class WofXDefinition(ConstraintApplierBase):
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        constraints = [
-            constraint
-            for (h, d, p1, p2, c) in model.w.keys()
-            for constraint in self._generate_double_consecutive_constraints(model, h, d, p1, p2, c)
-        ]
+class WofXDefinition(SparseConstraintApplierBase):
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        for (h, d, p1, p2, c) in model.w.keys():
+            self._emit_double_consecutive_constraints(model, rows, h, d, p1, p2, c)
 
-        for constraint in constraints:
-            model.problem += constraint
-        return model
-
-    def _generate_double_consecutive_constraints(
+    def _emit_double_consecutive_constraints(
         self,
         model: AnnualLpModel,
+        rows: SparseRows,
         h: str,
         d: str,
         p1: int,
         p2: int,
         c: str
-    ) -> List[pulp.LpConstraint]:
-        """consecutive := min(x_{h,d,p1,c}, x_{h,d,p2,c})に相当する制約を生成する"""
-        return [
-            model.w[h, d, p1, p2, c] <= model.x[h, d, p1, c],
-            model.w[h, d, p1, p2, c] <= model.x[h, d, p2, c],
-            model.x[h, d, p1, c] + model.x[h, d, p2, c] - 1 <= model.w[h, d, p1, p2, c]
-        ]
+    ) -> None:
+        """consecutive := min(x_{h,d,p1,c}, x_{h,d,p2,c})に相当する制約を書き出す"""
+        w = model.w.col((h, d, p1, p2, c))
+        x1 = model.x.col((h, d, p1, c))
+        x2 = model.x.col((h, d, p2, c))
+        rows.add_row([w, x1], [1, -1], pulp.LpConstraintLE, 0)
+        rows.add_row([w, x2], [1, -1], pulp.LpConstraintLE, 0)
+        rows.add_row([x1, x2, w], [1, 1, -1], pulp.LpConstraintLE, 1)
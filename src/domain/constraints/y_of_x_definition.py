@@ -1,28 +1,31 @@
+from typing import Dict, List, Tuple
 import pulp
-from domain.logics.constraint_logic import get_enrolled_homeroom, is_instructor_of_course
-from domain.constraints._base import ConstraintApplierBase
+from domain.logics.constraint_logic import get_enrolled_homeroom
+from domain.constraints._base import SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
 
 
-class YofXDefinition(ConstraintApplierBase):
-    def apply(self, model: AnnualLpModel) -> AnnualLpModel:
-        constraints = [
-            # cに関して和をとる
-            model.y[d, p, i] == pulp.lpSum(
-                model.x[h, d, p, c]
-                for c in model.data.C
-                if (h := get_enrolled_homeroom(model.data, c)) is not None
-                and is_instructor_of_course(model.data, i, c)
-                and (h, d, p, c) in model.x
-            )
+class YofXDefinition(SparseConstraintApplierBase):
+    def emit(self, model: AnnualLpModel, rows: SparseRows) -> None:
+        # 教員 -> 担当講座の対応から、(d, p, i)ごとの列を非ゼロ要素分だけ集める
+        terms: Dict[Tuple[str, int, str], List[int]] = {}
+        for i in model.data.I:
+            for c in model.data.index.instructor_courses.get(i, ()):
+                if (h := get_enrolled_homeroom(model.data, c)) is None:
+                    continue
+                for d in model.data.D:
+                    for p in model.data.homeroom_day_dict[h].get(d, []):
+                        terms.setdefault((d, p, i), []).append(model.x.col((h, d, p, c)))
 
-            # 任意のd, p, iに対して
-            for d in model.data.D
-            for p in model.data.P
-            for i in model.data.I
-        ]
-
-        for constraint in constraints:
-            model.problem += constraint
-
-        return model
+        # 任意のd, p, iに対して、y - (cに関するxの和) == 0
+        for d in model.data.D:
+            for p in model.data.P:
+                for i in model.data.I:
+                    cols = terms.get((d, p, i), [])
+                    rows.add_row(
+                        [model.y.col((d, p, i)), *cols],
+                        [1, *([-1] * len(cols))],
+                        pulp.LpConstraintEQ,
+                        0
+                    )
@@ -1,9 +1,52 @@
+from typing import List, Optional
+
+from domain.vo.id_labels import IdLabelsVo
+from domain.vo.infeasibility import InfeasibilityVo
+
+
 class OptimizationError(Exception):
     def __init__(self, solver_status: int):
         self.solver_status = solver_status
         super().__init__(f"Optimization failed with status {solver_status}")
 
+    def __reduce__(self):
+        # 子プロセスから受け渡す場合に、イニシャライザの引数で復元する
+        return (type(self), (self.solver_status,))
+
 
 class ConstraintError(Exception):
     def __init__(self, message: str):
         super().__init__(message)
+
+
+class SolverUnavailableError(Exception):
+    """ソルバーを利用できない（ライセンスの取得に失敗した、トークンが使用中など）"""
+    def __init__(self, backend: str, message: str):
+        self.backend = backend
+        self.message = message
+        super().__init__(f"Solver {backend} is unavailable: {message}")
+
+    def __reduce__(self):
+        return (type(self), (self.backend, self.message))
+
+
+class OptimizationCancelledError(Exception):
+    """求解が中断された（ジョブのキャンセル、クライアントの切断など）"""
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Optimization was cancelled: {reason}")
+
+    def __reduce__(self):
+        return (type(self), (self.reason,))
+
+
+class InfeasibleInputError(Exception):
+    """入力に必須制約を満たせない矛盾がある（求解する前に検出した）。labelsは矛盾のIDを元のIDに戻す対応表"""
+    def __init__(self, infeasibilities: List[InfeasibilityVo], labels: Optional[IdLabelsVo] = None):
+        self.infeasibilities = infeasibilities
+        self.labels = labels
+        kinds = ", ".join(dict.fromkeys(i.kind.value for i in infeasibilities))
+        super().__init__(f"Input is infeasible: {len(infeasibilities)} conflict(s) ({kinds})")
+
+    def __reduce__(self):
+        return (type(self), (self.infeasibilities, self.labels))
@@ -1,10 +1,34 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+import pulp
+
+from domain.exceptions.exceptions import OptimizationCancelledError
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from domain.vo.solve_progress import SolveProgressVo
+
+# 中断処理の登録とcancelの呼び出しを直列化するロック
+_cancel_lock = threading.Lock()
 
 
 class SolverInterface(ABC):
     """ソルバーのインターフェース。"""
 
+    # ソルバーの種類（SolverBackendの値）
+    backend: str = ""
+    # 行列形式を直接解けるかどうか。Trueの場合はsolve_matrixを実装する
+    supports_matrix: bool = False
+    # 求解中の進捗を受け取る関数。対応していないソルバーでは呼び出されない
+    progress: Optional[Callable[[SolveProgressVo], None]] = None
+    # PuLPの問題を解く場合に、PuLP変数の値を解の初期値（MIPスタート）として渡すかどうか
+    # （行列形式の場合はLpMatrix.startが設定されていれば渡す）
+    warm_start: bool = False
+    # 求解を中断した理由。中断していない場合はNone
+    cancel_reason: Optional[str] = None
+    # 求解中にcancelで呼び出す中断処理
+    _interrupt: Optional[Callable[[], None]] = None
+
     @abstractmethod
     def get_solver(self) -> Any:
         """ソルバーインスタンスを取得する。
@@ -13,3 +37,90 @@ class SolverInterface(ABC):
             Any: PuLPのソルバーインスタンス
         """
         pass
+
+    def cancel(self, reason: str) -> None:
+        """求解を中断する（求解しているスレッドとは別のスレッドから呼び出す）。
+
+        求解中であればソルバーを停止し、求解前であれば求解を開始しない。
+        中断後にソルバーが返した結果は使わない（AnnualLpServiceがOptimizationCancelledErrorを送出する）。
+
+        Args:
+            reason (str): 中断する理由（ログに出力する）
+        """
+        with _cancel_lock:
+            self.cancel_reason = reason
+            interrupt = self._interrupt
+        if interrupt is not None:
+            interrupt()
+
+    @contextmanager
+    def interruptible(self, interrupt: Callable[[], None]) -> Iterator[None]:
+        """求解中にcancelで呼び出す中断処理を登録する。ソルバーの実装で求解を囲んで使う。
+
+        Args:
+            interrupt (Callable[[], None]): ソルバーを停止する関数（別スレッドから呼び出される）
+
+        Raises:
+            OptimizationCancelledError: 既に中断されている場合
+        """
+        with _cancel_lock:
+            if self.cancel_reason is not None:
+                raise OptimizationCancelledError(self.cancel_reason)
+            self._interrupt = interrupt
+        try:
+            yield
+        finally:
+            with _cancel_lock:
+                self._interrupt = None
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式の問題を解く。
+
+        Args:
+            matrix (LpMatrix): 行列形式の問題
+
+        Returns:
+            MatrixSolution: 解いた結果
+
+        Raises:
+            SolverUnavailableError: ソルバーを利用できない場合
+        """
+        raise NotImplementedError()
+
+    def solve_problem(self, problem: pulp.LpProblem) -> MatrixSolution:
+        """PuLPの問題を解く。
+
+        解の値はPuLP変数に書き戻す。行列形式を直接解けるソルバーの場合は行列形式に変換して解く。
+        求解中の進捗には暫定解の値を含めない。
+        それ以外のソルバーで下界を取得できる場合は、このメソッドをオーバーライドしてboundを設定する。
+
+        Args:
+            problem (pulp.LpProblem): PuLPの問題（setSolverでソルバーを設定済み）
+
+        Returns:
+            MatrixSolution: 解いた結果
+
+        Raises:
+            SolverUnavailableError: ソルバーを利用できない場合
+        """
+        if self.supports_matrix:
+            matrix = LpMatrix.from_problem(problem)
+            progress = self.progress
+            if progress is not None:
+                # 列インデックスがPuLPの問題に現れた順になるため、暫定解の値は通知しない
+                self.progress = lambda p: progress(p.model_copy(update={"values": None}))
+            try:
+                solution = self.solve_matrix(matrix)
+            finally:
+                self.progress = progress
+            if solution.values is not None:
+                matrix.assign_values(solution.values)
+            problem.assignStatus(solution.status, solution.sol_status)
+            return solution
+
+        status = problem.solve()
+        objective = None
+        if problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+            # 目的関数を設定していない（ソフト制約がない）場合は0
+            objective = problem.objective.valueOrDefault() if problem.objective is not None else 0.0
+        return MatrixSolution(status=status, sol_status=problem.sol_status, objective=objective)
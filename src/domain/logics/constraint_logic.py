@@ -1,17 +1,31 @@
-from domain.vo.annual_data import AnnualDataVo
+from typing import Dict, Optional, Union
+
+from common.constants import COURSE_PARAMETER_KEYS
+from domain.vo.annual_data import AnnualDataVo, CourseId
 
 
 def is_enrolled(data: AnnualDataVo, h: str, c: str) -> bool:
     """学級 h が講座 c を履修しているか"""
-    return any(c in lane for block in data.curriculum_dict[h] for lane in block)
+    return c in data.index.homeroom_courses.get(h, frozenset())
 
 
 def get_enrolled_homeroom(data: AnnualDataVo, c: str) -> str | None:
     """講座 c を履修している学級を1つ取得する。該当する学級がない場合はNoneを返す"""
-    enrolled_homerooms = [h for h in data.H if is_enrolled(data, h, c)]
+    enrolled_homerooms = data.index.course_homerooms.get(c, ())
     return min(enrolled_homerooms) if enrolled_homerooms else None
 
 
 def is_instructor_of_course(data: AnnualDataVo, i: str, c: str) -> bool:
     """教員 i が講座 c を担当しているか"""
-    return any(i == detail.instructor_id for detail in data.course_details_dict[c])
+    return i in data.index.course_instructors.get(c, frozenset())
+
+
+def get_parameter_course(parameters: Optional[Dict[str, Union[str, int]]]) -> Optional[CourseId]:
+    """制約定義のパラメータから講座IDを取得する。講座を対象としない制約定義の場合はNoneを返す
+
+    整数IDに変換した講座ID 0 も講座IDとして扱う。
+    """
+    for key in COURSE_PARAMETER_KEYS:
+        if parameters and key in parameters:
+            return parameters[key]
+    return None
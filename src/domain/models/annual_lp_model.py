@@ -1,9 +1,17 @@
-from typing import List
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
 import pulp
 
-from domain.vo.annual_data import AnnualDataVo
+from common.constants import COURSE_PARAMETER_KEYS
+from domain.vo.annual_data import AnnualDataVo, CourseId, DayOfWeek, HomeroomId, Period
 from domain.vo.constraint_definition import ConstraintDefinitionVo
 from domain.interfaces.solver_interface import SolverInterface
+from domain.models.variables import ColumnRegistry, VariableFamily
+from domain.vo.build_profile import BuildProfileVo
+from domain.vo.solve_result import SolveResultVo
+from domain.vo.warm_start import WarmStartVo
+
+# wの添字 (h, d, p1, p2, c)
+WKey = Tuple[HomeroomId, DayOfWeek, Period, Period, CourseId]
 
 
 class AnnualLpModel:
@@ -16,7 +24,9 @@ class AnnualLpModel:
         self,
         annual_data: AnnualDataVo,
         constraint_definitions: List[ConstraintDefinitionVo],
-        solver: SolverInterface
+        solver: SolverInterface,
+        merge_shared_courses: bool = False,
+        warm_start: Optional[WarmStartVo] = None
     ) -> None:
         """イニシャライザ。
 
@@ -30,64 +40,172 @@ class AnnualLpModel:
                 制約定義リスト。
             solver (SolverInterface):
                 ソルバーの実装。
+            merge_shared_courses (bool):
+                Trueの場合、複数学級が履修する講座の解変数を(曜日, 時限, 講座)ごとに1つにまとめ、
+                各学級の解変数はその共有変数を参照する。
+            warm_start (Optional[WarmStartVo]):
+                解の初期値とする前回の時間割。Noneの場合は初期値を渡さない。
         """
 
         self.data = annual_data
         self.constraint_definitions = constraint_definitions
+        self.merge_shared_courses = merge_shared_courses
+        self.warm_start = warm_start
+        self.solver = solver
+        self.columns = ColumnRegistry()
+        # 構築の計測結果（AnnualLpServiceで構築したときに格納される）
+        self.build_profile: Optional[BuildProfileVo] = None
+        # 求解結果の要約（AnnualLpServiceで求解したときに格納される）
+        self.solve_result: Optional[SolveResultVo] = None
         self.problem = pulp.LpProblem("sample", pulp.LpMinimize)
 
         self.problem.setSolver(solver.get_solver())
         self.define_variables()
 
     def define_variables(self) -> None:
-        """変数を定義する。"""
-        self.x = {
-            (h, d, p, c): pulp.LpVariable(name=f"x_{h}_{d}_{p}_{c}", cat=pulp.LpBinary)
-            for h in self.data.H
-            for d in self.data.D
-            for p in self.data.homeroom_day_dict[h][d]
-            for b in self.data.curriculum_dict[h]
-            for l in b
-            for c in l
-        }
+        """変数を定義する。
 
-        self.y = {
-            (d, p, i): pulp.LpVariable(name=f"y_{d}_{p}_{i}", cat=pulp.LpBinary)
-            for d in self.data.D
-            for p in self.data.P
-            for i in self.data.I
-        }
+        変数は列の登録簿に整数インデックスで登録し、PuLP変数は参照されたときに生成する。
+        補助変数（y, w）とペナルティ変数（v1〜v4）は、制約定義クラスが初めて参照したときに定義する。
+        """
+        self.x = self._define_x()
+        # 定義済みの補助変数・ペナルティ変数（変数族の名前 -> 変数族）
+        self._families: Dict[str, VariableFamily] = {}
+        # 講座 -> wの添字のリスト（wを定義したときに構築する）
+        self._w_by_course: Dict[CourseId, List[WKey]] = {}
 
-        self.w = {
-            (h, d, p1, p2, c): pulp.LpVariable(name=f"w_{h}_{d}_{p1}_{p2}_{c}", cat=pulp.LpBinary)
-            for h in self.data.H
-            for d in self.data.D
-            for b in self.data.curriculum_dict[h]
-            for l in b
-            for c in l
-            for p1, p2 in zip(self.data.homeroom_day_dict[h][d], self.data.homeroom_day_dict[h][d][1:])
-            if all((h, d, p, c) in self.x for p in (p1, p2))
-        }
+    def variable_families(self) -> Dict[str, VariableFamily]:
+        """解変数と、定義済みの補助変数・ペナルティ変数の変数族を取得する（未定義の変数族は定義しない）。
 
-        self.v1 = {
-            c: pulp.LpVariable(name=f"v^1_{c}", cat=pulp.LpBinary)
-            for c in self.data.C
-        }
+        Returns:
+            Dict[str, VariableFamily]: 変数族の名前 -> 変数族
+        """
+        return {"x": self.x, **self._families}
 
-        self.v2 = {
-            c: pulp.LpVariable(name=f"v^2_{c}", cat=pulp.LpBinary)
-            for c in self.data.C
-        }
+    def has_family(self, name: str) -> bool:
+        """補助変数・ペナルティ変数の変数族が定義済みかどうか（参照しても定義しない）。
 
-        self.v3 = {
-            (d, i): pulp.LpVariable(name=f"v^3_{d}_{i}", cat=pulp.LpBinary)
-            for d in self.data.D
-            for i in self.data.I
+        Args:
+            name (str): 変数族の名前（"y", "w", "v1"〜"v4"）
+
+        Returns:
+            bool: 定義済みの場合はTrue
+        """
+        return name in self._families
+
+    @property
+    def y(self) -> VariableFamily:
+        """教員の担当コマの補助変数 y[d, p, i]"""
+        def define() -> Tuple[List[Hashable], List[str]]:
+            keys = [(d, p, i) for d in self.data.D for p in self.data.P for i in self.data.I]
+            return keys, [f"y_{d}_{p}_{i}" for (d, p, i) in keys]
+        return self._family("y", define)
+
+    @property
+    def w(self) -> VariableFamily:
+        """連続する2時限の補助変数 w[h, d, p1, p2, c]。適用する2コマ連続開講制約の講座についてのみ定義する。"""
+        def define() -> Tuple[List[Hashable], List[str]]:
+            courses = self._consecutive_period_courses()
+            keys = [
+                (h, d, p1, p2, c)
+                for h in self.data.H
+                for d in self.data.D
+                for b in self.data.curriculum_dict[h]
+                for l in b
+                for c in l
+                if c in courses
+                for p1, p2 in zip(self.data.homeroom_day_dict[h][d], self.data.homeroom_day_dict[h][d][1:])
+                if (h, d, p1, c) in self.x and (h, d, p2, c) in self.x
+            ]
+            for key in keys:
+                self._w_by_course.setdefault(key[4], []).append(key)
+            return keys, [f"w_{h}_{d}_{p1}_{p2}_{c}" for (h, d, p1, p2, c) in keys]
+        return self._family("w", define)
+
+    def w_keys(self, c: CourseId) -> List[WKey]:
+        """講座cのwの添字を、wの定義順（学級・曜日・時限の順）で取得する。
+
+        wの全添字を走査せずに、講座ごとの索引から取得する。
+
+        Args:
+            c (CourseId): 講座ID
+
+        Returns:
+            List[WKey]: 講座cの (h, d, p1, p2, c) のリスト。wを定義していない講座の場合は空
+        """
+        # 索引はwを定義したときに構築する
+        self.w
+        return self._w_by_course.get(c, [])
+
+    @property
+    def v1(self) -> VariableFamily:
+        """午前午後制約のペナルティ変数 v1[c]"""
+        return self._family("v1", lambda: (list(self.data.C), [f"v^1_{c}" for c in self.data.C]))
+
+    @property
+    def v2(self) -> VariableFamily:
+        """連続曜日制約のペナルティ変数 v2[c]"""
+        return self._family("v2", lambda: (list(self.data.C), [f"v^2_{c}" for c in self.data.C]))
+
+    @property
+    def v3(self) -> VariableFamily:
+        """教員の1日あたりのコマ数制約のペナルティ変数 v3[d, i]"""
+        def define() -> Tuple[List[Hashable], List[str]]:
+            keys = [(d, i) for d in self.data.D for i in self.data.I]
+            return keys, [f"v^3_{d}_{i}" for (d, i) in keys]
+        return self._family("v3", define)
+
+    @property
+    def v4(self) -> VariableFamily:
+        """教員の連続コマ数制約のペナルティ変数 v4[d, p, i]"""
+        def define() -> Tuple[List[Hashable], List[str]]:
+            keys = [(d, p, i) for d in self.data.D for p in self.data.P for i in self.data.I]
+            return keys, [f"v^4_{d}_{p}_{i}" for (d, p, i) in keys]
+        return self._family("v4", define)
+
+    def _family(self, name: str, define: Callable[[], Tuple[List[Hashable], List[str]]]) -> VariableFamily:
+        """変数族を取得する。未定義の場合は、define()が返す (添字のリスト, 変数名のリスト) で定義する。"""
+        if (family := self._families.get(name)) is None:
+            keys, names = define()
+            family = self._families[name] = VariableFamily(self.columns)
+            family.add_many(keys, names)
+        return family
+
+    def _consecutive_period_courses(self) -> Set[CourseId]:
+        """適用する2コマ連続開講制約（ソフト制約でないもの）の講座IDを取得する。"""
+        return {
+            cd.parameters[key]
+            for cd in self.constraint_definitions
+            if cd.code.upper() == "CONSECUTIVE_PERIOD" and not cd.soft_flag and cd.parameters
+            for key in COURSE_PARAMETER_KEYS
+            if key in cd.parameters
         }
 
-        self.v4 = {
-            (d, p, i): pulp.LpVariable(name=f"v^4_{d}_{p}_{i}", cat=pulp.LpBinary)
+    def _define_x(self) -> VariableFamily:
+        """解変数を定義する。
+
+        共有講座をまとめる場合、複数学級が履修する講座は(曜日, 時限, 講座)ごとの共有変数を参照する。
+        """
+        keys = [
+            (h, d, p, c)
+            for h in self.data.H
             for d in self.data.D
-            for p in self.data.P
-            for i in self.data.I
-        }
+            for p in self.data.homeroom_day_dict[h][d]
+            for b in self.data.curriculum_dict[h]
+            for l in b
+            for c in l
+        ]
+        x = VariableFamily(self.columns)
+        if not self.merge_shared_courses:
+            x.add_many(keys, [f"x_{h}_{d}_{p}_{c}" for (h, d, p, c) in keys])
+            return x
+
+        shared: Dict[Tuple[DayOfWeek, Period, CourseId], int] = {}
+        for (h, d, p, c) in keys:
+            if len(self.data.index.course_homerooms[c]) > 1:
+                if (d, p, c) not in shared:
+                    shared[d, p, c] = self.columns.add(f"x_{d}_{p}_{c}")
+                x.alias((h, d, p, c), shared[d, p, c])
+            else:
+                x.add((h, d, p, c), f"x_{h}_{d}_{p}_{c}")
+        return x
@@ -0,0 +1,286 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+import pulp
+
+from domain.models.sparse_rows import SparseRows
+from domain.models.variables import ColumnRegistry
+
+INF = float("inf")
+# 初期値の補完で、行を満たしているとみなす許容誤差
+START_TOLERANCE = 1e-9
+
+
+@dataclass
+class LpMatrix:
+    """LPモデルの行列形式。
+
+    列（変数）と行（制約）を整数インデックスで表し、制約係数をCOO形式の三つ組で保持する。
+    ソルバー固有の疎行列への変換はinfrastructure層で行う。
+
+    Attributes:
+        names: 列インデックス -> 変数名
+        variables: 列インデックス -> PuLP変数（from_problemで生成した場合のみ）
+        col_lower: 列の下限
+        col_upper: 列の上限
+        integrality: 列が整数変数かどうか
+        objective: 列の目的関数係数
+        objective_offset: 目的関数の定数項
+        minimize: 最小化問題かどうか
+        senses: 行の向き（pulp.LpConstraintLE / EQ / GE）
+        rhs: 行の右辺
+        rows: 非ゼロ要素の行インデックス
+        cols: 非ゼロ要素の列インデックス
+        coefs: 非ゼロ要素の係数
+        start: 列インデックス -> 解の初期値（MIPスタート）。未設定の列はNone。初期値を渡さない場合はNone
+    """
+    names: List[str] = field(default_factory=list)
+    variables: List[pulp.LpVariable] = field(default_factory=list)
+    col_lower: List[float] = field(default_factory=list)
+    col_upper: List[float] = field(default_factory=list)
+    integrality: List[bool] = field(default_factory=list)
+    objective: List[float] = field(default_factory=list)
+    objective_offset: float = 0.0
+    minimize: bool = True
+    senses: List[int] = field(default_factory=list)
+    rhs: List[float] = field(default_factory=list)
+    rows: List[int] = field(default_factory=list)
+    cols: List[int] = field(default_factory=list)
+    coefs: List[float] = field(default_factory=list)
+    start: Optional[List[Optional[float]]] = None
+
+    @property
+    def num_cols(self) -> int:
+        """列数"""
+        return len(self.names)
+
+    @property
+    def num_rows(self) -> int:
+        """行数"""
+        return len(self.rhs)
+
+    @property
+    def num_nonzeros(self) -> int:
+        """非ゼロ要素数"""
+        return len(self.coefs)
+
+    @classmethod
+    def from_problem(cls, problem: pulp.LpProblem) -> "LpMatrix":
+        """PuLPの問題から行列形式を生成する。
+
+        列は制約・目的関数に現れた順に割り当てる。
+        値が設定されたPuLP変数がある場合は、その値を解の初期値とする。
+
+        Args:
+            problem (pulp.LpProblem): PuLPの問題
+
+        Returns:
+            LpMatrix: 行列形式
+        """
+        matrix = cls(minimize=problem.sense == pulp.LpMinimize)
+        col_index: Dict[pulp.LpVariable, int] = {}
+
+        def get_col(v: pulp.LpVariable) -> int:
+            if (j := col_index.get(v)) is None:
+                j = col_index[v] = matrix.add_variable(v)
+            return j
+
+        for r, constraint in enumerate(problem.constraints.values()):
+            for v, a in constraint.items():
+                matrix.rows.append(r)
+                matrix.cols.append(get_col(v))
+                matrix.coefs.append(a)
+            matrix.senses.append(constraint.sense)
+            matrix.rhs.append(-constraint.constant)
+
+        if problem.objective is not None:
+            for v, a in problem.objective.items():
+                matrix.objective[get_col(v)] += a
+            matrix.objective_offset = problem.objective.constant
+
+        if any(v.varValue is not None for v in matrix.variables):
+            matrix.start = [v.varValue for v in matrix.variables]
+        return matrix
+
+    @classmethod
+    def from_rows(cls, columns: ColumnRegistry, rows: SparseRows, minimize: bool = True) -> "LpMatrix":
+        """列の登録簿と三つ組バッファから行列形式を生成する。
+
+        PuLPの変数・制約オブジェクトを経由しない。
+        値が設定された列がある場合は、その値を解の初期値とする。
+
+        Args:
+            columns (ColumnRegistry): 列の登録簿
+            rows (SparseRows): 制約行の三つ組バッファ
+            minimize (bool): 最小化問題かどうか
+
+        Returns:
+            LpMatrix: 行列形式
+        """
+        objective = [0.0] * len(columns)
+        for j, a in rows.objective.items():
+            objective[j] += a
+        return cls(
+            names=columns.names,
+            col_lower=columns.lower,
+            col_upper=columns.upper,
+            integrality=columns.integrality,
+            objective=objective,
+            minimize=minimize,
+            senses=rows.senses,
+            rhs=rows.rhs,
+            rows=rows.rows,
+            cols=rows.cols,
+            coefs=rows.coefs,
+            start=list(columns.values) if any(v is not None for v in columns.values) else None,
+        )
+
+    def to_problem(self) -> Tuple[pulp.LpProblem, List[pulp.LpVariable]]:
+        """行列形式からPuLPの問題を生成する（行列形式を直接解けないソルバーで解く場合に使う）。
+
+        解の初期値はPuLP変数の値に設定する。
+
+        Returns:
+            Tuple[pulp.LpProblem, List[pulp.LpVariable]]: PuLPの問題と、列インデックス -> PuLP変数
+        """
+        problem = pulp.LpProblem("matrix", pulp.LpMinimize if self.minimize else pulp.LpMaximize)
+        variables = [
+            pulp.LpVariable(
+                name,
+                lowBound=None if lower == -INF else lower,
+                upBound=None if upper == INF else upper,
+                cat=pulp.LpInteger if is_integer else pulp.LpContinuous
+            )
+            for name, lower, upper, is_integer in zip(self.names, self.col_lower, self.col_upper, self.integrality)
+        ]
+        if self.start is not None:
+            for v, value in zip(variables, self.start):
+                v.varValue = value
+
+        terms: List[List[Tuple[pulp.LpVariable, float]]] = [[] for _ in range(self.num_rows)]
+        for r, j, a in zip(self.rows, self.cols, self.coefs):
+            terms[r].append((variables[j], a))
+        for r, (row, sense, rhs) in enumerate(zip(terms, self.senses, self.rhs)):
+            problem.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(row), sense, f"c{r}", rhs))
+
+        problem.setObjective(pulp.LpAffineExpression(
+            [(variables[j], a) for j, a in enumerate(self.objective) if a], constant=self.objective_offset
+        ))
+        return problem, variables
+
+    def add_variable(self, v: pulp.LpVariable) -> int:
+        """列を追加し、列インデックスを返す。"""
+        self.names.append(v.name)
+        self.variables.append(v)
+        self.col_lower.append(-INF if v.lowBound is None else v.lowBound)
+        self.col_upper.append(INF if v.upBound is None else v.upBound)
+        self.integrality.append(v.cat == pulp.LpInteger)
+        self.objective.append(0.0)
+        return len(self.variables) - 1
+
+    def assign_values(self, values: List[Optional[float]]) -> None:
+        """列の値をPuLP変数に書き戻す（from_problemで生成した場合のみ）。"""
+        for v, value in zip(self.variables, values):
+            v.varValue = value
+
+    def complete_start(self) -> None:
+        """解の初期値のうち未設定の列を、各行を満たすように補完する。
+
+        補助変数・ペナルティ変数の値を、設定済みの列の値から導出するために使う。
+        未設定の列は下限（下限がない場合は0）から始め、満たされない行があれば、その行の未設定の列を
+        必要な分だけ増やす。増やした列を含む行は確認し直す。
+        設定済みの列だけで満たせない行が残る場合（前回の時間割が今回の制約に反する場合など）も、
+        補完した値をそのまま初期値とする（初期値の修復・破棄はソルバーに任せる）。
+        """
+        if self.start is None:
+            return
+        free = [value is None for value in self.start]
+        values = [
+            (0.0 if lower == -INF else lower) if value is None else value
+            for value, lower in zip(self.start, self.col_lower)
+        ]
+
+        row_terms: List[List[Tuple[int, float]]] = [[] for _ in range(self.num_rows)]
+        col_terms: Dict[int, List[Tuple[int, float]]] = {}
+        activity = [0.0] * self.num_rows
+        for r, j, a in zip(self.rows, self.cols, self.coefs):
+            row_terms[r].append((j, a))
+            activity[r] += a * values[j]
+            if free[j]:
+                col_terms.setdefault(j, []).append((r, a))
+
+        queue: Deque[int] = deque(range(self.num_rows))
+        queued = [True] * self.num_rows
+        while queue:
+            r = queue.popleft()
+            queued[r] = False
+            if (delta := self._row_violation(r, activity[r])) == 0.0:
+                continue
+            for j, a in row_terms[r]:
+                # 未設定の列を増やして、行の値をdeltaの向きに動かす
+                if not free[j] or a * delta <= 0:
+                    continue
+                step = delta / a
+                if self.integrality[j]:
+                    step = math.ceil(step - START_TOLERANCE)
+                step = min(step, self.col_upper[j] - values[j])
+                if step <= 0:
+                    continue
+                values[j] += step
+                for r2, a2 in col_terms[j]:
+                    activity[r2] += a2 * step
+                    if not queued[r2]:
+                        queue.append(r2)
+                        queued[r2] = True
+                delta -= a * step
+                if abs(delta) <= START_TOLERANCE:
+                    break
+        self.start = values
+
+    def evaluate(self, values: List[float]) -> Tuple[float, int]:
+        """列の値に対する目的関数値と、満たさない行の数を計算する。
+
+        Args:
+            values (List[float]): 列インデックス -> 値
+
+        Returns:
+            Tuple[float, int]: 目的関数値と、満たさない行の数
+        """
+        activity = [0.0] * self.num_rows
+        for r, j, a in zip(self.rows, self.cols, self.coefs):
+            activity[r] += a * values[j]
+        unsatisfied = sum(1 for r in range(self.num_rows) if self._row_violation(r, activity[r]) != 0.0)
+        objective = self.objective_offset + sum(c * v for c, v in zip(self.objective, values) if c)
+        return objective, unsatisfied
+
+    def _row_violation(self, r: int, activity: float) -> float:
+        """行rを満たすために必要な行の値の変化量（満たしている場合は0）。"""
+        sense, rhs = self.senses[r], self.rhs[r]
+        if sense == pulp.LpConstraintLE and activity <= rhs + START_TOLERANCE:
+            return 0.0
+        if sense == pulp.LpConstraintGE and activity >= rhs - START_TOLERANCE:
+            return 0.0
+        if sense == pulp.LpConstraintEQ and abs(activity - rhs) <= START_TOLERANCE:
+            return 0.0
+        return rhs - activity
+
+
+@dataclass
+class MatrixSolution:
+    """行列形式を解いた結果。
+
+    Attributes:
+        status: PuLPの問題のステータス（pulp.LpStatus*）
+        sol_status: PuLPの解のステータス（pulp.LpSolution*）
+        values: 列インデックス -> 解の値。解がない場合、またはPuLP変数に直接書き戻した場合はNone
+        objective: 解の目的関数値。解がない場合はNone
+        bound: 目的関数値の下界（最小化問題の場合）。取得できない場合はNone
+        backend: 解いたソルバーの種類。フォールバックした場合のみ設定される
+    """
+    status: int
+    sol_status: int
+    values: Optional[List[float]] = None
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    backend: Optional[str] = None
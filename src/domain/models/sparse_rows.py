@@ -0,0 +1,80 @@
+from typing import Dict, List, Sequence
+import pulp
+
+from domain.models.variables import ColumnRegistry
+
+
+class SparseRows:
+    """制約行の三つ組バッファ。
+
+    制約を (行, 列, 係数) の三つ組と、行ごとの向き・右辺として蓄積する。
+    目的関数は 列 -> 係数 として蓄積する。
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[int] = []
+        self.cols: List[int] = []
+        self.coefs: List[float] = []
+        self.senses: List[int] = []
+        self.rhs: List[float] = []
+        self.objective: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.rhs)
+
+    @property
+    def num_nonzeros(self) -> int:
+        """非ゼロ要素数"""
+        return len(self.coefs)
+
+    def add_row(self, cols: Sequence[int], coefs: Sequence[float], sense: int, rhs: float) -> None:
+        """行 sum(coefs * x[cols]) (sense) rhs を追加する。
+
+        Args:
+            cols (Sequence[int]): 列インデックス
+            coefs (Sequence[float]): 係数
+            sense (int): pulp.LpConstraintLE / EQ / GE
+            rhs (float): 右辺
+        """
+        r = len(self.rhs)
+        self.rows.extend([r] * len(cols))
+        self.cols.extend(cols)
+        self.coefs.extend(coefs)
+        self.senses.append(sense)
+        self.rhs.append(rhs)
+
+    def add_objective(self, cols: Sequence[int], coefs: Sequence[float]) -> None:
+        """目的関数に項を加える。"""
+        for j, a in zip(cols, coefs):
+            self.objective[j] = self.objective.get(j, 0) + a
+
+    def extend(self, other: "SparseRows") -> None:
+        """他のバッファの行と目的関数を末尾に加える。"""
+        offset = len(self.rhs)
+        self.rows.extend(r + offset for r in other.rows)
+        self.cols.extend(other.cols)
+        self.coefs.extend(other.coefs)
+        self.senses.extend(other.senses)
+        self.rhs.extend(other.rhs)
+        self.add_objective(other.objective.keys(), other.objective.values())
+
+    def add_to_problem(self, problem: pulp.LpProblem, columns: ColumnRegistry) -> None:
+        """PuLPの問題に制約と目的関数を追加する（PuLPで解く場合のアダプタ）。"""
+        start = 0
+        for r, (sense, rhs) in enumerate(zip(self.senses, self.rhs)):
+            terms: Dict[pulp.LpVariable, float] = {}
+            end = start
+            while end < len(self.rows) and self.rows[end] == r:
+                v = columns.variable(self.cols[end])
+                terms[v] = terms.get(v, 0) + self.coefs[end]
+                end += 1
+            problem.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), sense, rhs=rhs))
+            start = end
+
+        if self.objective:
+            expression = pulp.LpAffineExpression(
+                {columns.variable(j): a for j, a in self.objective.items()}
+            )
+            problem.setObjective(
+                expression if problem.objective is None else problem.objective + expression
+            )
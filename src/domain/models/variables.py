@@ -0,0 +1,113 @@
+from typing import Dict, Generic, Hashable, Iterator, List, Mapping, Optional, Sequence, TypeVar
+import pulp
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ColumnRegistry:
+    """LPモデルの列（変数）の登録簿。
+
+    変数を整数の列インデックスで管理し、名前・上下限・整数性を配列で保持する。
+    PuLPの変数オブジェクトは、PuLP経由で参照されたときに初めて生成する。
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.lower: List[float] = []
+        self.upper: List[float] = []
+        self.integrality: List[bool] = []
+        self.values: List[Optional[float]] = []
+        self._variables: List[Optional[pulp.LpVariable]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, lower: float = 0, upper: float = 1, integer: bool = True) -> int:
+        """列を追加し、列インデックスを返す。既定は0-1変数。"""
+        self.names.append(name)
+        self.lower.append(lower)
+        self.upper.append(upper)
+        self.integrality.append(integer)
+        self.values.append(None)
+        self._variables.append(None)
+        return len(self.names) - 1
+
+    def add_many(self, names: Sequence[str], lower: float = 0, upper: float = 1, integer: bool = True) -> range:
+        """同じ上下限・整数性の列をまとめて追加し、列インデックスの範囲を返す。"""
+        start, n = len(self.names), len(names)
+        self.names.extend(names)
+        self.lower.extend([lower] * n)
+        self.upper.extend([upper] * n)
+        self.integrality.extend([integer] * n)
+        self.values.extend([None] * n)
+        self._variables.extend([None] * n)
+        return range(start, start + n)
+
+    def variable(self, j: int) -> pulp.LpVariable:
+        """列jのPuLP変数を取得する。未生成の場合は生成する。"""
+        if (v := self._variables[j]) is None:
+            v = self._variables[j] = pulp.LpVariable(
+                name=self.names[j],
+                lowBound=self.lower[j],
+                upBound=self.upper[j],
+                cat=pulp.LpInteger if self.integrality[j] else pulp.LpContinuous
+            )
+            v.varValue = self.values[j]
+        return v
+
+    def value(self, j: int) -> Optional[float]:
+        """列jの解の値を取得する。"""
+        if (v := self._variables[j]) is not None:
+            return v.value()
+        return self.values[j]
+
+    def assign_values(self, values: List[Optional[float]]) -> None:
+        """解の値を書き込む。生成済みのPuLP変数にも反映する。"""
+        self.values = list(values)
+        for v, value in zip(self._variables, self.values):
+            if v is not None:
+                v.varValue = value
+
+
+class VariableFamily(Mapping[K, pulp.LpVariable], Generic[K]):
+    """添字 -> 変数 の変数族。
+
+    PuLP変数の辞書として参照できるほか、colで列インデックスを取得できる。
+    """
+
+    def __init__(self, columns: ColumnRegistry) -> None:
+        self.columns = columns
+        self._cols: Dict[K, int] = {}
+
+    def add(self, key: K, name: str, **kwargs) -> int:
+        """変数を追加し、列インデックスを返す。"""
+        j = self._cols[key] = self.columns.add(name, **kwargs)
+        return j
+
+    def add_many(self, keys: Sequence[K], names: Sequence[str], **kwargs) -> None:
+        """変数をまとめて追加する。列は連続して確保される。"""
+        self._cols.update(zip(keys, self.columns.add_many(names, **kwargs)))
+
+    def alias(self, key: K, j: int) -> None:
+        """添字keyに既存の列jを割り当てる。"""
+        self._cols[key] = j
+
+    def col(self, key: K) -> int:
+        """添字keyの列インデックスを取得する。"""
+        return self._cols[key]
+
+    def value(self, key: K) -> Optional[float]:
+        """添字keyの変数の解の値を取得する。"""
+        return self.columns.value(self._cols[key])
+
+    def __getitem__(self, key: K) -> pulp.LpVariable:
+        return self.columns.variable(self._cols[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._cols
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._cols)
+
+    def __len__(self) -> int:
+        return len(self._cols)
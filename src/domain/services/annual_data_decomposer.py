@@ -0,0 +1,102 @@
+import logging
+from typing import Dict, List
+
+from domain.logics.constraint_logic import get_parameter_course
+from domain.vo.annual_data import AnnualDataVo, HomeroomId
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+
+logger = logging.getLogger(__name__)
+
+
+class AnnualDataDecomposer:
+    """年次データを、互いに影響しない部分（連結成分）に分割するサービスクラス。
+
+    学級どうしは、講座の共有（curriculum_dict）と教員の共有（course_details_dict）を通じてのみ影響し合う。
+    学級・講座・教員をつないだグラフの連結成分ごとに年次データを分ければ、それぞれを別のLPモデルとして
+    解いた結果を合わせたものが、全体を解いた結果と同じ最適解になる（学年・校舎が分かれている学校など）。
+    """
+
+    @staticmethod
+    def decompose(data: AnnualDataVo) -> List[AnnualDataVo]:
+        """年次データを連結成分ごとに分割する。
+
+        各部分は、成分の学級と、それらが履修する講座、講座を担当する教員だけを含む（曜日・時限・学校曜日は共通）。
+        どの学級も履修しない講座と、担当講座のない教員は含めない。IDの対応表は元の年次データと共通。
+
+        Args:
+            data (AnnualDataVo): 年次データ
+
+        Returns:
+            List[AnnualDataVo]: 連結成分ごとの年次データ（学級の並び順）。分割できない場合は元の年次データのみ
+        """
+        parent: Dict[HomeroomId, HomeroomId] = {h: h for h in data.H}
+
+        def find(h: HomeroomId) -> HomeroomId:
+            while parent[h] != h:
+                parent[h] = parent[parent[h]]
+                h = parent[h]
+            return h
+
+        def union(homerooms: List[HomeroomId]) -> None:
+            for h in homerooms[1:]:
+                parent[find(h)] = find(homerooms[0])
+
+        index = data.index
+        for c in data.C:
+            union(list(index.course_homerooms.get(c, ())))
+        for i in data.I:
+            union([h for c in index.instructor_courses.get(i, ()) for h in index.course_homerooms.get(c, ())])
+
+        components: Dict[HomeroomId, List[HomeroomId]] = {}
+        for h in data.H:
+            components.setdefault(find(h), []).append(h)
+        if len(components) <= 1:
+            return [data]
+
+        parts = [AnnualDataDecomposer._restrict(data, homerooms) for homerooms in components.values()]
+        logger.info(
+            "年次データを分割しました",
+            extra={"components": len(parts), "homerooms": [len(part.H) for part in parts]}
+        )
+        return parts
+
+    @staticmethod
+    def restrict_definitions(
+        part: AnnualDataVo,
+        constraint_definitions: List[ConstraintDefinitionVo]
+    ) -> List[ConstraintDefinitionVo]:
+        """制約定義を、部分の年次データに含まれる講座を対象とするものに絞り込む。
+
+        講座を対象とする制約定義（2コマ連続開講制約など）は、講座が部分に含まれない場合に除く。
+        講座を対象としない制約定義はそのまま含める。
+
+        Args:
+            part (AnnualDataVo): decomposeで分割した部分の年次データ
+            constraint_definitions (List[ConstraintDefinitionVo]): 全体の制約定義
+
+        Returns:
+            List[ConstraintDefinitionVo]: 部分に適用する制約定義
+        """
+        courses = set(part.C)
+        return [
+            cd for cd in constraint_definitions
+            if (course := get_parameter_course(cd.parameters)) is None or course in courses
+        ]
+
+    @staticmethod
+    def _restrict(data: AnnualDataVo, homerooms: List[HomeroomId]) -> AnnualDataVo:
+        """年次データを、学級とそれらが履修する講座・担当教員に絞り込む。"""
+        index = data.index
+        members = set(homerooms)
+        courses = [c for c in data.C if any(h in members for h in index.course_homerooms.get(c, ()))]
+        instructors = {i for c in courses for i in index.course_instructors.get(c, ())}
+        return data.model_copy(update={
+            "H": homerooms,
+            "C": courses,
+            "I": [i for i in data.I if i in instructors],
+            "homeroom_day_dict": {h: v for h, v in data.homeroom_day_dict.items() if h in members},
+            "curriculum_dict": {h: v for h, v in data.curriculum_dict.items() if h in members},
+            "credit_dict": {c: data.credit_dict[c] for c in courses if c in data.credit_dict},
+            "course_details_dict": {c: data.course_details_dict[c] for c in courses if c in data.course_details_dict},
+            "attendance_day_dict": {i: v for i, v in data.attendance_day_dict.items() if i in instructors},
+        })
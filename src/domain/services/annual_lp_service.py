@@ -1,38 +1,527 @@
-from typing import List
+import logging
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Set, Union
 
 import pulp
-from domain.constraints._base import ConstraintApplierBase
+from common.constants import HEURISTIC_BACKEND, SolveStatus
+from domain.constraints._base import ConstraintApplierBase, SparseConstraintApplierBase
 from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.lp_matrix import INF, LpMatrix, MatrixSolution
+from domain.models.sparse_rows import SparseRows
 from domain.constraints._mapping import (
-    CONSTRAINT_DEFINITIONS_BUILT_IN, CONSTRAINT_DEFINITIONS_MANDATORY, VARIABLE_DEFINITIONS
+    CONSTRAINT_DEFINITIONS_BATCHED, CONSTRAINT_DEFINITIONS_BUILT_IN, CONSTRAINT_DEFINITIONS_MANDATORY,
+    VARIABLE_DEFINITIONS
 )
-from domain.exceptions.exceptions import OptimizationError
+from domain.exceptions.exceptions import OptimizationCancelledError, OptimizationError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.services.build_profiler import BuildProfiler, PulpRowCounter
+from domain.services.lns_neighbourhoods import LnsNeighbourhoodSelector, XKey
+from domain.services.lp_presolver import LpPresolver
+from domain.vo.lns_improvement import LnsImprovementVo
+from domain.vo.lns_settings import LnsSettingsVo
+from domain.vo.solve_progress import SolveProgressVo
+from domain.vo.solve_result import SolveResultVo, relative_gap
+
+logger = logging.getLogger(__name__)
+
+# LNSで初期解を求める求解のタイムリミットの、探索全体のタイムリミットに対する割合
+LNS_INITIAL_TIME_FRACTION = 0.25
+# LNSで部分問題を解く残り時間の下限（秒）。これを下回ったら探索を終える
+LNS_MIN_SUB_TIME_LIMIT = 1.0
+# LNSで改善とみなす目的関数値の減少量の下限
+LNS_IMPROVEMENT_TOLERANCE = 1e-6
 
 
 class AnnualLpService:
     """modelオブジェクトに定義した最適化問題を解くサービスクラス"""
 
     @staticmethod
-    def solve(model: AnnualLpModel) -> None:
+    def solve(model: AnnualLpModel, trace_memory: bool = False) -> SolveResultVo:
         """最適化問題を解く。
 
+        時間制限などで打ち切られても実行可能解が得られていれば、その解を採用してFEASIBLEを返す。
+        model.warm_startが設定されている場合は、前回の時間割から導出した値を解の初期値としてソルバーに渡す。
+        構築の計測結果はmodel.build_profileに、求解結果の要約はmodel.solve_resultに格納する。
+
+        Args:
+            model (AnnualLpModel): AnnualLpModelインスタンス
+            trace_memory (bool): 構築時のメモリ使用量を計測するかどうか
+
+        Returns:
+            SolveResultVo: 求解結果の要約
+
+        Raises:
+            OptimizationError: 解が得られなかった場合（実行不可能・非有界・解なしで打ち切り）
+            OptimizationCancelledError: ソルバーのcancelで中断された場合
+        """
+        AnnualLpService._raise_if_cancelled(model)
+        appliers = AnnualLpService._create_appliers(model)
+        if model.warm_start is not None:
+            AnnualLpService._set_warm_start(model)
+
+        try:
+            # 行列形式で構築して前処理で縮小し、PuLPの制約オブジェクトは縮小後の行だけ生成する
+            if all(isinstance(a, SparseConstraintApplierBase) for a in appliers):
+                matrix = AnnualLpService._build_matrix(model, appliers, trace_memory)
+                matrix.complete_start()
+                start = time.perf_counter()
+                solution = AnnualLpService._solve_matrix(model.solver, matrix)
+                elapsed_seconds = time.perf_counter() - start
+                if solution.values is not None:
+                    model.columns.assign_values(solution.values)
+                model.problem.assignStatus(solution.status, solution.sol_status)
+            else:
+                AnnualLpService._apply(model, appliers, trace_memory)
+                if model.warm_start is not None:
+                    AnnualLpService._complete_problem_start(model)
+                start = time.perf_counter()
+                solution = model.solver.solve_problem(model.problem)
+                elapsed_seconds = time.perf_counter() - start
+        except Exception:
+            # 中断したソルバーがエラーを送出した場合（CBCのプロセスを終了した場合など）も中断として扱う
+            AnnualLpService._raise_if_cancelled(model)
+            raise
+        AnnualLpService._raise_if_cancelled(model)
+
+        model.solve_result = AnnualLpService._create_solve_result(model, solution, elapsed_seconds)
+        logger.info("LPモデルを求解しました", extra={"solve_result": model.solve_result.model_dump()})
+
+        if not model.solve_result.has_solution:
+            raise OptimizationError(solution.status)
+        return model.solve_result
+
+    @staticmethod
+    def evaluate_start(model: AnnualLpModel, trace_memory: bool = False) -> SolveResultVo:
+        """求解せずに、model.warm_startの時間割をそのまま解とする（fastモード）。
+
+        補助変数・ペナルティ変数の値は制約行から導出する。すべての制約行を満たす場合はFEASIBLE、
+        満たさない行がある場合はINCOMPLETEとし、満たさない行の数を求解結果の要約に含める。
+
+        Args:
+            model (AnnualLpModel): AnnualLpModelインスタンス（warm_startを設定済み）
+            trace_memory (bool): 構築時のメモリ使用量を計測するかどうか
+
+        Returns:
+            SolveResultVo: 求解結果の要約
+        """
+        matrix = AnnualLpService._build_start_matrix(model, trace_memory)
+        start = time.perf_counter()
+        objective, unsatisfied_rows = matrix.evaluate(matrix.start)
+        AnnualLpService._assign_matrix_values(model, matrix, matrix.start)
+
+        model.solve_result = SolveResultVo(
+            status=SolveStatus.FEASIBLE if unsatisfied_rows == 0 else SolveStatus.INCOMPLETE,
+            objective=objective,
+            elapsed_seconds=time.perf_counter() - start,
+            build_seconds=model.build_profile.elapsed_seconds,
+            backend=HEURISTIC_BACKEND,
+            unsatisfied_rows=unsatisfied_rows
+        )
+        logger.info("解の初期値を評価しました", extra={"solve_result": model.solve_result.model_dump()})
+        return model.solve_result
+
+    @staticmethod
+    def solve_lns(
+        model: AnnualLpModel,
+        create_solver: Callable[[float], SolverInterface],
+        settings: LnsSettingsVo,
+        trace_memory: bool = False
+    ) -> SolveResultVo:
+        """LNS（大近傍探索）で最適化問題を解く。
+
+        最良解のうち近傍（settings.neighbourhoodsの順に選ぶ）の解変数xだけを解放し、それ以外のxを上下限で
+        最良解の値に固定した部分問題を、短いタイムリミットで繰り返し解く。目的関数値が改善した解を採用し、
+        settings.time_limitを過ぎるか、目的関数値が自明な下界に達したら終える。
+        初期解はmodel.warm_startから導出した値とし、制約を満たさない場合は全体をソルバーで解いて求める。
+        最良解が改善した時点の記録（改善曲線）は求解結果の要約に含め、求解中の進捗としても通知する。
+
+        Args:
+            model (AnnualLpModel): AnnualLpModelインスタンス。solverは中断の受け付けと進捗の通知にだけ使う
+            create_solver (Callable[[float], SolverInterface]): タイムリミット（秒） -> 部分問題を解くソルバー
+            settings (LnsSettingsVo): LNSの設定
+            trace_memory (bool): 構築時のメモリ使用量を計測するかどうか
+
+        Returns:
+            SolveResultVo: 求解結果の要約
+
+        Raises:
+            OptimizationError: 初期解が得られなかった場合
+            OptimizationCancelledError: model.solverのcancelで中断された場合
+        """
+        AnnualLpService._raise_if_cancelled(model)
+        matrix = AnnualLpService._build_start_matrix(model, trace_memory)
+        x_cols = AnnualLpService._x_columns(model, matrix)
+        start = time.perf_counter()
+        deadline = start + settings.time_limit
+        bound = AnnualLpService._trivial_bound(matrix)
+        backend = HEURISTIC_BACKEND
+
+        values: Optional[List[float]] = None
+        objective = 0.0
+        if matrix.start is not None:
+            objective, unsatisfied_rows = matrix.evaluate(matrix.start)
+            values = matrix.start if unsatisfied_rows == 0 else None
+        if values is None:
+            time_limit = max(settings.sub_time_limit, settings.time_limit * LNS_INITIAL_TIME_FRACTION)
+            solver = create_solver(min(time_limit, settings.time_limit))
+            solution = AnnualLpService._solve_lns_step(model, matrix, solver)
+            backend = solution.backend or solver.backend
+            if solution.values is None:
+                model.solve_result = AnnualLpService._create_solve_result(
+                    model, solution, time.perf_counter() - start
+                )
+                raise OptimizationError(solution.status)
+            values = solution.values
+            objective, _ = matrix.evaluate(values)
+
+        improvements = [LnsImprovementVo(iteration=0, elapsed_seconds=time.perf_counter() - start, objective=objective)]
+        AnnualLpService._report_lns_progress(model, matrix, improvements[-1], bound, backend, values)
+        selector = LnsNeighbourhoodSelector(model.data, x_cols, settings)
+        iteration = 0
+        while (remaining := deadline - time.perf_counter()) >= LNS_MIN_SUB_TIME_LIMIT:
+            if bound is not None and objective <= bound + LNS_IMPROVEMENT_TOLERANCE:
+                break
+            iteration += 1
+            kind = selector.kind(iteration)
+            free = selector.select(kind, {key for key, j in x_cols.items() if values[j] > 0.5})
+            solver = create_solver(min(settings.sub_time_limit, remaining))
+            solution = AnnualLpService._solve_lns_step(
+                model, AnnualLpService._fix_columns(matrix, x_cols, free, values), solver
+            )
+            if solution.values is None:
+                continue
+            candidate = solution.values
+            candidate_objective, unsatisfied_rows = matrix.evaluate(candidate)
+            if unsatisfied_rows == 0 and candidate_objective < objective - LNS_IMPROVEMENT_TOLERANCE:
+                values, objective = candidate, candidate_objective
+                backend = solution.backend or solver.backend
+                improvements.append(LnsImprovementVo(
+                    iteration=iteration,
+                    elapsed_seconds=time.perf_counter() - start,
+                    objective=objective,
+                    neighbourhood=kind
+                ))
+                AnnualLpService._report_lns_progress(model, matrix, improvements[-1], bound, backend, values)
+
+        AnnualLpService._assign_matrix_values(model, matrix, values)
+        optimal = bound is not None and objective <= bound + LNS_IMPROVEMENT_TOLERANCE
+        model.problem.assignStatus(
+            pulp.LpStatusOptimal, pulp.LpSolutionOptimal if optimal else pulp.LpSolutionIntegerFeasible
+        )
+        model.solve_result = SolveResultVo(
+            status=SolveStatus.OPTIMAL if optimal else SolveStatus.FEASIBLE,
+            objective=objective,
+            bound=bound,
+            gap=relative_gap(objective, bound),
+            elapsed_seconds=time.perf_counter() - start,
+            build_seconds=model.build_profile.elapsed_seconds,
+            backend=backend,
+            improvements=improvements
+        )
+        logger.info(
+            "LNSで求解しました",
+            extra={"iterations": iteration, "solve_result": model.solve_result.model_dump()}
+        )
+        return model.solve_result
+
+    @staticmethod
+    def build(model: AnnualLpModel, trace_memory: bool = False) -> None:
+        """modelオブジェクトに変数定義・制約を適用し、最適化問題を構築する。
+
         Args:
             model (AnnualLpModel): AnnualLpModelインスタンス
+            trace_memory (bool): 構築時のメモリ使用量を計測するかどうか
         """
-        # modelオブジェクトに格納した制約を適用する
-        appliers: List[ConstraintApplierBase] = [
+        AnnualLpService._apply(model, AnnualLpService._create_appliers(model), trace_memory)
+
+    @staticmethod
+    def build_matrix(model: AnnualLpModel, trace_memory: bool = False) -> LpMatrix:
+        """modelオブジェクトの変数定義・制約を行列形式で構築する。
+
+        PuLPの変数・制約オブジェクトを経由せず、列の登録簿と三つ組バッファから直接生成する。
+
+        Args:
+            model (AnnualLpModel): AnnualLpModelインスタンス
+            trace_memory (bool): 構築時のメモリ使用量を計測するかどうか
+
+        Returns:
+            LpMatrix: 行列形式
+        """
+        return AnnualLpService._build_matrix(model, AnnualLpService._create_appliers(model), trace_memory)
+
+    @staticmethod
+    def _apply(model: AnnualLpModel, appliers: List[ConstraintApplierBase], trace_memory: bool) -> None:
+        """制約定義をPuLPの問題に適用する。"""
+        count = PulpRowCounter(model.problem)
+        with BuildProfiler(trace_memory) as profiler:
+            for applier in appliers:
+                profiler.run(applier, lambda: applier.apply(model), count)
+        AnnualLpService._record_profile(model, profiler)
+
+    @staticmethod
+    def _build_matrix(model: AnnualLpModel, appliers: List[ConstraintApplierBase], trace_memory: bool) -> LpMatrix:
+        """制約定義を三つ組バッファに書き出し、行列形式を生成する。"""
+        rows = SparseRows()
+        with BuildProfiler(trace_memory) as profiler:
+            for applier in appliers:
+                profiler.run(applier, lambda: applier.emit(model, rows), lambda: (len(rows), rows.num_nonzeros))
+        AnnualLpService._record_profile(model, profiler)
+        return LpMatrix.from_rows(model.columns, rows, minimize=model.problem.sense == pulp.LpMinimize)
+
+    @staticmethod
+    def _record_profile(model: AnnualLpModel, profiler: BuildProfiler) -> None:
+        """構築の計測結果をmodelオブジェクトに格納し、ログに出力する。"""
+        model.build_profile = profiler.result(model)
+        logger.info("LPモデルを構築しました", extra={"build_profile": model.build_profile.model_dump()})
+
+    @staticmethod
+    def _set_warm_start(model: AnnualLpModel) -> None:
+        """前回の時間割を解変数の初期値として列の登録簿に書き込む。
+
+        前回の時間割にない組は0とする。補助変数・ペナルティ変数は構築後に制約行から導出する。
+        """
+        assignments = model.warm_start.assignments
+        values = model.columns.values
+        for key in model.x:
+            values[model.x.col(key)] = 0.0
+        matched = 0
+        for key in assignments:
+            if key in model.x:
+                values[model.x.col(key)] = 1.0
+                matched += 1
+        logger.info(
+            "解の初期値を設定しました",
+            extra={"assignments": len(assignments), "matched_assignments": matched}
+        )
+
+    @staticmethod
+    def _complete_problem_start(model: AnnualLpModel) -> None:
+        """PuLPの問題で解く場合に、補助変数・ペナルティ変数の初期値を導出してPuLP変数に書き込む。"""
+        matrix = LpMatrix.from_problem(model.problem)
+        matrix.complete_start()
+        if matrix.start is not None:
+            matrix.assign_values(matrix.start)
+        model.solver.warm_start = True
+
+    @staticmethod
+    def _build_start_matrix(model: AnnualLpModel, trace_memory: bool) -> LpMatrix:
+        """最適化問題を行列形式で構築し、model.warm_startから導出した値を解の初期値とする。"""
+        appliers = AnnualLpService._create_appliers(model)
+        if model.warm_start is not None:
+            AnnualLpService._set_warm_start(model)
+        if all(isinstance(a, SparseConstraintApplierBase) for a in appliers):
+            matrix = AnnualLpService._build_matrix(model, appliers, trace_memory)
+        else:
+            AnnualLpService._apply(model, appliers, trace_memory)
+            matrix = LpMatrix.from_problem(model.problem)
+        matrix.complete_start()
+        return matrix
+
+    @staticmethod
+    def _assign_matrix_values(model: AnnualLpModel, matrix: LpMatrix, values: List[Optional[float]]) -> None:
+        """_build_start_matrixで構築した行列形式の列の値を、modelの変数に書き戻す。"""
+        if matrix.variables:
+            matrix.assign_values(values)
+        else:
+            model.columns.assign_values(values)
+
+    @staticmethod
+    def _x_columns(model: AnnualLpModel, matrix: LpMatrix) -> Dict[XKey, int]:
+        """解変数xの組 -> 行列形式の列インデックス を取得する。"""
+        if not matrix.variables:
+            return {key: model.x.col(key) for key in model.x}
+        # PuLPの問題から生成した場合は、列が制約に現れた順になる
+        positions = {name: j for j, name in enumerate(matrix.names)}
+        names = {key: model.columns.names[model.x.col(key)] for key in model.x}
+        return {key: positions[name] for key, name in names.items() if name in positions}
+
+    @staticmethod
+    def _trivial_bound(matrix: LpMatrix) -> Optional[float]:
+        """目的関数値の自明な下界（目的関数の各項を列の下限で評価した値）。計算できない場合はNone。"""
+        if not matrix.minimize:
+            return None
+        bound = matrix.objective_offset
+        for c, lower in zip(matrix.objective, matrix.col_lower):
+            if c < 0 or (c > 0 and lower == -INF):
+                return None
+            bound += c * lower if c else 0.0
+        return bound
+
+    @staticmethod
+    def _fix_columns(matrix: LpMatrix, x_cols: Dict[XKey, int], free: Set[XKey], values: List[float]) -> LpMatrix:
+        """近傍に含まれない解変数xの列を、上下限で値に固定した行列形式を生成する。値を解の初期値とする。
+
+        共有講座の組が同じ列を共有する場合は、いずれかの組が近傍に含まれれば固定しない。
+        """
+        free_cols = {x_cols[key] for key in free if key in x_cols}
+        lower = list(matrix.col_lower)
+        upper = list(matrix.col_upper)
+        for j in set(x_cols.values()) - free_cols:
+            lower[j] = upper[j] = values[j]
+        return replace(matrix, col_lower=lower, col_upper=upper, start=list(values))
+
+    @staticmethod
+    def _round_integers(matrix: LpMatrix, values: List[Optional[float]]) -> List[Optional[float]]:
+        """整数変数の解の値を丸める（ソルバーの許容誤差による端数を除く）。値のない列はそのままにする。"""
+        return [
+            float(round(v)) if is_integer and v is not None else v
+            for v, is_integer in zip(values, matrix.integrality)
+        ]
+
+    @staticmethod
+    def _solve_lns_step(model: AnnualLpModel, matrix: LpMatrix, solver: SolverInterface) -> MatrixSolution:
+        """LNSの1回分の問題を解く。model.solverのcancelで、解いているソルバーも中断する。
+
+        近傍に含まれない解変数xは上下限で固定しているため、前処理でソルバーに渡す問題から取り除かれる。
+        """
+        try:
+            with model.solver.interruptible(lambda: solver.cancel(model.solver.cancel_reason)):
+                solution = AnnualLpService._solve_matrix(solver, matrix)
+        except Exception:
+            AnnualLpService._raise_if_cancelled(model)
+            raise
+        AnnualLpService._raise_if_cancelled(model)
+        return solution
+
+    @staticmethod
+    def _solve_matrix(solver: SolverInterface, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式を前処理で縮小してから解き、解の値を元の列の順で返す。
+
+        行列形式を直接解けないソルバーの場合は縮小した行列形式をPuLPの問題に変換し、解の値を列の順に読み出す。
+        前処理で実行不可能と判定した場合は、元の行列形式を解いてソルバーに判定させる。
+        すべての列が固定された場合は、ソルバーを呼び出さない。
+        整数変数の解の値は、ソルバーの許容誤差による端数（0.9999999など）を除くため丸める。
+        求解中の進捗に含まれる暫定解の値も、元の列の順に戻して通知する。
+        """
+        presolved = LpPresolver.presolve(matrix)
+        reduced = presolved.matrix
+        logger.info(
+            "前処理で行列形式を縮小しました",
+            extra={
+                "infeasible": presolved.infeasible,
+                "removed_rows": presolved.removed_rows,
+                "fixed_cols": presolved.fixed_cols,
+                "rows": reduced.num_rows,
+                "cols": reduced.num_cols
+            }
+        )
+        if reduced.num_cols == 0:
+            return MatrixSolution(
+                status=pulp.LpStatusOptimal,
+                sol_status=pulp.LpSolutionOptimal,
+                values=presolved.postsolve([]),
+                objective=reduced.objective_offset,
+                bound=reduced.objective_offset
+            )
+
+        progress = solver.progress
+        if progress is not None:
+            solver.progress = lambda p: progress(
+                p if p.values is None else p.model_copy(update={"values": presolved.postsolve(p.values)})
+            )
+        try:
+            if solver.supports_matrix:
+                solution = solver.solve_matrix(reduced)
+            else:
+                solver.warm_start = reduced.start is not None
+                problem, variables = reduced.to_problem()
+                problem.setSolver(solver.get_solver())
+                solution = solver.solve_problem(problem)
+                if solution.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                    solution = replace(solution, values=[v.varValue for v in variables])
+        finally:
+            solver.progress = progress
+        if solution.values is not None:
+            values = presolved.postsolve(solution.values)
+            solution = replace(solution, values=AnnualLpService._round_integers(matrix, values))
+        return solution
+
+    @staticmethod
+    def _report_lns_progress(
+        model: AnnualLpModel,
+        matrix: LpMatrix,
+        improvement: LnsImprovementVo,
+        bound: Optional[float],
+        backend: str,
+        values: List[float]
+    ) -> None:
+        """LNSで最良解が改善したことを、求解中の進捗として通知する。"""
+        if (progress := model.solver.progress) is None:
+            return
+        progress(SolveProgressVo(
+            elapsed_seconds=improvement.elapsed_seconds,
+            objective=improvement.objective,
+            bound=bound,
+            gap=relative_gap(improvement.objective, bound),
+            backend=backend,
+            # PuLPの問題から生成した場合は、列インデックスがモデルの列の順と異なるため値を通知しない
+            values=None if matrix.variables else values
+        ))
+
+    @staticmethod
+    def _raise_if_cancelled(model: AnnualLpModel) -> None:
+        """ソルバーのcancelで中断されていれば、理由をログに出力してOptimizationCancelledErrorを送出する。"""
+        if (reason := model.solver.cancel_reason) is None:
+            return
+        logger.info("求解を中断しました", extra={"reason": reason, "backend": model.solver.backend})
+        raise OptimizationCancelledError(reason)
+
+    @staticmethod
+    def _create_solve_result(model: AnnualLpModel, solution: MatrixSolution, elapsed_seconds: float) -> SolveResultVo:
+        """ソルバーの結果から求解結果の要約を生成する。"""
+        if solution.sol_status == pulp.LpSolutionOptimal:
+            status = SolveStatus.OPTIMAL
+        elif solution.sol_status == pulp.LpSolutionIntegerFeasible:
+            status = SolveStatus.FEASIBLE
+        elif solution.status == pulp.LpStatusInfeasible:
+            status = SolveStatus.INFEASIBLE
+        elif solution.status == pulp.LpStatusUnbounded:
+            status = SolveStatus.UNBOUNDED
+        else:
+            status = SolveStatus.NOT_SOLVED
+
+        objective = solution.objective if status in (SolveStatus.OPTIMAL, SolveStatus.FEASIBLE) else None
+        bound = solution.bound
+        if bound is None and status == SolveStatus.OPTIMAL:
+            # 最適解の場合、下界は目的関数値に等しい
+            bound = objective
+        return SolveResultVo(
+            status=status,
+            objective=objective,
+            bound=bound if objective is not None else None,
+            gap=relative_gap(objective, bound),
+            elapsed_seconds=elapsed_seconds,
+            build_seconds=model.build_profile.elapsed_seconds if model.build_profile is not None else None,
+            backend=solution.backend or model.solver.backend
+        )
+
+    @staticmethod
+    def _create_appliers(model: AnnualLpModel) -> List[ConstraintApplierBase]:
+        """modelオブジェクトに格納した制約定義から、適用する制約定義クラスを生成する。
+
+        CONSTRAINT_DEFINITIONS_BATCHEDの制約は、同じコードの制約定義をまとめて1つの制約定義クラスとし、
+        最初の制約定義の位置で適用する。
+        """
+        definitions = [c for c in model.constraint_definitions if not c.soft_flag]
+        batched: Dict[str, List[Dict[str, Union[str, int]]]] = {}
+        for c in definitions:
+            if c.code.upper() in CONSTRAINT_DEFINITIONS_BATCHED:
+                batched.setdefault(c.code.upper(), []).append(c.parameters or {})
+
+        built_in: List[ConstraintApplierBase] = []
+        for c in definitions:
+            code = c.code.upper()
+            if code not in CONSTRAINT_DEFINITIONS_BATCHED:
+                built_in.append(CONSTRAINT_DEFINITIONS_BUILT_IN[code](**c.parameters))
+            elif code in batched:
+                built_in.append(CONSTRAINT_DEFINITIONS_BATCHED[code](batched.pop(code)))
+
+        return [
             # 変数定義
             *(cls() for cls in VARIABLE_DEFINITIONS.values()),
             # 必須制約
             *(cls() for cls in CONSTRAINT_DEFINITIONS_MANDATORY.values()),
             # 組み込み制約
-            *(CONSTRAINT_DEFINITIONS_BUILT_IN[c.code.upper()](**c.parameters)
-              for c in model.constraint_definitions if not c.soft_flag),
+            *built_in,
         ]
-        for applier in appliers:
-            applier.apply(model)
-
-        # 最適化問題を解く
-        status = model.problem.solve()
-        if status != pulp.LpStatusOptimal:
-            raise OptimizationError(status)
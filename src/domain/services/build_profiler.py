@@ -0,0 +1,118 @@
+import logging
+import time
+import tracemalloc
+from itertools import islice
+from typing import Callable, List, Tuple
+
+import pulp
+from domain.constraints._base import ConstraintApplierBase
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.build_profile import ApplierProfileVo, BuildProfileVo
+
+logger = logging.getLogger(__name__)
+
+# 計測対象の変数族（AnnualLpModelの属性名）
+VARIABLE_FAMILIES = ("x", "y", "w", "v1", "v2", "v3", "v4")
+
+
+class BuildProfiler:
+    """LPモデル構築の計測クラス。
+
+    制約定義クラスごとに、適用時間・追加した行数・非ゼロ要素数を記録する。
+    trace_memoryがTrueの場合は、tracemallocでメモリ使用量の増分のピークも記録する（低速になる）。
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """イニシャライザ。
+
+        Args:
+            trace_memory (bool): メモリ使用量を計測するかどうか
+        """
+        self.trace_memory = trace_memory
+        self.appliers: List[ApplierProfileVo] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "BuildProfiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def run(
+        self,
+        applier: ConstraintApplierBase,
+        step: Callable[[], None],
+        count: Callable[[], Tuple[int, int]]
+    ) -> None:
+        """制約定義クラスを適用し、計測結果を記録する。
+
+        Args:
+            applier (ConstraintApplierBase): 制約定義クラス
+            step (Callable[[], None]): 適用処理
+            count (Callable[[], Tuple[int, int]]): その時点の (行数, 非ゼロ要素数) を返す関数
+        """
+        rows, nonzeros = count()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        step()
+        elapsed = time.perf_counter() - start
+
+        memory_peak = None
+        if self.trace_memory:
+            memory_peak = tracemalloc.get_traced_memory()[1] - memory
+        rows_after, nonzeros_after = count()
+
+        profile = ApplierProfileVo(
+            applier=type(applier).__name__,
+            elapsed_seconds=elapsed,
+            memory_peak_bytes=memory_peak,
+            rows=rows_after - rows,
+            nonzeros=nonzeros_after - nonzeros
+        )
+        self.appliers.append(profile)
+        logger.debug("制約を適用しました", extra=profile.model_dump())
+
+    def result(self, model: AnnualLpModel) -> BuildProfileVo:
+        """計測結果を集計する。
+
+        Args:
+            model (AnnualLpModel): 構築したLPモデル
+
+        Returns:
+            BuildProfileVo: 計測結果
+        """
+        families = model.variable_families()
+        return BuildProfileVo(
+            appliers=self.appliers,
+            variables={name: len(families[name]) for name in VARIABLE_FAMILIES if name in families},
+            columns=len(model.columns),
+            elapsed_seconds=sum(p.elapsed_seconds for p in self.appliers),
+            rows=sum(p.rows for p in self.appliers),
+            nonzeros=sum(p.nonzeros for p in self.appliers)
+        )
+
+
+class PulpRowCounter:
+    """PuLPの問題の (行数, 非ゼロ要素数) を数える関数オブジェクト。
+
+    前回以降に追加された制約だけを走査する。
+    """
+
+    def __init__(self, problem: pulp.LpProblem):
+        self.problem = problem
+        self.rows = 0
+        self.nonzeros = 0
+
+    def __call__(self) -> Tuple[int, int]:
+        constraints = self.problem.constraints
+        self.nonzeros += sum(len(c) for c in islice(constraints.values(), self.rows, None))
+        self.rows = len(constraints)
+        return self.rows, self.nonzeros
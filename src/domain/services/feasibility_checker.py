@@ -0,0 +1,142 @@
+import logging
+from typing import Dict, List, Set, Tuple
+
+from common.constants import InfeasibilityKind
+from domain.logics.constraint_logic import get_enrolled_homeroom
+from domain.vo.annual_data import AnnualDataVo, CourseId, DayOfWeek, HomeroomId, Period
+from domain.vo.infeasibility import InfeasibilityVo
+
+logger = logging.getLogger(__name__)
+
+
+class FeasibilityChecker:
+    """LPモデルを構築する前に、必須制約を満たせない入力の矛盾を検出するサービスクラス。
+
+    年次データを一度ずつ走査するだけで、矛盾する学級・講座・教員を特定する。
+    検出するのは、必須制約から直接導かれる必要条件のみで、矛盾がなくても実行可能とは限らない。
+    """
+
+    @staticmethod
+    def check(data: AnnualDataVo) -> List[InfeasibilityVo]:
+        """入力の矛盾を検出する。
+
+        Args:
+            data (AnnualDataVo): 年次データ
+
+        Returns:
+            List[InfeasibilityVo]: 検出した矛盾のリスト。矛盾がない場合は空
+        """
+        infeasibilities = [
+            *FeasibilityChecker._check_homerooms(data),
+            *FeasibilityChecker._check_courses(data),
+            *FeasibilityChecker._check_instructors(data),
+        ]
+        if infeasibilities:
+            logger.info(
+                "入力の矛盾を検出しました",
+                extra={"infeasibilities": [i.model_dump(mode="json") for i in infeasibilities]}
+            )
+        return infeasibilities
+
+    @staticmethod
+    def _check_homerooms(data: AnnualDataVo) -> List[InfeasibilityVo]:
+        """ブロックのレーンの単位数と、学級の時限を埋める単位数を検査する。
+
+        ブロックのレーンは同じ時限に開講するため、レーンどうしの単位数の合計は等しくなければならない。
+        また、学級のすべての時限にいずれかの講座を開講するため、ブロックごとのレーンの単位数の合計が
+        学級の時限数に満たない場合は、埋まらない時限が残る。
+        """
+        infeasibilities: List[InfeasibilityVo] = []
+        for h in data.H:
+            periods = sum(len(ps) for ps in data.homeroom_day_dict[h].values())
+            coverable = 0
+            for block in data.curriculum_dict[h]:
+                lane_credits = [sum(data.credit_dict[c] for c in lane) for lane in block]
+                if not lane_credits:
+                    continue
+                coverable += min(lane_credits)
+                if min(lane_credits) != max(lane_credits):
+                    infeasibilities.append(InfeasibilityVo(
+                        kind=InfeasibilityKind.BLOCK_LANES,
+                        homerooms=[h],
+                        courses=[c for lane in block for c in lane],
+                        required=max(lane_credits),
+                        available=min(lane_credits)
+                    ))
+            if coverable < periods:
+                infeasibilities.append(InfeasibilityVo(
+                    kind=InfeasibilityKind.HOMEROOM_PERIODS,
+                    homerooms=[h],
+                    required=periods,
+                    available=coverable
+                ))
+        return infeasibilities
+
+    @staticmethod
+    def _check_courses(data: AnnualDataVo) -> List[InfeasibilityVo]:
+        """講座の単位数が、学級で開講できる時限数に収まるかを検査する。
+
+        教員の出勤を考慮するのは、教員のコマ数を数える学級（get_enrolled_homeroom）の時限のみ。
+        """
+        infeasibilities: List[InfeasibilityVo] = []
+        index = data.index
+        homeroom_order = {h: n for n, h in enumerate(data.H)}
+        instructor_order = {i: n for n, i in enumerate(data.I)}
+        for c in data.C:
+            instructors = sorted(
+                (i for i in index.course_instructors.get(c, ()) if i in instructor_order), key=instructor_order.get
+            )
+            counted = get_enrolled_homeroom(data, c)
+            for h in sorted(index.course_homerooms.get(c, ()), key=homeroom_order.get):
+                available = sum(
+                    1
+                    for d, periods in data.homeroom_day_dict[h].items()
+                    for p in periods
+                    if h != counted or all(
+                        p not in data.attendance_day_dict.get(i, {}).get(d, ()) for i in instructors
+                    )
+                )
+                if data.credit_dict[c] > available:
+                    infeasibilities.append(InfeasibilityVo(
+                        kind=InfeasibilityKind.COURSE_CREDITS,
+                        homerooms=[h],
+                        courses=[c],
+                        instructors=instructors if h == counted else [],
+                        required=data.credit_dict[c],
+                        available=available
+                    ))
+        return infeasibilities
+
+    @staticmethod
+    def _check_instructors(data: AnnualDataVo) -> List[InfeasibilityVo]:
+        """教員の担当講座の単位数の合計が、出勤している時限数に収まるかを検査する。
+
+        教員は1つの時限に1つの講座しか担当できず、複数の学級で共有する講座は1回と数える。
+        出勤している時限は、担当講座を開講できる（学級に時限がある）時限に限る。
+        """
+        infeasibilities: List[InfeasibilityVo] = []
+        index = data.index
+        course_order = {c: n for n, c in enumerate(data.C)}
+        homeroom_slots: Dict[HomeroomId, Set[Tuple[DayOfWeek, Period]]] = {}
+        for i in data.I:
+            courses: List[CourseId] = []
+            slots: Set[Tuple[DayOfWeek, Period]] = set()
+            for c in sorted(index.instructor_courses.get(i, ()), key=lambda c: course_order.get(c, len(course_order))):
+                if (h := get_enrolled_homeroom(data, c)) is None:
+                    continue
+                courses.append(c)
+                if h not in homeroom_slots:
+                    homeroom_slots[h] = {(d, p) for d, periods in data.homeroom_day_dict[h].items() for p in periods}
+                slots |= homeroom_slots[h]
+            unavailable = data.attendance_day_dict.get(i, {})
+            available = sum(1 for d, p in slots if p not in unavailable.get(d, ()))
+            load = sum(data.credit_dict[c] for c in courses)
+            if load > available:
+                infeasibilities.append(InfeasibilityVo(
+                    kind=InfeasibilityKind.INSTRUCTOR_LOAD,
+                    courses=courses,
+                    instructors=[i],
+                    required=load,
+                    available=available
+                ))
+        return infeasibilities
@@ -0,0 +1,93 @@
+import random
+from typing import Dict, Iterable, List, Set, Tuple
+
+from common.constants import LnsNeighbourhood
+from domain.vo.annual_data import AnnualDataVo, CourseId, DayOfWeek, HomeroomId, Period
+from domain.vo.lns_settings import LnsSettingsVo
+
+# (学級ID, 曜日, 時限, 講座ID)
+XKey = Tuple[HomeroomId, DayOfWeek, Period, CourseId]
+
+
+class LnsNeighbourhoodSelector:
+    """LNSで解放する近傍（値を固定しない解変数xの組）を選ぶクラス。
+
+    - DAY: 1日のすべての組
+    - HOMEROOMS: 講座を共有する学級をたどって集めた学級群のすべての組
+    - INSTRUCTORS: 数名の教員の担当講座の組と、それらの講座が現在の解で配置されている学級・時限のすべての組
+      （担当講座を同じ学級の他の講座と入れ替えられるようにする）
+    """
+
+    def __init__(self, data: AnnualDataVo, keys: Iterable[XKey], settings: LnsSettingsVo):
+        """イニシャライザ。
+
+        Args:
+            data (AnnualDataVo): 年次データ
+            keys (Iterable[XKey]): 解変数xの組
+            settings (LnsSettingsVo): LNSの設定
+        """
+        self.data = data
+        self.settings = settings
+        self.random = random.Random(settings.seed)
+        self._keys_by_day: Dict[DayOfWeek, List[XKey]] = {}
+        self._keys_by_homeroom: Dict[HomeroomId, List[XKey]] = {}
+        self._keys_by_course: Dict[CourseId, List[XKey]] = {}
+        self._keys_by_slot: Dict[Tuple[HomeroomId, DayOfWeek, Period], List[XKey]] = {}
+        for key in keys:
+            h, d, p, c = key
+            self._keys_by_day.setdefault(d, []).append(key)
+            self._keys_by_homeroom.setdefault(h, []).append(key)
+            self._keys_by_course.setdefault(c, []).append(key)
+            self._keys_by_slot.setdefault((h, d, p), []).append(key)
+        self._instructors = [i for i in data.I if data.index.instructor_courses.get(i)]
+
+    def select(self, kind: LnsNeighbourhood, assigned: Set[XKey]) -> Set[XKey]:
+        """近傍を選ぶ。
+
+        Args:
+            kind (LnsNeighbourhood): 近傍の種類
+            assigned (Set[XKey]): 現在の解で1の組
+
+        Returns:
+            Set[XKey]: 解放する組
+        """
+        if kind == LnsNeighbourhood.DAY:
+            return set(self._keys_by_day.get(self.random.choice(self.data.D), ()))
+        if kind == LnsNeighbourhood.HOMEROOMS:
+            return {key for h in self._pick_homerooms() for key in self._keys_by_homeroom.get(h, ())}
+        return self._select_instructors(assigned)
+
+    def _pick_homerooms(self) -> List[HomeroomId]:
+        """無作為に選んだ学級から、講座を共有する学級を幅優先でたどって学級群を選ぶ。
+
+        たどれる学級が足りない場合は、無作為に選んだ学級から新たにたどる。
+        """
+        data = self.data
+        size = min(self.settings.homerooms, len(data.H))
+        chosen: List[HomeroomId] = []
+        while len(chosen) < size:
+            queue = [self.random.choice([h for h in data.H if h not in chosen])]
+            while queue and len(chosen) < size:
+                h = queue.pop(0)
+                if h in chosen:
+                    continue
+                chosen.append(h)
+                linked = {h2 for c in data.index.homeroom_courses[h] for h2 in data.index.course_homerooms[c]}
+                queue.extend(h2 for h2 in data.H if h2 in linked and h2 not in chosen)
+        return chosen
+
+    def _select_instructors(self, assigned: Set[XKey]) -> Set[XKey]:
+        """無作為に選んだ教員の担当講座と、それらが配置されている学級・時限の組を選ぶ。"""
+        data = self.data
+        instructors = self.random.sample(self._instructors, min(self.settings.instructors, len(self._instructors)))
+        courses = {c for i in instructors for c in data.index.instructor_courses[i]}
+        selected = {key for c in courses for key in self._keys_by_course.get(c, ())}
+        for h, d, p, c in assigned:
+            if c in courses:
+                selected.update(self._keys_by_slot[h, d, p])
+        return selected
+
+    def kind(self, iteration: int) -> LnsNeighbourhood:
+        """iteration回目（1始まり）の部分問題で使う近傍の種類を取得する（設定の順に繰り返す）。"""
+        neighbourhoods = self.settings.neighbourhoods
+        return neighbourhoods[(iteration - 1) % len(neighbourhoods)]
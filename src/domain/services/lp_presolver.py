@@ -0,0 +1,212 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+import pulp
+
+from domain.models.lp_matrix import INF, LpMatrix
+
+# 上下限・行の値を比較する許容誤差
+PRESOLVE_TOLERANCE = 1e-9
+
+
+@dataclass
+class PresolvedMatrix:
+    """前処理で縮小した行列形式と、元の列への対応。
+
+    Attributes:
+        matrix: 縮小した行列形式（実行不可能と判定した場合は、ソルバーに判定させるため元の行列形式）
+        cols: 縮小した列インデックス -> 元の列インデックス
+        values: 元の列インデックス -> 固定した値（縮小した行列形式に残した列は0）
+        removed_rows: 取り除いた行の数
+        infeasible: 上下限の伝播で実行不可能と判定したかどうか
+    """
+    matrix: LpMatrix
+    cols: List[int] = field(default_factory=list)
+    values: List[float] = field(default_factory=list)
+    removed_rows: int = 0
+    infeasible: bool = False
+
+    @property
+    def fixed_cols(self) -> int:
+        """固定して取り除いた列の数"""
+        return len(self.values) - len(self.cols)
+
+    def postsolve(self, values: List[Optional[float]]) -> List[Optional[float]]:
+        """縮小した行列形式の列の値を、元の列の順の値に戻す（取り除いた列は固定した値）。
+
+        Args:
+            values (List[Optional[float]]): 縮小した列インデックス -> 値
+
+        Returns:
+            List[Optional[float]]: 元の列インデックス -> 値
+        """
+        full: List[Optional[float]] = list(self.values)
+        for k, j in enumerate(self.cols):
+            full[j] = values[k]
+        return full
+
+
+class LpPresolver:
+    """行列形式をソルバーに渡す前に、上下限の伝播で縮小するサービスクラス。
+
+    - 列が1つの行（教員制約の y == 0 / y <= 1、曜日時限指定の x == 1 など）は列の上下限に置き換える
+    - 各行の値の取り得る範囲から整数変数の上下限を締め、締めた列を含む行を確認し直す
+      （欠勤時限の y == 0 から担当講座の x を0に、指定した x == 1 から同じ教員の他の講座の x を0に、
+      ブロックの他のレーンの x を1にするなど）
+    - 常に満たされる行を取り除き、上下限が一致した列は値を代入して取り除く
+    - どの行にも現れない列は、目的関数値が小さくなる側の上下限に固定する
+    """
+
+    @staticmethod
+    def presolve(matrix: LpMatrix) -> PresolvedMatrix:
+        """行列形式を縮小する。
+
+        Args:
+            matrix (LpMatrix): 行列形式
+
+        Returns:
+            PresolvedMatrix: 縮小した行列形式と、元の列への対応
+        """
+        lower = list(matrix.col_lower)
+        upper = list(matrix.col_upper)
+        # 同じ列が1つの行に複数回現れる場合は係数をまとめる
+        coefs: List[Dict[int, float]] = [{} for _ in range(matrix.num_rows)]
+        for r, j, a in zip(matrix.rows, matrix.cols, matrix.coefs):
+            coefs[r][j] = coefs[r].get(j, 0.0) + a
+        row_terms: List[List[Tuple[int, float]]] = [[(j, a) for j, a in row.items() if a] for row in coefs]
+        col_rows: List[List[int]] = [[] for _ in range(matrix.num_cols)]
+        for r, terms in enumerate(row_terms):
+            for j, _ in terms:
+                col_rows[j].append(r)
+
+        removed = [False] * matrix.num_rows
+        queue: Deque[int] = deque(range(matrix.num_rows))
+        queued = [True] * matrix.num_rows
+        while queue:
+            r = queue.popleft()
+            queued[r] = False
+            if removed[r]:
+                continue
+            sense, rhs, terms = matrix.senses[r], matrix.rhs[r], row_terms[r]
+            min_activity = sum(a * (lower[j] if a > 0 else upper[j]) for j, a in terms)
+            max_activity = sum(a * (upper[j] if a > 0 else lower[j]) for j, a in terms)
+            has_upper = sense in (pulp.LpConstraintLE, pulp.LpConstraintEQ)
+            has_lower = sense in (pulp.LpConstraintGE, pulp.LpConstraintEQ)
+            if (has_upper and min_activity > rhs + PRESOLVE_TOLERANCE) or (
+                has_lower and max_activity < rhs - PRESOLVE_TOLERANCE
+            ):
+                return LpPresolver._unchanged(matrix)
+            if (not has_upper or max_activity <= rhs + PRESOLVE_TOLERANCE) and (
+                not has_lower or min_activity >= rhs - PRESOLVE_TOLERANCE
+            ):
+                removed[r] = True
+                continue
+
+            for j, a in terms:
+                if not matrix.integrality[j] or upper[j] - lower[j] <= PRESOLVE_TOLERANCE:
+                    continue
+                new_lower, new_upper = lower[j], upper[j]
+                if has_upper and min_activity > -INF:
+                    # 他の列が最小の場合に、行の上限を超えない範囲
+                    if a > 0:
+                        new_upper = min(new_upper, lower[j] + (rhs - min_activity) / a)
+                    else:
+                        new_lower = max(new_lower, upper[j] + (rhs - min_activity) / a)
+                if has_lower and max_activity < INF:
+                    # 他の列が最大の場合に、行の下限を下回らない範囲
+                    if a > 0:
+                        new_lower = max(new_lower, upper[j] - (max_activity - rhs) / a)
+                    else:
+                        new_upper = min(new_upper, lower[j] - (max_activity - rhs) / a)
+                if not math.isinf(new_lower):
+                    new_lower = math.ceil(new_lower - PRESOLVE_TOLERANCE)
+                if not math.isinf(new_upper):
+                    new_upper = math.floor(new_upper + PRESOLVE_TOLERANCE)
+                if new_lower > new_upper:
+                    return LpPresolver._unchanged(matrix)
+                if new_lower <= lower[j] and new_upper >= upper[j]:
+                    continue
+                lower[j], upper[j] = max(lower[j], new_lower), min(upper[j], new_upper)
+                for r2 in col_rows[j]:
+                    if not queued[r2] and not removed[r2]:
+                        queue.append(r2)
+                        queued[r2] = True
+
+        return LpPresolver._reduce(matrix, lower, upper, row_terms, removed)
+
+    @staticmethod
+    def _reduce(
+        matrix: LpMatrix,
+        lower: List[float],
+        upper: List[float],
+        row_terms: List[List[Tuple[int, float]]],
+        removed: List[bool]
+    ) -> PresolvedMatrix:
+        """取り除いた行と、固定した列を除いた行列形式を生成する。"""
+        used = [False] * matrix.num_cols
+        for r, terms in enumerate(row_terms):
+            if not removed[r]:
+                for j, _ in terms:
+                    used[j] = True
+
+        values = [0.0] * matrix.num_cols
+        kept: List[int] = []
+        for j in range(matrix.num_cols):
+            if upper[j] - lower[j] <= PRESOLVE_TOLERANCE:
+                values[j] = lower[j]
+            elif not used[j] and (value := LpPresolver._best_bound(matrix, j, lower[j], upper[j])) is not None:
+                values[j] = value
+            else:
+                kept.append(j)
+        index = {j: k for k, j in enumerate(kept)}
+
+        reduced = LpMatrix(
+            names=[matrix.names[j] for j in kept],
+            variables=[matrix.variables[j] for j in kept] if matrix.variables else [],
+            col_lower=[lower[j] for j in kept],
+            col_upper=[upper[j] for j in kept],
+            integrality=[matrix.integrality[j] for j in kept],
+            objective=[matrix.objective[j] for j in kept],
+            objective_offset=matrix.objective_offset + sum(
+                c * values[j] for j, c in enumerate(matrix.objective) if c and j not in index
+            ),
+            minimize=matrix.minimize,
+            start=[matrix.start[j] for j in kept] if matrix.start is not None else None,
+        )
+        for r, terms in enumerate(row_terms):
+            if removed[r]:
+                continue
+            # 固定した列の値は右辺に移す
+            kept_terms = [(index[j], a) for j, a in terms if j in index]
+            rhs = matrix.rhs[r] - sum(a * values[j] for j, a in terms if j not in index)
+            if not kept_terms:
+                continue
+            row = reduced.num_rows
+            for k, a in kept_terms:
+                reduced.rows.append(row)
+                reduced.cols.append(k)
+                reduced.coefs.append(a)
+            reduced.senses.append(matrix.senses[r])
+            reduced.rhs.append(rhs)
+
+        return PresolvedMatrix(
+            matrix=reduced,
+            cols=kept,
+            values=values,
+            removed_rows=matrix.num_rows - reduced.num_rows
+        )
+
+    @staticmethod
+    def _unchanged(matrix: LpMatrix) -> PresolvedMatrix:
+        """実行不可能と判定した場合に、元の行列形式をそのまま返す。"""
+        return PresolvedMatrix(
+            matrix=matrix, cols=list(range(matrix.num_cols)), values=[0.0] * matrix.num_cols, infeasible=True
+        )
+
+    @staticmethod
+    def _best_bound(matrix: LpMatrix, j: int, lower: float, upper: float) -> Optional[float]:
+        """どの行にも現れない列jの、目的関数値が最も良くなる値。上下限がない側の場合はNone。"""
+        c = matrix.objective[j] if matrix.minimize else -matrix.objective[j]
+        value = upper if c < 0 else lower
+        return None if math.isinf(value) else value
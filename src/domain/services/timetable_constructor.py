@@ -0,0 +1,307 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from domain.vo.annual_data import AnnualDataVo, CourseId, DayOfWeek, HomeroomId, InstructorId, Period
+from domain.vo.warm_start import WarmStartVo
+
+logger = logging.getLogger(__name__)
+
+# (学級ID, ブロックの番号)
+BlockKey = Tuple[HomeroomId, int]
+# (学級ID, ブロックの番号, レーンの番号)
+LaneKey = Tuple[HomeroomId, int, int]
+Slot = Tuple[DayOfWeek, Period]
+# 修復で一度に移動するコマの最大数
+MAX_REPAIR_MOVES = 2
+# 修復で再帰的に移動する深さの上限
+MAX_REPAIR_DEPTH = 3
+
+
+@dataclass
+class _BlockGroup:
+    """共有講座でつながったブロックの集まり。同じ時限に、全レーンの講座を同時に開講する。
+
+    Attributes:
+        homerooms: 構成するブロックの学級
+        lanes: レーン -> 講座IDリスト
+        lane_of: (学級ID, 講座ID) -> レーン
+        instructors: 担当教員
+        sessions_per_day: 曜日 -> 配置したコマ数
+    """
+    homerooms: List[HomeroomId] = field(default_factory=list)
+    lanes: Dict[LaneKey, List[CourseId]] = field(default_factory=dict)
+    lane_of: Dict[Tuple[HomeroomId, CourseId], LaneKey] = field(default_factory=dict)
+    instructors: Set[InstructorId] = field(default_factory=set)
+    sessions_per_day: Dict[DayOfWeek, int] = field(default_factory=dict)
+
+
+@dataclass(eq=False)
+class _Session:
+    """同じ時限に開講する講座の組（1コマ）。
+
+    Attributes:
+        group: 属するブロックの集まり
+        courses: 開講する講座ID
+        instructors: 担当教員
+        slot: 配置した時限。配置していない場合はNone
+    """
+    group: _BlockGroup
+    courses: List[CourseId]
+    instructors: List[InstructorId]
+    slot: Optional[Slot] = None
+
+
+class TimetableConstructor:
+    """年次データから時間割を貪欲法で構築するクラス。
+
+    ソルバーの最初の実行可能解（MIPスタート）や、求解しないfastモードの解として使う。
+    必須制約（学級・講座・単位数・ブロック・教員）を満たすように、共有講座でつながったブロックを単位として、
+    各レーンの講座を1コマずつ、学級の時限が空いていて教員が出勤し手が空いている時限に配置する。
+    配置できないコマは配置せずに残す（単位数制約などを満たさない、実行可能に近い解になる）。
+    """
+
+    def __init__(self, data: AnnualDataVo):
+        """イニシャライザ。
+
+        Args:
+            data (AnnualDataVo): 年次データ
+        """
+        self.data = data
+        # 直近のconstructで配置できなかったコマ数
+        self.unplaced_sessions = 0
+        # (学級ID, 曜日, 時限) / (教員ID, 曜日, 時限) -> 配置したコマ
+        self._filled: Dict[Tuple[HomeroomId, DayOfWeek, Period], _Session] = {}
+        self._busy: Dict[Tuple[InstructorId, DayOfWeek, Period], _Session] = {}
+        # 配置・取り除きの履歴（コマ, 取り除く前の時限。配置した場合はNone）。修復の取り消しに使う
+        self._moves: List[Tuple[_Session, Optional[Slot]]] = []
+
+    def construct(self) -> WarmStartVo:
+        """時間割を構築する。
+
+        ブロックの集まりは、学級数・教員数・コマ数が多い（配置しにくい）順に配置する。
+        各コマは、同じ集まりのコマが少ない曜日、学級の空き時限が多い曜日、早い時限の順に優先して配置する。
+        空いている時限がないコマは、その時限のコマを別の時限に移動して配置する（修復）。
+
+        Returns:
+            WarmStartVo: 配置した(学級ID, 曜日, 時限, 講座ID)の集合
+        """
+        start = time.perf_counter()
+        data = self.data
+        remaining = {(h, c): data.credit_dict[c] for h in data.H for c in data.index.homeroom_courses[h]}
+        self._filled = {}
+        self._busy = {}
+        self._moves = []
+
+        sessions: List[_Session] = []
+        unplaced: List[_Session] = []
+        groups = self._create_groups()
+        groups.sort(key=lambda g: (-len(g.homerooms), -len(g.instructors), -self._count_sessions(g)))
+        for group in groups:
+            group.sessions_per_day = {d: 0 for d in data.D}
+            while courses := self._pick_courses(group, remaining):
+                for c in courses:
+                    for h in data.index.course_homerooms[c]:
+                        remaining[h, c] -= 1
+                session = _Session(
+                    group=group,
+                    courses=courses,
+                    instructors=[i for c in courses for i in data.index.course_instructors.get(c, ())]
+                )
+                sessions.append(session)
+                if (slot := self._find_slot(session)) is not None:
+                    self._place(session, slot)
+                else:
+                    unplaced.append(session)
+
+        unplaced = [session for session in unplaced if not self._repair(session)]
+        self._moves = []
+        self.unplaced_sessions = len(unplaced)
+
+        assignments = {
+            (h, d, p, c)
+            for session in sessions if session.slot is not None
+            for d, p in [session.slot]
+            for c in session.courses
+            for h in data.index.course_homerooms[c]
+        }
+        logger.info(
+            "時間割を構築しました",
+            extra={
+                "assignments": len(assignments),
+                "unplaced_sessions": self.unplaced_sessions,
+                "elapsed_seconds": time.perf_counter() - start,
+            }
+        )
+        return WarmStartVo(assignments=frozenset(assignments))
+
+    def _create_groups(self) -> List[_BlockGroup]:
+        """共有講座でつながったブロックをまとめる（Union-Find）。"""
+        data = self.data
+        parent: Dict[BlockKey, BlockKey] = {}
+
+        def find(key: BlockKey) -> BlockKey:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        course_block: Dict[CourseId, BlockKey] = {}
+        for h in data.H:
+            for b, block in enumerate(data.curriculum_dict.get(h, [])):
+                parent[h, b] = (h, b)
+                for lane in block:
+                    for c in lane:
+                        if c in course_block:
+                            parent[find((h, b))] = find(course_block[c])
+                        else:
+                            course_block[c] = (h, b)
+
+        groups: Dict[BlockKey, _BlockGroup] = {}
+        for key in parent:
+            group = groups.setdefault(find(key), _BlockGroup())
+            h, b = key
+            if h not in group.homerooms:
+                group.homerooms.append(h)
+            for l, lane in enumerate(data.curriculum_dict[h][b]):
+                group.lanes[h, b, l] = lane
+                for c in lane:
+                    group.lane_of[h, c] = (h, b, l)
+                    group.instructors.update(data.index.course_instructors.get(c, ()))
+        return list(groups.values())
+
+    def _count_sessions(self, group: _BlockGroup) -> int:
+        """集まりのコマ数（レーンの単位数の合計の最大値）を取得する。"""
+        return max((sum(self.data.credit_dict[c] for c in lane) for lane in group.lanes.values()), default=0)
+
+    def _pick_courses(self, group: _BlockGroup, remaining: Dict[Tuple[HomeroomId, CourseId], int]) -> List[CourseId]:
+        """次のコマで開講する講座を、レーンごとに1つ選ぶ。
+
+        共有講座は複数のレーンに現れるため、選択済みの講座を含むレーンでは新たに選ばない。
+        レーンの中では、残りの単位数が多い講座を選ぶ。
+        """
+        data = self.data
+        chosen: List[CourseId] = []
+        covered: Set[LaneKey] = set()
+        for key, lane in group.lanes.items():
+            if key in covered:
+                continue
+            h = key[0]
+            candidates = [c for c in lane if remaining[h, c] > 0]
+            if not candidates:
+                continue
+            c = max(candidates, key=lambda c: remaining[h, c])
+            chosen.append(c)
+            covered.update(group.lane_of[h2, c] for h2 in data.index.course_homerooms[c])
+        return chosen
+
+    def _open_slots(self, session: _Session) -> List[Slot]:
+        """コマを開講できる時限（全学級に時限があり、全教員が出勤している時限）を取得する。
+
+        同じ教員が同じコマの複数の講座を担当している場合は、開講できる時限はない。
+        """
+        data = self.data
+        if len(session.instructors) != len(set(session.instructors)):
+            return []
+        slots: List[Slot] = []
+        for d in data.D:
+            periods: Optional[Set[Period]] = None
+            for h in session.group.homerooms:
+                day_periods = set(data.index.homeroom_day_periods.get((h, d), ()))
+                periods = day_periods if periods is None else periods & day_periods
+            for p in sorted(periods or ()):
+                if not any(p in data.attendance_day_dict.get(i, {}).get(d, ()) for i in session.instructors):
+                    slots.append((d, p))
+        return slots
+
+    def _blockers(self, session: _Session, slot: Slot) -> Set[_Session]:
+        """時限に配置済みで、コマと学級・教員が重なるコマを取得する。"""
+        d, p = slot
+        blockers = {self._filled.get((h, d, p)) for h in session.group.homerooms}
+        blockers.update(self._busy.get((i, d, p)) for i in session.instructors)
+        blockers.discard(None)
+        return blockers
+
+    def _find_slot(self, session: _Session) -> Optional[Slot]:
+        """コマを配置する時限を探す。配置できる時限がない場合はNone。"""
+        group = session.group
+        free_slots = [slot for slot in self._open_slots(session) if not self._blockers(session, slot)]
+        free_count: Dict[DayOfWeek, int] = {}
+        for d, _ in free_slots:
+            free_count[d] = free_count.get(d, 0) + 1
+        return min(
+            free_slots,
+            key=lambda slot: (group.sessions_per_day[slot[0]], -free_count[slot[0]], slot[1]),
+            default=None
+        )
+
+    def _place(self, session: _Session, slot: Slot) -> None:
+        """コマを時限に配置する。"""
+        d, p = slot
+        session.slot = slot
+        session.group.sessions_per_day[d] += 1
+        for h in session.group.homerooms:
+            self._filled[h, d, p] = session
+        for i in session.instructors:
+            self._busy[i, d, p] = session
+        self._moves.append((session, None))
+
+    def _remove(self, session: _Session) -> None:
+        """配置したコマを取り除く。"""
+        d, p = slot = session.slot
+        session.slot = None
+        session.group.sessions_per_day[d] -= 1
+        for h in session.group.homerooms:
+            del self._filled[h, d, p]
+        for i in session.instructors:
+            del self._busy[i, d, p]
+        self._moves.append((session, slot))
+
+    def _rollback(self, mark: int) -> None:
+        """配置・取り除きの履歴をmarkの時点まで戻す。"""
+        while len(self._moves) > mark:
+            session, slot = self._moves.pop()
+            if slot is None:
+                self._remove(session)
+            else:
+                self._place(session, slot)
+            self._moves.pop()
+
+    def _repair(self, session: _Session, depth: int = MAX_REPAIR_DEPTH, fixed: FrozenSet[int] = frozenset()) -> bool:
+        """重なるコマを別の時限に移動して、配置できなかったコマを配置する。
+
+        重なるコマが少ない時限から順に、重なるコマ（MAX_REPAIR_MOVES個まで）を取り除いてコマを配置し、
+        取り除いたコマを空いている時限に配置し直す。空いている時限がなければ、depthの深さまで
+        同じ方法で再帰的に配置し直す。配置し直せない場合は元に戻して次の時限を試す。
+
+        Args:
+            session (_Session): 配置するコマ
+            depth (int): 再帰の深さの上限
+            fixed (FrozenSet[int]): 移動しないコマ（修復中のコマ）のid
+
+        Returns:
+            bool: 配置できた場合はTrue
+        """
+        fixed = fixed | {id(session)}
+        candidates = []
+        for slot in self._open_slots(session):
+            blockers = self._blockers(session, slot)
+            if len(blockers) <= MAX_REPAIR_MOVES and not any(id(blocker) in fixed for blocker in blockers):
+                candidates.append((len(blockers), slot, blockers))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        for _, slot, blockers in candidates:
+            mark = len(self._moves)
+            for blocker in blockers:
+                self._remove(blocker)
+            self._place(session, slot)
+            for blocker in blockers:
+                if (new_slot := self._find_slot(blocker)) is not None:
+                    self._place(blocker, new_slot)
+                elif depth <= 1 or not self._repair(blocker, depth - 1, fixed):
+                    break
+            else:
+                return True
+            self._rollback(mark)
+        return False
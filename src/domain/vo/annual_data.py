@@ -1,12 +1,19 @@
-from typing import List, Dict, Optional, TypeAlias
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, TypeAlias, Union
 from pydantic import BaseModel, ConfigDict
 
+from domain.vo.id_labels import IdLabelsVo
+
+if TYPE_CHECKING:
+    from domain.vo.annual_data_index import AnnualDataIndex
+
 # 型エイリアス
-HomeroomId: TypeAlias = str
-DayOfWeek: TypeAlias = str
+# 学級・曜日・講座・教員は、年次データ生成時に整数IDへ変換される（文字列のままでも扱える）
+HomeroomId: TypeAlias = Union[int, str]
+DayOfWeek: TypeAlias = Union[int, str]
 Period: TypeAlias = int
-CourseId: TypeAlias = str
-InstructorId: TypeAlias = str
+CourseId: TypeAlias = Union[int, str]
+InstructorId: TypeAlias = Union[int, str]
 HomeroomDay: TypeAlias = Dict[DayOfWeek, List[Period]]
 AttendanceDay: TypeAlias = Dict[DayOfWeek, List[Period]]
 Lane: TypeAlias = List[CourseId]
@@ -45,6 +52,8 @@ class AnnualDataVo(BaseModel):
         course_details_dict: 講座ID -> 講座詳細リスト
         school_day_dict: 曜日 -> 学校曜日
         attendance_day_dict: 教員ID -> 勤怠曜日
+        labels: 整数ID -> 元のID の対応表（IDを変換していない場合はNone）
+        index: 年次データの索引（初回参照時に構築）
     """
     H: List[HomeroomId]
     D: List[DayOfWeek]
@@ -57,5 +66,18 @@ class AnnualDataVo(BaseModel):
     course_details_dict: Dict[CourseId, List[CourseDetailVo]]
     school_day_dict: Dict[DayOfWeek, SchoolDayVo]
     attendance_day_dict: Dict[InstructorId, AttendanceDay]
+    labels: Optional[IdLabelsVo] = None
 
     model_config = ConfigDict(frozen=True)
+
+    @cached_property
+    def index(self) -> "AnnualDataIndex":
+        """年次データの索引を取得する。初回参照時に一度だけ構築する。"""
+        from domain.vo.annual_data_index import AnnualDataIndex
+        return AnnualDataIndex.build(self)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "AnnualDataVo":
+        """複製する。内容が変わり得るため、構築済みの索引は引き継がない。"""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__dict__.pop("index", None)
+        return copied
@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING, Dict, FrozenSet, Tuple
+from pydantic import BaseModel, ConfigDict
+
+from domain.vo.annual_data import HomeroomId, DayOfWeek, Period, CourseId, InstructorId
+
+if TYPE_CHECKING:
+    from domain.vo.annual_data import AnnualDataVo
+
+
+class AnnualDataIndex(BaseModel):
+    """年次データの索引。
+
+    制約生成で繰り返し参照される対応関係を、年次データから一度だけ構築して保持する。
+
+    Attributes:
+        course_homerooms: 講座ID -> 履修学級IDタプル（Hの順序）
+        homeroom_courses: 学級ID -> 履修講座IDセット
+        instructor_courses: 教員ID -> 担当講座IDタプル（Cの順序）
+        course_instructors: 講座ID -> 担当教員IDセット
+        homeroom_day_periods: (学級ID, 曜日) -> 時限セット
+    """
+    course_homerooms: Dict[CourseId, Tuple[HomeroomId, ...]]
+    homeroom_courses: Dict[HomeroomId, FrozenSet[CourseId]]
+    instructor_courses: Dict[InstructorId, Tuple[CourseId, ...]]
+    course_instructors: Dict[CourseId, FrozenSet[InstructorId]]
+    homeroom_day_periods: Dict[Tuple[HomeroomId, DayOfWeek], FrozenSet[Period]]
+
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def build(cls, data: "AnnualDataVo") -> "AnnualDataIndex":
+        """年次データから索引を構築する。
+
+        Args:
+            data (AnnualDataVo): 年次データ
+
+        Returns:
+            AnnualDataIndex: 年次データの索引
+        """
+        homeroom_courses = {
+            h: frozenset(c for block in data.curriculum_dict.get(h, []) for lane in block for c in lane)
+            for h in data.H
+        }
+
+        course_homerooms: Dict[CourseId, list] = {c: [] for c in data.C}
+        for h in data.H:
+            for c in homeroom_courses[h]:
+                course_homerooms.setdefault(c, []).append(h)
+
+        course_instructors = {
+            c: frozenset(detail.instructor_id for detail in details)
+            for c, details in data.course_details_dict.items()
+        }
+
+        instructor_courses: Dict[InstructorId, list] = {i: [] for i in data.I}
+        for c in data.C:
+            for i in dict.fromkeys(detail.instructor_id for detail in data.course_details_dict.get(c, [])):
+                instructor_courses.setdefault(i, []).append(c)
+
+        return cls(
+            course_homerooms={c: tuple(hs) for c, hs in course_homerooms.items()},
+            homeroom_courses=homeroom_courses,
+            instructor_courses={i: tuple(cs) for i, cs in instructor_courses.items()},
+            course_instructors=course_instructors,
+            homeroom_day_periods={
+                (h, d): frozenset(periods)
+                for h, homeroom_day in data.homeroom_day_dict.items()
+                for d, periods in homeroom_day.items()
+            },
+        )
@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class ApplierProfileVo(BaseModel):
+    """制約定義クラスごとの構築の計測結果。
+
+    Attributes:
+        applier: 制約定義クラス名
+        elapsed_seconds: 適用にかかった時間（秒）
+        memory_peak_bytes: 適用中のメモリ使用量の増分のピーク（バイト）。計測しない場合はNone
+        rows: 追加した行（制約）数
+        nonzeros: 追加した非ゼロ要素数
+    """
+    applier: str
+    elapsed_seconds: float
+    memory_peak_bytes: Optional[int] = None
+    rows: int
+    nonzeros: int
+
+    model_config = ConfigDict(frozen=True)
+
+
+class BuildProfileVo(BaseModel):
+    """LPモデル構築の計測結果。
+
+    Attributes:
+        appliers: 制約定義クラスごとの計測結果（適用順）
+        variables: 変数族名 -> 変数の数（定義した変数族のみ）
+        columns: 列数（共有変数にまとめた解変数は1列として数える）
+        elapsed_seconds: 制約の適用にかかった時間の合計（秒）
+        rows: 行（制約）数の合計
+        nonzeros: 非ゼロ要素数の合計
+    """
+    appliers: List[ApplierProfileVo]
+    variables: Dict[str, int]
+    columns: int
+    elapsed_seconds: float
+    rows: int
+    nonzeros: int
+
+    model_config = ConfigDict(frozen=True)
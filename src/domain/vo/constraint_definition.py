@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from pydantic import BaseModel
 
 
@@ -6,4 +6,4 @@ class ConstraintDefinitionVo(BaseModel):
     code: str
     soft_flag: bool
     penalty_weight: Optional[float]
-    parameters: Optional[Dict[str, str]]
+    parameters: Optional[Dict[str, Union[str, int]]]
@@ -0,0 +1,22 @@
+from typing import List
+from pydantic import BaseModel, ConfigDict
+
+
+class IdLabelsVo(BaseModel):
+    """整数IDの対応表。
+
+    年次データのIDは、生成時に0始まりの連番に変換される。
+    各リストは 整数ID -> 元のID を表す。
+
+    Attributes:
+        homerooms: 学級ID
+        days: 曜日
+        courses: 講座ID
+        instructors: 教員ID
+    """
+    homerooms: List[str]
+    days: List[str]
+    courses: List[str]
+    instructors: List[str]
+
+    model_config = ConfigDict(frozen=True)
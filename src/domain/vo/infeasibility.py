@@ -0,0 +1,30 @@
+from typing import List
+from pydantic import BaseModel, ConfigDict
+
+from common.constants import InfeasibilityKind
+from domain.vo.annual_data import CourseId, HomeroomId, InstructorId
+
+
+class InfeasibilityVo(BaseModel):
+    """求解する前に分かる、必須制約を満たせない入力の矛盾。
+
+    Attributes:
+        kind: 矛盾の種類
+            - HOMEROOM_PERIODS: 学級の時限数に対して、カリキュラムの単位数が足りない（埋まらない時限が残る）
+            - COURSE_CREDITS: 講座の単位数が、学級で開講できる時限数を超える
+            - BLOCK_LANES: ブロックのレーンどうしで単位数の合計が異なる
+            - INSTRUCTOR_LOAD: 教員の担当講座の単位数の合計が、出勤している時限数を超える
+        homerooms: 関係する学級IDリスト
+        courses: 関係する講座IDリスト
+        instructors: 関係する教員IDリスト
+        required: 必要なコマ数（BLOCK_LANESの場合はレーンの単位数の最大値）
+        available: 使えるコマ数（BLOCK_LANESの場合はレーンの単位数の最小値）
+    """
+    kind: InfeasibilityKind
+    homerooms: List[HomeroomId] = []
+    courses: List[CourseId] = []
+    instructors: List[InstructorId] = []
+    required: int
+    available: int
+
+    model_config = ConfigDict(frozen=True)
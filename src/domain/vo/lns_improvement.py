@@ -0,0 +1,21 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+from common.constants import LnsNeighbourhood
+
+
+class LnsImprovementVo(BaseModel):
+    """LNSで最良解が改善した時点の記録（改善曲線の1点）。
+
+    Attributes:
+        iteration: 部分問題を解いた回数（初期解は0）
+        elapsed_seconds: 探索開始からの経過時間（秒）
+        objective: 最良解の目的関数値
+        neighbourhood: 改善した部分問題の近傍の種類。初期解の場合はNone
+    """
+    iteration: int
+    elapsed_seconds: float
+    objective: float
+    neighbourhood: Optional[LnsNeighbourhood] = None
+
+    model_config = ConfigDict(frozen=True)
@@ -0,0 +1,25 @@
+from typing import Optional, Tuple
+from pydantic import BaseModel, ConfigDict
+
+from common.constants import DEFAULT_LNS_SUB_TIME_LIMIT, LnsNeighbourhood
+
+
+class LnsSettingsVo(BaseModel):
+    """LNS（大近傍探索）の設定。
+
+    Attributes:
+        time_limit: 探索全体のタイムリミット（秒）。これを過ぎたら、それまでの最良解を返す
+        sub_time_limit: 部分問題1回あたりのタイムリミット（秒）
+        neighbourhoods: 順に使う近傍の種類（1日 / 学級群 / 教員の担当講座）
+        homerooms: 学級群の近傍で解放する学級数
+        instructors: 教員の近傍で解放する教員数
+        seed: 近傍を選ぶ乱数シード
+    """
+    time_limit: float
+    sub_time_limit: float = DEFAULT_LNS_SUB_TIME_LIMIT
+    neighbourhoods: Tuple[LnsNeighbourhood, ...] = tuple(LnsNeighbourhood)
+    homerooms: int = 4
+    instructors: int = 3
+    seed: Optional[int] = None
+
+    model_config = ConfigDict(frozen=True)
@@ -0,0 +1,25 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class SolveProgressVo(BaseModel):
+    """求解中の進捗。
+
+    Attributes:
+        elapsed_seconds: 求解開始からの経過時間（秒）
+        objective: 暫定解の目的関数値。暫定解がない場合はNone
+        bound: 目的関数値の下界（最小化問題の場合）。取得できない場合はNone
+        gap: 相対ギャップ |objective - bound| / |objective|。計算できない場合はNone
+        nodes: 探索済みの分枝限定法のノード数。取得できない場合はNone
+        backend: 解いているソルバーの種類
+        values: 列インデックス -> 暫定解の値。新しい暫定解が見つかった時点の通知のみ設定される
+    """
+    elapsed_seconds: float
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    gap: Optional[float] = None
+    nodes: Optional[int] = None
+    backend: Optional[str] = None
+    values: Optional[List[float]] = None
+
+    model_config = ConfigDict(frozen=True)
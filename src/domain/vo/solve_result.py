@@ -0,0 +1,50 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+from common.constants import SolveStatus
+from domain.vo.lns_improvement import LnsImprovementVo
+
+
+class SolveResultVo(BaseModel):
+    """求解結果の要約。
+
+    Attributes:
+        status: 求解ステータス。FEASIBLEは時間制限などで打ち切られたが実行可能解が得られたことを表す。
+            INCOMPLETEは求解せずに解の初期値を解とし、満たさない制約があることを表す
+        objective: 得られた解の目的関数値。解がない場合はNone
+        bound: 目的関数値の下界（最小化問題の場合）。ソルバーから取得できない場合はNone
+        gap: 相対ギャップ |objective - bound| / |objective|。計算できない場合はNone
+        elapsed_seconds: 求解にかかった時間（秒）
+        build_seconds: 制約の適用にかかった時間（秒）
+        backend: 解いたソルバーの種類（フォールバックした場合は代わりのソルバー）
+        unsatisfied_rows: 満たさない制約行の数（求解せずに解の初期値を解とした場合のみ）
+        improvements: 最良解が改善した時点の記録（LNSの場合のみ）
+    """
+    status: SolveStatus
+    objective: Optional[float] = None
+    bound: Optional[float] = None
+    gap: Optional[float] = None
+    elapsed_seconds: float
+    build_seconds: Optional[float] = None
+    backend: Optional[str] = None
+    unsatisfied_rows: Optional[int] = None
+    improvements: Optional[List[LnsImprovementVo]] = None
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def has_solution(self) -> bool:
+        """解（最適解または実行可能解）が得られたかどうか"""
+        return self.status in (SolveStatus.OPTIMAL, SolveStatus.FEASIBLE)
+
+
+def relative_gap(objective: Optional[float], bound: Optional[float]) -> Optional[float]:
+    """相対ギャップ |objective - bound| / |objective| を計算する（Gurobiの定義に合わせる）。"""
+    if objective is None or bound is None:
+        return None
+    if abs(objective - bound) <= 1e-9:
+        return 0.0
+    if abs(objective) <= 1e-9:
+        # 目的関数値が0でギャップが残っている場合は定義できない
+        return None
+    return abs(objective - bound) / abs(objective)
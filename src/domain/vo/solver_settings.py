@@ -0,0 +1,27 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+from common.constants import SolverEmphasis
+
+
+class SolverSettingsVo(BaseModel):
+    """ソルバーの設定。
+
+    Noneの項目はソルバーの既定値を使う。ソルバー固有のパラメータへの変換はinfrastructure層で行う。
+
+    Attributes:
+        time_limit: タイムリミット（秒）
+        mip_gap: 相対ギャップの許容値。これ以下になったら打ち切る
+        mip_gap_abs: 絶対ギャップの許容値。これ以下になったら打ち切る
+        threads: スレッド数
+        seed: 乱数シード
+        emphasis: 探索の重点（実行可能解の発見 / 最適性の証明 / 下界の改善）
+    """
+    time_limit: Optional[float] = None
+    mip_gap: Optional[float] = None
+    mip_gap_abs: Optional[float] = None
+    threads: Optional[int] = None
+    seed: Optional[int] = None
+    emphasis: Optional[SolverEmphasis] = None
+
+    model_config = ConfigDict(frozen=True)
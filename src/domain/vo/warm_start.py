@@ -0,0 +1,15 @@
+from typing import FrozenSet, Tuple
+from pydantic import BaseModel, ConfigDict
+
+from domain.vo.annual_data import CourseId, DayOfWeek, HomeroomId, Period
+
+
+class WarmStartVo(BaseModel):
+    """解の初期値（MIPスタート）とする前回の時間割。
+
+    Attributes:
+        assignments: 配置されていた(学級ID, 曜日, 時限, 講座ID)の集合。LPモデルにない組は無視される
+    """
+    assignments: FrozenSet[Tuple[HomeroomId, DayOfWeek, Period, CourseId]]
+
+    model_config = ConfigDict(frozen=True)
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TtlLruCache(Generic[V]):
+    """有効期限付きのLRUキャッシュ。
+
+    件数が上限を超えた場合は最も古く参照されたエントリから、
+    有効期限を過ぎたエントリは参照時に削除する。スレッドセーフ。
+    """
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        ttl_seconds: float = 3600,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """イニシャライザ。
+
+        Args:
+            max_size (int): 最大件数
+            ttl_seconds (float): 有効期限（秒）
+            clock (Callable[[], float]): 現在時刻を返す関数
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """値を取得する。存在しない・有効期限切れの場合はNone。"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """値を格納する。上限を超えた場合は最も古く参照されたエントリを削除する。"""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """全エントリを削除する。"""
+        with self._lock:
+            self._entries.clear()
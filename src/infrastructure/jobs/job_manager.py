@@ -0,0 +1,347 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common.constants import JobStatus
+from infrastructure.jobs.process_group import detach_process_group, terminate_process_group
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """ジョブ。
+
+    Attributes:
+        job_id: ジョブID
+        status: 状態
+        submitted_at: 投入日時
+        started_at: 実行開始日時
+        finished_at: 終了日時
+        result: 実行結果（成功した場合）
+        error: エラー内容（失敗した場合）、またはキャンセルの理由（キャンセルした場合）
+        progress: 実行中に通知された最新の進捗
+        progress_seq: 進捗が通知された回数
+    """
+    job_id: str
+    status: JobStatus = JobStatus.PENDING
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+    progress: Any = None
+    progress_seq: int = 0
+
+    @property
+    def finished(self) -> bool:
+        """終了しているかどうか"""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+# 子プロセスで実行する関数。(payload, 進捗を通知する関数, キャンセルを要求されると設定されるイベント) を受け取る
+JobTarget = Callable[[Any, Callable[[Any], None], Any], Any]
+
+
+@dataclass
+class _Task:
+    job: Job
+    target: JobTarget
+    payload: Any
+    on_success: Optional[Callable[[Any], None]]
+    # キャンセルを子プロセスに伝えるイベント（multiprocessing.Event）
+    cancelled: Any
+    cancel_reason: Optional[str] = None
+    kill_timer: Optional[threading.Timer] = None
+
+
+class JobManager:
+    """ジョブを別プロセスで実行するジョブ管理クラス。
+
+    ジョブはFIFOで待機し、同時に実行するプロセス数はmax_workersまでに制限する。
+    ジョブごとにspawnで子プロセスを起動するため、APIプロセスは求解中も応答できる。
+    子プロセスが通知した進捗はパイプで受け取り、waitで待ち受けられる。
+    実行中のジョブのキャンセルは子プロセスにイベントで伝え、猶予時間内に終了しない場合は強制終了する。
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = 100, cancel_grace_seconds: float = 10.0):
+        """イニシャライザ。
+
+        Args:
+            max_workers (int): 同時に実行するプロセス数の上限
+            max_finished_jobs (int): 保持する終了済みジョブ数の上限。超えた場合は古いものから削除する
+            cancel_grace_seconds (float): キャンセルを要求してから子プロセスを強制終了するまでの猶予時間（秒）
+        """
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.cancel_grace_seconds = cancel_grace_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: "queue.Queue[Optional[_Task]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        # ジョブID -> 待機中・実行中のジョブの実行内容
+        self._active: Dict[str, _Task] = {}
+        # ジョブID -> 実行中の子プロセス
+        self._processes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # 進捗の通知・ジョブの終了を待ち受けるための条件変数
+        self._changed = threading.Condition(self._lock)
+
+    def submit(
+        self,
+        target: JobTarget,
+        payload: Any,
+        on_success: Optional[Callable[[Any], None]] = None
+    ) -> Job:
+        """ジョブを投入する。
+
+        Args:
+            target (JobTarget): 子プロセスで実行する関数（モジュールの最上位で定義し、pickle可能であること）。
+                payloadと、進捗を通知する関数（引数はpickle可能であること）と、
+                キャンセルを要求されると設定されるイベントを受け取る
+            payload (Any): targetに渡す引数（pickle可能であること）
+            on_success (Optional[Callable[[Any], None]]): 成功時にこのプロセスで呼び出す関数
+
+        Returns:
+            Job: 投入したジョブ
+        """
+        job = Job(job_id=str(uuid.uuid4()))
+        task = _Task(job, target, payload, on_success, cancelled=self._context.Event())
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._active[job.job_id] = task
+            self._start_workers()
+            snapshot = replace(job)
+        self._tasks.put(task)
+        return snapshot
+
+    def add_finished(self, result: Any) -> Job:
+        """実行せずに成功済みのジョブを登録する（キャッシュにある結果を返す場合など）。"""
+        job = Job(job_id=str(uuid.uuid4()), status=JobStatus.SUCCEEDED, result=result)
+        job.started_at = job.finished_at = job.submitted_at
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        return replace(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """ジョブの現在の状態のコピーを取得する。存在しない場合はNone。"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job is not None else None
+
+    def wait(self, job_id: str, after_seq: int, timeout: float) -> Optional[Job]:
+        """進捗が通知されるか、ジョブが終了するまで待ち、ジョブの状態のコピーを取得する。
+
+        Args:
+            job_id (str): ジョブID
+            after_seq (int): 受け取り済みの進捗の通知回数。これより後の通知を待つ
+            timeout (float): 待つ時間の上限（秒）。超えた場合はその時点の状態を返す
+
+        Returns:
+            Optional[Job]: ジョブの状態のコピー。存在しない場合はNone
+        """
+        def changed() -> bool:
+            job = self._jobs.get(job_id)
+            return job is None or job.finished or job.progress_seq > after_seq
+
+        with self._changed:
+            self._changed.wait_for(changed, timeout)
+            job = self._jobs.get(job_id)
+            return replace(job) if job is not None else None
+
+    def cancel(self, job_id: str, reason: str) -> Optional[Job]:
+        """ジョブをキャンセルする。
+
+        待機中のジョブはすぐにCANCELLEDになる。実行中のジョブは子プロセスに求解の中断を要求し、
+        子プロセスが終了した時点でCANCELLEDになる（中断前に成功した場合はSUCCEEDEDのまま）。
+        cancel_grace_seconds以内に終了しない場合は子プロセスを強制終了する。
+        終了済みのジョブは何もしない。
+
+        Args:
+            job_id (str): ジョブID
+            reason (str): キャンセルの理由（ログとジョブのerrorに記録する）
+
+        Returns:
+            Optional[Job]: ジョブの状態のコピー。存在しない場合はNone
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            task = self._active.get(job_id)
+            if task is None or task.cancel_reason is not None:
+                return replace(job)
+            task.cancel_reason = reason
+            if job.status == JobStatus.PENDING:
+                self._finish(task, JobStatus.CANCELLED, error=reason)
+            else:
+                task.cancelled.set()
+                if (process := self._processes.get(job_id)) is not None:
+                    self._schedule_kill(task, process)
+            snapshot = replace(job)
+        logger.info(
+            "ジョブのキャンセルを要求しました",
+            extra={"job_id": job_id, "job_status": snapshot.status.value, "cancel_reason": reason}
+        )
+        return snapshot
+
+    def shutdown(self) -> None:
+        """ワーカーを終了する。
+
+        待機中のジョブは実行せず、実行中のジョブの子プロセスは強制終了する（FAILEDになる）。
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+            processes = list(self._processes.values())
+        while True:
+            try:
+                self._tasks.get_nowait()
+            except queue.Empty:
+                break
+        for _ in workers:
+            self._tasks.put(None)
+        for process in processes:
+            terminate_process_group(process)
+        for worker in workers:
+            worker.join()
+
+    def _start_workers(self) -> None:
+        """ワーカースレッドを起動する（初回の投入時のみ）。"""
+        if self._workers:
+            return
+        for n in range(self.max_workers):
+            worker = threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self) -> None:
+        """待機中のジョブを1つずつ子プロセスで実行する。"""
+        while (task := self._tasks.get()) is not None:
+            job = task.job
+            with self._lock:
+                if job.status == JobStatus.CANCELLED:
+                    # 待機中にキャンセルされた
+                    continue
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.now(timezone.utc)
+
+            ok, value = self._run_process(task)
+
+            if ok and task.on_success is not None:
+                try:
+                    task.on_success(value)
+                except Exception:
+                    logger.exception("ジョブの完了処理に失敗しました", extra={"job_id": job.job_id})
+            with self._lock:
+                if ok:
+                    self._finish(task, JobStatus.SUCCEEDED, result=value)
+                elif task.cancel_reason is not None:
+                    self._finish(task, JobStatus.CANCELLED, error=task.cancel_reason)
+                else:
+                    self._finish(task, JobStatus.FAILED, error=value)
+            logger.info(
+                "ジョブが終了しました",
+                extra={
+                    "job_id": job.job_id,
+                    "job_status": job.status.value,
+                    "cancel_reason": task.cancel_reason,
+                    "elapsed_seconds": (job.finished_at - job.started_at).total_seconds(),
+                }
+            )
+
+    def _finish(self, task: _Task, status: JobStatus, result: Any = None, error: Optional[str] = None) -> None:
+        """ジョブを終了済みにし、待ち受けているスレッドに知らせる（ロックを取得して呼び出す）。"""
+        job = task.job
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        if job.started_at is None:
+            job.started_at = job.finished_at
+        if task.kill_timer is not None:
+            task.kill_timer.cancel()
+        del self._active[job.job_id]
+        self._evict_finished()
+        self._changed.notify_all()
+
+    def _schedule_kill(self, task: _Task, process: Any) -> None:
+        """猶予時間が過ぎても子プロセスが終了していなければ、強制終了する（ロックを取得して呼び出す）。"""
+        task.kill_timer = threading.Timer(self.cancel_grace_seconds, terminate_process_group, args=(process,))
+        task.kill_timer.daemon = True
+        task.kill_timer.start()
+
+    def _run_process(self, task: _Task) -> Tuple[bool, Any]:
+        """子プロセスでジョブを実行し、(成功したかどうか, 結果またはエラー内容) を返す。"""
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_run_in_process, args=(task.target, task.payload, sender, task.cancelled), daemon=True
+        )
+        process.start()
+        with self._lock:
+            self._processes[task.job.job_id] = process
+            if task.cancel_reason is not None:
+                # 子プロセスの起動中にキャンセルされた
+                self._schedule_kill(task, process)
+        sender.close()
+        try:
+            while (message := receiver.recv())[0] == "progress":
+                self._set_progress(task.job, message[1])
+            _, ok, value = message
+        except EOFError:
+            # 結果を送る前に子プロセスが終了した（メモリ不足で強制終了された場合など）
+            process.join()
+            ok, value = False, f"ワーカープロセスが異常終了しました（終了コード: {process.exitcode}）"
+        finally:
+            receiver.close()
+            process.join()
+            with self._lock:
+                del self._processes[task.job.job_id]
+        return ok, value
+
+    def _set_progress(self, job: Job, progress: Any) -> None:
+        """子プロセスから受け取った進捗を記録し、待ち受けているスレッドに知らせる。"""
+        with self._lock:
+            job.progress = progress
+            job.progress_seq += 1
+            self._changed.notify_all()
+
+    def _evict_finished(self) -> None:
+        """終了済みジョブが上限を超えた場合、古いものから削除する。"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+            del self._jobs[job_id]
+
+
+def _run_in_process(target: JobTarget, payload: Any, sender: Any, cancelled: Any) -> None:
+    """子プロセスでtargetを実行し、進捗と結果をパイプで返す。
+
+    進捗は ("progress", 進捗)、結果は ("done", 成功したかどうか, 結果またはエラー内容) として送る。
+    """
+    # 強制終了する場合に、ソルバーのプロセスもまとめて終了できるようにする
+    detach_process_group()
+    # 進捗はソルバーのスレッドから通知される場合があるため、送信を直列化する
+    lock = threading.Lock()
+
+    def send(message: Tuple[Any, ...]) -> None:
+        with lock:
+            sender.send(message)
+
+    try:
+        result = target(payload, lambda progress: send(("progress", progress)), cancelled)
+    except Exception as e:
+        send(("done", False, f"{type(e).__name__}: {e}"))
+        # キャンセルによる中断は、親プロセスでキャンセルの理由とともにログ出力する
+        if not cancelled.is_set():
+            logger.error("ジョブの実行に失敗しました", extra={"traceback": traceback.format_exc()})
+    else:
+        send(("done", True, result))
+    finally:
+        sender.close()
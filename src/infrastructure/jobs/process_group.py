@@ -0,0 +1,31 @@
+import os
+import signal
+from typing import Any
+
+
+def detach_process_group() -> None:
+    """このプロセスを新しいプロセスグループの先頭にする（子プロセスの開始時に呼び出す）。
+
+    terminate_process_groupで、このプロセスが起動したソルバーのプロセス（CBCなど）もまとめて終了できるようにする。
+    プロセスグループに対応していない環境では何もしない。
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+
+def terminate_process_group(process: Any) -> None:
+    """子プロセスを、その子プロセスが起動したプロセスとともに終了する。
+
+    子プロセスがまだdetach_process_groupを呼び出していない場合や、
+    プロセスグループに対応していない環境では、子プロセスのみ終了する。
+
+    Args:
+        process (Any): multiprocessingのプロセス
+    """
+    if hasattr(os, "killpg") and process.pid is not None:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            return
+        except ProcessLookupError:
+            pass
+    process.terminate()
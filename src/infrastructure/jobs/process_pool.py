@@ -0,0 +1,161 @@
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from domain.exceptions.exceptions import OptimizationCancelledError
+from infrastructure.jobs.process_group import detach_process_group, terminate_process_group
+
+logger = logging.getLogger(__name__)
+
+# 子プロセスで実行する関数。最後の引数に、進捗を親プロセスに送る関数を受け取る
+PoolTarget = Callable[..., Any]
+
+
+class ProcessPool:
+    """関数を別プロセスで並列に実行するプール。
+
+    同時に実行するプロセス数をmax_workersに制限し、結果を引数の順に返す。
+    子プロセスの進捗は ("progress", 進捗)、結果は ("done", 成功したかどうか, 結果または例外) としてパイプで受け取る。
+    cancelで実行中のプロセスを、そのプロセスが起動したソルバーのプロセスとともに終了する。
+    """
+
+    def __init__(self, max_workers: int):
+        """イニシャライザ。
+
+        Args:
+            max_workers (int): 同時に実行するプロセス数の上限
+        """
+        self.max_workers = max_workers
+        # 実行を中断した理由。中断していない場合はNone
+        self.cancel_reason: Optional[str] = None
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._processes: Dict[Any, Any] = {}
+
+    @property
+    def available(self) -> bool:
+        """別プロセスで並列に実行できるかどうか。
+
+        プロセス数の上限が1以下の場合と、このプロセス自体がデーモンプロセス（ジョブのワーカーなど）で
+        子プロセスを起動できない場合はFalse。
+        """
+        return self.max_workers > 1 and not multiprocessing.current_process().daemon
+
+    def map(
+        self,
+        target: PoolTarget,
+        args_list: List[Tuple[Any, ...]],
+        on_progress: Optional[Callable[[int, Any], None]] = None
+    ) -> List[Any]:
+        """targetを引数ごとに別プロセスで実行し、結果を引数の順に返す。
+
+        いずれかのプロセスが失敗した場合は、他のプロセスを終了して、その例外を送出する。
+
+        Args:
+            target (PoolTarget): 実行する関数（子プロセスに渡すため、モジュールのトップレベルで定義すること）
+            args_list (List[Tuple[Any, ...]]): 引数のリスト
+            on_progress (Optional[Callable[[int, Any], None]]): (引数の番号, 進捗) を受け取る関数
+
+        Returns:
+            List[Any]: 引数の順の結果
+
+        Raises:
+            OptimizationCancelledError: cancelで中断された場合
+        """
+        results: List[Any] = [None] * len(args_list)
+        pending: Deque[Tuple[int, Tuple[Any, ...]]] = deque(enumerate(args_list))
+        indices: Dict[Any, int] = {}
+        try:
+            while pending or indices:
+                with self._lock:
+                    self._raise_if_cancelled()
+                    while pending and len(indices) < self.max_workers:
+                        index, args = pending.popleft()
+                        receiver, sender = self._context.Pipe(duplex=False)
+                        process = self._context.Process(target=_run, args=(target, args, sender), daemon=True)
+                        process.start()
+                        sender.close()
+                        self._processes[receiver] = process
+                        indices[receiver] = index
+                for receiver in wait(list(indices)):
+                    try:
+                        message = receiver.recv()
+                    except EOFError:
+                        # 結果を送る前に子プロセスが終了した（cancelで終了した場合、メモリ不足の場合など）
+                        self._raise_if_cancelled()
+                        raise RuntimeError(
+                            f"ワーカープロセスが異常終了しました（終了コード: {self._finish(receiver).exitcode}）"
+                        )
+                    if message[0] == "progress":
+                        if on_progress is not None:
+                            on_progress(indices[receiver], message[1])
+                        continue
+                    _, ok, value = message
+                    index = indices.pop(receiver)
+                    self._finish(receiver)
+                    if not ok:
+                        raise value
+                    results[index] = value
+        finally:
+            with self._lock:
+                processes = list(self._processes.items())
+            for receiver, process in processes:
+                if process.is_alive():
+                    terminate_process_group(process)
+                self._finish(receiver)
+        return results
+
+    def cancel(self, reason: str) -> None:
+        """実行を中断する（mapを呼び出したスレッドとは別のスレッドから呼び出す）。
+
+        Args:
+            reason (str): 中断する理由
+        """
+        with self._lock:
+            self.cancel_reason = reason
+            processes = list(self._processes.values())
+        for process in processes:
+            if process.is_alive():
+                terminate_process_group(process)
+
+    def _finish(self, receiver: Any) -> Any:
+        """終了したプロセスを回収する。"""
+        with self._lock:
+            process = self._processes.pop(receiver, None)
+        receiver.close()
+        if process is not None:
+            process.join()
+        return process
+
+    def _raise_if_cancelled(self) -> None:
+        if self.cancel_reason is not None:
+            raise OptimizationCancelledError(self.cancel_reason)
+
+
+def create_process_pool() -> ProcessPool:
+    """環境変数DECOMPOSITION_WORKERS（既定値はCPU数）をプロセス数の上限とするプールを生成する。"""
+    return ProcessPool(max_workers=int(os.getenv("DECOMPOSITION_WORKERS", str(os.cpu_count() or 1))))
+
+
+def _run(target: PoolTarget, args: Tuple[Any, ...], sender: Any) -> None:
+    """子プロセスでtargetを実行し、進捗と結果をパイプで返す。"""
+    # 終了する場合に、ソルバーのプロセス（CBCなど）もまとめて終了できるようにする
+    detach_process_group()
+    # 進捗はソルバーのスレッドから通知される場合があるため、送信を直列化する
+    lock = threading.Lock()
+
+    def send(message: Tuple[Any, ...]) -> None:
+        with lock:
+            sender.send(message)
+
+    try:
+        result = target(*args, lambda progress: send(("progress", progress)))
+        send(("done", True, result))
+    except Exception as e:
+        send(("done", False, e))
+    finally:
+        sender.close()
@@ -1,32 +1,252 @@
+import contextlib
 import os
-from typing import Any
+import re
+import subprocess
+import tempfile
+import threading
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional
 import pulp
 from dotenv import load_dotenv
 
+from common.constants import DEFAULT_TIME_LIMIT, SolverBackend, SolverEmphasis
 from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import MatrixSolution
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.progress_reporter import ProgressReporter, create_reporter
 
 load_dotenv()
 
+# ログファイルを読み進める間隔（秒）
+LOG_POLL_INTERVAL_SECONDS = 0.2
+
+# 例: Cbc0012I Integer solution of 26 found by feasibility pump after 0 iterations and 0 nodes (0.05 seconds)
+_INTEGER_SOLUTION = re.compile(
+    r"Integer solution of (\S+) found .*after \d+ iterations and (\d+) nodes \(([\d.]+) seconds\)"
+)
+# 例: Cbc0010I After 1000 nodes, 6 on tree, 26 best solution, best possible 20.5 (0.51 seconds)
+_NODE_PROGRESS = re.compile(
+    r"After (\d+) nodes, \d+ on tree, (\S+) best solution, best possible (\S+) \(([\d.]+) seconds\)"
+)
+# 例: Lower bound:                    20.500（最適性を証明せずに終了した場合の、結果の要約の行）
+_FINAL_BOUND = re.compile(r"^Lower bound:\s+(\S+)")
+
 
 class CbcSolver(SolverInterface):
     """CBCソルバーの実装。
 
     infrastructure層でCBCの具体的な設定と初期化を行う。
+    環境変数CBC_PATHが未設定の場合は、PuLPに同梱のCBCを使う。
     """
 
-    def __init__(self, time_limit: int = 1200):
+    backend = SolverBackend.CBC.value
+
+    def __init__(self, settings: Optional[SolverSettingsVo] = None):
         """イニシャライザ。
 
         Args:
-            time_limit (int): ソルバーのタイムリミット（秒）
+            settings (Optional[SolverSettingsVo]): ソルバーの設定。タイムリミットの既定値はDEFAULT_TIME_LIMIT
         """
         self.cbc_path = os.getenv("CBC_PATH")
-        self.time_limit = time_limit
+        self.settings = settings or SolverSettingsVo()
 
-    def get_solver(self) -> Any:
+    def get_solver(
+        self,
+        log_path: Optional[str] = None,
+        on_start: Optional[Callable[[subprocess.Popen], None]] = None
+    ) -> Any:
         """CBCソルバーインスタンスを取得する。
 
+        Args:
+            log_path (Optional[str]): CBCのログの出力先。Noneの場合は出力しない
+            on_start (Optional[Callable[[subprocess.Popen], None]]): CBCのプロセスを起動したときに呼び出す関数
+
         Returns:
-            pulp.COIN_CMD: CBCソルバーインスタンス
+            CbcCommand: CBCソルバーインスタンス
         """
-        return pulp.COIN_CMD(timeLimit=self.time_limit, path=self.cbc_path)
+        options = to_cbc_options(self.settings)
+        if log_path is not None:
+            # ログは標準出力ではなくファイルに出力する
+            options.update(msg=False, logPath=log_path)
+        if self.warm_start:
+            # 値が設定されたPuLP変数を初期値としてCBCに渡す
+            options.update(warmStart=True)
+        return CbcCommand(path=self.cbc_path or pulp.PULP_CBC_CMD.pulp_cbc_path, on_start=on_start, **options)
+
+    def solve_problem(self, problem: pulp.LpProblem) -> MatrixSolution:
+        """PuLPの問題をCBCで解く。
+
+        CBCのログはファイルに出力し、別スレッドで読み進めて進捗を通知する（ログに含まれないため、暫定解の値は含めない）。
+        最適性を証明せずに終了した場合（タイムリミットなど）は、ログの結果の要約にある下界をboundとして返す。
+        cancelで中断された場合は、CBCのプロセスを終了する（PuLPがPulpSolverErrorを送出する）。
+        """
+        processes: List[subprocess.Popen] = []
+
+        def on_start(process: subprocess.Popen) -> None:
+            processes.append(process)
+            if self.cancel_reason is not None:
+                process.terminate()
+
+        def interrupt() -> None:
+            for process in processes:
+                process.terminate()
+
+        # CBCのログの目的関数値・下界は、目的関数の定数項を含まない
+        offset = problem.objective.constant if problem.objective is not None else 0.0
+        reporter = create_reporter(self.progress, self.backend)
+        with self.interruptible(interrupt), tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "cbc.log")
+            open(log_path, "w").close()
+            problem.setSolver(self.get_solver(log_path, on_start))
+            with CbcLogMonitor(log_path, reporter, objective_offset=offset) as monitor:
+                solution = super().solve_problem(problem)
+        if problem.sense == pulp.LpMinimize and solution.sol_status == pulp.LpSolutionIntegerFeasible:
+            solution = replace(solution, bound=monitor.final_bound)
+        return solution
+
+
+class CbcCommand(pulp.COIN_CMD):
+    """起動したCBCのプロセスをon_startに渡すpulp.COIN_CMD。
+
+    PuLPはCBCのプロセスを公開しないため、solve_CBCをオーバーライドしてCBCのプロセスを自分で起動する。
+    MPS形式の書き出しと解ファイルの読み込みはPuLPのメソッドを使い、コマンドライン引数はCbcSolverが渡す
+    オプション（タイムリミット・ギャップ・スレッド数・options・初期値・ログファイル）から組み立てる。
+    """
+
+    def __init__(self, *args: Any, on_start: Optional[Callable[[subprocess.Popen], None]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.on_start = on_start
+
+    def solve_CBC(self, lp: pulp.LpProblem, use_mps: bool = True) -> int:
+        """CBCのプロセスを起動して問題を解き、解をPuLPの問題に書き戻す。"""
+        if not self.executable(self.path):
+            raise pulp.PulpSolverError(f"Pulp: cannot execute {self.path} cwd: {os.getcwd()}")
+        tmp_mps, tmp_sol, tmp_mst = self.create_tmp_files(lp.name, "mps", "sol", "mst")
+        variables, variable_names, constraint_names, _ = lp.writeMPS(tmp_mps, rename=1)
+        args = [self.path, tmp_mps]
+        if lp.sense == pulp.LpMaximize:
+            args.append("-max")
+        if self.optionsDict.get("warmStart", False):
+            self.writesol(tmp_mst, lp, variables, variable_names, constraint_names)
+            args += ["-mips", tmp_mst]
+        if self.timeLimit is not None:
+            args += ["-sec", str(self.timeLimit)]
+        for option in self.options + self.getOptions():
+            args += f"-{option}".split()
+        args += ["-branch" if self.mip else "-initialSolve", "-printingOptions", "all", "-solution", tmp_sol]
+
+        log_path = self.optionsDict.get("logPath")
+        with contextlib.ExitStack() as stack:
+            # ログファイルを指定しない場合、msgがTrueなら標準出力に出力し、Falseなら破棄する
+            pipe = None if self.msg and not log_path else stack.enter_context(open(log_path or os.devnull, "w"))
+            process = subprocess.Popen(args, stdout=pipe, stderr=pipe, stdin=subprocess.DEVNULL)
+            if self.on_start is not None:
+                self.on_start(process)
+            if process.wait() != 0:
+                raise pulp.PulpSolverError(f"Pulp: Error while trying to execute {self.path}")
+        if not os.path.exists(tmp_sol):
+            raise pulp.PulpSolverError(f"Pulp: Error while executing {self.path}")
+
+        status, values, reduced_costs, shadow_prices, slacks, sol_status = self.readsol_MPS(
+            tmp_sol, lp, variables, variable_names, constraint_names
+        )
+        lp.assignVarsVals(values)
+        lp.assignVarsDj(reduced_costs)
+        lp.assignConsPi(shadow_prices)
+        lp.assignConsSlack(slacks, activity=True)
+        lp.assignStatus(status, sol_status)
+        self.delete_tmp_files(tmp_mps, tmp_sol, tmp_mst)
+        return status
+
+
+class CbcLogMonitor:
+    """CBCのログファイルを別スレッドで読み進め、進捗を通知するクラス。
+
+    ログの目的関数値・下界にはobjective_offset（目的関数の定数項）を加える。
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        reporter: Optional[ProgressReporter],
+        poll_interval: float = LOG_POLL_INTERVAL_SECONDS,
+        objective_offset: float = 0.0
+    ):
+        """イニシャライザ。
+
+        Args:
+            log_path (str): CBCのログファイルのパス
+            reporter (Optional[ProgressReporter]): 進捗の通知先。Noneの場合は通知しない
+            poll_interval (float): ログファイルを読み進める間隔（秒）
+            objective_offset (float): 目的関数の定数項
+        """
+        self.log_path = log_path
+        self.reporter = reporter
+        self.poll_interval = poll_interval
+        self.objective_offset = objective_offset
+        # 結果の要約にある下界。最適性を証明せずに終了した場合のみ設定される
+        self.final_bound: Optional[float] = None
+        self._bound: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._follow, name="cbc-log-monitor", daemon=True)
+
+    def __enter__(self) -> "CbcLogMonitor":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def parse_line(self, line: str) -> None:
+        """ログの1行を解釈し、進捗を表す行であれば通知する。結果の要約の下界はfinal_boundに記録する。"""
+        if (m := _FINAL_BOUND.search(line)) is not None:
+            self.final_bound = float(m.group(1)) + self.objective_offset
+        elif (m := _NODE_PROGRESS.search(line)) is not None:
+            nodes, objective, bound, seconds = m.groups()
+            self._bound = float(bound) + self.objective_offset
+            self._report(float(seconds), float(objective), int(nodes))
+        elif (m := _INTEGER_SOLUTION.search(line)) is not None:
+            objective, nodes, seconds = m.groups()
+            self._report(float(seconds), float(objective), int(nodes), force=True)
+
+    def _report(self, seconds: float, objective: float, nodes: int, force: bool = False) -> None:
+        if self.reporter is not None:
+            self.reporter.report(
+                seconds, objective=objective + self.objective_offset, bound=self._bound, nodes=nodes, force=force
+            )
+
+    def _follow(self) -> None:
+        """求解が終わるまで、ログファイルに追記された行を読み進める。
+
+        停止後にもう一度読み進め、最後の改行のない行を含めて残りの行を解釈する。
+        """
+        pending = ""
+        with open(self.log_path) as f:
+            while not self._stop.wait(self.poll_interval):
+                pending += f.read()
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    self.parse_line(line)
+            for line in (pending + f.read()).split("\n"):
+                self.parse_line(line)
+
+
+def to_cbc_options(settings: SolverSettingsVo) -> Dict[str, Any]:
+    """ソルバーの設定をpulp.COIN_CMDの引数に変換する。
+
+    CBCには探索の重点を切り替えるパラメータがないため、FEASIBILITYの場合のみ
+    Feasibility Pumpを有効にし、それ以外の重点は無視する。
+    """
+    options: List[str] = []
+    if settings.seed is not None:
+        options += [f"randomSeed {settings.seed}", f"randomCbcSeed {settings.seed}"]
+    if settings.emphasis == SolverEmphasis.FEASIBILITY:
+        options.append("feasibilityPump on")
+    return {
+        "timeLimit": settings.time_limit if settings.time_limit is not None else DEFAULT_TIME_LIMIT,
+        "gapRel": settings.mip_gap,
+        "gapAbs": settings.mip_gap_abs,
+        "threads": settings.threads,
+        "options": options,
+    }
@@ -0,0 +1,85 @@
+import logging
+from dataclasses import replace
+from typing import Any, Callable, Optional
+import pulp
+
+from domain.exceptions.exceptions import SolverUnavailableError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from domain.vo.solve_progress import SolveProgressVo
+
+logger = logging.getLogger(__name__)
+
+
+class FallbackSolver(SolverInterface):
+    """ソルバーを利用できない場合に、代わりのソルバーで解くソルバーの実装。
+
+    主ソルバーがSolverUnavailableErrorを送出した場合（Gurobiのライセンスを取得できない場合など）に、
+    同じ問題を代わりのソルバーで解き直す。
+    """
+
+    def __init__(self, primary: SolverInterface, fallback: SolverInterface):
+        """イニシャライザ。
+
+        Args:
+            primary (SolverInterface): 主ソルバー
+            fallback (SolverInterface): 代わりのソルバー
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.backend = primary.backend
+        # 行列形式は両方のソルバーが直接解ける場合のみ使う
+        self.supports_matrix = primary.supports_matrix and fallback.supports_matrix
+
+    @property
+    def progress(self) -> Optional[Callable[[SolveProgressVo], None]]:
+        """求解中の進捗を受け取る関数（主ソルバーと代わりのソルバーの両方に設定する）。"""
+        return self.primary.progress
+
+    @progress.setter
+    def progress(self, callback: Optional[Callable[[SolveProgressVo], None]]) -> None:
+        self.primary.progress = callback
+        self.fallback.progress = callback
+
+    @property
+    def warm_start(self) -> bool:
+        """PuLP変数の値を解の初期値として渡すかどうか（主ソルバーと代わりのソルバーの両方に設定する）。"""
+        return self.primary.warm_start
+
+    @warm_start.setter
+    def warm_start(self, enabled: bool) -> None:
+        self.primary.warm_start = enabled
+        self.fallback.warm_start = enabled
+
+    def cancel(self, reason: str) -> None:
+        """主ソルバーと代わりのソルバーの両方の求解を中断する。"""
+        super().cancel(reason)
+        self.primary.cancel(reason)
+        self.fallback.cancel(reason)
+
+    def get_solver(self) -> Any:
+        """主ソルバーのソルバーインスタンスを取得する。"""
+        return self.primary.get_solver()
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式の問題を主ソルバーで解く。利用できない場合は代わりのソルバーで解く。"""
+        try:
+            return self.primary.solve_matrix(matrix)
+        except SolverUnavailableError as e:
+            self._log_fallback(e)
+        return replace(self.fallback.solve_matrix(matrix), backend=self.fallback.backend)
+
+    def solve_problem(self, problem: pulp.LpProblem) -> MatrixSolution:
+        """PuLPの問題を主ソルバーで解く。利用できない場合は代わりのソルバーで解く。"""
+        try:
+            return self.primary.solve_problem(problem)
+        except SolverUnavailableError as e:
+            self._log_fallback(e)
+        problem.setSolver(self.fallback.get_solver())
+        return replace(self.fallback.solve_problem(problem), backend=self.fallback.backend)
+
+    def _log_fallback(self, error: SolverUnavailableError) -> None:
+        logger.warning(
+            "ソルバーを利用できないため、代わりのソルバーで解きます",
+            extra={"backend": self.primary.backend, "fallback": self.fallback.backend, "reason": str(error)}
+        )
@@ -0,0 +1,146 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple
+import gurobipy as gp
+from gurobipy import GRB
+
+from common.constants import SolverBackend
+from domain.exceptions.exceptions import SolverUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# 環境が使えなくなったことを表すエラーコード（この場合は返却時に破棄する）
+BROKEN_ENV_ERRORS = frozenset({
+    GRB.Error.NO_LICENSE,
+    GRB.Error.NETWORK,
+    GRB.Error.JOB_REJECTED,
+    GRB.Error.CLOUD,
+})
+
+
+class GurobiEnvPool:
+    """Gurobiの環境（gp.Env）を使い回すプール。
+
+    環境の開始にはライセンスの認証（WLSの場合は通信）を伴うため、求解ごとに作り直さず貸し出す。
+    同時に存在する環境の数はmax_sizeまでに制限する（ライセンスのシート数に合わせる）。
+    環境は必要になったときに作成し、貸し出す前に使えるかどうかを確認して、使えなければ作り直す。
+    """
+
+    def __init__(self, options: Dict[str, Any], max_size: int = 2, timeout: float = 60.0):
+        """イニシャライザ。
+
+        Args:
+            options (Dict[str, Any]): 環境のパラメータ（ライセンス情報など）
+            max_size (int): 同時に存在する環境の数の上限
+            timeout (float): すべての環境が貸し出し中の場合に、返却を待つ時間（秒）
+        """
+        self.options = options
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: List[gp.Env] = []
+        # 作成済みの環境の数（貸し出し中を含む）
+        self._size = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def borrow(self) -> Iterator[gp.Env]:
+        """環境を借りる。ブロックを抜けると返却する。
+
+        ライセンス・通信に関するエラーで抜けた場合は、その環境を破棄する（次回作り直す）。
+
+        Raises:
+            SolverUnavailableError: timeout秒待っても環境を借りられなかった場合
+            gp.GurobiError: 環境の作成に失敗した場合
+        """
+        env = self._acquire()
+        healthy = True
+        try:
+            yield env
+        except gp.GurobiError as e:
+            healthy = e.errno not in BROKEN_ENV_ERRORS
+            raise
+        finally:
+            self._release(env, healthy)
+
+    def close(self) -> None:
+        """待機中の環境を破棄する。貸し出し中の環境は返却時に破棄されずプールに戻る。"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for env in idle:
+            env.dispose()
+
+    def _acquire(self) -> gp.Env:
+        """待機中の環境を取り出す。なければ上限まで作成し、上限に達していれば返却を待つ。"""
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                if not self._condition.wait(self.timeout):
+                    raise SolverUnavailableError(
+                        SolverBackend.GUROBI.value, f"all {self.max_size} Gurobi environments are in use"
+                    )
+            env = self._idle.pop() if self._idle else None
+            if env is None:
+                self._size += 1
+        if env is not None and _is_healthy(env):
+            return env
+        if env is not None:
+            logger.warning("Gurobiの環境を作り直します")
+            env.dispose()
+        try:
+            return gp.Env(params={**self.options, "OutputFlag": 0})
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, env: gp.Env, healthy: bool) -> None:
+        """環境を返却する。使えない環境は破棄する。"""
+        if not healthy:
+            env.dispose()
+        with self._condition:
+            if healthy:
+                self._idle.append(env)
+            else:
+                self._size -= 1
+            self._condition.notify()
+
+
+def _is_healthy(env: gp.Env) -> bool:
+    """環境が使えるかどうか（空のモデルを作成できるかどうか）を確認する。"""
+    try:
+        gp.Model(env=env).dispose()
+        return True
+    except gp.GurobiError:
+        return False
+
+
+_pools: Dict[FrozenSet[Tuple[str, Any]], GurobiEnvPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_env_pool(options: Dict[str, Any]) -> GurobiEnvPool:
+    """環境のパラメータごとのプロセス全体で共有するプールを取得する。
+
+    上限は環境変数GUROBI_ENV_POOL_SIZE、待ち時間は環境変数GUROBI_ENV_POOL_TIMEOUT_SECONDSで指定する。
+    """
+    key = frozenset(options.items())
+    with _pools_lock:
+        if (pool := _pools.get(key)) is None:
+            pool = _pools[key] = GurobiEnvPool(
+                options,
+                max_size=int(os.getenv("GUROBI_ENV_POOL_SIZE", "2")),
+                timeout=float(os.getenv("GUROBI_ENV_POOL_TIMEOUT_SECONDS", "60"))
+            )
+        return pool
+
+
+def close_env_pools() -> None:
+    """すべてのプールの待機中の環境を破棄する（アプリケーションの終了時に呼び出す）。"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
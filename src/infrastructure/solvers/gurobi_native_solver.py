@@ -0,0 +1,164 @@
+import threading
+from typing import Any, Dict, Optional
+import numpy as np
+import pulp
+import gurobipy as gp
+from gurobipy import GRB
+from scipy.sparse import coo_array
+
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from domain.vo.solver_settings import SolverSettingsVo
+from common.constants import SolverBackend
+from infrastructure.solvers.gurobi_env_pool import get_env_pool
+from infrastructure.solvers.gurobi_solver import (
+    GurobiSolver, get_gurobi_objective, get_gurobi_status, gurobi_license_errors, gurobi_callback
+)
+from infrastructure.solvers.progress_reporter import ProgressReporter, create_reporter
+
+_SENSES = {
+    pulp.LpConstraintLE: GRB.LESS_EQUAL,
+    pulp.LpConstraintEQ: GRB.EQUAL,
+    pulp.LpConstraintGE: GRB.GREATER_EQUAL,
+}
+
+
+class GurobiNativeSolver(GurobiSolver):
+    """gurobipyの行列APIを直接使うGurobiソルバーの実装。
+
+    PuLPのGUROBIは変数・制約を1つずつgurobipyに登録し直すため、
+    行列形式に変換してaddMVar/addMConstrで一括登録する。
+    ライセンス情報の読み込みはGurobiSolverと共通。
+    """
+
+    backend = SolverBackend.GUROBI_NATIVE.value
+    supports_matrix = True
+
+    def __init__(self, settings: Optional[SolverSettingsVo] = None, msg: bool = False):
+        """イニシャライザ。
+
+        Args:
+            settings (Optional[SolverSettingsVo]): ソルバーの設定。Noneの場合はGurobiの既定値を使う
+            msg (bool): ソルバーのログを出力するかどうか
+        """
+        super().__init__(settings, msg)
+
+    def get_solver(self) -> Any:
+        """Gurobiソルバーインスタンスを取得する。
+
+        Returns:
+            GurobiMatrixSolver: PuLPから呼び出し可能なGurobiソルバーインスタンス
+        """
+        return GurobiMatrixSolver(env_options=self.options, params=self.params, msg=self.msg)
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式の問題をGurobiで解く。"""
+        cancelled = threading.Event()
+        with gurobi_license_errors(self.backend), self.interruptible(cancelled.set):
+            return solve_with_gurobi(
+                matrix, self.options, self.params, self.msg, create_reporter(self.progress, self.backend), cancelled
+            )
+
+    # PuLPの問題も行列形式に変換して解く（GurobiSolverのpulp.GUROBI向けの実装は使わない）
+    solve_problem = SolverInterface.solve_problem
+
+
+class GurobiMatrixSolver(pulp.LpSolver):
+    """PuLPの問題を行列形式に変換し、gurobipyの行列APIで解くソルバー。"""
+
+    name = "GurobiMatrix"
+
+    def __init__(
+        self,
+        env_options: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.env_options = env_options or {}
+        self.params = params or {}
+
+    def available(self) -> bool:
+        """True if the solver is available"""
+        return True
+
+    def actualSolve(self, lp: pulp.LpProblem, **kwargs) -> int:
+        """Solve a well formulated lp problem"""
+        matrix = LpMatrix.from_problem(lp)
+        solution = solve_with_gurobi(matrix, self.env_options, self.params, self.msg)
+        if solution.values is not None:
+            matrix.assign_values(solution.values)
+
+        lp.assignStatus(solution.status, solution.sol_status)
+        return solution.status
+
+
+def solve_with_gurobi(
+    matrix: LpMatrix,
+    env_options: Dict[str, Any],
+    params: Dict[str, Any],
+    msg: bool,
+    reporter: Optional[ProgressReporter] = None,
+    cancelled: Optional[threading.Event] = None
+) -> MatrixSolution:
+    """行列形式の問題をgurobipyの行列APIで解く。
+
+    環境はプロセス全体のプールから借りる（求解ごとにライセンスの認証をしない）。
+
+    Args:
+        matrix (LpMatrix): 行列形式の問題
+        env_options (Dict[str, Any]): ライセンス情報などの環境のパラメータ
+        params (Dict[str, Any]): モデルのパラメータ（to_gurobi_paramsで変換したもの）
+        msg (bool): ソルバーのログを出力するかどうか
+        reporter (Optional[ProgressReporter]): 進捗の通知先。新しい暫定解の値も通知する
+        cancelled (Optional[threading.Event]): 設定された場合に求解を停止するイベント
+    """
+    with get_env_pool(env_options).borrow() as env:
+        with build_gurobi_model(matrix, env) as model:
+            model.setParam("OutputFlag", int(bool(msg)))
+            for param, value in params.items():
+                model.setParam(param, value)
+            if reporter is not None or cancelled is not None:
+                model.optimize(gurobi_callback(
+                    reporter, cancelled or threading.Event(), model.getVars() if reporter is not None else None
+                ))
+            else:
+                model.optimize()
+
+            status, sol_status = get_gurobi_status(model)
+            objective, bound = get_gurobi_objective(model)
+            values = None
+            if model.SolCount > 0:
+                # 解の値を一括で読み出す。IntFeasTolの範囲の端数（0.9999999など）は
+                # AnnualLpService._solve_matrixで整数変数の値を丸めて除く
+                values = model.getAttr(GRB.Attr.X, model.getVars())
+    return MatrixSolution(status=status, sol_status=sol_status, values=values, objective=objective, bound=bound)
+
+
+def build_gurobi_model(matrix: LpMatrix, env: gp.Env) -> gp.Model:
+    """行列形式からgurobipyのモデルを構築する。"""
+    model = gp.Model(env=env)
+    x = model.addMVar(
+        matrix.num_cols,
+        lb=np.asarray(matrix.col_lower, dtype=np.float64),
+        ub=np.asarray(matrix.col_upper, dtype=np.float64),
+        obj=np.asarray(matrix.objective, dtype=np.float64),
+        vtype=np.where(np.asarray(matrix.integrality, dtype=bool), GRB.INTEGER, GRB.CONTINUOUS),
+    )
+    a_matrix = coo_array(
+        (matrix.coefs, (matrix.rows, matrix.cols)),
+        shape=(matrix.num_rows, matrix.num_cols)
+    ).tocsr()
+    model.addMConstr(
+        a_matrix,
+        x,
+        np.array([_SENSES[sense] for sense in matrix.senses], dtype="U1"),
+        np.asarray(matrix.rhs, dtype=np.float64),
+    )
+    model.ModelSense = GRB.MINIMIZE if matrix.minimize else GRB.MAXIMIZE
+    model.ObjCon = matrix.objective_offset
+    if matrix.start is not None:
+        # 未設定の列はGRB.UNDEFINEDとし、Gurobiに補完させる
+        x.Start = np.array([GRB.UNDEFINED if v is None else v for v in matrix.start], dtype=np.float64)
+    model.update()
+    return model
@@ -1,12 +1,31 @@
 import os
-from typing import Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import pulp
+import gurobipy as gp
+from gurobipy import GRB
 from dotenv import load_dotenv
 
+from common.constants import SolverBackend, SolverEmphasis
+from domain.exceptions.exceptions import SolverUnavailableError
 from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import MatrixSolution
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.gurobi_env_pool import get_env_pool
+from infrastructure.solvers.progress_reporter import ProgressReporter, create_reporter
 
 load_dotenv()
 
+# ライセンスを取得できなかったことを表すエラーコード（トークンが使用中の場合を含む）
+LICENSE_ERRORS = frozenset({
+    GRB.Error.NO_LICENSE,
+    GRB.Error.SIZE_LIMIT_EXCEEDED,
+    GRB.Error.NETWORK,
+    GRB.Error.JOB_REJECTED,
+    GRB.Error.CLOUD,
+})
+
 
 class GurobiSolver(SolverInterface):
     """Gurobiソルバーの実装。
@@ -14,11 +33,20 @@ class GurobiSolver(SolverInterface):
     infrastructure層でGurobiの具体的な設定と初期化を行う。
     """
 
-    def __init__(self):
+    backend = SolverBackend.GUROBI.value
+
+    def __init__(self, settings: Optional[SolverSettingsVo] = None, msg: bool = True):
         """イニシャライザ。
 
         環境変数からGurobiのライセンス情報を読み込む。
+
+        Args:
+            settings (Optional[SolverSettingsVo]): ソルバーの設定。Noneの場合はGurobiの既定値を使う
+            msg (bool): ソルバーのログを出力するかどうか
         """
+        self.settings = settings or SolverSettingsVo()
+        self.msg = msg
+        self.params = to_gurobi_params(self.settings)
         self.options = {
             "WLSACCESSID": os.getenv("WLSACCESSID"),
             "WLSSECRET": os.getenv("WLSSECRET"),
@@ -34,4 +62,120 @@ class GurobiSolver(SolverInterface):
         Returns:
             pulp.GUROBI: Gurobiソルバーインスタンス
         """
-        return pulp.GUROBI(manageEnv=True, envOptions=self.options)
+        return pulp.GUROBI(manageEnv=True, envOptions=self.options, **self.params)
+
+    def solve_problem(self, problem: pulp.LpProblem) -> MatrixSolution:
+        """PuLPの問題をGurobiで解く。
+
+        環境はプロセス全体のプールから借りる（求解ごとにライセンスの認証をしない）。
+        PuLPは時間制限で打ち切られた場合に実行可能解があっても未求解とするため、
+        gurobipyのモデルからステータスと下界を読み直す。
+        進捗はコールバックで通知する（PuLPの変数と列インデックスが対応しないため、暫定解の値は含めない）。
+        cancelで中断された場合は、コールバックからモデルの求解を停止する。
+        """
+        callback = gurobi_callback(create_reporter(self.progress, self.backend), cancelled := threading.Event())
+        with gurobi_license_errors(self.backend), get_env_pool(self.options).borrow() as env:
+            solver = pulp.GUROBI(
+                env=env, msg=self.msg, warmStart=self.warm_start, OutputFlag=int(self.msg), **self.params
+            )
+            problem.setSolver(solver)
+            try:
+                with self.interruptible(cancelled.set):
+                    problem.solve(callback=callback)
+                model: gp.Model = problem.solverModel
+                status, sol_status = get_gurobi_status(model)
+                objective, bound = get_gurobi_objective(model)
+            finally:
+                # モデルのみ破棄し、環境はプールに返す
+                solver.close()
+        return MatrixSolution(status=status, sol_status=sol_status, objective=objective, bound=bound)
+
+
+@contextmanager
+def gurobi_license_errors(backend: str) -> Iterator[None]:
+    """ライセンスに関するGurobiのエラーをSolverUnavailableErrorに変換する。"""
+    try:
+        yield
+    except gp.GurobiError as e:
+        if e.errno in LICENSE_ERRORS:
+            raise SolverUnavailableError(backend, str(e)) from e
+        raise
+
+
+_MIP_FOCUS = {
+    SolverEmphasis.BALANCED: 0,
+    SolverEmphasis.FEASIBILITY: 1,
+    SolverEmphasis.OPTIMALITY: 2,
+    SolverEmphasis.BOUND: 3,
+}
+
+
+def to_gurobi_params(settings: SolverSettingsVo) -> Dict[str, Any]:
+    """ソルバーの設定をGurobiのパラメータに変換する。Noneの項目は含めない。"""
+    params = {
+        "TimeLimit": settings.time_limit,
+        "MIPGap": settings.mip_gap,
+        "MIPGapAbs": settings.mip_gap_abs,
+        "Threads": settings.threads,
+        "Seed": settings.seed,
+        "MIPFocus": _MIP_FOCUS[settings.emphasis] if settings.emphasis is not None else None,
+    }
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def gurobi_callback(
+    reporter: Optional[ProgressReporter],
+    cancelled: threading.Event,
+    variables: Optional[List[gp.Var]] = None
+) -> Callable[[gp.Model, int], None]:
+    """進捗の通知と求解の中断を行うGurobiのコールバックを生成する。
+
+    Args:
+        reporter (Optional[ProgressReporter]): 進捗の通知先。Noneの場合は通知しない
+        cancelled (threading.Event): 設定された場合に求解を停止するイベント
+        variables (Optional[List[gp.Var]]): 暫定解の値を読み出す変数（列インデックス順）。Noneの場合は値を通知しない
+    """
+    def callback(model: gp.Model, where: int) -> None:
+        if cancelled.is_set():
+            model.terminate()
+            return
+        if reporter is None:
+            return
+        if where == GRB.Callback.MIP:
+            reporter.report(
+                model.cbGet(GRB.Callback.RUNTIME),
+                objective=model.cbGet(GRB.Callback.MIP_OBJBST),
+                bound=model.cbGet(GRB.Callback.MIP_OBJBND),
+                nodes=int(model.cbGet(GRB.Callback.MIP_NODCNT)),
+            )
+        elif where == GRB.Callback.MIPSOL:
+            reporter.report(
+                model.cbGet(GRB.Callback.RUNTIME),
+                objective=model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                bound=model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                nodes=int(model.cbGet(GRB.Callback.MIPSOL_NODCNT)),
+                values=model.cbGetSolution(variables) if variables is not None else None,
+                force=True,
+            )
+    return callback
+
+
+def get_gurobi_status(model: gp.Model) -> Tuple[int, int]:
+    """GurobiのステータスをPuLPのステータスに変換する。"""
+    if model.Status == GRB.OPTIMAL:
+        return pulp.LpStatusOptimal, pulp.LpSolutionOptimal
+    if model.Status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
+        return pulp.LpStatusInfeasible, pulp.LpSolutionInfeasible
+    if model.Status == GRB.UNBOUNDED:
+        return pulp.LpStatusUnbounded, pulp.LpSolutionUnbounded
+    if model.SolCount > 0:
+        # 時間制限などで打ち切られたが、実行可能解は得られている
+        return pulp.LpStatusOptimal, pulp.LpSolutionIntegerFeasible
+    return pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound
+
+
+def get_gurobi_objective(model: gp.Model) -> Tuple[Optional[float], Optional[float]]:
+    """解の目的関数値と下界を取得する。解がない場合はいずれもNone。"""
+    if model.SolCount == 0:
+        return None, None
+    return model.ObjVal, (model.ObjBound if model.IsMIP else model.ObjVal)
@@ -0,0 +1,237 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pulp
+import highspy
+from scipy.sparse import coo_array
+
+from common.constants import DEFAULT_TIME_LIMIT, SolverBackend, SolverEmphasis
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.progress_reporter import ProgressReporter, create_reporter
+
+# 実行可能解を重視する場合のプライマルヒューリスティクスの実行割合（HiGHSの既定値は0.05）
+FEASIBILITY_HEURISTIC_EFFORT = 0.3
+
+
+class HighsSolver(SolverInterface):
+    """HiGHSソルバーの実装。
+
+    infrastructure層でHiGHSの具体的な設定と初期化を行う。
+    LPモデルを疎行列としてプロセス内のHiGHSに渡すため、MPSファイルの書き出しや
+    ソルバーの子プロセス起動を伴わない。
+    """
+
+    backend = SolverBackend.HIGHS.value
+    supports_matrix = True
+
+    def __init__(self, settings: Optional[SolverSettingsVo] = None, msg: bool = False):
+        """イニシャライザ。
+
+        Args:
+            settings (Optional[SolverSettingsVo]): ソルバーの設定。タイムリミットの既定値はDEFAULT_TIME_LIMIT
+            msg (bool): ソルバーのログを出力するかどうか
+        """
+        self.settings = settings or SolverSettingsVo()
+        self.options = to_highs_options(self.settings)
+        self.msg = msg
+
+    def get_solver(self) -> Any:
+        """HiGHSソルバーインスタンスを取得する。
+
+        Returns:
+            HighsMatrixSolver: PuLPから呼び出し可能なHiGHSソルバーインスタンス
+        """
+        return HighsMatrixSolver(options=self.options, msg=self.msg)
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式の問題をHiGHSで解く。"""
+        cancelled = threading.Event()
+        with self.interruptible(cancelled.set):
+            return solve_with_highs(
+                matrix, self.options, self.msg, create_reporter(self.progress, self.backend), cancelled
+            )
+
+
+class HighsMatrixSolver(pulp.LpSolver):
+    """PuLPの問題を行列形式に変換し、highspyで解くソルバー。"""
+
+    name = "HighsMatrix"
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.options = options or {}
+
+    def available(self) -> bool:
+        """True if the solver is available"""
+        return True
+
+    def actualSolve(self, lp: pulp.LpProblem, **kwargs) -> int:
+        """Solve a well formulated lp problem"""
+        matrix = LpMatrix.from_problem(lp)
+        solution = solve_with_highs(matrix, self.options, self.msg)
+        if solution.values is not None:
+            matrix.assign_values(solution.values)
+
+        lp.assignStatus(solution.status, solution.sol_status)
+        return solution.status
+
+
+def to_highs_options(settings: SolverSettingsVo) -> Dict[str, Any]:
+    """ソルバーの設定をHiGHSのオプションに変換する。Noneの項目は含めない。
+
+    HiGHSには探索の重点を切り替えるオプションがないため、FEASIBILITYの場合のみ
+    ヒューリスティクスの実行割合を上げ、それ以外の重点は無視する。
+    """
+    options = {
+        "time_limit": float(settings.time_limit if settings.time_limit is not None else DEFAULT_TIME_LIMIT),
+        "mip_rel_gap": settings.mip_gap,
+        "mip_abs_gap": settings.mip_gap_abs,
+        "threads": settings.threads,
+        "random_seed": settings.seed,
+        "mip_heuristic_effort": (
+            FEASIBILITY_HEURISTIC_EFFORT if settings.emphasis == SolverEmphasis.FEASIBILITY else None
+        ),
+    }
+    return {k: v for k, v in options.items() if v is not None}
+
+
+def solve_with_highs(
+    matrix: LpMatrix,
+    options: Dict[str, Any],
+    msg: bool,
+    reporter: Optional[ProgressReporter] = None,
+    cancelled: Optional[threading.Event] = None
+) -> MatrixSolution:
+    """行列形式の問題をHiGHSで解く。
+
+    Args:
+        matrix (LpMatrix): 行列形式の問題
+        options (Dict[str, Any]): HiGHSのオプション（to_highs_optionsで変換したもの）
+        msg (bool): ソルバーのログを出力するかどうか
+        reporter (Optional[ProgressReporter]): 進捗の通知先。新しい暫定解の値も通知する
+        cancelled (Optional[threading.Event]): 設定された場合に求解を停止するイベント
+    """
+    # スレッド数はこのインスタンスのオプションとしてのみ設定する。プロセス全体のスケジューラは、
+    # 同じプロセスで並行して求解している他のインスタンス（同期APIのスレッド、LNSの部分問題など）も使うため作り直さない
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", bool(msg))
+    for option, value in options.items():
+        highs.setOptionValue(option, value)
+    highs.passModel(to_highs_lp(matrix))
+    if matrix.start is not None:
+        _set_start(highs, matrix)
+    if reporter is not None:
+        _subscribe_progress(highs, reporter)
+    if cancelled is not None:
+        _subscribe_cancel(highs, cancelled)
+    highs.run()
+
+    status, sol_status = _get_status(highs)
+    values = objective = bound = None
+    if sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        values = list(highs.getSolution().col_value)
+        info = highs.getInfo()
+        objective = info.objective_function_value
+        bound = info.mip_dual_bound if any(matrix.integrality) else objective
+    return MatrixSolution(
+        status=status, sol_status=sol_status, values=values, objective=objective, bound=bound
+    )
+
+
+def _set_start(highs: highspy.Highs, matrix: LpMatrix) -> None:
+    """解の初期値を設定する。未設定の列はHiGHSに補完させる。"""
+    index = [j for j, v in enumerate(matrix.start) if v is not None]
+    highs.setSolution(
+        len(index),
+        np.asarray(index, dtype=np.int32),
+        np.asarray([matrix.start[j] for j in index], dtype=np.float64)
+    )
+
+
+def _subscribe_progress(highs: highspy.Highs, reporter: ProgressReporter) -> None:
+    """進捗を通知するコールバックを登録する（登録したコールバックのみ有効になる）。"""
+    def on_improving_solution(e: Any) -> None:
+        data = e.data_out
+        reporter.report(
+            data.running_time,
+            objective=data.objective_function_value,
+            bound=data.mip_dual_bound,
+            nodes=data.mip_node_count,
+            values=list(data.mip_solution),
+            force=True,
+        )
+
+    def on_interrupt(e: Any) -> None:
+        data = e.data_out
+        reporter.report(
+            data.running_time,
+            objective=data.mip_primal_bound,
+            bound=data.mip_dual_bound,
+            nodes=data.mip_node_count,
+        )
+
+    highs.cbMipImprovingSolution += on_improving_solution
+    highs.cbMipInterrupt += on_interrupt
+
+
+def _subscribe_cancel(highs: highspy.Highs, cancelled: threading.Event) -> None:
+    """イベントが設定された場合に求解を停止するコールバックを登録する。"""
+    def on_interrupt(e: Any) -> None:
+        if cancelled.is_set():
+            e.interrupt()
+
+    highs.cbSimplexInterrupt += on_interrupt
+    highs.cbIpmInterrupt += on_interrupt
+    highs.cbMipInterrupt += on_interrupt
+
+
+def _get_status(highs: highspy.Highs) -> Tuple[int, int]:
+    """HiGHSのモデルステータスをPuLPのステータスに変換する。"""
+    status = highs.getModelStatus()
+    has_solution = highs.getInfo().primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible
+
+    if status == highspy.HighsModelStatus.kOptimal:
+        return pulp.LpStatusOptimal, pulp.LpSolutionOptimal
+    if status in (highspy.HighsModelStatus.kInfeasible, highspy.HighsModelStatus.kUnboundedOrInfeasible):
+        return pulp.LpStatusInfeasible, pulp.LpSolutionInfeasible
+    if status == highspy.HighsModelStatus.kUnbounded:
+        return pulp.LpStatusUnbounded, pulp.LpSolutionUnbounded
+    if has_solution:
+        # 時間制限などで打ち切られたが、実行可能解は得られている
+        return pulp.LpStatusOptimal, pulp.LpSolutionIntegerFeasible
+    return pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound
+
+
+def to_highs_lp(matrix: LpMatrix) -> highspy.HighsLp:
+    """行列形式をHiGHSのLPに変換する。"""
+    rhs = np.asarray(matrix.rhs, dtype=np.float64)
+    senses = np.asarray(matrix.senses, dtype=np.int8)
+    row_lower = np.where(senses == pulp.LpConstraintLE, -highspy.kHighsInf, rhs)
+    row_upper = np.where(senses == pulp.LpConstraintGE, highspy.kHighsInf, rhs)
+
+    a_matrix = coo_array(
+        (matrix.coefs, (matrix.rows, matrix.cols)),
+        shape=(matrix.num_rows, matrix.num_cols)
+    ).tocsc()
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = matrix.num_cols
+    lp.num_row_ = matrix.num_rows
+    lp.sense_ = highspy.ObjSense.kMinimize if matrix.minimize else highspy.ObjSense.kMaximize
+    lp.offset_ = matrix.objective_offset
+    lp.col_cost_ = np.asarray(matrix.objective, dtype=np.float64)
+    lp.col_lower_ = np.clip(np.asarray(matrix.col_lower, dtype=np.float64), -highspy.kHighsInf, None)
+    lp.col_upper_ = np.clip(np.asarray(matrix.col_upper, dtype=np.float64), None, highspy.kHighsInf)
+    lp.row_lower_ = row_lower
+    lp.row_upper_ = row_upper
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = a_matrix.indptr
+    lp.a_matrix_.index_ = a_matrix.indices
+    lp.a_matrix_.value_ = a_matrix.data
+    lp.integrality_ = [
+        highspy.HighsVarType.kInteger if is_integer else highspy.HighsVarType.kContinuous
+        for is_integer in matrix.integrality
+    ]
+    return lp
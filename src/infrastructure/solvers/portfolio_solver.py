@@ -0,0 +1,231 @@
+import logging
+import multiprocessing
+import time
+from dataclasses import dataclass, replace
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+import pulp
+
+from common.constants import SolverBackend
+from domain.exceptions.exceptions import OptimizationCancelledError, SolverUnavailableError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from infrastructure.jobs.process_group import detach_process_group, terminate_process_group
+
+logger = logging.getLogger(__name__)
+
+# 各ソルバーのタイムリミットを過ぎてから、結果の受け渡しを待つ時間（秒）
+DEADLINE_GRACE_SECONDS = 10.0
+
+
+@dataclass
+class PortfolioMember:
+    """ポートフォリオを構成するソルバー。
+
+    Attributes:
+        label: ログに出力する名前（ソルバーの種類と設定）
+        solver: ソルバー（子プロセスに渡すため、pickle可能であること）
+    """
+    label: str
+    solver: SolverInterface
+
+
+class PortfolioSolver(SolverInterface):
+    """複数のソルバー・設定を別プロセスで同時に実行し、最初に得られた最適解を採用するソルバーの実装。
+
+    最適解が得られた時点、または実行不可能・非有界が示された時点で他のソルバーのプロセスを終了する。
+    タイムリミットまでに最適解が得られなかった場合は、得られた実行可能解のうち目的関数値が最良のものを採用する。
+    cancelで中断された場合は、すべてのソルバーのプロセスを終了する。
+
+    このプロセス自体がデーモンプロセス（ジョブのワーカーなど）で子プロセスを起動できない場合は、
+    同じプロセスでソルバーを順に実行する（最適解などが得られた時点、または打ち切る時刻を過ぎた時点で、
+    残りのソルバーは実行しない）。
+    """
+
+    supports_matrix = True
+
+    def __init__(self, members: List[PortfolioMember], time_limit: float):
+        """イニシャライザ。
+
+        Args:
+            members (List[PortfolioMember]): ポートフォリオを構成するソルバー
+            time_limit (float): 各ソルバーのタイムリミット（秒）。これにDEADLINE_GRACE_SECONDSを加えた時間で打ち切る
+        """
+        self.members = members
+        self.time_limit = time_limit
+        self.backend = SolverBackend.PORTFOLIO.value
+        self._context = multiprocessing.get_context("spawn")
+
+    def get_solver(self) -> Any:
+        """PuLPから直接は使わないため、最初のソルバーのソルバーインスタンスを返す。"""
+        return self.members[0].solver.get_solver()
+
+    @property
+    def parallel(self) -> bool:
+        """ソルバーを別プロセスで同時に実行できるかどうか（デーモンプロセスは子プロセスを起動できない）。"""
+        return not multiprocessing.current_process().daemon
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        """行列形式の問題を各ソルバーで同時に解き、最初に得られた最適解（または最良の実行可能解）を返す。"""
+        # PuLP変数はpickleのコストが大きく、子プロセスでは使わないため除く
+        matrix = replace(matrix, variables=[])
+        start = time.perf_counter()
+        if not self.parallel:
+            best, winner, outcomes = self._solve_sequentially(matrix)
+            return self._conclude(best, winner, outcomes, start)
+        processes: Dict[Any, Any] = {}
+        receivers: Dict[Any, PortfolioMember] = {}
+
+        def interrupt() -> None:
+            for process in list(processes.values()):
+                terminate_process_group(process)
+
+        best: Optional[MatrixSolution] = None
+        winner: Optional[PortfolioMember] = None
+        outcomes: Dict[str, str] = {}
+        deadline = time.monotonic() + self.time_limit + DEADLINE_GRACE_SECONDS
+        try:
+            with self.interruptible(interrupt):
+                for member in self.members:
+                    receiver, sender = self._context.Pipe(duplex=False)
+                    process = self._context.Process(
+                        target=_solve_member, args=(member.solver, matrix, sender), daemon=True
+                    )
+                    process.start()
+                    sender.close()
+                    processes[receiver] = process
+                    receivers[receiver] = member
+                if self.cancel_reason is not None:
+                    # プロセスの起動中に中断された
+                    interrupt()
+                pending = list(receivers)
+                while pending and (remaining := deadline - time.monotonic()) > 0:
+                    for receiver in wait(pending, timeout=remaining):
+                        pending.remove(receiver)
+                        member = receivers[receiver]
+                        try:
+                            solution = receiver.recv()
+                        except EOFError:
+                            solution = None
+                        if not isinstance(solution, MatrixSolution):
+                            # ライセンスを取得できない場合などは、そのソルバーを除いて続ける
+                            outcomes[member.label] = f"error: {solution}"
+                            continue
+                        outcomes[member.label] = pulp.LpSolution[solution.sol_status]
+                        if _is_better(solution, best, matrix.minimize):
+                            best, winner = solution, member
+                        if solution.sol_status in _CONCLUSIVE:
+                            pending = []
+                            break
+        finally:
+            for receiver, process in processes.items():
+                if process.is_alive():
+                    terminate_process_group(process)
+                process.join()
+                receiver.close()
+        return self._conclude(best, winner, outcomes, start)
+
+    def _solve_sequentially(
+        self,
+        matrix: LpMatrix
+    ) -> Tuple[Optional[MatrixSolution], Optional[PortfolioMember], Dict[str, str]]:
+        """同じプロセスでソルバーを順に実行する。cancelで、実行中のソルバーも中断する。"""
+        best: Optional[MatrixSolution] = None
+        winner: Optional[PortfolioMember] = None
+        outcomes: Dict[str, str] = {}
+        deadline = time.monotonic() + self.time_limit + DEADLINE_GRACE_SECONDS
+        for member in self.members:
+            if self.cancel_reason is not None or time.monotonic() >= deadline:
+                break
+            try:
+                with self.interruptible(lambda solver=member.solver: solver.cancel(self.cancel_reason)):
+                    solution = _solve_with(member.solver, matrix)
+            except Exception as e:
+                if self.cancel_reason is not None:
+                    break
+                outcomes[member.label] = f"error: {type(e).__name__}: {e}"
+                continue
+            outcomes[member.label] = pulp.LpSolution[solution.sol_status]
+            if _is_better(solution, best, matrix.minimize):
+                best, winner = solution, member
+            if solution.sol_status in _CONCLUSIVE:
+                break
+        return best, winner, outcomes
+
+    def _conclude(
+        self,
+        best: Optional[MatrixSolution],
+        winner: Optional[PortfolioMember],
+        outcomes: Dict[str, str],
+        start: float
+    ) -> MatrixSolution:
+        """ソルバーごとの結果をログに出力し、採用した解を返す。"""
+        for member in self.members:
+            outcomes.setdefault(member.label, "cancelled")
+        logger.info(
+            "ポートフォリオの求解が終了しました",
+            extra={
+                "winner": winner.label if winner is not None else None,
+                "outcomes": outcomes,
+                "elapsed_seconds": time.perf_counter() - start,
+            }
+        )
+        if self.cancel_reason is not None:
+            raise OptimizationCancelledError(self.cancel_reason)
+        if best is None:
+            if all(outcome.startswith("error") for outcome in outcomes.values()):
+                raise SolverUnavailableError(self.backend, "no solver in the portfolio is available")
+            return MatrixSolution(status=pulp.LpStatusNotSolved, sol_status=pulp.LpSolutionNoSolutionFound)
+        return replace(best, backend=winner.solver.backend)
+
+
+# 他のソルバーの結果を待つ必要がない解のステータス
+_CONCLUSIVE = frozenset({pulp.LpSolutionOptimal, pulp.LpSolutionInfeasible, pulp.LpSolutionUnbounded})
+
+# 解のステータスの優先順位（大きいほど良い）
+_RANK = {
+    pulp.LpSolutionOptimal: 3,
+    pulp.LpSolutionInfeasible: 3,
+    pulp.LpSolutionUnbounded: 3,
+    pulp.LpSolutionIntegerFeasible: 2,
+}
+
+
+def _is_better(solution: MatrixSolution, best: Optional[MatrixSolution], minimize: bool) -> bool:
+    """solutionがbestより良いかどうか。実行可能解どうしは目的関数値で比べる。"""
+    if best is None:
+        return True
+    rank, best_rank = _RANK.get(solution.sol_status, 1), _RANK.get(best.sol_status, 1)
+    if rank != best_rank:
+        return rank > best_rank
+    if solution.sol_status == pulp.LpSolutionIntegerFeasible:
+        if minimize:
+            return solution.objective < best.objective
+        return solution.objective > best.objective
+    return False
+
+
+def _solve_member(solver: SolverInterface, matrix: LpMatrix, sender: Any) -> None:
+    """子プロセスで行列形式の問題を解き、結果をパイプで返す。失敗した場合はエラー内容を返す。"""
+    # 終了する場合に、ソルバーのプロセス（CBCなど）もまとめて終了できるようにする
+    detach_process_group()
+    try:
+        sender.send(_solve_with(solver, matrix))
+    except Exception as e:
+        sender.send(f"{type(e).__name__}: {e}")
+    finally:
+        sender.close()
+
+
+def _solve_with(solver: SolverInterface, matrix: LpMatrix) -> MatrixSolution:
+    """行列形式の問題を1つのソルバーで解く。行列形式を直接解けないソルバーの場合はPuLPの問題に変換する。"""
+    if solver.supports_matrix:
+        return solver.solve_matrix(matrix)
+    problem, variables = matrix.to_problem()
+    solver.warm_start = matrix.start is not None
+    problem.setSolver(solver.get_solver())
+    solution = solver.solve_problem(problem)
+    if solution.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        solution = replace(solution, values=[v.value() for v in variables])
+    return solution
@@ -0,0 +1,89 @@
+import logging
+import math
+import time
+from typing import Callable, List, Optional
+
+from domain.vo.solve_progress import SolveProgressVo
+from domain.vo.solve_result import relative_gap
+
+logger = logging.getLogger(__name__)
+
+# 進捗を通知する最短の間隔（秒）。新しい暫定解の通知は間引かない
+PROGRESS_INTERVAL_SECONDS = 1.0
+# これ以上の絶対値は無限大として扱う（Gurobiは1e100、HiGHSはinfを返す）
+_INFINITY = 1e30
+
+
+class ProgressReporter:
+    """ソルバーのコールバックから受け取った進捗を間引いて通知するクラス。"""
+
+    def __init__(
+        self,
+        callback: Callable[[SolveProgressVo], None],
+        backend: str,
+        interval: float = PROGRESS_INTERVAL_SECONDS
+    ):
+        """イニシャライザ。
+
+        Args:
+            callback (Callable[[SolveProgressVo], None]): 進捗を受け取る関数
+            backend (str): ソルバーの種類
+            interval (float): 進捗を通知する最短の間隔（秒）
+        """
+        self.callback = callback
+        self.backend = backend
+        self.interval = interval
+        self._last_reported = -math.inf
+
+    def report(
+        self,
+        elapsed_seconds: float,
+        objective: Optional[float] = None,
+        bound: Optional[float] = None,
+        nodes: Optional[int] = None,
+        values: Optional[List[float]] = None,
+        force: bool = False
+    ) -> None:
+        """進捗を通知する。前回の通知からintervalが経過していない場合は、forceの場合を除いて通知しない。
+
+        Args:
+            elapsed_seconds (float): 求解開始からの経過時間（秒）
+            objective (Optional[float]): 暫定解の目的関数値
+            bound (Optional[float]): 目的関数値の下界
+            nodes (Optional[int]): 探索済みのノード数
+            values (Optional[List[float]]): 暫定解の値（列インデックス順）
+            force (bool): 間引かずに通知するかどうか（新しい暫定解が見つかった場合）
+        """
+        now = time.monotonic()
+        if not force and now - self._last_reported < self.interval:
+            return
+        self._last_reported = now
+
+        objective, bound = _finite(objective), _finite(bound)
+        progress = SolveProgressVo(
+            elapsed_seconds=elapsed_seconds,
+            objective=objective,
+            bound=bound,
+            gap=relative_gap(objective, bound),
+            nodes=nodes,
+            backend=self.backend,
+            values=values,
+        )
+        try:
+            self.callback(progress)
+        except Exception:
+            # 進捗の通知に失敗しても求解は続ける
+            logger.warning("求解の進捗を通知できませんでした", exc_info=True)
+
+
+def create_reporter(
+    callback: Optional[Callable[[SolveProgressVo], None]], backend: str
+) -> Optional[ProgressReporter]:
+    """進捗を受け取る関数が設定されている場合のみProgressReporterを生成する。"""
+    return ProgressReporter(callback, backend) if callback is not None else None
+
+
+def _finite(value: Optional[float]) -> Optional[float]:
+    if value is None or math.isnan(value) or abs(value) >= _INFINITY:
+        return None
+    return float(value)
@@ -0,0 +1,75 @@
+import os
+from typing import Callable, Dict, List, Optional
+
+from common.constants import DEFAULT_TIME_LIMIT, SolverBackend
+from domain.interfaces.solver_interface import SolverInterface
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.cbc_solver import CbcSolver
+from infrastructure.solvers.fallback_solver import FallbackSolver
+from infrastructure.solvers.gurobi_native_solver import GurobiNativeSolver
+from infrastructure.solvers.gurobi_solver import GurobiSolver
+from infrastructure.solvers.highs_solver import HighsSolver
+from infrastructure.solvers.portfolio_solver import PortfolioMember, PortfolioSolver
+
+# ソルバーの種類 -> ソルバーのファクトリ
+SOLVERS: Dict[SolverBackend, Callable[[SolverSettingsVo], SolverInterface]] = {
+    SolverBackend.GUROBI: GurobiSolver,
+    SolverBackend.GUROBI_NATIVE: GurobiNativeSolver,
+    SolverBackend.HIGHS: HighsSolver,
+    SolverBackend.CBC: CbcSolver,
+}
+
+# ライセンスが必要なため、利用できない場合に代わりのソルバーで解くソルバー
+LICENSED_BACKENDS = frozenset({SolverBackend.GUROBI, SolverBackend.GUROBI_NATIVE})
+
+# ポートフォリオの構成の既定値（ソルバーの種類:乱数シード をカンマ区切り）
+DEFAULT_PORTFOLIO = "GUROBI_NATIVE:0,HIGHS:0,CBC:0"
+
+
+def create_solver(backend: Optional[SolverBackend], settings: SolverSettingsVo) -> SolverInterface:
+    """ソルバーを生成する。
+
+    ソルバーの種類が指定されない場合は、環境変数SOLVERの値（既定値はGUROBI）を使う。
+    ライセンスが必要なソルバーは、環境変数SOLVER_FALLBACKのソルバー（既定値はCBC。空文字列の場合は無効）に
+    フォールバックするようにする。
+    PORTFOLIOの場合は、環境変数SOLVER_PORTFOLIOの構成でソルバーを同時に実行する。
+
+    Args:
+        backend (Optional[SolverBackend]): ソルバーの種類
+        settings (SolverSettingsVo): ソルバーの設定
+
+    Returns:
+        SolverInterface: ソルバー
+    """
+    backend = backend or SolverBackend(os.getenv("SOLVER", SolverBackend.GUROBI.value).upper())
+    if backend == SolverBackend.PORTFOLIO:
+        return create_portfolio(os.getenv("SOLVER_PORTFOLIO", DEFAULT_PORTFOLIO), settings)
+    solver = SOLVERS[backend](settings)
+
+    fallback = os.getenv("SOLVER_FALLBACK", SolverBackend.CBC.value).upper()
+    if backend not in LICENSED_BACKENDS or not fallback:
+        return solver
+    return FallbackSolver(solver, SOLVERS[SolverBackend(fallback)](settings))
+
+
+def create_portfolio(spec: str, settings: SolverSettingsVo) -> PortfolioSolver:
+    """ポートフォリオを生成する。
+
+    各ソルバーにはsettingsの乱数シードを構成のシードに置き換えた設定を渡す。
+    タイムリミットが指定されない場合は、すべてのソルバーにDEFAULT_TIME_LIMITを設定する。
+
+    Args:
+        spec (str): 構成（"GUROBI_NATIVE:0,HIGHS:0,HIGHS:1,CBC:0" のように ソルバーの種類:乱数シード をカンマ区切り）
+        settings (SolverSettingsVo): ソルバーの設定
+
+    Returns:
+        PortfolioSolver: ポートフォリオ
+    """
+    time_limit = settings.time_limit if settings.time_limit is not None else DEFAULT_TIME_LIMIT
+    members: List[PortfolioMember] = []
+    for item in spec.split(","):
+        name, _, seed = item.strip().partition(":")
+        backend = SolverBackend(name.upper())
+        member_settings = settings.model_copy(update={"time_limit": time_limit, "seed": int(seed) if seed else None})
+        members.append(PortfolioMember(label=item.strip(), solver=SOLVERS[backend](member_settings)))
+    return PortfolioSolver(members, time_limit)
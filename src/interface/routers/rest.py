@@ -1,15 +1,46 @@
+import asyncio
 import logging
+import os
+from typing import Iterator, Optional, Union
 
-from fastapi import APIRouter, Path, Body
+from fastapi import APIRouter, Path, Body, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from application.factories.infeasibility_factory import create_infeasibilities
 from application.usecases.get_annual_data_usecase import AnnualDataService
 from application.usecases.optimise_annual_timetable_usecase import OptimiseAnnualTimetableUsecase
-from application.models.dto import OptimiseAnnualTimetableDto, AnnualTimetableResultDto
+from application.usecases.optimise_annual_timetable_job_usecase import OptimiseAnnualTimetableJobUsecase
+from application.models.dto import (
+    OptimiseAnnualTimetableDto, AnnualTimetableResultDto, OptimisationJobDto, SolveProgressDto
+)
+from common.constants import JobStatus
+from domain.exceptions.exceptions import InfeasibleInputError, OptimizationCancelledError
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+from infrastructure.jobs.job_manager import JobManager
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 同じ内容の編成リクエストの結果を再利用するキャッシュ
+result_cache: TtlLruCache[AnnualTimetableResultDto] = TtlLruCache(
+    max_size=int(os.getenv("RESULT_CACHE_SIZE", "32")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+)
+
+# 編成ジョブを別プロセスで実行するジョブ管理
+job_manager = JobManager(
+    max_workers=int(os.getenv("JOB_MAX_WORKERS", "2")),
+    max_finished_jobs=int(os.getenv("JOB_MAX_FINISHED", "100")),
+    cancel_grace_seconds=float(os.getenv("JOB_CANCEL_GRACE_SECONDS", "10"))
+)
+
+# 同期の編成エンドポイントでクライアントの切断を確認する間隔（秒）
+DISCONNECT_POLL_SECONDS = 0.5
+# クライアントが切断して編成を中断した場合のステータスコード（nginxの慣例）
+STATUS_CLIENT_CLOSED_REQUEST = 499
+
 
 @router.get(
     "/annual-data/{ttid}",
@@ -46,7 +77,9 @@ def get_annual_data(
     description="年次データと制約定義を基に、最適な時間割を生成します。",
     response_description="最適化された時間割の結果"
 )
-def optimise_annual_timetable(
+async def optimise_annual_timetable(
+    request: Request,
+    response: Response,
     input_data: OptimiseAnnualTimetableDto = Body(
         ...,
         description="年次時間割最適化リクエスト"
@@ -58,21 +91,54 @@ def optimise_annual_timetable(
     ## 処理フロー
     1. 年次データと制約定義を受け取る
     2. 線形計画問題を構築
-    3. Gurobi Optimizerで最適化を実行
+    3. 指定されたソルバー（既定はGurobi Optimizer）で最適化を実行。Gurobiのライセンスを取得できない場合はCBCで実行
     4. 最適な時間割エントリと制約違反を返却
     
     ## 入力データ
     - **ttid**: 時間割ID
     - **annualData**: 年次データ（学校曜日、学級、教員、教室、講座、カリキュラム）
     - **constraintDefinitions**: 制約定義リスト
+    - **solver**: ソルバー（任意。GUROBI / GUROBI_NATIVE / HIGHS / CBC / PORTFOLIO。省略時は環境変数SOLVERの値）
+      PORTFOLIOの場合は複数のソルバー・乱数シードを別プロセスで同時に実行し、最初に得られた最適解を返します
+    - **solverSettings**: ソルバー設定（任意。タイムリミット、ギャップ、スレッド数、乱数シード、探索の重点）
+    - **warmStart**: 解の初期値とする前回の時間割エントリ（任意）。少し変更した年次データで編成し直す場合に、
+      最初の実行可能解が早く得られます。年次データにない学級・講座などのエントリは無視します
+    - **warmStartJobId**: 解の初期値とする前回の編成ジョブのID（任意。warmStartの代わりに指定する）。
+      ジョブが存在しない、または成功していない場合は404を返します
+    - **mode**: 編成モード（任意。EXACT / FAST / LNS。省略時はEXACT）。
+      FASTの場合は求解せず、貪欲法で構築した時間割（warmStartを指定した場合はその時間割）を返します。
+      LNSの場合は、1日・学級群・数名の教員の担当講座のいずれかの近傍だけを解放して残りを固定した部分問題を、
+      短いタイムリミットで繰り返し解いて時間割を改善します（solverSettingsのタイムリミットまで）
+    - **lnsSettings**: LNS設定（任意。部分問題のタイムリミット、使う近傍、解放する学級数・教員数）
     
     ## 出力データ
     - **entries**: 時間割エントリのリスト（学級ID、曜日、時限、講座ID）
     - **violations**: 制約違反のリスト
+    - **solve_result**: 求解ステータス（OPTIMAL / FEASIBLE / INCOMPLETE）、目的関数値、下界、ギャップ、構築・求解時間、
+      使用したソルバー、満たさない制約行の数（FASTの場合のみ）、改善曲線（LNSの場合のみ）
+
+    時間制限に達した場合でも実行可能解が得られていれば、その解を **FEASIBLE** として返します。
+    EXACTの場合も、warmStartを指定しなければ貪欲法で構築した時間割を解の初期値とします。
+    FASTの場合、構築した時間割がすべての制約を満たせば **FEASIBLE**、満たさない制約があれば **INCOMPLETE** を返します。
     
     ## 最適化について
     このエンドポイントは、与えられた制約の下で最適な時間割を生成します。
     すべてのハード制約は満たされ、ソフト制約は可能な限り満たされます。
+    講座も教員も共有しない学級群（学年・校舎など）に分かれる場合は、学級群ごとに並列に解いて結果をまとめます
+    （目的関数値・下界は合計、求解時間は最も長い学級群の時間）。
+
+    ## 入力の検査について
+    求解する前に、学級の時限を埋める単位数の不足、学級で開講できる時限数を超える講座の単位数、
+    ブロックのレーンどうしの単位数の違い、出勤している時限数を超える教員の担当コマ数を検査します。
+    矛盾がある場合は求解せずに **422** を返し、detail.infeasibilitiesに矛盾の種類と、
+    関係する学級・講座・教員、必要なコマ数・使えるコマ数を含めます（FASTの場合は検査しません）。
+
+    ## キャッシュについて
+    年次データと制約定義が同じ（並び順は問わない）リクエストには、キャッシュした結果を返します。
+    キャッシュの利用状況はレスポンスヘッダー **X-Cache**（HIT / MISS / BYPASS）で確認できます。
+
+    ## 切断について
+    求解中にクライアントが切断した場合は求解を中断します（結果はキャッシュしません）。
     """
     # リクエストをログ出力
     logger.info(
@@ -80,5 +146,235 @@ def optimise_annual_timetable(
         extra={"request_body": input_data.model_dump()}
     )
     
-    result = OptimiseAnnualTimetableUsecase(input_data).execute()
+    input_data = _resolve_warm_start(input_data)
+    usecase = OptimiseAnnualTimetableUsecase(input_data, cache=result_cache)
+    try:
+        result = await _execute_until_disconnected(request, usecase)
+    except OptimizationCancelledError:
+        # クライアントは切断済みのため、レスポンスは届かない
+        return Response(status_code=STATUS_CLIENT_CLOSED_REQUEST)
+    except InfeasibleInputError as e:
+        raise _infeasible_input(e)
+    response.headers["X-Cache"] = usecase.cache_status.value
     return result
+
+
+def _infeasible_input(error: InfeasibleInputError) -> HTTPException:
+    """入力の矛盾を、矛盾する学級・講座・教員を含む422レスポンスに変換する。"""
+    return HTTPException(
+        status_code=422,
+        detail={
+            "message": "入力に必須制約を満たせない矛盾があります",
+            "infeasibilities": [
+                i.model_dump(mode="json") for i in create_infeasibilities(error.infeasibilities, error.labels)
+            ],
+        }
+    )
+
+
+def _resolve_warm_start(input_data: OptimiseAnnualTimetableDto) -> OptimiseAnnualTimetableDto:
+    """warmStartJobIdで指定されたジョブの時間割エントリを、解の初期値に置き換える。"""
+    resolved = OptimiseAnnualTimetableJobUsecase(job_manager).resolve_warm_start(input_data)
+    if resolved is None:
+        raise HTTPException(
+            status_code=404, detail=f"解の初期値とするジョブの結果が見つかりません: {input_data.warm_start_job_id}"
+        )
+    return resolved
+
+
+async def _execute_until_disconnected(
+    request: Request,
+    usecase: OptimiseAnnualTimetableUsecase
+) -> AnnualTimetableResultDto:
+    """編成をワーカースレッドで実行し、クライアントが切断した場合は中断する。
+
+    Raises:
+        OptimizationCancelledError: クライアントが切断して中断した場合
+    """
+    task = asyncio.ensure_future(run_in_threadpool(usecase.execute))
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+        if done:
+            break
+        if await request.is_disconnected():
+            usecase.cancel("クライアントが切断しました")
+            break
+    return await task
+
+
+@router.post(
+    "/optimise-annual-timetable/jobs",
+    response_model=OptimisationJobDto,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["timetable"],
+    summary="年次時間割最適化ジョブ投入",
+    description="年次時間割最適化をジョブとして投入し、ジョブIDを返します。",
+    response_description="投入したジョブ"
+)
+def submit_optimise_annual_timetable_job(
+    request: Request,
+    response: Response,
+    input_data: OptimiseAnnualTimetableDto = Body(
+        ...,
+        description="年次時間割最適化リクエスト"
+    )
+) -> OptimisationJobDto:
+    """
+    年次時間割編成ジョブ投入エンドポイント
+
+    求解は別プロセスのワーカーで実行され、このエンドポイントはすぐに返ります。
+    入力に矛盾がある場合は、ジョブを投入せずに422を返します（同期の編成エンドポイントと同じ検査）。
+    同時に実行するジョブ数は **JOB_MAX_WORKERS** までで、それを超えたジョブは投入順に待機します。
+    ジョブのワーカーは子プロセスを起動できないため、年次データが互いに影響しない部分に分かれる場合も
+    部分を順に解きます（**DECOMPOSITION_WORKERS** は使いません）。全体の求解時間はタイムリミットに収まるように、
+    残り時間をまだ解いていない部分に割り当てます。
+
+    - 状態の確認: `GET /optimise-annual-timetable/jobs/{jobId}`
+    - 進捗の購読: `GET /optimise-annual-timetable/jobs/{jobId}/events`
+    - 結果の取得: `GET /optimise-annual-timetable/jobs/{jobId}/result`
+    - キャンセル: `DELETE /optimise-annual-timetable/jobs/{jobId}`
+    """
+    logger.info(
+        "POST /optimise-annual-timetable/jobs - Request received",
+        extra={"request_body": input_data.model_dump()}
+    )
+
+    input_data = _resolve_warm_start(input_data)
+    usecase = OptimiseAnnualTimetableJobUsecase(job_manager, cache=result_cache)
+    try:
+        job = usecase.submit(input_data)
+    except InfeasibleInputError as e:
+        raise _infeasible_input(e)
+    response.headers["Location"] = str(
+        request.url_for("get_optimise_annual_timetable_job", job_id=job.job_id)
+    )
+    return job
+
+
+@router.get(
+    "/optimise-annual-timetable/jobs/{job_id}",
+    response_model=OptimisationJobDto,
+    tags=["timetable"],
+    summary="年次時間割最適化ジョブ状態取得",
+    description="投入したジョブの状態を取得します。",
+    response_description="ジョブの状態"
+)
+def get_optimise_annual_timetable_job(
+    job_id: str = Path(..., description="ジョブID")
+) -> OptimisationJobDto:
+    """
+    年次時間割編成ジョブ状態取得エンドポイント
+
+    - **PENDING**: 空きワーカーを待っている
+    - **RUNNING**: 求解中
+    - **SUCCEEDED**: 完了。結果を取得できる
+    - **FAILED**: 失敗。**error** に内容が入る
+    - **CANCELLED**: キャンセルされた。**error** に理由が入る
+    """
+    job = OptimiseAnnualTimetableJobUsecase(job_manager).get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"ジョブが見つかりません: {job_id}")
+    return job
+
+
+@router.delete(
+    "/optimise-annual-timetable/jobs/{job_id}",
+    response_model=OptimisationJobDto,
+    tags=["timetable"],
+    summary="年次時間割最適化ジョブキャンセル",
+    description="投入したジョブをキャンセルします。",
+    response_description="キャンセルを要求した時点のジョブの状態"
+)
+def cancel_optimise_annual_timetable_job(
+    job_id: str = Path(..., description="ジョブID")
+) -> OptimisationJobDto:
+    """
+    年次時間割編成ジョブキャンセルエンドポイント
+
+    - 待機中のジョブはすぐに **CANCELLED** になります
+    - 実行中のジョブは求解を中断してから **CANCELLED** になります。
+      ソルバーが **JOB_CANCEL_GRACE_SECONDS** 秒以内に停止しない場合はワーカープロセスを強制終了します
+    - 終了済みのジョブは変更せず、そのまま返します
+    """
+    job = OptimiseAnnualTimetableJobUsecase(job_manager).cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"ジョブが見つかりません: {job_id}")
+    return job
+
+
+@router.get(
+    "/optimise-annual-timetable/jobs/{job_id}/result",
+    response_model=AnnualTimetableResultDto,
+    tags=["timetable"],
+    summary="年次時間割最適化ジョブ結果取得",
+    description="完了したジョブの時間割の結果を取得します。",
+    response_description="最適化された時間割の結果"
+)
+def get_optimise_annual_timetable_job_result(
+    job_id: str = Path(..., description="ジョブID")
+) -> AnnualTimetableResultDto:
+    """
+    年次時間割編成ジョブ結果取得エンドポイント
+
+    ジョブが終了していない場合・キャンセルされた場合は409、失敗した場合は500を返します。
+    """
+    usecase = OptimiseAnnualTimetableJobUsecase(job_manager)
+    job = usecase.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"ジョブが見つかりません: {job_id}")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status == JobStatus.CANCELLED:
+        raise HTTPException(status_code=409, detail=f"ジョブはキャンセルされました: {job.error}")
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"ジョブが終了していません: {job.status.value}")
+    return usecase.get_result(job_id)
+
+
+@router.get(
+    "/optimise-annual-timetable/jobs/{job_id}/events",
+    tags=["timetable"],
+    summary="年次時間割最適化ジョブ進捗購読",
+    description="ジョブの求解の進捗をServer-Sent Eventsで配信します。",
+    response_description="進捗のイベントストリーム（text/event-stream）",
+    response_class=StreamingResponse
+)
+def stream_optimise_annual_timetable_job_events(
+    job_id: str = Path(..., description="ジョブID"),
+    entries: bool = Query(False, description="新しい暫定解が見つかった時点の時間割エントリを含めるかどうか")
+) -> StreamingResponse:
+    """
+    年次時間割編成ジョブ進捗購読エンドポイント
+
+    ## イベント
+    - **progress**: 求解の進捗（経過時間、暫定解の目的関数値、下界、ギャップ、探索ノード数、ソルバー）。
+      おおむね1秒ごと、および新しい暫定解が見つかるたびに配信します
+    - **status**: ジョブの終了時に1回だけ、ジョブの状態を配信してストリームを閉じます
+
+    進捗がない間も、接続を維持するためにコメント行（`: keepalive`）を送ります。
+
+    ## 対応しているソルバー
+    - **GUROBI / GUROBI_NATIVE / HIGHS**: ソルバーのコールバックから取得します
+      （GUROBI_NATIVE / HIGHSは **entries=true** で暫定解の時間割エントリも配信します）
+    - **CBC**: ソルバーのログから取得します
+    - **PORTFOLIO**: 進捗は配信せず、終了時の **status** のみ配信します
+    """
+    usecase = OptimiseAnnualTimetableJobUsecase(job_manager)
+    if usecase.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"ジョブが見つかりません: {job_id}")
+    return StreamingResponse(
+        _to_event_stream(usecase.watch(job_id, include_entries=entries)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _to_event_stream(events: Iterator[Optional[Union[SolveProgressDto, OptimisationJobDto]]]) -> Iterator[str]:
+    """ジョブの進捗をServer-Sent Eventsの形式に変換する。"""
+    for event in events:
+        if event is None:
+            yield ": keepalive\n\n"
+        elif isinstance(event, SolveProgressDto):
+            yield f"event: progress\ndata: {event.model_dump_json()}\n\n"
+        else:
+            yield f"event: status\ndata: {event.model_dump_json()}\n\n"
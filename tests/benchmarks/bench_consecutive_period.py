@@ -0,0 +1,82 @@
+"""ConsecutivePeriodConstraintの構築時間ベンチマーク
+
+教員200の合成データで、2コマ連続開講制約を設定する講座数を10/50/200と変えて、
+制約定義ごとにwの全添字と全学級を走査する旧実装と、講座ごとの索引を使って
+すべての制約定義をまとめて書き出す現実装の構築時間を比較する。
+
+wの定義は両方の計測から除く（計測前に定義しておく）。
+
+実行方法:
+    PYTHONPATH=./src:./tests uv run python tests/benchmarks/bench_consecutive_period.py
+"""
+
+import math
+import time
+from typing import List
+
+import pulp
+
+from domain.constraints.consecutive_period import ConsecutivePeriodConstraint
+from domain.logics.constraint_logic import is_enrolled
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.sparse_rows import SparseRows
+from domain.vo.annual_data import AnnualDataVo
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.highs_solver import HighsSolver
+from utils.synthetic_school import create_synthetic_annual_data
+
+N_INSTRUCTORS = 200
+COURSE_COUNTS = [10, 50, 200]
+
+
+def legacy_emit(model: AnnualLpModel, rows: SparseRows, course: str) -> None:
+    """比較用の旧実装（制約定義ごとに全学級とwの全添字を走査する）。"""
+    for h in model.data.H:
+        if not is_enrolled(model.data, h, course):
+            continue
+        for d in model.data.D:
+            periods = model.data.homeroom_day_dict[h][d]
+            for p1, p2, p3 in zip(periods, periods[1:], periods[2:]):
+                rows.add_row([model.x.col((h, d, p, course)) for p in (p1, p2, p3)], [1, 1, 1], pulp.LpConstraintLE, 2)
+
+    w_cols = [model.w.col(key) for key in model.w.keys() if key[4] == course]
+    rows.add_row(w_cols, [1] * len(w_cols), pulp.LpConstraintEQ, math.floor(model.data.credit_dict[course] / 2))
+
+
+def create_model(data: AnnualDataVo, courses: List[str]) -> AnnualLpModel:
+    definitions = [
+        ConstraintDefinitionVo(
+            code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": c}
+        )
+        for c in courses
+    ]
+    model = AnnualLpModel(data, definitions, HighsSolver())
+    _ = model.w
+    return model
+
+
+def main() -> None:
+    data = create_synthetic_annual_data(N_INSTRUCTORS)
+    _ = data.index
+
+    print(f"{'courses':>8} {'w':>7} {'rows':>7} {'legacy[s]':>10} {'batched[s]':>11} {'speedup':>8}")
+    for n in COURSE_COUNTS:
+        courses = list(data.C[:n])
+
+        model = create_model(data, courses)
+        start = time.perf_counter()
+        for c in courses:
+            legacy_emit(model, SparseRows(), c)
+        legacy = time.perf_counter() - start
+
+        model = create_model(data, courses)
+        rows = SparseRows()
+        start = time.perf_counter()
+        ConsecutivePeriodConstraint.batch([{"courseId": c} for c in courses]).emit(model, rows)
+        batched = time.perf_counter() - start
+
+        print(f"{n:>8} {len(model.w):>7} {len(rows):>7} {legacy:>10.3f} {batched:>11.3f} {legacy / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Gurobiバックエンドのベンチマーク
+
+合成データで、PuLPのGUROBI（変数・制約を1つずつ登録）と、
+行列APIで一括登録するGurobiNativeSolverの所要時間を比較する。
+
+- build: AnnualLpModelの構築と制約適用（両者共通）
+- transfer: PuLPの問題からgurobipyのモデルを構築するまで
+- optimize: 求解と解の読み出し
+
+サイズ制限付きライセンス（pip版gurobipyに同梱）ではoptimizeがモデルサイズ超過で失敗するため、
+その場合はtransferまでを計測し、optimizeは "size-limited" と表示する。
+--skip-optimize を指定すると、ライセンスに関わらずtransferまでを計測する。
+
+実行方法:
+    PYTHONPATH=./src:./tests uv run python tests/benchmarks/bench_gurobi_backend.py [--skip-optimize]
+"""
+
+import argparse
+import time
+from typing import Callable, Optional, Tuple
+
+import gurobipy as gp
+import pulp
+
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.lp_matrix import LpMatrix
+from domain.services.annual_lp_service import AnnualLpService
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.gurobi_native_solver import GurobiNativeSolver, build_gurobi_model
+from infrastructure.solvers.gurobi_solver import GurobiSolver
+from utils.synthetic_school import create_synthetic_annual_data
+
+# 5はサイズ制限付きライセンスでも求解まで計測できる規模
+INSTRUCTOR_COUNTS = [5, 50, 100, 200]
+TIME_LIMIT = 60
+CONSTRAINT_DEFINITIONS = [
+    ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={}),
+]
+
+
+def build_model(n_instructors: int) -> Tuple[AnnualLpModel, float]:
+    """合成データからLPモデルを構築し、所要時間とともに返す。"""
+    data = create_synthetic_annual_data(n_instructors)
+    start = time.perf_counter()
+    model = AnnualLpModel(data, CONSTRAINT_DEFINITIONS, GurobiSolver())
+    AnnualLpService.build(model)
+    return model, time.perf_counter() - start
+
+
+def run_pulp_gurobi(model: AnnualLpModel, optimize: bool) -> Tuple[float, Optional[float]]:
+    """PuLPのGUROBIで登録・求解する。"""
+    solver = pulp.GUROBI(manageEnv=True, envOptions=GurobiSolver().options, timeLimit=TIME_LIMIT, msg=False)
+    lp = model.problem
+    try:
+        start = time.perf_counter()
+        solver.buildSolverModel(lp)
+        transfer = time.perf_counter() - start
+        if not optimize:
+            return transfer, None
+        start = time.perf_counter()
+        solver.callSolver(lp)
+        solver.findSolutionValues(lp)
+        return transfer, time.perf_counter() - start
+    finally:
+        solver.close()
+
+
+def run_gurobi_native(model: AnnualLpModel, optimize: bool) -> Tuple[float, Optional[float]]:
+    """行列APIで登録・求解する。"""
+    options = GurobiNativeSolver().options
+    with gp.Env(params={**options, "OutputFlag": 0}) as env:
+        start = time.perf_counter()
+        matrix = LpMatrix.from_problem(model.problem)
+        with build_gurobi_model(matrix, env) as gurobi_model:
+            transfer = time.perf_counter() - start
+            if not optimize:
+                return transfer, None
+            gurobi_model.Params.TimeLimit = TIME_LIMIT
+            start = time.perf_counter()
+            gurobi_model.optimize()
+            matrix.assign_values(gurobi_model.getAttr(gp.GRB.Attr.X, gurobi_model.getVars()))
+            return transfer, time.perf_counter() - start
+
+
+def measure(run: Callable, model: AnnualLpModel, optimize: bool) -> Tuple[float, str]:
+    """登録時間と求解時間の表示文字列を返す。"""
+    try:
+        transfer, solve = run(model, optimize)
+    except gp.GurobiError as e:
+        if e.errno != gp.GRB.Error.SIZE_LIMIT_EXCEEDED:
+            raise
+        transfer, _ = run(model, False)
+        return transfer, "size-limited"
+    return transfer, "-" if solve is None else f"{solve:.3f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skip-optimize", action="store_true", help="求解を省略し、登録時間のみ計測する")
+    args = parser.parse_args()
+
+    print(
+        f"{'instructors':>11} {'cols':>7} {'rows':>7} {'build[s]':>9} "
+        f"{'backend':>14} {'transfer[s]':>12} {'optimize[s]':>12} {'total[s]':>9}"
+    )
+    for n in INSTRUCTOR_COUNTS:
+        model, build = build_model(n)
+        for name, run in (("pulp.GUROBI", run_pulp_gurobi), ("native", run_gurobi_native)):
+            transfer, solve = measure(run, model, not args.skip_optimize)
+            total = build + transfer + (float(solve) if solve[0].isdigit() else 0.0)
+            print(
+                f"{n:>11} {len(model.problem.variables()):>7} {len(model.problem.constraints):>7} {build:>9.3f} "
+                f"{name:>14} {transfer:>12.3f} {solve:>12} {total:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
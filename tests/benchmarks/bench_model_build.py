@@ -0,0 +1,74 @@
+"""モデル構築のベンチマーク
+
+合成データで、制約をPuLPの制約オブジェクトとして構築する経路と、
+三つ組バッファに書き出して行列形式を直接生成する経路の所要時間とメモリ使用量を比較する。
+
+- pulp: AnnualLpService.build + LpMatrix.from_problem（ソルバーに渡す行列形式まで）
+- matrix: AnnualLpService.build_matrix
+
+メモリ使用量はtracemallocで計測したピーク値。計測のオーバーヘッドを避けるため、時間とは別に計測する。
+
+実行方法:
+    PYTHONPATH=./src:./tests uv run python tests/benchmarks/bench_model_build.py
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.lp_matrix import LpMatrix
+from domain.services.annual_lp_service import AnnualLpService
+from domain.vo.annual_data import AnnualDataVo
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.highs_solver import HighsSolver
+from utils.synthetic_school import create_synthetic_annual_data
+
+INSTRUCTOR_COUNTS = [50, 100, 200]
+CONSTRAINT_DEFINITIONS = [
+    ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={}),
+    ConstraintDefinitionVo(code="CONSECUTIVE_DAY", soft_flag=False, penalty_weight=None, parameters={}),
+]
+
+
+def build_pulp(data: AnnualDataVo) -> LpMatrix:
+    """PuLPの制約オブジェクトを経由して行列形式を生成する。"""
+    model = AnnualLpModel(data, CONSTRAINT_DEFINITIONS, HighsSolver())
+    AnnualLpService.build(model)
+    return LpMatrix.from_problem(model.problem)
+
+
+def build_matrix(data: AnnualDataVo) -> LpMatrix:
+    """三つ組バッファから行列形式を直接生成する。"""
+    model = AnnualLpModel(data, CONSTRAINT_DEFINITIONS, HighsSolver())
+    return AnnualLpService.build_matrix(model)
+
+
+def measure(build: Callable[[AnnualDataVo], LpMatrix], data: AnnualDataVo) -> Tuple[LpMatrix, float, float]:
+    """構築時間[s]とピークメモリ[MiB]を計測する。"""
+    start = time.perf_counter()
+    matrix = build(data)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    build(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return matrix, elapsed, peak / 2**20
+
+
+def main() -> None:
+    print(f"{'instructors':>11} {'path':>7} {'cols':>7} {'rows':>7} {'nonzeros':>9} {'build[s]':>9} {'peak[MiB]':>10}")
+    for n in INSTRUCTOR_COUNTS:
+        data = create_synthetic_annual_data(n)
+        data.index  # 索引の構築は計測に含めない
+        for name, build in (("pulp", build_pulp), ("matrix", build_matrix)):
+            matrix, elapsed, peak = measure(build, data)
+            print(
+                f"{n:>11} {name:>7} {matrix.num_cols:>7} {matrix.num_rows:>7} {matrix.num_nonzeros:>9} "
+                f"{elapsed:>9.3f} {peak:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
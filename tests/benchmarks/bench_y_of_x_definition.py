@@ -0,0 +1,82 @@
+"""YofXDefinitionの構築時間ベンチマーク
+
+教員数50/100/200の合成データで、講座全走査による旧実装と、
+教員 -> 担当講座の対応から項を集める現実装の構築時間を比較する。
+
+実行方法:
+    PYTHONPATH=./src:./tests uv run python tests/benchmarks/bench_y_of_x_definition.py [--skip-legacy]
+
+旧実装は教員200で数分かかるため、現実装のみ計測する場合は --skip-legacy を指定する。
+"""
+
+import argparse
+import time
+
+import pulp
+
+from domain.constraints.y_of_x_definition import YofXDefinition
+from domain.models.annual_lp_model import AnnualLpModel
+from infrastructure.solvers.cbc_solver import CbcSolver
+from utils.synthetic_school import create_synthetic_annual_data
+
+INSTRUCTOR_COUNTS = [50, 100, 200]
+
+
+def legacy_apply(model: AnnualLpModel) -> AnnualLpModel:
+    """比較用の旧実装（(d, p, i)ごとに全講座を走査する）。"""
+    data = model.data
+
+    def is_enrolled(h, c):
+        return any(c in lane for block in data.curriculum_dict[h] for lane in block)
+
+    def get_enrolled_homeroom(c):
+        enrolled_homerooms = [h for h in data.H if is_enrolled(h, c)]
+        return min(enrolled_homerooms) if enrolled_homerooms else None
+
+    def is_instructor_of_course(i, c):
+        return any(i == detail.instructor_id for detail in data.course_details_dict[c])
+
+    for d in data.D:
+        for p in data.P:
+            for i in data.I:
+                model.problem += model.y[d, p, i] == pulp.lpSum(
+                    model.x[h, d, p, c]
+                    for c in data.C
+                    if (h := get_enrolled_homeroom(c)) is not None
+                    and is_instructor_of_course(i, c)
+                    and (h, d, p, c) in model.x
+                )
+    return model
+
+
+def measure(apply, n_instructors: int) -> float:
+    data = create_synthetic_annual_data(n_instructors)
+    model = AnnualLpModel(data, [], CbcSolver())
+    _ = data.index
+    start = time.perf_counter()
+    apply(model)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skip-legacy", action="store_true", help="旧実装の計測を省略する")
+    args = parser.parse_args()
+
+    print(f"{'instructors':>11} {'courses':>8} {'nnz':>8} {'legacy[s]':>10} {'indexed[s]':>11} {'speedup':>8}")
+    for n in INSTRUCTOR_COUNTS:
+        data = create_synthetic_annual_data(n)
+        nnz = sum(
+            len(data.D) * len(data.P) * len(data.index.course_instructors[c])
+            for c in data.C
+        )
+        indexed = measure(YofXDefinition().apply, n)
+        if args.skip_legacy:
+            print(f"{n:>11} {len(data.C):>8} {nnz:>8} {'-':>10} {indexed:>11.3f} {'-':>8}")
+            continue
+        legacy = measure(legacy_apply, n)
+        print(f"{n:>11} {len(data.C):>8} {nnz:>8} {legacy:>10.3f} {indexed:>11.3f} {legacy / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,10 @@ from application.models.dto import (
     BlockDto, CurriculumDto, LaneDto,
     HomeroomDto, HomeroomDayDto,
     InstructorDto, AttendanceDayDto,
-    SchoolDayDto
+    SchoolDayDto, AnnualDataDto
 )
 from application.factories.annual_data_factory import (
+    create_annual_data,
     _get_C,
     _get_H,
     _get_P,
@@ -274,3 +275,41 @@ def test_get_school_days(sample_school_days):
     assert result["tue"].pm_periods == 1
     assert result["thu"].am_periods == 2
     assert result["thu"].pm_periods == 2
+
+
+@pytest.fixture
+def sample_annual_data_dto(sample_courses, sample_curriculums, sample_homerooms, sample_instructors, sample_days):
+    return AnnualDataDto(
+        school_days=sample_days,
+        homerooms=sample_homerooms,
+        instructors=sample_instructors,
+        rooms=[],
+        courses=sample_courses,
+        curriculums=sample_curriculums
+    )
+
+
+def test_create_annual_data(sample_annual_data_dto):
+    result = create_annual_data(sample_annual_data_dto)
+
+    # H, D, C, Iの順序どおりに0始まりの整数IDが振られる
+    assert (result.H, result.D, result.C, result.I) == ([0, 1], [0, 1, 2], [0, 1], [0, 1, 2, 3])
+    assert result.labels.homerooms == ["2-4", "2-5"]
+    assert result.labels.instructors == ["instructor1", "instructor2", "instructor3", "instructor4"]
+    # 講座リストにない講座、授業日でない曜日には後続の整数IDが振られる
+    assert result.labels.courses == ["math", "science", "history", "english"]
+    assert result.labels.days == ["mon", "tue", "wed", "thu"]
+
+    assert result.homeroom_day_dict[0] == {0: [1, 2, 3, 4, 5, 6], 1: [1, 2, 3, 4, 5, 6, 7]}
+    assert result.curriculum_dict[1] == [[[0, 1], [2, 3]], [[0, 1], [2, 3]]]
+    assert result.credit_dict == {0: 1, 1: 2}
+    assert [d.instructor_id for d in result.course_details_dict[1]] == [2, 3]
+    assert result.attendance_day_dict[3] == {3: [6]}
+
+
+def test_create_annual_data_without_interning(sample_annual_data_dto):
+    result = create_annual_data(sample_annual_data_dto, intern_ids=False)
+
+    assert result.H == ["2-4", "2-5"]
+    assert result.C == ["math", "science"]
+    assert result.labels is None
@@ -0,0 +1,83 @@
+from application.factories.annual_timetable_result_factory import create_timetable_entries, merge_timetable_results
+from application.models.dto import (
+    AnnualTimetableResultDto, ApplierProfileDto, BuildProfileDto, SolveResultDto, TimetableEntryDto,
+    V1ConstraintViolationDto, V3ConstraintViolationDto
+)
+from common.constants import SolveStatus
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.annual_data import AnnualDataVo, CourseDetailVo
+from infrastructure.solvers.highs_solver import HighsSolver
+
+
+def _result(homeroom: str, status: SolveStatus, objective: float, bound: float, violations) -> AnnualTimetableResultDto:
+    return AnnualTimetableResultDto(
+        entries=[TimetableEntryDto(homeroom=homeroom, day="mon", period=1, course=f"C{homeroom}")],
+        violations=violations,
+        solve_result=SolveResultDto(
+            status=status, objective=objective, bound=bound, elapsed_seconds=objective, backend="HIGHS"
+        ),
+        build_profile=BuildProfileDto(
+            appliers=[ApplierProfileDto(applier="HomeroomConstraint", elapsed_seconds=0.5, rows=2, nonzeros=4)],
+            variables={"x": 3},
+            columns=3,
+            elapsed_seconds=0.5,
+            rows=2,
+            nonzeros=4
+        )
+    )
+
+
+def test_merge_timetable_results():
+    merged = merge_timetable_results([
+        _result("H1", SolveStatus.OPTIMAL, 2, 2, [V1ConstraintViolationDto(violation_keys=["C1"])]),
+        _result("H2", SolveStatus.FEASIBLE, 3, 1, [
+            V3ConstraintViolationDto(violation_keys=[("mon", "I2")]),
+            V1ConstraintViolationDto(violation_keys=["C2"]),
+        ]),
+    ])
+
+    assert [e.homeroom for e in merged.entries] == ["H1", "H2"]
+    assert [(v.violation_code, v.violation_keys) for v in merged.violations] == [
+        ("v1", ["C1", "C2"]), ("v3", [("mon", "I2")])
+    ]
+    result = merged.solve_result
+    assert result.status == SolveStatus.FEASIBLE
+    assert (result.objective, result.bound, result.gap) == (5, 3, 0.4)
+    assert result.elapsed_seconds == 3
+    assert result.backend == "HIGHS"
+    profile = merged.build_profile
+    assert [(a.applier, a.rows, a.nonzeros) for a in profile.appliers] == [("HomeroomConstraint", 4, 8)]
+    assert (profile.variables, profile.columns, profile.rows) == ({"x": 6}, 6, 4)
+
+
+def test_merge_timetable_results_optimal_only_when_all_optimal():
+    results = [_result(h, SolveStatus.OPTIMAL, 0, 0, []) for h in ("H1", "H2")]
+
+    assert merge_timetable_results(results).solve_result.status == SolveStatus.OPTIMAL
+    results[1].solve_result.status = SolveStatus.INCOMPLETE
+    assert merge_timetable_results(results).solve_result.status == SolveStatus.INCOMPLETE
+
+
+def test_create_timetable_entries_with_near_integral_values():
+    data = AnnualDataVo(
+        H=["H1"],
+        D=["mon"],
+        P=[1, 2, 3],
+        C=["C1", "C2"],
+        I=["I1"],
+        homeroom_day_dict={"H1": {"mon": [1, 2, 3]}},
+        curriculum_dict={"H1": [[["C1"]], [["C2"]]]},
+        credit_dict={"C1": 2, "C2": 1},
+        course_details_dict={"C1": [CourseDetailVo(instructor_id="I1", room_id="R1")], "C2": []},
+        school_day_dict={"mon": {"am_periods": 2, "pm_periods": 1}},
+        attendance_day_dict={"I1": {"mon": []}}
+    )
+    model = AnnualLpModel(data, [], HighsSolver())
+    # ソルバーの許容誤差による端数を含む値
+    values = {(1, "C1"): 1.0000000000000002, (2, "C1"): 0.9999999, (3, "C2"): 0.9999999999999998}
+    for (h, d, p, c) in model.x:
+        model.x[h, d, p, c].varValue = values.get((p, c), 1e-9)
+
+    entries = create_timetable_entries(model)
+
+    assert [(e.period, e.course) for e in entries] == [(1, "C1"), (2, "C1"), (3, "C2")]
@@ -0,0 +1,117 @@
+import pytest
+from application.factories.fingerprint_factory import create_fingerprint
+from application.models.dto import OptimiseAnnualTimetableDto
+
+
+@pytest.fixture
+def sample_request():
+    return {
+        "ttid": "t1",
+        "annualData": {
+            "schoolDays": [
+                {"day": "mon", "available": True, "amPeriods": 2, "pmPeriods": 1},
+                {"day": "tue", "available": True, "amPeriods": 2, "pmPeriods": 1},
+            ],
+            "homerooms": [
+                {"id": "H1", "days": [{"day": "mon", "periods": 3}, {"day": "tue", "periods": 3}]},
+                {"id": "H2", "days": [{"day": "mon", "periods": 3}]},
+            ],
+            "instructors": [
+                {"id": "I1", "days": [{"day": "mon", "unavailablePeriods": [1, 2]}]},
+                {"id": "I2", "days": []},
+            ],
+            "rooms": [],
+            "courses": [
+                {"id": "C1", "credits": 2, "courseDetails": [{"instructorId": "I1"}]},
+                {"id": "C2", "credits": 1, "courseDetails": [{"instructorId": "I2"}, {"instructorId": "I1"}]},
+            ],
+            "curriculums": [
+                {"homeroomId": "H1", "blocks": [{"id": "B1", "lanes": [{"courseIds": ["C1", "C2"]}]}]},
+                {"homeroomId": "H2", "blocks": [{"id": "B2", "lanes": [{"courseIds": ["C1"]}]}]},
+            ],
+        },
+        "constraintDefinitions": [
+            {"constraintDefinitionCode": "AFTERNOON", "softFlag": False},
+            {
+                "constraintDefinitionCode": "CONSECUTIVE_PERIOD",
+                "softFlag": False,
+                "parameters": [{"key": "courseId", "value": "C1"}],
+            },
+        ],
+    }
+
+
+def _reversed_lists(value, keep=("schoolDays",)):
+    """schoolDays以外のリストを逆順にする。"""
+    if isinstance(value, dict):
+        return {k: (v if k in keep else _reversed_lists(v, keep)) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_reversed_lists(v, keep) for v in reversed(value)]
+    return value
+
+
+def test_fingerprint_ignores_order(sample_request):
+    reordered = _reversed_lists(sample_request)
+    reordered["ttid"] = "t2"
+    reordered["debug"] = True
+
+    assert create_fingerprint(OptimiseAnnualTimetableDto(**sample_request)) == create_fingerprint(
+        OptimiseAnnualTimetableDto(**reordered)
+    )
+
+
+def test_fingerprint_depends_on_school_day_order(sample_request):
+    reordered = dict(sample_request)
+    reordered["annualData"] = {
+        **sample_request["annualData"],
+        "schoolDays": list(reversed(sample_request["annualData"]["schoolDays"])),
+    }
+
+    assert create_fingerprint(OptimiseAnnualTimetableDto(**sample_request)) != create_fingerprint(
+        OptimiseAnnualTimetableDto(**reordered)
+    )
+
+
+def test_fingerprint_depends_on_content(sample_request):
+    changed = _reversed_lists(sample_request, keep=())
+    changed["annualData"]["courses"][0]["credits"] += 1
+
+    assert create_fingerprint(OptimiseAnnualTimetableDto(**sample_request)) != create_fingerprint(
+        OptimiseAnnualTimetableDto(**changed)
+    )
+
+
+def test_fingerprint_depends_on_solver_settings(sample_request):
+    default = create_fingerprint(OptimiseAnnualTimetableDto(**sample_request))
+
+    # ソルバー設定の省略と、すべての項目の省略は同一視する
+    assert default == create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, solverSettings={}))
+    assert default != create_fingerprint(
+        OptimiseAnnualTimetableDto(**sample_request, solverSettings={"timeLimit": 10})
+    )
+
+
+def test_fingerprint_depends_on_warm_start(sample_request):
+    entries = [
+        {"homeroom": "H1", "day": "mon", "period": 1, "course": "C1"},
+        {"homeroom": "H1", "day": "mon", "period": 2, "course": "C2"},
+    ]
+    warm = create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, warmStart=entries))
+
+    assert warm == create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, warmStart=entries[::-1]))
+    assert warm != create_fingerprint(OptimiseAnnualTimetableDto(**sample_request))
+
+
+def test_fingerprint_depends_on_mode(sample_request):
+    fast = create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, mode="FAST"))
+
+    assert fast != create_fingerprint(OptimiseAnnualTimetableDto(**sample_request))
+    assert create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, mode="EXACT")) == create_fingerprint(
+        OptimiseAnnualTimetableDto(**sample_request)
+    )
+
+
+def test_fingerprint_depends_on_lns_settings(sample_request):
+    lns = create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, mode="LNS", lnsSettings={"subTimeLimit": 5}))
+
+    assert lns != create_fingerprint(OptimiseAnnualTimetableDto(**sample_request, mode="LNS"))
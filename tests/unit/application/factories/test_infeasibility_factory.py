@@ -0,0 +1,25 @@
+from application.factories.infeasibility_factory import create_infeasibilities
+from common.constants import InfeasibilityKind
+from domain.vo.id_labels import IdLabelsVo
+from domain.vo.infeasibility import InfeasibilityVo
+
+INFEASIBILITIES = [
+    InfeasibilityVo(
+        kind=InfeasibilityKind.COURSE_CREDITS, homerooms=[1], courses=[0], instructors=[0], required=3, available=2
+    ),
+]
+
+
+def test_create_infeasibilities():
+    labels = IdLabelsVo(homerooms=["H1", "H2"], days=["mon"], courses=["C1"], instructors=["I1"])
+
+    [infeasibility] = create_infeasibilities(INFEASIBILITIES, labels)
+
+    assert (infeasibility.homerooms, infeasibility.courses, infeasibility.instructors) == (["H2"], ["C1"], ["I1"])
+    assert (infeasibility.required, infeasibility.available) == (3, 2)
+
+
+def test_create_infeasibilities_without_labels():
+    [infeasibility] = create_infeasibilities(INFEASIBILITIES)
+
+    assert (infeasibility.homerooms, infeasibility.courses, infeasibility.instructors) == (["1"], ["0"], ["0"])
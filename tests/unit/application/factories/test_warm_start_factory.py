@@ -0,0 +1,24 @@
+from application.factories.warm_start_factory import create_warm_start
+from application.models.dto import TimetableEntryDto
+from domain.vo.id_labels import IdLabelsVo
+
+ENTRIES = [
+    TimetableEntryDto(homeroom="H1", day="mon", period=1, course="C1"),
+    TimetableEntryDto(homeroom="H2", day="tue", period=3, course="C2"),
+    # 今回の年次データから削除された講座
+    TimetableEntryDto(homeroom="H1", day="mon", period=2, course="C9"),
+]
+
+
+def test_create_warm_start():
+    labels = IdLabelsVo(homerooms=["H1", "H2"], days=["mon", "tue"], courses=["C1", "C2"], instructors=["I1"])
+
+    warm_start = create_warm_start(ENTRIES, labels)
+
+    assert warm_start.assignments == {(0, 0, 1, 0), (1, 1, 3, 1)}
+
+
+def test_create_warm_start_without_labels():
+    warm_start = create_warm_start(ENTRIES)
+
+    assert warm_start.assignments == {("H1", "mon", 1, "C1"), ("H2", "tue", 3, "C2"), ("H1", "mon", 2, "C9")}
@@ -0,0 +1,126 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from application.models.dto import (
+    AnnualTimetableResultDto, OptimisationJobDto, OptimiseAnnualTimetableDto, SolveProgressDto, TimetableEntryDto
+)
+from application.usecases.optimise_annual_timetable_job_usecase import (
+    OptimiseAnnualTimetableJobUsecase, optimise_annual_timetable
+)
+from common.constants import JobStatus, SolverBackend, SolveStatus
+from domain.exceptions.exceptions import InfeasibleInputError
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+from infrastructure.jobs.job_manager import Job, JobManager
+
+from test_optimise_annual_timetable_usecase import INFEASIBLE_REQUEST, REQUEST
+
+
+def test_submit_uses_cache(mocker):
+    result = AnnualTimetableResultDto(entries=[], violations=[])
+    manager = JobManager(max_workers=1)
+
+    def run_immediately(target, payload, on_success=None):
+        on_success(result)
+        return manager.add_finished(result)
+
+    submit = mocker.patch.object(manager, "submit", side_effect=run_immediately)
+    cache = TtlLruCache(max_size=4, ttl_seconds=60)
+    usecase = OptimiseAnnualTimetableJobUsecase(manager, cache=cache)
+
+    first = usecase.submit(OptimiseAnnualTimetableDto(**REQUEST))
+    second = usecase.submit(OptimiseAnnualTimetableDto(**{**REQUEST, "ttid": "t2"}))
+
+    # 2回目はキャッシュにある結果で成功済みのジョブになる
+    assert submit.call_count == 1
+    assert submit.call_args.args == (optimise_annual_timetable, OptimiseAnnualTimetableDto(**REQUEST))
+    assert first.job_id != second.job_id
+    assert second.status == JobStatus.SUCCEEDED
+    assert usecase.get_result(second.job_id) is result
+    assert usecase.get_job("unknown") is None
+
+
+def test_submit_rejects_infeasible_input(mocker):
+    manager = JobManager(max_workers=1)
+    submit = mocker.patch.object(manager, "submit")
+    usecase = OptimiseAnnualTimetableJobUsecase(manager, cache=TtlLruCache(max_size=4, ttl_seconds=60))
+
+    # 入力に矛盾がある場合はジョブを投入しない
+    with pytest.raises(InfeasibleInputError):
+        usecase.submit(OptimiseAnnualTimetableDto(**INFEASIBLE_REQUEST))
+    submit.assert_not_called()
+
+
+def test_submit_runs_portfolio_in_job_worker(mocker):
+    # ジョブのワーカー（デーモンプロセス）では子プロセスを起動できないため、ポートフォリオのソルバーを順に実行する
+    mocker.patch.dict("os.environ", {"SOLVER_PORTFOLIO": "HIGHS:0,CBC:0"})
+    manager = JobManager(max_workers=1)
+    try:
+        usecase = OptimiseAnnualTimetableJobUsecase(manager)
+        # 前処理で解が決まらないように、2講座を2時限のどちらに置いてもよい入力にする
+        request = {**REQUEST, "annualData": {
+            **REQUEST["annualData"],
+            "instructors": [{"id": "I1", "days": []}, {"id": "I2", "days": []}],
+            "courses": [
+                {"id": "C1", "credits": 1, "courseDetails": [{"instructorId": "I1"}]},
+                {"id": "C2", "credits": 1, "courseDetails": [{"instructorId": "I2"}]},
+            ],
+            "curriculums": [{"homeroomId": "H1", "blocks": [
+                {"id": "B1", "lanes": [{"courseIds": ["C1"]}]},
+                {"id": "B2", "lanes": [{"courseIds": ["C2"]}]},
+            ]}],
+        }}
+        job = usecase.submit(OptimiseAnnualTimetableDto(**request, solver=SolverBackend.PORTFOLIO))
+        deadline = time.monotonic() + 60
+        while (job := usecase.get_job(job.job_id)).status not in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+        assert job.status == JobStatus.SUCCEEDED, job.error
+        result = usecase.get_result(job.job_id)
+        assert result.solve_result.status == SolveStatus.OPTIMAL
+        assert result.solve_result.backend == SolverBackend.HIGHS.value
+    finally:
+        manager.shutdown()
+
+
+def test_watch_streams_progress_until_finished(mocker):
+    entry = TimetableEntryDto(homeroom="h1", day="mon", period=1, course="c1")
+    first = SolveProgressDto(elapsed_seconds=1.0, objective=10.0, bound=5.0, gap=0.5, entries=[entry])
+    last = SolveProgressDto(elapsed_seconds=2.0, objective=8.0, bound=8.0, gap=0.0)
+    running = Job(job_id="j1", status=JobStatus.RUNNING, progress=first, progress_seq=1)
+    finished = replace(running, status=JobStatus.SUCCEEDED, progress=last, progress_seq=2)
+
+    manager = JobManager(max_workers=1)
+    # 1回目は進捗、2回目は通知なし（タイムアウト）、3回目で終了
+    wait = mocker.patch.object(manager, "wait", side_effect=[running, running, finished])
+    events = list(OptimiseAnnualTimetableJobUsecase(manager).watch("j1", keepalive_seconds=0.5))
+
+    assert [call.args for call in wait.call_args_list] == [("j1", 0, 0.5), ("j1", 1, 0.5), ("j1", 1, 0.5)]
+    assert events[0] == first.model_copy(update={"entries": None})
+    assert events[1] is None
+    assert events[2] == last
+    assert isinstance(events[3], OptimisationJobDto) and events[3].status == JobStatus.SUCCEEDED
+    assert len(events) == 4
+
+    mocker.patch.object(manager, "wait", side_effect=[finished])
+    assert list(OptimiseAnnualTimetableJobUsecase(manager).watch("j1", include_entries=True))[0] == last
+
+    mocker.patch.object(manager, "wait", side_effect=[running, None])
+    assert list(OptimiseAnnualTimetableJobUsecase(manager).watch("j1", include_entries=True)) == [first]
+
+
+def test_resolve_warm_start_from_job():
+    entry = TimetableEntryDto(homeroom="H1", day="mon", period=1, course="C1")
+    manager = JobManager(max_workers=1)
+    job = manager.add_finished(AnnualTimetableResultDto(entries=[entry], violations=[]))
+    usecase = OptimiseAnnualTimetableJobUsecase(manager)
+
+    dto = OptimiseAnnualTimetableDto(**REQUEST, warmStartJobId=job.job_id)
+    resolved = usecase.resolve_warm_start(dto)
+
+    assert resolved.warm_start == [entry]
+    assert resolved.warm_start_job_id is None
+    assert usecase.resolve_warm_start(OptimiseAnnualTimetableDto(**REQUEST)).warm_start is None
+    assert usecase.resolve_warm_start(OptimiseAnnualTimetableDto(**REQUEST, warmStartJobId="unknown")) is None
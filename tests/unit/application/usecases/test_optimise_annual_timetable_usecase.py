@@ -0,0 +1,181 @@
+import pytest
+
+from application.models.dto import AnnualTimetableResultDto, OptimiseAnnualTimetableDto
+from application.usecases import optimise_annual_timetable_usecase as usecase_module
+from application.usecases.optimise_annual_timetable_usecase import OptimiseAnnualTimetableUsecase
+from common.constants import HEURISTIC_BACKEND, CacheStatus, InfeasibilityKind, SolverBackend, SolveStatus
+from domain.exceptions.exceptions import InfeasibleInputError, OptimizationCancelledError
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+from infrastructure.jobs.process_pool import ProcessPool
+
+REQUEST = {
+    "ttid": "t1",
+    "annualData": {
+        "schoolDays": [{"day": "mon", "available": True, "amPeriods": 1, "pmPeriods": 1}],
+        "homerooms": [{"id": "H1", "days": [{"day": "mon", "periods": 2}]}],
+        "instructors": [{"id": "I1", "days": []}],
+        "rooms": [],
+        "courses": [{"id": "C1", "credits": 2, "courseDetails": [{"instructorId": "I1"}]}],
+        "curriculums": [{"homeroomId": "H1", "blocks": [{"id": "B1", "lanes": [{"courseIds": ["C1"]}]}]}],
+    },
+    "constraintDefinitions": [],
+}
+
+
+def test_execute_uses_cache(mocker):
+    result = AnnualTimetableResultDto(entries=[], violations=[])
+    optimise = mocker.patch.object(OptimiseAnnualTimetableUsecase, "_optimise", return_value=result)
+    cache = TtlLruCache(max_size=4, ttl_seconds=60)
+
+    first = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**REQUEST), cache=cache)
+    assert first.execute() is result
+    assert first.cache_status == CacheStatus.MISS
+
+    second = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**{**REQUEST, "ttid": "t2"}), cache=cache)
+    assert second.execute() is result
+    assert second.cache_status == CacheStatus.HIT
+    assert optimise.call_count == 1
+
+
+def test_execute_bypasses_cache_when_debug(mocker):
+    result = AnnualTimetableResultDto(entries=[], violations=[])
+    optimise = mocker.patch.object(OptimiseAnnualTimetableUsecase, "_optimise", return_value=result)
+    cache = TtlLruCache(max_size=4, ttl_seconds=60)
+
+    for _ in range(2):
+        usecase = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**REQUEST, debug=True), cache=cache)
+        usecase.execute()
+        assert usecase.cache_status == CacheStatus.BYPASS
+    assert optimise.call_count == 2
+    assert len(cache) == 0
+
+
+def test_execute_raises_when_cancelled():
+    cache = TtlLruCache(max_size=4, ttl_seconds=60)
+    usecase = OptimiseAnnualTimetableUsecase(
+        OptimiseAnnualTimetableDto(**REQUEST, solver=SolverBackend.HIGHS), cache=cache
+    )
+    # 求解前にキャンセルした場合は求解を開始しない
+    usecase.cancel("test")
+
+    with pytest.raises(OptimizationCancelledError) as e:
+        usecase.execute()
+    assert e.value.reason == "test"
+    assert len(cache) == 0
+
+
+def test_execute_fast_mode(mocker):
+    solve = mocker.patch("application.usecases.optimise_annual_timetable_usecase.AnnualLpService.solve")
+    usecase = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**REQUEST, mode="FAST"))
+
+    result = usecase.execute()
+
+    # 求解せず、貪欲法で構築した時間割を返す
+    solve.assert_not_called()
+    assert result.solve_result.status == SolveStatus.FEASIBLE
+    assert result.solve_result.backend == HEURISTIC_BACKEND
+    assert result.solve_result.unsatisfied_rows == 0
+    assert sorted((e.day, e.period, e.course) for e in result.entries) == [("mon", 1, "C1"), ("mon", 2, "C1")]
+
+
+def test_execute_lns_mode():
+    usecase = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(
+        **REQUEST, solver=SolverBackend.HIGHS, solverSettings={"timeLimit": 10}, mode="LNS"
+    ))
+
+    result = usecase.execute()
+
+    # 構築した時間割の目的関数値が下界（0）に等しいため、部分問題を解かずに返す
+    assert result.solve_result.status == SolveStatus.OPTIMAL
+    assert result.solve_result.backend == HEURISTIC_BACKEND
+    assert [i.iteration for i in result.solve_result.improvements] == [0]
+    assert sorted((e.day, e.period, e.course) for e in result.entries) == [("mon", 1, "C1"), ("mon", 2, "C1")]
+
+
+# H1・H2は講座も教員も共有しないため、別々のLPモデルとして解いて結果をまとめる
+# C1の2コマ連続開講制約は、C1を含む部分にだけ適用する
+DECOMPOSED_REQUEST = {**REQUEST, "constraintDefinitions": [{
+    "constraintDefinitionCode": "CONSECUTIVE_PERIOD",
+    "softFlag": False,
+    "parameters": [{"key": "courseId", "value": "C1"}],
+}], "annualData": {
+    **REQUEST["annualData"],
+    "homerooms": [{"id": h, "days": [{"day": "mon", "periods": 2}]} for h in ("H1", "H2")],
+    "instructors": [{"id": "I1", "days": []}, {"id": "I2", "days": []}],
+    "courses": [
+        {"id": "C1", "credits": 2, "courseDetails": [{"instructorId": "I1"}]},
+        {"id": "C2", "credits": 2, "courseDetails": [{"instructorId": "I2"}]},
+    ],
+    "curriculums": [
+        {"homeroomId": h, "blocks": [{"id": f"B{h}", "lanes": [{"courseIds": [c]}]}]}
+        for h, c in (("H1", "C1"), ("H2", "C2"))
+    ],
+}}
+
+
+def test_execute_decomposed(mocker):
+    pool_map = mocker.spy(ProcessPool, "map")
+    # 2プロセスで並列に解く場合と、順に解く場合
+    for workers, calls in (("2", 1), ("1", 1)):
+        mocker.patch.dict("os.environ", {"DECOMPOSITION_WORKERS": workers})
+        usecase = OptimiseAnnualTimetableUsecase(
+            OptimiseAnnualTimetableDto(**DECOMPOSED_REQUEST, solver=SolverBackend.HIGHS)
+        )
+
+        result = usecase.execute()
+
+        assert result.solve_result.status == SolveStatus.OPTIMAL
+        assert result.solve_result.objective == 0
+        assert result.solve_result.backend == SolverBackend.HIGHS.value
+        assert sorted((e.homeroom, e.day, e.period, e.course) for e in result.entries) == [
+            ("H1", "mon", 1, "C1"), ("H1", "mon", 2, "C1"), ("H2", "mon", 1, "C2"), ("H2", "mon", 2, "C2")
+        ]
+        assert pool_map.call_count == calls
+
+
+def test_execute_decomposed_splits_time_limit(mocker):
+    dto = OptimiseAnnualTimetableDto(
+        **DECOMPOSED_REQUEST, solver=SolverBackend.HIGHS, solverSettings={"timeLimit": 10}
+    )
+    create_solver = mocker.spy(usecase_module, "create_solver")
+    pool_map = mocker.spy(ProcessPool, "map")
+
+    # 並列に解く場合は、同時に解く部分ごとにタイムリミット全体を割り当てる
+    mocker.patch.dict("os.environ", {"DECOMPOSITION_WORKERS": "2"})
+    OptimiseAnnualTimetableUsecase(dto).execute()
+    assert [args[4] for args in pool_map.call_args.args[2]] == [10, 10]
+
+    # 順に解く場合は、残り時間をまだ解いていない部分で等分する（先に解いた部分の残り時間は次の部分に回す）
+    mocker.patch.dict("os.environ", {"DECOMPOSITION_WORKERS": "1"})
+    OptimiseAnnualTimetableUsecase(dto).execute()
+    first, second = [call.args[1].time_limit for call in create_solver.call_args_list]
+    assert first == pytest.approx(5, abs=0.1)
+    assert first < second < 10
+
+
+# C1（3単位）がH1の時限数（2時限）を超える
+INFEASIBLE_REQUEST = {**REQUEST, "annualData": {
+    **REQUEST["annualData"],
+    "courses": [{"id": "C1", "credits": 3, "courseDetails": [{"instructorId": "I1"}]}],
+}}
+
+
+def test_execute_raises_when_input_is_infeasible(mocker):
+    solve = mocker.patch("application.usecases.optimise_annual_timetable_usecase.AnnualLpService.solve")
+    usecase = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**INFEASIBLE_REQUEST))
+
+    with pytest.raises(InfeasibleInputError) as e:
+        usecase.execute()
+
+    # LPモデルを構築せずに、矛盾を返す
+    solve.assert_not_called()
+    assert [i.kind for i in e.value.infeasibilities] == [
+        InfeasibilityKind.COURSE_CREDITS, InfeasibilityKind.INSTRUCTOR_LOAD
+    ]
+    assert e.value.labels.courses == ["C1"]
+
+
+def test_execute_fast_mode_skips_feasibility_check():
+    result = OptimiseAnnualTimetableUsecase(OptimiseAnnualTimetableDto(**INFEASIBLE_REQUEST, mode="FAST")).execute()
+
+    assert result.solve_result.status == SolveStatus.INCOMPLETE
@@ -1,10 +1,16 @@
 import pulp
 from domain.constraints.consecutive_period import ConsecutivePeriodConstraint
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.gurobi_solver import GurobiSolver
 
 
-def test_consecutive_period(mock_annual_model):
+def test_consecutive_period(mock_annual_data):
+    definition = ConstraintDefinitionVo(
+        code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": "C2"}
+    )
     course_constraint = ConsecutivePeriodConstraint('C2')
-    model = course_constraint.apply(mock_annual_model)
+    model = course_constraint.apply(AnnualLpModel(mock_annual_data, [definition], GurobiSolver()))
 
     expected_constraints = [
         # {
@@ -170,3 +176,24 @@ def test_consecutive_period(mock_annual_model):
         for e, a in zip(expected_coefficients, actual_coefficients):
             assert e["name"] == a["name"]
             assert e["value"] == a["value"]
+
+
+def test_consecutive_period_batch(mock_annual_data):
+    # 複数の講座をまとめて適用した場合も、講座ごとに適用した場合と同じ行を書き出す
+    definitions = [
+        ConstraintDefinitionVo(
+            code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": c}
+        )
+        for c in ("C1", "C2")
+    ]
+    separate = AnnualLpModel(mock_annual_data, definitions, GurobiSolver())
+    for c in ("C1", "C2"):
+        ConsecutivePeriodConstraint(c).apply(separate)
+    batched = AnnualLpModel(mock_annual_data, definitions, GurobiSolver())
+    applier = ConsecutivePeriodConstraint.batch([{"courseId": "C1"}, {"course": "C2"}, {"courseId": "C1"}])
+    applier.apply(batched)
+
+    assert applier.courses == ["C1", "C2"]
+    assert [v.toDict() for v in batched.problem.constraints.values()] == [
+        v.toDict() for v in separate.problem.constraints.values()
+    ]
@@ -1,5 +1,7 @@
 import pulp
 from domain.constraints.course import CourseConstraint
+from domain.models.annual_lp_model import AnnualLpModel
+from infrastructure.solvers.gurobi_solver import GurobiSolver
 
 
 def test_course_constraint(mock_annual_model):
@@ -105,3 +107,26 @@ def test_course_constraint(mock_annual_model):
         for e, a in zip(expected_coefficients, actual_coefficients):
             assert e["name"] == a["name"]
             assert e["value"] == a["value"]
+
+
+def test_course_constraint_with_merged_shared_courses(mock_annual_data):
+    """共有講座の解変数をまとめる場合、学級間の等式制約は生成されない。"""
+    model = AnnualLpModel(mock_annual_data, [], GurobiSolver(), merge_shared_courses=True)
+    model = CourseConstraint().apply(model)
+
+    assert len(model.problem.constraints) == 0
+
+    # 複数学級が履修する講座は同一の変数を参照する
+    assert model.x["H1", "mon", 1, "C1"] is model.x["H2", "mon", 1, "C1"]
+    assert model.x["H1", "mon", 1, "C1"] is model.x["H3", "mon", 1, "C1"]
+    assert model.x["H1", "mon", 1, "C1"].name == "x_mon_1_C1"
+
+    # 1学級のみが履修する講座は学級ごとの変数のまま
+    assert model.x["H1", "mon", 1, "C3"].name == "x_H1_mon_1_C3"
+
+    # 学級の時限にない(曜日, 時限)は参照を持たない
+    assert ("H3", "mon", 2, "C1") not in model.x
+    assert model.x["H2", "mon", 3, "C1"].name == "x_mon_3_C1"
+
+    # 変数の数: C1, C2は(曜日, 時限)ごとに1つ、C3はH1の4コマ分
+    assert len({id(v) for v in model.x.values()}) == 5 + 5 + 4
@@ -1,5 +1,9 @@
 import pulp
 from domain.constraints.courses_per_day import CoursesPerDayConstraint
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.annual_data import AnnualDataVo, CourseDetailVo
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.gurobi_solver import GurobiSolver
 
 
 def test_course_per_day(mock_annual_model):
@@ -73,3 +77,32 @@ def test_course_per_day(mock_annual_model):
         for e, a in zip(expected_coefficients, actual_coefficients):
             assert e["name"] == a["name"]
             assert e["value"] == a["value"]
+
+
+def test_course_per_day_allows_twice_for_interned_course_zero():
+    # 整数IDに変換した講座0の2コマ連続開講制約も、同日2コマ開講を許可する
+    data = AnnualDataVo(
+        H=[0],
+        D=[0],
+        P=[1, 2, 3, 4],
+        C=[0, 1],
+        I=[0, 1],
+        homeroom_day_dict={0: {0: [1, 2, 3, 4]}},
+        curriculum_dict={0: [[[0]], [[1]]]},
+        credit_dict={0: 2, 1: 2},
+        course_details_dict={
+            0: [CourseDetailVo(instructor_id=0, room_id=None)],
+            1: [CourseDetailVo(instructor_id=1, room_id=None)],
+        },
+        school_day_dict={0: {"am_periods": 2, "pm_periods": 2}},
+        attendance_day_dict={}
+    )
+    definitions = [
+        ConstraintDefinitionVo(
+            code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": c}
+        )
+        for c in (0, 1)
+    ]
+    model = CoursesPerDayConstraint().apply(AnnualLpModel(data, definitions, GurobiSolver()))
+
+    assert [c.constant for c in model.problem.constraints.values()] == [-2, -2]
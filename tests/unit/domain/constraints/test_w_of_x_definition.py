@@ -1,10 +1,21 @@
 import pulp
 from domain.constraints.w_of_x_definition import WofXDefinition
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from infrastructure.solvers.gurobi_solver import GurobiSolver
 
 
-def test_w_of_x_definition(mock_annual_model):
+def _consecutive_period(course: str) -> ConstraintDefinitionVo:
+    return ConstraintDefinitionVo(
+        code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": course}
+    )
+
+
+def test_w_of_x_definition(mock_annual_data):
+    # wは2コマ連続開講制約の講座についてのみ定義される
+    definitions = [_consecutive_period(c) for c in ("C1", "C2", "C3")]
     course_constraint = WofXDefinition()
-    model = course_constraint.apply(mock_annual_model)
+    model = course_constraint.apply(AnnualLpModel(mock_annual_data, definitions, GurobiSolver()))
 
     expected_constraints = [
         # 0
@@ -337,3 +348,10 @@ def test_w_of_x_definition(mock_annual_model):
         for e, a in zip(expected_coefficients, actual_coefficients):
             assert e["name"] == a["name"]
             assert e["value"] == a["value"]
+
+
+def test_w_of_x_definition_without_consecutive_period(mock_annual_model):
+    model = WofXDefinition().apply(mock_annual_model)
+
+    assert len(model.w) == 0
+    assert len(model.problem.constraints) == 0
@@ -0,0 +1,117 @@
+import pulp
+from domain.models.lp_matrix import INF, LpMatrix
+
+
+def test_from_problem():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    a = pulp.LpVariable("a", cat=pulp.LpBinary)
+    b = pulp.LpVariable("b", lowBound=0)
+    c = pulp.LpVariable("c", cat=pulp.LpBinary)
+    problem += 2 * c + 1
+    problem += a + b <= 3
+    problem += a - c == 0
+    problem += b >= 1
+
+    matrix = LpMatrix.from_problem(problem)
+
+    # 列は制約、目的関数の順に現れた順で割り当てられる
+    assert [v.name for v in matrix.variables] == ["a", "b", "c"]
+    assert matrix.col_lower == [0, 0, 0]
+    assert matrix.col_upper == [1, INF, 1]
+    assert matrix.integrality == [True, False, True]
+    assert matrix.objective == [0.0, 0.0, 2.0]
+    assert matrix.objective_offset == 1
+
+    assert matrix.senses == [pulp.LpConstraintLE, pulp.LpConstraintEQ, pulp.LpConstraintGE]
+    assert matrix.rhs == [3, 0, 1]
+    assert list(zip(matrix.rows, matrix.cols, matrix.coefs)) == [
+        (0, 0, 1), (0, 1, 1),
+        (1, 0, 1), (1, 2, -1),
+        (2, 1, 1),
+    ]
+    assert (matrix.num_rows, matrix.num_cols, matrix.num_nonzeros) == (3, 3, 5)
+
+
+def test_assign_values():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    a = pulp.LpVariable("a", cat=pulp.LpBinary)
+    b = pulp.LpVariable("b", cat=pulp.LpBinary)
+    problem += a + b >= 1
+
+    matrix = LpMatrix.from_problem(problem)
+    matrix.assign_values([1.0, 0.0])
+
+    assert a.value() == 1
+    assert b.value() == 0
+
+
+def test_to_problem():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    a = pulp.LpVariable("a", cat=pulp.LpBinary)
+    b = pulp.LpVariable("b", lowBound=0)
+    problem += 2 * a + b + 1
+    problem += a + b >= 2
+    problem += a - b <= 0
+
+    converted, variables = LpMatrix.from_problem(problem).to_problem()
+    converted.solve(pulp.PULP_CBC_CMD(msg=False))
+
+    assert [v.name for v in variables] == ["a", "b"]
+    assert [v.value() for v in variables] == [0, 2]
+    assert pulp.value(converted.objective) == 3
+    assert len(converted.constraints) == 2
+
+
+def test_complete_start():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x1 = pulp.LpVariable("x1", cat=pulp.LpBinary)
+    x2 = pulp.LpVariable("x2", cat=pulp.LpBinary)
+    w = pulp.LpVariable("w", cat=pulp.LpBinary)
+    y = pulp.LpVariable("y", lowBound=0, upBound=2, cat=pulp.LpInteger)
+    v = pulp.LpVariable("v", cat=pulp.LpBinary)
+    problem += v
+    # w = min(x1, x2)
+    problem += w - x1 <= 0
+    problem += w - x2 <= 0
+    problem += x1 + x2 - w <= 1
+    # ペナルティの行が、後で導出されるyを参照する
+    problem += y - 2 * v <= 1
+    problem += y - x1 - x2 == 0
+    x1.varValue = x2.varValue = 1
+
+    matrix = LpMatrix.from_problem(problem)
+    assert dict(zip(matrix.names, matrix.start)) == {"x1": 1, "x2": 1, "w": None, "y": None, "v": None}
+    matrix.complete_start()
+
+    assert dict(zip(matrix.names, matrix.start)) == {"x1": 1, "x2": 1, "w": 1, "y": 2, "v": 1}
+
+
+def test_evaluate():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    a = pulp.LpVariable("a", cat=pulp.LpBinary)
+    b = pulp.LpVariable("b", cat=pulp.LpBinary)
+    problem += 2 * a + 3 * b + 1
+    problem += a + b <= 2
+    problem += a - b == 0
+    problem += b >= 1
+
+    matrix = LpMatrix.from_problem(problem)
+
+    # 目的関数値（定数項を含む）と、満たさない行の数
+    assert matrix.evaluate([1, 1]) == (6.0, 0)
+    assert matrix.evaluate([0, 0]) == (1.0, 1)
+    assert matrix.evaluate([0, 1]) == (4.0, 1)
+
+
+def test_complete_start_without_values():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    a = pulp.LpVariable("a", cat=pulp.LpBinary)
+    problem += a >= 0
+
+    matrix = LpMatrix.from_problem(problem)
+    matrix.complete_start()
+
+    # 初期値を渡さない
+    assert matrix.start is None
+    converted, variables = matrix.to_problem()
+    assert variables[0].varValue is None
@@ -0,0 +1,81 @@
+import pulp
+from domain.models.lp_matrix import LpMatrix
+from domain.models.sparse_rows import SparseRows
+from domain.models.variables import ColumnRegistry
+
+
+def test_add_row():
+    rows = SparseRows()
+    rows.add_row([0, 1], [1, 1], pulp.LpConstraintLE, 3)
+    rows.add_row([2], [-1], pulp.LpConstraintEQ, 0)
+
+    assert list(zip(rows.rows, rows.cols, rows.coefs)) == [(0, 0, 1), (0, 1, 1), (1, 2, -1)]
+    assert rows.senses == [pulp.LpConstraintLE, pulp.LpConstraintEQ]
+    assert rows.rhs == [3, 0]
+    assert (len(rows), rows.num_nonzeros) == (2, 3)
+
+
+def test_extend():
+    rows = SparseRows()
+    rows.add_row([0], [1], pulp.LpConstraintGE, 1)
+    rows.add_objective([0], [1])
+    other = SparseRows()
+    other.add_row([1, 2], [1, -1], pulp.LpConstraintEQ, 0)
+    other.add_objective([0, 1], [2, 1])
+
+    rows.extend(other)
+
+    assert list(zip(rows.rows, rows.cols, rows.coefs)) == [(0, 0, 1), (1, 1, 1), (1, 2, -1)]
+    assert rows.objective == {0: 3, 1: 1}
+
+
+def test_add_to_problem():
+    columns = ColumnRegistry()
+    a = columns.add("a")
+    b = columns.add("b")
+    rows = SparseRows()
+    # 同じ列が複数回現れる場合は係数を合算する
+    rows.add_row([a, b, a], [1, 1, 1], pulp.LpConstraintLE, 2)
+    rows.add_objective([b], [1])
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    problem += columns.variable(a)
+
+    rows.add_to_problem(problem, columns)
+
+    constraint = list(problem.constraints.values())[0].toDict()
+    assert constraint["sense"] == pulp.LpConstraintLE
+    assert constraint["constant"] == -2
+    assert constraint["coefficients"] == [{"name": "a", "value": 2}, {"name": "b", "value": 1}]
+    # 既存の目的関数に項が加わる
+    assert {v.name: a for v, a in problem.objective.items()} == {"a": 1, "b": 1}
+
+
+def test_from_rows():
+    columns = ColumnRegistry()
+    a = columns.add("a")
+    b = columns.add("b", upper=3, integer=False)
+    rows = SparseRows()
+    rows.add_row([a, b], [1, 1], pulp.LpConstraintGE, 1)
+    rows.add_objective([b], [2])
+
+    matrix = LpMatrix.from_rows(columns, rows)
+
+    assert matrix.names == ["a", "b"]
+    assert matrix.col_upper == [1, 3]
+    assert matrix.integrality == [True, False]
+    assert matrix.objective == [0.0, 2.0]
+    assert (matrix.num_rows, matrix.num_cols, matrix.num_nonzeros) == (1, 2, 2)
+
+
+def test_assign_values_to_columns():
+    columns = ColumnRegistry()
+    a = columns.add("a")
+    b = columns.add("b")
+    variable_a = columns.variable(a)
+
+    columns.assign_values([1.0, 0.0])
+
+    # 生成済みの変数にも、後から生成した変数にも値が反映される
+    assert variable_a.value() == 1
+    assert columns.variable(b).value() == 0
+    assert columns.value(b) == 0
@@ -0,0 +1,60 @@
+from domain.services.annual_data_decomposer import AnnualDataDecomposer
+from domain.vo.annual_data import AnnualDataVo, CourseDetailVo
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+
+
+def _annual_data(instructor_of_c2: str) -> AnnualDataVo:
+    """講座を共有しない2学級の年次データを生成する（C2の教員によって、教員を共有するかが変わる）。"""
+    return AnnualDataVo(
+        H=["H1", "H2"],
+        D=["mon"],
+        P=[1, 2],
+        C=["C1", "C2", "C9"],
+        I=["I1", "I2", "I9"],
+        homeroom_day_dict={"H1": {"mon": [1, 2]}, "H2": {"mon": [1, 2]}},
+        curriculum_dict={"H1": [[["C1"]]], "H2": [[["C2"]]]},
+        credit_dict={"C1": 2, "C2": 2, "C9": 1},
+        course_details_dict={
+            "C1": [CourseDetailVo(instructor_id="I1", room_id="R1")],
+            "C2": [CourseDetailVo(instructor_id=instructor_of_c2, room_id="R2")],
+            "C9": [CourseDetailVo(instructor_id="I9", room_id="R9")],
+        },
+        school_day_dict={"mon": {"am_periods": 1, "pm_periods": 1}},
+        attendance_day_dict={"I1": {"mon": [1]}, "I2": {"mon": []}, "I9": {"mon": []}}
+    )
+
+
+def test_decompose_disconnected_homerooms():
+    parts = AnnualDataDecomposer.decompose(_annual_data("I2"))
+
+    assert [(part.H, part.C, part.I) for part in parts] == [
+        (["H1"], ["C1"], ["I1"]),
+        (["H2"], ["C2"], ["I2"]),
+    ]
+    assert parts[0].attendance_day_dict == {"I1": {"mon": [1]}}
+    assert parts[1].curriculum_dict == {"H2": [[["C2"]]]}
+    assert parts[1].credit_dict == {"C2": 2}
+    assert parts[1].index.course_instructors == {"C2": frozenset({"I2"})}
+
+
+def test_decompose_homerooms_sharing_instructor(mock_annual_data: AnnualDataVo):
+    data = _annual_data("I1")
+
+    # 教員を共有する学級は分割しない
+    assert AnnualDataDecomposer.decompose(data) == [data]
+    # H1〜H3は講座C1を共有する
+    assert AnnualDataDecomposer.decompose(mock_annual_data) == [mock_annual_data]
+
+
+def test_restrict_definitions():
+    # 講座を対象とする制約定義は、講座を含む部分にだけ適用する（整数IDの講座0も講座として扱う）
+    consecutive = ConstraintDefinitionVo(
+        code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": "C1"}
+    )
+    interned = consecutive.model_copy(update={"parameters": {"course": 0}})
+    afternoon = ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={})
+    definitions = [consecutive, interned, afternoon]
+    parts = AnnualDataDecomposer.decompose(_annual_data("I2"))
+
+    assert AnnualDataDecomposer.restrict_definitions(parts[0], definitions) == [consecutive, afternoon]
+    assert AnnualDataDecomposer.restrict_definitions(parts[1], definitions) == [afternoon]
@@ -0,0 +1,260 @@
+from dataclasses import replace
+
+import pulp
+import pytest
+
+from common.constants import LnsNeighbourhood, SolveStatus
+from domain.exceptions.exceptions import OptimizationCancelledError, OptimizationError
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.models.lp_matrix import MatrixSolution
+from domain.services.annual_lp_service import AnnualLpService
+from domain.vo.constraint_definition import ConstraintDefinitionVo
+from domain.vo.lns_settings import LnsSettingsVo
+from domain.vo.solver_settings import SolverSettingsVo
+from domain.vo.warm_start import WarmStartVo
+from infrastructure.solvers.gurobi_native_solver import GurobiNativeSolver
+from infrastructure.solvers.highs_solver import HighsSolver
+
+WARM_START = WarmStartVo(assignments=frozenset({
+    ("H1", "mon", 1, "C1"),
+    ("H1", "mon", 2, "C1"),
+    # LPモデルにない組は無視する
+    ("H9", "mon", 1, "C1"),
+}))
+CONSECUTIVE_PERIOD = ConstraintDefinitionVo(
+    code="CONSECUTIVE_PERIOD", soft_flag=False, penalty_weight=None, parameters={"courseId": "C1"}
+)
+
+
+def test_build_profile(mock_annual_model: AnnualLpModel):
+    AnnualLpService.build(mock_annual_model)
+    profile = mock_annual_model.build_profile
+
+    assert [p.applier for p in profile.appliers] == [
+        "WofXDefinition",
+        "YofXDefinition",
+        "HomeroomConstraint",
+        "CourseConstraint",
+        "CreditConstraint",
+        "BlockConstraint",
+        "InstructorConstraint",
+    ]
+    assert profile.rows == len(mock_annual_model.problem.constraints)
+    assert profile.nonzeros == sum(len(c) for c in mock_annual_model.problem.constraints.values())
+    # 2コマ連続開講制約がない場合はwが0個、ペナルティ変数を使用する制約がない場合はペナルティ変数を定義しない
+    assert profile.variables == {"x": 24, "y": 12, "w": 0}
+    # メモリ使用量は計測しない
+    assert all(p.memory_peak_bytes is None for p in profile.appliers)
+
+
+def test_build_profile_with_consecutive_period(mock_annual_data):
+    # wは2コマ連続開講制約の講座についてのみ、ペナルティ変数は参照する制約がある場合のみ定義する
+    afternoon = ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={})
+    model = AnnualLpModel(mock_annual_data, [CONSECUTIVE_PERIOD, afternoon], HighsSolver())
+    AnnualLpService.build_matrix(model)
+
+    assert model.build_profile.variables == {"x": 24, "y": 12, "w": 5, "v1": 3}
+    assert all(c == "C1" for (_, _, _, _, c) in model.w)
+    assert not model.has_family("v2")
+
+
+def test_build_batches_consecutive_period(mock_annual_data):
+    # 2コマ連続開講制約は、最初の制約定義の位置で1つの制約定義クラスにまとめて適用する
+    definitions = [
+        CONSECUTIVE_PERIOD,
+        ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={}),
+        CONSECUTIVE_PERIOD.model_copy(update={"parameters": {"courseId": "C2"}}),
+        CONSECUTIVE_PERIOD.model_copy(update={"parameters": {"courseId": "C3"}, "soft_flag": True}),
+    ]
+    model = AnnualLpModel(mock_annual_data, definitions, HighsSolver())
+    AnnualLpService.build_matrix(model)
+
+    assert [p.applier for p in model.build_profile.appliers][-2:] == [
+        "ConsecutivePeriodConstraint", "AfternoonConstraint"
+    ]
+    assert {c for (_, _, _, _, c) in model.w} == {"C1", "C2"}
+    assert model.w_keys("C2") == [key for key in model.w if key[4] == "C2"]
+    assert model.w_keys("C3") == []
+
+
+def test_build_matrix_profile(mock_annual_model: AnnualLpModel, mock_annual_data):
+    matrix = AnnualLpService.build_matrix(mock_annual_model, trace_memory=True)
+    profile = mock_annual_model.build_profile
+
+    # PuLP経由で構築した場合と、制約定義クラスごとの行数・非ゼロ要素数が一致する
+    model = AnnualLpModel(mock_annual_data, [], mock_annual_model.solver)
+    AnnualLpService.build(model)
+    assert [(p.rows, p.nonzeros) for p in profile.appliers] == [
+        (p.rows, p.nonzeros) for p in model.build_profile.appliers
+    ]
+    assert (profile.rows, profile.nonzeros) == (matrix.num_rows, matrix.num_nonzeros)
+    assert all(p.memory_peak_bytes >= 0 for p in profile.appliers)
+
+
+def test_solve_optimal(mock_annual_model: AnnualLpModel, mocker):
+    # 下界を返さないソルバー（最適解を得た場合のCBCなど）
+    mocker.patch.object(mock_annual_model.solver, "solve_problem", return_value=MatrixSolution(
+        status=pulp.LpStatusOptimal, sol_status=pulp.LpSolutionOptimal, objective=3.0
+    ))
+
+    result = AnnualLpService.solve(mock_annual_model)
+
+    assert result is mock_annual_model.solve_result
+    assert result.status == SolveStatus.OPTIMAL
+    assert (result.objective, result.bound, result.gap) == (3.0, 3.0, 0.0)
+    assert result.elapsed_seconds >= 0
+    assert result.build_seconds == mock_annual_model.build_profile.elapsed_seconds
+    assert result.backend == "GUROBI"
+
+
+def test_solve_returns_incumbent_on_time_limit(mock_annual_model: AnnualLpModel, mocker):
+    # 時間制限で打ち切られたが、実行可能解は得られている
+    mocker.patch.object(mock_annual_model.solver, "solve_problem", return_value=MatrixSolution(
+        status=pulp.LpStatusOptimal, sol_status=pulp.LpSolutionIntegerFeasible, objective=10.0, bound=8.0
+    ))
+
+    result = AnnualLpService.solve(mock_annual_model)
+
+    assert result.status == SolveStatus.FEASIBLE
+    assert (result.objective, result.bound) == (10.0, 8.0)
+    assert result.gap == pytest.approx(0.2)
+
+
+def test_solve_raises_without_solution(mock_annual_model: AnnualLpModel):
+    # H3の時限数（2）がC1の単位数（3）より少ないため、実行不可能
+    with pytest.raises(OptimizationError):
+        AnnualLpService.solve(mock_annual_model)
+    assert mock_annual_model.solve_result.status == SolveStatus.INFEASIBLE
+    assert mock_annual_model.solve_result.objective is None
+
+
+def test_solve_raises_when_cancelled(mock_annual_model: AnnualLpModel, mocker):
+    # 中断されたソルバーが結果を返しても採用しない
+    def cancel_during_solve(problem):
+        mock_annual_model.solver.cancel("client disconnected")
+        return MatrixSolution(
+            status=pulp.LpStatusOptimal, sol_status=pulp.LpSolutionIntegerFeasible, objective=10.0, bound=8.0
+        )
+
+    mocker.patch.object(mock_annual_model.solver, "solve_problem", side_effect=cancel_during_solve)
+    with pytest.raises(OptimizationCancelledError) as e:
+        AnnualLpService.solve(mock_annual_model)
+    assert e.value.reason == "client disconnected"
+    assert mock_annual_model.solve_result is None
+
+    # 中断済みの場合は求解しない
+    with pytest.raises(OptimizationCancelledError):
+        AnnualLpService.solve(mock_annual_model)
+    assert mock_annual_model.solver.solve_problem.call_count == 1
+
+
+def test_solve_passes_warm_start_to_problem(mock_annual_model: AnnualLpModel, mocker):
+    model = mock_annual_model
+    model.warm_start = WARM_START
+    model.constraint_definitions = [CONSECUTIVE_PERIOD]
+    solve_problem = mocker.patch.object(model.solver, "solve_problem", return_value=MatrixSolution(
+        status=pulp.LpStatusOptimal, sol_status=pulp.LpSolutionOptimal, objective=0.0
+    ))
+
+    AnnualLpService.solve(model)
+
+    # PuLP変数の値として渡す（解変数は前回の時間割、補助変数は制約行から導出）
+    assert solve_problem.call_count == 1
+    assert model.solver.warm_start
+    assert model.x[("H1", "mon", 1, "C1")].varValue == 1
+    assert model.x[("H1", "tue", 1, "C1")].varValue == 0
+    assert model.w[("H1", "mon", 1, 2, "C1")].varValue == 1
+    assert model.y[("mon", 1, "I1")].varValue == 1
+    assert model.y[("tue", 1, "I1")].varValue == 0
+
+
+def test_solve_passes_warm_start_to_matrix(mock_annual_data):
+    model = AnnualLpModel(mock_annual_data, [CONSECUTIVE_PERIOD], HighsSolver(), warm_start=WARM_START)
+    starts = []
+
+    def solve_matrix(matrix):
+        starts.append(matrix.start)
+        return MatrixSolution(status=pulp.LpStatusOptimal, sol_status=pulp.LpSolutionOptimal, objective=0.0)
+
+    model.solver.solve_matrix = solve_matrix
+    AnnualLpService.solve(model)
+
+    start = starts[0]
+    assert None not in start
+    assert start[model.x.col(("H1", "mon", 1, "C1"))] == 1
+    assert start[model.x.col(("H2", "mon", 1, "C1"))] == 0
+    assert start[model.w.col(("H1", "mon", 1, 2, "C1"))] == 1
+    assert start[model.y.col(("mon", 2, "I1"))] == 1
+    assert sum(start[model.x.col(key)] for key in model.x) == 2
+
+
+@pytest.mark.parametrize("solver_class", [HighsSolver, GurobiNativeSolver])
+def test_solve_rounds_integer_values(feasible_annual_data, solver_class):
+    # ソルバーが許容誤差の範囲で1・0からずれた値（0.9999999など）を返しても、整数変数の値は丸める
+    model = AnnualLpModel(feasible_annual_data, [], solver_class())
+    solve_matrix = model.solver.solve_matrix
+
+    def solve_matrix_with_noise(matrix):
+        solution = solve_matrix(matrix)
+        return replace(solution, values=[v - 1e-7 if v > 0.5 else v + 1e-7 for v in solution.values])
+
+    model.solver.solve_matrix = solve_matrix_with_noise
+    result = AnnualLpService.solve(model)
+
+    assert result.status == SolveStatus.OPTIMAL
+    assert {model.x.value(key) for key in model.x} == {0, 1}
+    assert sum(model.x.value(key) for key in model.x) == 16
+
+
+def test_solve_lns_improves_warm_start(feasible_annual_data):
+    afternoon = ConstraintDefinitionVo(code="AFTERNOON", soft_flag=False, penalty_weight=None, parameters={})
+    # C1・C4を両日とも午後（3時限）に配置した時間割（ペナルティ2）
+    warm_start = WarmStartVo(assignments=frozenset(
+        {(h, d, 1, c) for h in ("H1", "H2") for d in ("mon", "tue") for c in ("E1", "E2")}
+        | {("H1", d, p, c) for d in ("mon", "tue") for p, c in ((2, "C3"), (3, "C1"))}
+        | {("H2", d, p, c) for d in ("mon", "tue") for p, c in ((2, "C2"), (3, "C4"))}
+    ))
+    model = AnnualLpModel(feasible_annual_data, [afternoon], HighsSolver(), warm_start=warm_start)
+    progress = []
+    model.solver.progress = progress.append
+    settings = LnsSettingsVo(time_limit=60, neighbourhoods=(LnsNeighbourhood.DAY, LnsNeighbourhood.HOMEROOMS), seed=0)
+
+    result = AnnualLpService.solve_lns(model, lambda t: HighsSolver(SolverSettingsVo(time_limit=t)), settings)
+
+    # 目的関数値が下界（0）に達したため、タイムリミットより前に探索を終える
+    assert result.status == SolveStatus.OPTIMAL
+    assert result.objective == 0
+    assert result.elapsed_seconds < 60
+    assert result.improvements[0].iteration == 0
+    assert result.improvements[0].objective == 2
+    assert result.improvements[0].neighbourhood is None
+    assert all(i.neighbourhood is not None for i in result.improvements[1:])
+    objectives = [i.objective for i in result.improvements]
+    assert objectives == sorted(objectives, reverse=True) and len(set(objectives)) == len(objectives)
+    assert [p.objective for p in progress] == objectives
+    assert sum(model.x.value(key) for key in model.x) == 16
+
+
+def test_solve_lns_solves_whole_problem_without_warm_start(feasible_annual_data):
+    model = AnnualLpModel(feasible_annual_data, [], HighsSolver())
+    time_limits = []
+
+    def create_solver(time_limit):
+        time_limits.append(time_limit)
+        return HighsSolver(SolverSettingsVo(time_limit=time_limit))
+
+    result = AnnualLpService.solve_lns(model, create_solver, LnsSettingsVo(time_limit=60, sub_time_limit=5))
+
+    # 初期解をタイムリミットの1/4で求め、目的関数値が下界に達したため探索を終える
+    assert time_limits == [15]
+    assert result.status == SolveStatus.OPTIMAL
+    assert result.objective == 0
+    assert len(result.improvements) == 1
+
+
+def test_solve_lns_raises_when_cancelled(feasible_annual_data):
+    model = AnnualLpModel(feasible_annual_data, [], HighsSolver())
+    model.solver.cancel("test")
+
+    with pytest.raises(OptimizationCancelledError):
+        AnnualLpService.solve_lns(model, lambda t: HighsSolver(), LnsSettingsVo(time_limit=60))
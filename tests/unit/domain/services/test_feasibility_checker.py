@@ -0,0 +1,37 @@
+from common.constants import InfeasibilityKind
+from domain.services.feasibility_checker import FeasibilityChecker
+from domain.vo.annual_data import AnnualDataVo
+from domain.vo.infeasibility import InfeasibilityVo
+
+
+def test_check_feasible(feasible_annual_data: AnnualDataVo):
+    assert FeasibilityChecker.check(feasible_annual_data) == []
+
+
+def test_check(mock_annual_data: AnnualDataVo):
+    infeasibilities = FeasibilityChecker.check(mock_annual_data)
+
+    assert infeasibilities == [
+        # H1のブロックのレーンは、C1（3単位）とC2・C3（計5単位）で単位数が異なる
+        InfeasibilityVo(
+            kind=InfeasibilityKind.BLOCK_LANES, homerooms=["H1"], courses=["C1", "C2", "C3"], required=5, available=3
+        ),
+        # H1の4時限のうち、ブロックで埋められるのは3時限まで
+        InfeasibilityVo(kind=InfeasibilityKind.HOMEROOM_PERIODS, homerooms=["H1"], required=4, available=3),
+        # C1（3単位）は、H1ではI1が出勤する2時限、H3では時限数の2時限にしか開講できない
+        InfeasibilityVo(
+            kind=InfeasibilityKind.COURSE_CREDITS, homerooms=["H1"], courses=["C1"], instructors=["I1"],
+            required=3, available=2
+        ),
+        InfeasibilityVo(
+            kind=InfeasibilityKind.COURSE_CREDITS, homerooms=["H3"], courses=["C1"], required=3, available=2
+        ),
+        # I1はC1・C2（計5単位）を担当するが、出勤しているH1の時限は2時限
+        InfeasibilityVo(
+            kind=InfeasibilityKind.INSTRUCTOR_LOAD, courses=["C1", "C2"], instructors=["I1"], required=5, available=2
+        ),
+        # I2はC2・C3（計5単位）を担当するが、H1の時限は4時限
+        InfeasibilityVo(
+            kind=InfeasibilityKind.INSTRUCTOR_LOAD, courses=["C2", "C3"], instructors=["I2"], required=5, available=4
+        ),
+    ]
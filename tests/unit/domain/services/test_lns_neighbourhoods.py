@@ -0,0 +1,55 @@
+from common.constants import LnsNeighbourhood
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.services.lns_neighbourhoods import LnsNeighbourhoodSelector
+from domain.vo.annual_data import AnnualDataVo
+from domain.vo.lns_settings import LnsSettingsVo
+from infrastructure.solvers.highs_solver import HighsSolver
+
+
+def create_selector(data: AnnualDataVo, **settings) -> LnsNeighbourhoodSelector:
+    keys = list(AnnualLpModel(data, [], HighsSolver()).x)
+    return LnsNeighbourhoodSelector(data, keys, LnsSettingsVo(time_limit=60, seed=0, **settings))
+
+
+def test_select_day(feasible_annual_data: AnnualDataVo):
+    selector = create_selector(feasible_annual_data)
+
+    selected = selector.select(LnsNeighbourhood.DAY, set())
+
+    days = {d for _, d, _, _ in selected}
+    assert len(days) == 1
+    assert len(selected) == 24
+
+
+def test_select_homerooms(feasible_annual_data: AnnualDataVo):
+    # H1とH2は選択講座を共有しているため、1学級から2学級をたどる
+    selected = create_selector(feasible_annual_data, homerooms=2).select(LnsNeighbourhood.HOMEROOMS, set())
+    assert {h for h, _, _, _ in selected} == {"H1", "H2"}
+
+    selected = create_selector(feasible_annual_data, homerooms=1).select(LnsNeighbourhood.HOMEROOMS, set())
+    assert len({h for h, _, _, _ in selected}) == 1
+
+
+def test_select_instructors(feasible_annual_data: AnnualDataVo):
+    keys = list(AnnualLpModel(feasible_annual_data, [], HighsSolver()).x)
+    selector = create_selector(feasible_annual_data, instructors=1)
+    assigned = {("H1", "mon", 2, "C1"), ("H2", "mon", 3, "C2"), ("H1", "tue", 1, "E1"), ("H2", "tue", 1, "E1")}
+
+    selected = selector.select(LnsNeighbourhood.INSTRUCTORS, assigned)
+
+    # 1名の教員の担当講座と、それらが配置されている学級・時限のすべての組
+    expected = {}
+    for i, courses in feasible_annual_data.index.instructor_courses.items():
+        slots = {(h, d, p) for h, d, p, c in assigned if c in courses}
+        expected[i] = {key for key in keys if key[3] in courses or key[:3] in slots}
+    assert selected in expected.values()
+
+
+def test_kind_cycles_neighbourhoods(feasible_annual_data: AnnualDataVo):
+    selector = create_selector(
+        feasible_annual_data, neighbourhoods=(LnsNeighbourhood.DAY, LnsNeighbourhood.INSTRUCTORS)
+    )
+
+    assert [selector.kind(i) for i in range(1, 4)] == [
+        LnsNeighbourhood.DAY, LnsNeighbourhood.INSTRUCTORS, LnsNeighbourhood.DAY
+    ]
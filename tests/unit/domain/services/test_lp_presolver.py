@@ -0,0 +1,77 @@
+import pulp
+
+from domain.models.lp_matrix import LpMatrix
+from domain.services.lp_presolver import LpPresolver
+
+
+def _binaries(*names: str) -> list:
+    return [pulp.LpVariable(name, cat=pulp.LpBinary) for name in names]
+
+
+def test_presolve_propagates_unavailable_instructor():
+    # 教員の欠勤時限（y == 0）から担当講座のxを0にし、学級の時限を埋める残りの講座のxを1にする
+    x_a, x_b, x_c = _binaries("x_a", "x_b", "x_c")
+    problem = pulp.LpProblem("presolve", pulp.LpMinimize)
+    problem += x_a + x_b + x_c
+    problem += x_a + x_b == 0
+    problem += x_a + x_c >= 1
+
+    presolved = LpPresolver.presolve(LpMatrix.from_problem(problem))
+
+    assert not presolved.infeasible
+    assert (presolved.matrix.num_cols, presolved.matrix.num_rows) == (0, 0)
+    assert (presolved.fixed_cols, presolved.removed_rows) == (3, 2)
+    assert presolved.matrix.objective_offset == 1
+    assert presolved.postsolve([]) == [0, 0, 1]
+
+
+def test_presolve_propagates_fixed_slot():
+    # 曜日時限指定（x == 1）から同じ教員の他の講座のxを0に、ブロックの他のレーンのxを1にする
+    x_a, x_b, x_d, x_e, x_f = _binaries("x_a", "x_b", "x_d", "x_e", "x_f")
+    problem = pulp.LpProblem("presolve", pulp.LpMinimize)
+    problem += x_e + 2 * x_f
+    problem += x_a == 1
+    problem += x_a + x_b <= 1
+    problem += x_a - x_d == 0
+    problem += x_e + x_f >= 1
+
+    matrix = LpMatrix.from_problem(problem)
+    presolved = LpPresolver.presolve(matrix)
+
+    assert not presolved.infeasible
+    assert presolved.matrix.names == ["x_e", "x_f"]
+    assert presolved.matrix.num_rows == 1
+    assert presolved.removed_rows == 3
+    assert presolved.fixed_cols == 3
+    values = presolved.postsolve([1.0, 0.0])
+    assert dict(zip(matrix.names, values)) == {"x_a": 1, "x_b": 0, "x_d": 1, "x_e": 1.0, "x_f": 0.0}
+
+
+def test_presolve_moves_fixed_values_to_rhs():
+    x_a, x_b, x_c = _binaries("x_a", "x_b", "x_c")
+    problem = pulp.LpProblem("presolve", pulp.LpMinimize)
+    problem += x_b + x_c
+    problem += x_a == 1
+    problem += x_a + x_b + x_c >= 2
+
+    presolved = LpPresolver.presolve(LpMatrix.from_problem(problem))
+
+    assert presolved.matrix.names == ["x_b", "x_c"]
+    assert presolved.matrix.rhs == [1]
+    assert presolved.matrix.start is None
+
+
+def test_presolve_returns_original_matrix_when_infeasible():
+    x_a, x_b = _binaries("x_a", "x_b")
+    problem = pulp.LpProblem("presolve", pulp.LpMinimize)
+    problem += x_a + x_b
+    problem += x_a == 1
+    problem += x_b == 1
+    problem += x_a + x_b <= 1
+
+    matrix = LpMatrix.from_problem(problem)
+    presolved = LpPresolver.presolve(matrix)
+
+    assert presolved.infeasible
+    assert presolved.matrix is matrix
+    assert presolved.postsolve([0.0, 1.0]) == [0.0, 1.0]
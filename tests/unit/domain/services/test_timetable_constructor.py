@@ -0,0 +1,61 @@
+from collections import Counter
+
+from common.constants import HEURISTIC_BACKEND, SolveStatus
+from domain.models.annual_lp_model import AnnualLpModel
+from domain.services.annual_lp_service import AnnualLpService
+from domain.services.timetable_constructor import TimetableConstructor
+from domain.vo.annual_data import AnnualDataVo
+from infrastructure.solvers.highs_solver import HighsSolver
+
+
+def test_construct(feasible_annual_data: AnnualDataVo):
+    constructor = TimetableConstructor(feasible_annual_data)
+    warm_start = constructor.construct()
+
+    assert constructor.unplaced_sessions == 0
+    # 単位数どおりに配置し、学級の時限は重ならない
+    assert Counter((h, c) for h, _, _, c in warm_start.assignments) == {
+        ("H1", "C1"): 2, ("H1", "C3"): 2, ("H1", "E1"): 2, ("H1", "E2"): 2,
+        ("H2", "C2"): 2, ("H2", "C4"): 2, ("H2", "E1"): 2, ("H2", "E2"): 2,
+    }
+    slots = warm_start.assignments
+    # ブロックのレーンの講座は同じ時限に、共有講座は全学級で同じ時限に開講する
+    e1 = {(d, p) for h, d, p, c in slots if c == "E1" and h == "H1"}
+    assert e1 == {(d, p) for h, d, p, c in slots if c == "E2" and h == "H1"}
+    assert e1 == {(d, p) for h, d, p, c in slots if c == "E1" and h == "H2"}
+    # 教員の時限は重ならず、出勤していない時限には配置しない
+    i1 = [(d, p) for _, d, p, c in slots if c in ("C1", "C2")]
+    assert len(i1) == len(set(i1))
+    assert ("mon", 1) not in i1
+    assert ("tue", 3) not in e1
+
+
+def test_construct_leaves_unplaced_sessions(mock_annual_data: AnnualDataVo):
+    constructor = TimetableConstructor(mock_annual_data)
+    warm_start = constructor.construct()
+
+    # H3の時限は月1・火1だけで、C1（3単位）の教員I1は月1に出勤しないため、火1にだけ配置する
+    assert constructor.unplaced_sessions > 0
+    assert {a for a in warm_start.assignments if a[0] == "H3"} == {("H3", "tue", 1, "C1")}
+
+
+def test_evaluate_start_feasible(feasible_annual_data: AnnualDataVo):
+    warm_start = TimetableConstructor(feasible_annual_data).construct()
+    model = AnnualLpModel(feasible_annual_data, [], HighsSolver(), warm_start=warm_start)
+
+    result = AnnualLpService.evaluate_start(model)
+
+    assert result.status == SolveStatus.FEASIBLE
+    assert result.unsatisfied_rows == 0
+    assert result.backend == HEURISTIC_BACKEND
+    assert {key for key, x in model.x.items() if x.value() == 1} == warm_start.assignments
+
+
+def test_evaluate_start_incomplete(mock_annual_data: AnnualDataVo):
+    warm_start = TimetableConstructor(mock_annual_data).construct()
+    model = AnnualLpModel(mock_annual_data, [], HighsSolver(), warm_start=warm_start)
+
+    result = AnnualLpService.evaluate_start(model)
+
+    assert result.status == SolveStatus.INCOMPLETE
+    assert result.unsatisfied_rows > 0
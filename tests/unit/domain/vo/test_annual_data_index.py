@@ -0,0 +1,56 @@
+from domain.vo.annual_data_index import AnnualDataIndex
+
+
+def test_course_homerooms(mock_annual_data):
+    index = mock_annual_data.index
+    assert index.course_homerooms == {
+        "C1": ("H1",),
+        "C2": ("H1", "H2"),
+        "C3": ("H2", "H3"),
+    }
+
+
+def test_homeroom_courses(mock_annual_data):
+    index = mock_annual_data.index
+    assert index.homeroom_courses == {
+        "H1": frozenset({"C1", "C2"}),
+        "H2": frozenset({"C2", "C3"}),
+        "H3": frozenset({"C3"}),
+    }
+
+
+def test_instructor_courses(mock_annual_data):
+    # 講座の並びはCの順序に従う
+    index = mock_annual_data.index
+    assert index.instructor_courses == {
+        "I1": ("C1", "C2"),
+        "I2": ("C2", "C3"),
+    }
+
+
+def test_course_instructors(mock_annual_data):
+    index = mock_annual_data.index
+    assert index.course_instructors == {
+        "C1": frozenset({"I1"}),
+        "C2": frozenset({"I1", "I2"}),
+        "C3": frozenset({"I2"}),
+    }
+
+
+def test_homeroom_day_periods(mock_annual_data):
+    index = mock_annual_data.index
+    assert index.homeroom_day_periods[("H2", "mon")] == frozenset({1, 2, 3})
+    assert index.homeroom_day_periods[("H3", "tue")] == frozenset({1})
+
+
+def test_index_is_built_once(mock_annual_data):
+    assert mock_annual_data.index is mock_annual_data.index
+    assert isinstance(mock_annual_data.index, AnnualDataIndex)
+
+
+def test_model_copy_rebuilds_index(mock_annual_data):
+    # 複製時に内容が変わる場合、索引は複製後のデータから再構築される
+    _ = mock_annual_data.index
+    copied = mock_annual_data.model_copy(update={"curriculum_dict": {"H1": [[["C3"]]], "H2": [], "H3": []}})
+    assert copied.index.course_homerooms["C3"] == ("H1",)
+    assert mock_annual_data.index.course_homerooms["C3"] == ("H2", "H3")
@@ -0,0 +1,42 @@
+from infrastructure.cache.ttl_lru_cache import TtlLruCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_put():
+    cache = TtlLruCache(max_size=2, ttl_seconds=10)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_evicts_least_recently_used():
+    cache = TtlLruCache(max_size=2, ttl_seconds=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    # 最も古く参照された"b"が削除される
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2
+
+
+def test_expires_after_ttl():
+    clock = FakeClock()
+    cache = TtlLruCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
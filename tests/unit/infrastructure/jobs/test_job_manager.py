@@ -0,0 +1,140 @@
+import os
+import time
+
+from common.constants import JobStatus
+from infrastructure.jobs.job_manager import JobManager
+
+
+def _square(x: int, progress=None, cancelled=None) -> int:
+    return x * x
+
+
+def _fail(x: int, progress=None, cancelled=None) -> int:
+    raise ValueError(f"bad input: {x}")
+
+
+def _crash(x: int, progress=None, cancelled=None) -> int:
+    os._exit(3)
+
+
+def _count(n: int, progress, cancelled=None) -> int:
+    for i in range(1, n + 1):
+        progress(i)
+    return n
+
+
+def _wait_for_cancel(timeout: float, progress, cancelled) -> None:
+    # 開始したことを知らせてから、キャンセルされるまで待つ
+    progress("started")
+    if cancelled.wait(timeout):
+        raise RuntimeError("interrupted")
+
+
+def _ignore_cancel(timeout: float, progress, cancelled) -> None:
+    progress("started")
+    time.sleep(timeout)
+
+
+def _wait(manager: JobManager, job_id: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while not (job := manager.get(job_id)).finished:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return job
+
+
+def test_runs_jobs_in_worker_processes():
+    manager = JobManager(max_workers=2)
+    try:
+        results = []
+        jobs = [manager.submit(_square, n, on_success=results.append) for n in range(3)]
+        assert all(job.status == JobStatus.PENDING for job in jobs)
+
+        finished = [_wait(manager, job.job_id) for job in jobs]
+        assert [job.status for job in finished] == [JobStatus.SUCCEEDED] * 3
+        assert [job.result for job in finished] == [0, 1, 4]
+        assert sorted(results) == [0, 1, 4]
+        assert all(job.started_at is not None and job.finished_at is not None for job in finished)
+    finally:
+        manager.shutdown()
+
+
+def test_reports_failures():
+    manager = JobManager(max_workers=1)
+    try:
+        failed = _wait(manager, manager.submit(_fail, 7).job_id)
+        assert failed.status == JobStatus.FAILED
+        assert failed.error == "ValueError: bad input: 7"
+        assert failed.result is None
+
+        # 子プロセスが異常終了しても、ワーカーは次のジョブを実行できる
+        crashed = _wait(manager, manager.submit(_crash, 0).job_id)
+        assert crashed.status == JobStatus.FAILED
+        assert "3" in crashed.error
+        assert _wait(manager, manager.submit(_square, 3).job_id).result == 9
+    finally:
+        manager.shutdown()
+
+
+def test_add_finished_and_eviction():
+    manager = JobManager(max_workers=1, max_finished_jobs=2)
+    jobs = [manager.add_finished(n) for n in range(3)]
+
+    # 古いものから削除される
+    assert manager.get(jobs[0].job_id) is None
+    assert [manager.get(job.job_id).result for job in jobs[1:]] == [1, 2]
+    assert manager.get("unknown") is None
+
+
+def test_reports_progress():
+    manager = JobManager(max_workers=1)
+    try:
+        job = manager.submit(_count, 3)
+        seen = []
+        seq = 0
+        while not (current := manager.wait(job.job_id, seq, timeout=60.0)).finished:
+            assert current.progress_seq > seq
+            seq = current.progress_seq
+            seen.append(current.progress)
+
+        # 進捗は結果より先に届き、最新の進捗が残る
+        assert current.status == JobStatus.SUCCEEDED
+        assert current.result == 3
+        assert current.progress == 3
+        assert current.progress_seq == 3
+        assert seen == sorted(seen)
+        assert manager.wait("unknown", 0, timeout=0.01) is None
+    finally:
+        manager.shutdown()
+
+
+def test_cancel_jobs():
+    manager = JobManager(max_workers=1, cancel_grace_seconds=0.5)
+    try:
+        running = manager.submit(_wait_for_cancel, 60.0)
+        pending = manager.submit(_square, 2)
+        assert manager.wait(running.job_id, 0, timeout=60.0).progress == "started"
+
+        # 待機中のジョブはすぐにキャンセルされる
+        cancelled = manager.cancel(pending.job_id, "no longer needed")
+        assert cancelled.status == JobStatus.CANCELLED
+        assert cancelled.error == "no longer needed"
+
+        # 実行中のジョブは子プロセスが中断してからキャンセルされる
+        assert manager.cancel(running.job_id, "client request").status == JobStatus.RUNNING
+        finished = _wait(manager, running.job_id)
+        assert finished.status == JobStatus.CANCELLED
+        assert finished.error == "client request"
+        assert manager.cancel(running.job_id, "again").status == JobStatus.CANCELLED
+        assert manager.cancel("unknown", "reason") is None
+
+        # キャンセルに応じない子プロセスは猶予時間の後に強制終了され、ワーカーは次のジョブを実行できる
+        stuck = manager.submit(_ignore_cancel, 60.0)
+        assert manager.wait(stuck.job_id, 0, timeout=60.0).progress == "started"
+        start = time.monotonic()
+        manager.cancel(stuck.job_id, "timeout")
+        assert _wait(manager, stuck.job_id).status == JobStatus.CANCELLED
+        assert time.monotonic() - start < 30.0
+        assert _wait(manager, manager.submit(_square, 3).job_id).result == 9
+    finally:
+        manager.shutdown()
@@ -0,0 +1,78 @@
+import pickle
+import threading
+import time
+
+import pytest
+
+from common.constants import InfeasibilityKind
+from domain.exceptions.exceptions import (
+    InfeasibleInputError, OptimizationCancelledError, OptimizationError, SolverUnavailableError
+)
+from domain.vo.infeasibility import InfeasibilityVo
+from infrastructure.jobs.process_pool import ProcessPool
+
+
+def _square(x: int, progress) -> int:
+    progress(x)
+    return x * x
+
+
+def _fail(x: int, progress) -> int:
+    raise OptimizationError(x)
+
+
+def _sleep(timeout: float, progress) -> None:
+    progress("started")
+    time.sleep(timeout)
+
+
+def test_map_returns_results_in_order():
+    pool = ProcessPool(max_workers=2)
+    reported = []
+
+    results = pool.map(_square, [(n,) for n in range(3)], on_progress=lambda i, p: reported.append((i, p)))
+
+    assert results == [0, 1, 4]
+    assert sorted(reported) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_map_raises_error_of_worker():
+    pool = ProcessPool(max_workers=2)
+
+    with pytest.raises(OptimizationError) as e:
+        pool.map(_fail, [(3,)])
+    assert e.value.solver_status == 3
+
+
+def test_cancel_terminates_workers():
+    pool = ProcessPool(max_workers=2)
+    started = threading.Event()
+
+    def on_progress(index, progress):
+        started.set()
+
+    threading.Thread(target=lambda: started.wait(60) and pool.cancel("test"), daemon=True).start()
+    begin = time.monotonic()
+    with pytest.raises(OptimizationCancelledError) as e:
+        pool.map(_sleep, [(60,), (60,)], on_progress=on_progress)
+    assert e.value.reason == "test"
+    assert time.monotonic() - begin < 30
+
+
+def test_available():
+    assert ProcessPool(max_workers=2).available
+    assert not ProcessPool(max_workers=1).available
+
+
+@pytest.mark.parametrize("error", [
+    OptimizationError(3),
+    SolverUnavailableError("GUROBI", "no license"),
+    OptimizationCancelledError("test"),
+    InfeasibleInputError([InfeasibilityVo(kind=InfeasibilityKind.BLOCK_LANES, homerooms=[0], required=3, available=2)]),
+])
+def test_errors_survive_pickling(error):
+    # 子プロセスから受け渡した例外は、元の属性を保つ
+    restored = pickle.loads(pickle.dumps(error))
+    assert type(restored) is type(error)
+    assert restored.__dict__ == error.__dict__
+    assert str(restored) == str(error)
@@ -0,0 +1,121 @@
+import subprocess
+import threading
+
+import pulp
+import pytest
+from pulp.apis import coin_api
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.cbc_solver import CbcLogMonitor, CbcSolver
+from infrastructure.solvers.progress_reporter import ProgressReporter
+
+
+def test_log_monitor_parses_progress_lines():
+    received = []
+    monitor = CbcLogMonitor("unused.log", ProgressReporter(received.append, "CBC", interval=0.0))
+
+    monitor.parse_line(
+        "Cbc0012I Integer solution of 26 found by feasibility pump after 0 iterations and 0 nodes (0.05 seconds)"
+    )
+    monitor.parse_line("Cbc0010I After 1000 nodes, 6 on tree, 26 best solution, best possible 20 (0.51 seconds)")
+    monitor.parse_line(
+        "Cbc0016I Integer solution of 25 found by strong branching after 5831 iterations and 1200 nodes (0.6 seconds)"
+    )
+    monitor.parse_line("Cbc0038I Full problem 80 rows 80 columns, reduced to 0 rows 0 columns")
+
+    assert [(p.elapsed_seconds, p.objective, p.bound, p.nodes) for p in received] == [
+        (0.05, 26.0, None, 0),
+        (0.51, 26.0, 20.0, 1000),
+        (0.6, 25.0, 20.0, 1200),
+    ]
+    assert received[-1].gap == 0.2
+
+
+def test_log_monitor_adds_objective_offset():
+    received = []
+    reporter = ProgressReporter(received.append, "CBC", interval=0.0)
+    monitor = CbcLogMonitor("unused.log", reporter, objective_offset=100.0)
+
+    monitor.parse_line("Cbc0010I After 1000 nodes, 6 on tree, 26 best solution, best possible 20 (0.51 seconds)")
+    monitor.parse_line("Lower bound:                    20.500")
+
+    assert [(p.objective, p.bound) for p in received] == [(126.0, 120.0)]
+    assert monitor.final_bound == 120.5
+
+
+def test_log_monitor_reads_remaining_lines_on_exit(tmp_path):
+    log_path = tmp_path / "cbc.log"
+    log_path.write_text("")
+    received = []
+    reporter = ProgressReporter(received.append, "CBC", interval=0.0)
+
+    # 読み進める間隔より前に書き込まれた最後の行も、終了時に読み込む
+    with CbcLogMonitor(str(log_path), reporter, poll_interval=60.0), open(log_path, "a") as f:
+        f.write("Cbc0010I After 1000 nodes, 6 on tree, 26 best solution, best possible 20 (0.51 seconds)\n")
+        f.write(
+            "Cbc0012I Integer solution of 25 found by feasibility pump after 0 iterations and 1200 nodes (0.6 seconds)"
+        )
+
+    assert [(p.elapsed_seconds, p.objective, p.bound, p.nodes) for p in received] == [
+        (0.51, 26.0, 20.0, 1000),
+        (0.6, 25.0, 20.0, 1200),
+    ]
+
+
+def _knapsack_problem(n: int, m: int) -> pulp.LpProblem:
+    # 分枝限定法で時間のかかる多次元ナップサック問題
+    problem = pulp.LpProblem("knapsack", pulp.LpMinimize)
+    x = [pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(n)]
+    problem += pulp.lpSum(-(5 + (i * 17) % 46) * x[i] for i in range(n))
+    for k in range(m):
+        problem += pulp.lpSum((5 + (i * (k + 7) * 31) % 46) * x[i] for i in range(n)) <= 3000
+    return problem
+
+
+def test_solve_problem_with_warm_start():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+    problem += x[1] - x[2] == 0
+    for i, value in enumerate([0, 1, 1]):
+        x[i].setInitialValue(value)
+
+    solver = CbcSolver()
+    solver.warm_start = True
+    problem.setSolver(solver.get_solver())
+    solution = solver.solve_problem(problem)
+
+    assert (solution.status, solution.sol_status) == (pulp.LpStatusOptimal, pulp.LpSolutionOptimal)
+    assert solution.objective == 6
+    assert [x[i].value() for i in range(3)] == [0, 1, 1]
+
+
+def test_cancel_terminates_cbc_process():
+    problem = _knapsack_problem(300, 30)
+    solver = CbcSolver()
+    problem.setSolver(solver.get_solver())
+
+    timer = threading.Timer(0.5, solver.cancel, args=("test",))
+    timer.start()
+    with pytest.raises(pulp.PulpSolverError):
+        solver.solve_problem(problem)
+    timer.join()
+
+    assert solver.cancel_reason == "test"
+    # CBCのプロセスはPuLPのsubprocessを差し替えずに取得する
+    assert coin_api.subprocess is subprocess
+
+
+def test_solve_problem_returns_bound_on_time_limit():
+    problem = _knapsack_problem(600, 40)
+    # CBCのログの値は目的関数の定数項を含まない
+    problem.objective += 10000
+    solver = CbcSolver(SolverSettingsVo(time_limit=1))
+    problem.setSolver(solver.get_solver())
+
+    solution = solver.solve_problem(problem)
+
+    assert solution.sol_status == pulp.LpSolutionIntegerFeasible
+    assert solution.objective == pulp.value(problem.objective)
+    assert solution.bound is not None
+    assert 0.99 * solution.objective <= solution.bound <= solution.objective
@@ -0,0 +1,64 @@
+import pulp
+import pytest
+
+from domain.exceptions.exceptions import SolverUnavailableError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from infrastructure.solvers.fallback_solver import FallbackSolver
+from infrastructure.solvers.highs_solver import HighsSolver
+
+
+class UnavailableSolver(SolverInterface):
+    """ライセンスを取得できないソルバー"""
+    backend = "UNAVAILABLE"
+    supports_matrix = True
+
+    def get_solver(self):
+        return None
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        raise SolverUnavailableError(self.backend, "no license")
+
+
+def _create_problem():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+    return problem, x
+
+
+def test_falls_back_when_unavailable():
+    problem, x = _create_problem()
+    solver = FallbackSolver(UnavailableSolver(), HighsSolver())
+    problem.setSolver(solver.get_solver())
+
+    solution = solver.solve_problem(problem)
+
+    assert solution.backend == "HIGHS"
+    assert solution.objective == 5
+    assert [x[i].value() for i in range(3)] == [1, 1, 0]
+    assert solver.backend == "UNAVAILABLE"
+    assert solver.supports_matrix
+
+
+def test_uses_primary_when_available():
+    problem, _ = _create_problem()
+    solver = FallbackSolver(HighsSolver(), UnavailableSolver())
+    problem.setSolver(solver.get_solver())
+
+    solution = solver.solve_problem(problem)
+
+    # 主ソルバーで解けた場合は、backendを設定しない
+    assert solution.backend is None
+    assert solution.sol_status == pulp.LpSolutionOptimal
+
+
+def test_does_not_hide_other_errors():
+    class FailingSolver(UnavailableSolver):
+        def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+            raise RuntimeError("boom")
+
+    problem, _ = _create_problem()
+    with pytest.raises(RuntimeError):
+        FallbackSolver(FailingSolver(), HighsSolver()).solve_problem(problem)
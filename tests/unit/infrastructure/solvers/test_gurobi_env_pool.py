@@ -0,0 +1,55 @@
+import gurobipy as gp
+import pytest
+from gurobipy import GRB
+
+from domain.exceptions.exceptions import SolverUnavailableError
+from infrastructure.solvers.gurobi_env_pool import GurobiEnvPool
+
+
+@pytest.fixture
+def pool():
+    pool = GurobiEnvPool({}, max_size=1, timeout=0.1)
+    yield pool
+    pool.close()
+
+
+def test_reuses_environment(pool: GurobiEnvPool):
+    with pool.borrow() as first:
+        pass
+    with pool.borrow() as second:
+        pass
+
+    assert first is second
+
+
+def test_raises_when_all_in_use(pool: GurobiEnvPool):
+    with pool.borrow():
+        with pytest.raises(SolverUnavailableError):
+            with pool.borrow():
+                pass
+
+    # 返却後は借りられる
+    with pool.borrow():
+        pass
+
+
+def test_recreates_unhealthy_environment(pool: GurobiEnvPool, mocker):
+    with pool.borrow() as first:
+        pass
+    mocker.patch("infrastructure.solvers.gurobi_env_pool._is_healthy", return_value=False)
+
+    with pool.borrow() as second:
+        pass
+
+    assert second is not first
+
+
+def test_discards_broken_environment(pool: GurobiEnvPool):
+    with pytest.raises(gp.GurobiError):
+        with pool.borrow() as first:
+            raise gp.GurobiError(GRB.Error.NETWORK, "connection lost")
+
+    with pool.borrow() as second:
+        pass
+
+    assert second is not first
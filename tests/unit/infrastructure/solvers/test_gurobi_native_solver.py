@@ -0,0 +1,69 @@
+import pulp
+from common.constants import SolverEmphasis
+from domain.models.lp_matrix import LpMatrix
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.gurobi_native_solver import GurobiNativeSolver
+
+
+def test_solve_optimal():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+    problem += x[1] - x[2] == 0
+
+    status = problem.solve(GurobiNativeSolver().get_solver())
+
+    assert status == pulp.LpStatusOptimal
+    assert problem.sol_status == pulp.LpSolutionOptimal
+    assert [x[i].value() for i in range(3)] == [0, 1, 1]
+    assert pulp.value(problem.objective) == 6
+
+
+def test_solve_infeasible():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = pulp.LpVariable("x", cat=pulp.LpBinary)
+    problem += x
+    problem += x >= 2
+
+    status = problem.solve(GurobiNativeSolver().get_solver())
+
+    assert status == pulp.LpStatusInfeasible
+
+
+def test_solve_with_settings():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+
+    settings = SolverSettingsVo(time_limit=10, mip_gap=0.0, threads=1, seed=1, emphasis=SolverEmphasis.OPTIMALITY)
+    solution = GurobiNativeSolver(settings).solve_problem(problem)
+
+    assert solution.sol_status == pulp.LpSolutionOptimal
+    assert (solution.objective, solution.bound) == (5, 5)
+
+
+def test_solve_reports_progress():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+    problem += x[1] - x[2] == 0
+
+    solver = GurobiNativeSolver()
+    received = []
+    solver.progress = received.append
+    matrix = LpMatrix.from_problem(problem)
+    solution = solver.solve_matrix(matrix)
+
+    # 新しい暫定解は値とともに通知される
+    assert received[-1].objective == solution.objective
+    assert received[-1].values == solution.values
+    assert received[-1].backend == "GUROBI_NATIVE"
+
+    # PuLPの問題を解く場合は暫定解の値を含めない
+    received.clear()
+    solver.solve_problem(problem)
+    assert received and all(p.values is None for p in received)
+    assert solver.progress == received.append
@@ -0,0 +1,120 @@
+import threading
+
+import highspy
+import pulp
+import pytest
+from domain.models.lp_matrix import LpMatrix
+from domain.models.sparse_rows import SparseRows
+from domain.models.variables import ColumnRegistry
+from domain.exceptions.exceptions import OptimizationCancelledError
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.highs_solver import HighsSolver
+
+
+def test_solve_optimal():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = {i: pulp.LpVariable(f"x_{i}", cat=pulp.LpBinary) for i in range(3)}
+    problem += 3 * x[0] + 2 * x[1] + 4 * x[2]
+    problem += x[0] + x[1] + x[2] >= 2
+    problem += x[1] - x[2] == 0
+
+    status = problem.solve(HighsSolver().get_solver())
+
+    assert status == pulp.LpStatusOptimal
+    assert problem.sol_status == pulp.LpSolutionOptimal
+    assert [x[i].value() for i in range(3)] == [0, 1, 1]
+    assert pulp.value(problem.objective) == 6
+
+
+def test_solve_infeasible():
+    problem = pulp.LpProblem("test", pulp.LpMinimize)
+    x = pulp.LpVariable("x", cat=pulp.LpBinary)
+    problem += x
+    problem += x >= 2
+
+    status = problem.solve(HighsSolver().get_solver())
+
+    assert status == pulp.LpStatusInfeasible
+
+
+def test_solve_matrix():
+    columns = ColumnRegistry()
+    x = [columns.add(f"x_{i}") for i in range(3)]
+    rows = SparseRows()
+    rows.add_row(x, [1, 1, 1], pulp.LpConstraintGE, 2)
+    rows.add_row([x[1], x[2]], [1, -1], pulp.LpConstraintEQ, 0)
+    rows.add_objective(x, [3, 2, 4])
+
+    solution = HighsSolver().solve_matrix(LpMatrix.from_rows(columns, rows))
+
+    assert solution.status == pulp.LpStatusOptimal
+    assert solution.sol_status == pulp.LpSolutionOptimal
+    assert solution.values == [0, 1, 1]
+    assert (solution.objective, solution.bound) == (6, 6)
+
+
+def test_solve_matrix_with_threads_in_parallel(mocker):
+    # スレッド数は各インスタンスにだけ設定し、並行して求解中の他のインスタンスが使うスケジューラを作り直さない
+    reset = mocker.spy(highspy.Highs, "resetGlobalScheduler")
+    columns = ColumnRegistry()
+    x = [columns.add(f"x_{i}") for i in range(3)]
+    rows = SparseRows()
+    rows.add_row(x, [1, 1, 1], pulp.LpConstraintGE, 2)
+    rows.add_row([x[1], x[2]], [1, -1], pulp.LpConstraintEQ, 0)
+    rows.add_objective(x, [3, 2, 4])
+    matrix = LpMatrix.from_rows(columns, rows)
+    solutions = []
+
+    def solve(threads: int) -> None:
+        solutions.append(HighsSolver(SolverSettingsVo(threads=threads)).solve_matrix(matrix))
+
+    workers = [threading.Thread(target=solve, args=(threads,)) for threads in (1, 2, 4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [s.objective for s in solutions] == [6, 6, 6]
+    reset.assert_not_called()
+
+
+def test_solve_matrix_reports_progress():
+    columns = ColumnRegistry()
+    x = [columns.add(f"x_{i}") for i in range(3)]
+    rows = SparseRows()
+    rows.add_row(x, [1, 1, 1], pulp.LpConstraintGE, 2)
+    rows.add_row([x[1], x[2]], [1, -1], pulp.LpConstraintEQ, 0)
+    rows.add_objective(x, [3, 2, 4])
+
+    solver = HighsSolver()
+    received = []
+    solver.progress = received.append
+    solution = solver.solve_matrix(LpMatrix.from_rows(columns, rows))
+
+    # 新しい暫定解は値とともに通知される
+    assert received[-1].objective == solution.objective
+    assert received[-1].values == [0, 1, 1]
+    assert received[-1].backend == "HIGHS"
+
+
+def test_cancel_stops_solve():
+    # 分枝限定法で時間のかかる多次元ナップサック問題
+    columns = ColumnRegistry()
+    x = [columns.add(f"x_{i}") for i in range(600)]
+    rows = SparseRows()
+    for k in range(40):
+        rows.add_row(x, [5 + (i * (k + 7) * 31) % 46 for i in range(600)], pulp.LpConstraintLE, 3000)
+    rows.add_objective(x, [-(5 + (i * 17) % 46) for i in range(600)])
+    matrix = LpMatrix.from_rows(columns, rows)
+
+    solver = HighsSolver()
+    timer = threading.Timer(0.5, solver.cancel, args=("test",))
+    timer.start()
+    solution = solver.solve_matrix(matrix)
+    timer.join()
+
+    assert solution.sol_status != pulp.LpSolutionOptimal
+    assert solver.cancel_reason == "test"
+    # 中断後は求解を開始しない
+    with pytest.raises(OptimizationCancelledError):
+        solver.solve_matrix(matrix)
@@ -0,0 +1,77 @@
+import pulp
+import pytest
+
+from domain.exceptions.exceptions import SolverUnavailableError
+from domain.interfaces.solver_interface import SolverInterface
+from domain.models.lp_matrix import LpMatrix, MatrixSolution
+from domain.models.sparse_rows import SparseRows
+from domain.models.variables import ColumnRegistry
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.cbc_solver import CbcSolver
+from infrastructure.solvers.highs_solver import HighsSolver
+from infrastructure.solvers.portfolio_solver import PortfolioMember, PortfolioSolver
+
+
+class UnavailableSolver(SolverInterface):
+    """ライセンスを取得できないソルバー"""
+    backend = "UNAVAILABLE"
+    supports_matrix = True
+
+    def get_solver(self):
+        return None
+
+    def solve_matrix(self, matrix: LpMatrix) -> MatrixSolution:
+        raise SolverUnavailableError(self.backend, "no license")
+
+
+def _create_matrix() -> LpMatrix:
+    columns = ColumnRegistry()
+    x = [columns.add(f"x_{i}") for i in range(3)]
+    rows = SparseRows()
+    rows.add_row(x, [1, 1, 1], pulp.LpConstraintGE, 2)
+    rows.add_row([x[1], x[2]], [1, -1], pulp.LpConstraintEQ, 0)
+    rows.add_objective(x, [3, 2, 4])
+    return LpMatrix.from_rows(columns, rows)
+
+
+def test_returns_optimal_solution():
+    settings = SolverSettingsVo(time_limit=30)
+    solver = PortfolioSolver([
+        PortfolioMember("UNAVAILABLE", UnavailableSolver()),
+        PortfolioMember("HIGHS:0", HighsSolver(settings)),
+        PortfolioMember("CBC:0", CbcSolver(settings)),
+    ], time_limit=30)
+
+    solution = solver.solve_matrix(_create_matrix())
+
+    assert solution.sol_status == pulp.LpSolutionOptimal
+    assert solution.backend in ("HIGHS", "CBC")
+    assert solution.objective == 6
+    assert solution.values == [0, 1, 1]
+
+
+def test_raises_when_no_solver_is_available():
+    solver = PortfolioSolver([PortfolioMember("UNAVAILABLE", UnavailableSolver())], time_limit=30)
+
+    with pytest.raises(SolverUnavailableError):
+        solver.solve_matrix(_create_matrix())
+
+
+def test_solves_sequentially_in_daemon_process(mocker):
+    # デーモンプロセスでは順に実行し、最適解が得られた時点で残りのソルバーは実行しない
+    mocker.patch.object(PortfolioSolver, "parallel", new_callable=mocker.PropertyMock, return_value=False)
+    settings = SolverSettingsVo(time_limit=30)
+    cbc = CbcSolver(settings)
+    solve_cbc = mocker.spy(cbc, "solve_problem")
+    solver = PortfolioSolver([
+        PortfolioMember("UNAVAILABLE", UnavailableSolver()),
+        PortfolioMember("HIGHS:0", HighsSolver(settings)),
+        PortfolioMember("CBC:0", cbc),
+    ], time_limit=30)
+
+    solution = solver.solve_matrix(_create_matrix())
+
+    assert solution.sol_status == pulp.LpSolutionOptimal
+    assert solution.backend == "HIGHS"
+    assert solution.values == [0, 1, 1]
+    solve_cbc.assert_not_called()
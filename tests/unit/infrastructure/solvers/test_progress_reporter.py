@@ -0,0 +1,25 @@
+from infrastructure.solvers.progress_reporter import ProgressReporter
+
+
+def test_report_throttles_and_normalises():
+    received = []
+    reporter = ProgressReporter(received.append, "GUROBI", interval=60.0)
+
+    reporter.report(0.5, objective=1e100, bound=-1e100, nodes=0)
+    reporter.report(1.0, objective=12.0, bound=9.0, nodes=10)
+    reporter.report(1.5, objective=10.0, bound=9.0, nodes=20, values=[1.0, 0.0], force=True)
+
+    # 間隔内の通知は間引かれ、新しい暫定解の通知は間引かれない
+    assert len(received) == 2
+    assert (received[0].objective, received[0].bound, received[0].gap) == (None, None, None)
+    assert received[1].objective == 10.0
+    assert received[1].gap == 0.1
+    assert received[1].values == [1.0, 0.0]
+    assert received[1].backend == "GUROBI"
+
+
+def test_report_ignores_callback_errors():
+    def fail(progress):
+        raise BrokenPipeError()
+
+    ProgressReporter(fail, "HIGHS").report(1.0, objective=1.0, bound=1.0)
@@ -0,0 +1,55 @@
+from common.constants import SolverBackend
+from domain.vo.solver_settings import SolverSettingsVo
+from infrastructure.solvers.cbc_solver import CbcSolver
+from infrastructure.solvers.fallback_solver import FallbackSolver
+from infrastructure.solvers.gurobi_solver import GurobiSolver
+from infrastructure.solvers.highs_solver import HighsSolver
+from infrastructure.solvers.portfolio_solver import PortfolioSolver
+from infrastructure.solvers.solver_registry import create_solver
+
+SETTINGS = SolverSettingsVo(time_limit=10)
+
+
+def test_selects_solver_from_env(monkeypatch):
+    monkeypatch.setenv("SOLVER", "highs")
+
+    solver = create_solver(None, SETTINGS)
+
+    assert isinstance(solver, HighsSolver)
+    assert solver.settings == SETTINGS
+
+
+def test_request_overrides_env(monkeypatch):
+    monkeypatch.setenv("SOLVER", "HIGHS")
+
+    assert isinstance(create_solver(SolverBackend.CBC, SETTINGS), CbcSolver)
+
+
+def test_licensed_solver_falls_back(monkeypatch):
+    monkeypatch.delenv("SOLVER", raising=False)
+    monkeypatch.delenv("SOLVER_FALLBACK", raising=False)
+
+    solver = create_solver(None, SETTINGS)
+
+    assert isinstance(solver, FallbackSolver)
+    assert isinstance(solver.primary, GurobiSolver)
+    assert isinstance(solver.fallback, CbcSolver)
+    assert solver.backend == SolverBackend.GUROBI.value
+
+
+def test_fallback_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("SOLVER_FALLBACK", "")
+
+    assert isinstance(create_solver(SolverBackend.GUROBI, SETTINGS), GurobiSolver)
+
+
+def test_creates_portfolio(monkeypatch):
+    monkeypatch.setenv("SOLVER_PORTFOLIO", "highs:1, HIGHS:2,CBC")
+
+    solver = create_solver(SolverBackend.PORTFOLIO, SETTINGS)
+
+    assert isinstance(solver, PortfolioSolver)
+    assert [m.label for m in solver.members] == ["highs:1", "HIGHS:2", "CBC"]
+    assert [m.solver.settings.seed for m in solver.members] == [1, 2, None]
+    assert all(m.solver.settings.time_limit == 10 for m in solver.members)
+    assert solver.time_limit == 10
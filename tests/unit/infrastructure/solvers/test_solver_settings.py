@@ -0,0 +1,40 @@
+from domain.vo.solver_settings import SolverSettingsVo
+from common.constants import DEFAULT_TIME_LIMIT, SolverEmphasis
+from infrastructure.solvers.cbc_solver import to_cbc_options
+from infrastructure.solvers.gurobi_solver import to_gurobi_params
+from infrastructure.solvers.highs_solver import to_highs_options
+
+SETTINGS = SolverSettingsVo(
+    time_limit=30, mip_gap=0.05, mip_gap_abs=1.0, threads=4, seed=7, emphasis=SolverEmphasis.FEASIBILITY
+)
+
+
+def test_to_gurobi_params():
+    assert to_gurobi_params(SETTINGS) == {
+        "TimeLimit": 30, "MIPGap": 0.05, "MIPGapAbs": 1.0, "Threads": 4, "Seed": 7, "MIPFocus": 1
+    }
+    # 未指定の項目はGurobiの既定値を使う
+    assert to_gurobi_params(SolverSettingsVo()) == {}
+
+
+def test_to_highs_options():
+    assert to_highs_options(SETTINGS) == {
+        "time_limit": 30.0,
+        "mip_rel_gap": 0.05,
+        "mip_abs_gap": 1.0,
+        "threads": 4,
+        "random_seed": 7,
+        "mip_heuristic_effort": 0.3,
+    }
+    assert to_highs_options(SolverSettingsVo(emphasis=SolverEmphasis.BOUND)) == {"time_limit": DEFAULT_TIME_LIMIT}
+
+
+def test_to_cbc_options():
+    assert to_cbc_options(SETTINGS) == {
+        "timeLimit": 30,
+        "gapRel": 0.05,
+        "gapAbs": 1.0,
+        "threads": 4,
+        "options": ["randomSeed 7", "randomCbcSeed 7", "feasibilityPump on"],
+    }
+    assert to_cbc_options(SolverSettingsVo())["timeLimit"] == DEFAULT_TIME_LIMIT
@@ -0,0 +1,131 @@
+"""ベンチマーク用の合成年次データ生成"""
+
+import random
+from typing import Dict, List
+
+from application.factories.annual_data_factory import create_annual_data
+from application.models.dto import (
+    AnnualDataDto, AttendanceDayDto, BlockDto, CourseDetailDto, CourseDto,
+    CurriculumDto, HomeroomDayDto, HomeroomDto, InstructorDto, LaneDto, SchoolDayDto
+)
+from domain.vo.annual_data import AnnualDataVo
+
+DAYS = ["mon", "tue", "wed", "thu", "fri"]
+AM_PERIODS = 4
+PM_PERIODS = 2
+
+# 学級ごとの固有講座の単位数（合計24）と、学級群で共有する選択ブロックの単位数
+HOMEROOM_COURSE_CREDITS = [3, 3, 3, 3, 2, 2, 2, 2, 2, 2]
+ELECTIVE_CREDITS = 6
+ELECTIVE_LANES = 2
+HOMEROOMS_PER_ELECTIVE_GROUP = 2
+
+
+def create_synthetic_annual_data(
+    n_instructors: int,
+    instructors_per_homeroom: int = 5,
+    seed: int = 0,
+    intern_ids: bool = True
+) -> AnnualDataVo:
+    """教員数に比例した規模の合成年次データを生成する。
+
+    Args:
+        n_instructors (int): 教員数
+        instructors_per_homeroom (int): 学級1つあたりの教員数
+        seed (int): 乱数シード
+        intern_ids (bool): IDを整数IDに変換するかどうか
+
+    Returns:
+        AnnualDataVo: 年次データ
+    """
+    return create_annual_data(
+        create_synthetic_annual_data_dto(n_instructors, instructors_per_homeroom, seed),
+        intern_ids=intern_ids
+    )
+
+
+def create_synthetic_annual_data_dto(
+    n_instructors: int,
+    instructors_per_homeroom: int = 5,
+    seed: int = 0
+) -> AnnualDataDto:
+    """教員数に比例した規模の合成年次データDTOを生成する。
+
+    学級は週30コマ（5日×6時限）で、固有講座10件と、学級群で共有する選択ブロック1件を履修する。
+    各講座には1名（一部2名）の教員を割り当てる。
+
+    Args:
+        n_instructors (int): 教員数
+        instructors_per_homeroom (int): 学級1つあたりの教員数
+        seed (int): 乱数シード
+
+    Returns:
+        AnnualDataDto: 年次データDTO
+    """
+    rng = random.Random(seed)
+
+    H = [f"H{n:03d}" for n in range(max(n_instructors // instructors_per_homeroom, 1))]
+    I = [f"I{n:03d}" for n in range(n_instructors)]
+    P = list(range(1, AM_PERIODS + PM_PERIODS + 1))
+
+    C: List[str] = []
+    credit_dict: Dict[str, int] = {}
+    curriculum_dict: Dict[str, list] = {h: [] for h in H}
+
+    for h in H:
+        for n, credit in enumerate(HOMEROOM_COURSE_CREDITS):
+            c = f"{h}_C{n:02d}"
+            C.append(c)
+            credit_dict[c] = credit
+            curriculum_dict[h].append([[c]])
+
+    for g in range(0, len(H), HOMEROOMS_PER_ELECTIVE_GROUP):
+        lanes = []
+        for lane in range(ELECTIVE_LANES):
+            c = f"E{g:03d}_L{lane}"
+            C.append(c)
+            credit_dict[c] = ELECTIVE_CREDITS
+            lanes.append([c])
+        for h in H[g:g + HOMEROOMS_PER_ELECTIVE_GROUP]:
+            curriculum_dict[h].append(lanes)
+
+    courses = [
+        CourseDto(
+            id=c,
+            credits=credit_dict[c],
+            courseDetails=[
+                CourseDetailDto(instructor_id=i, room_id=None)
+                for i in dict.fromkeys([I[n % len(I)]] + ([rng.choice(I)] if rng.random() < 0.1 else []))
+            ]
+        )
+        for n, c in enumerate(C)
+    ]
+
+    instructors = [
+        InstructorDto(
+            id=i,
+            days=[
+                AttendanceDayDto(day=d, unavailable_periods=[rng.choice(P)] if rng.random() < 0.2 else [])
+                for d in DAYS
+            ]
+        )
+        for i in I
+    ]
+
+    return AnnualDataDto(
+        school_days=[SchoolDayDto(day=d, available=True, am_periods=AM_PERIODS, pm_periods=PM_PERIODS) for d in DAYS],
+        homerooms=[HomeroomDto(id=h, days=[HomeroomDayDto(day=d, periods=len(P)) for d in DAYS]) for h in H],
+        instructors=instructors,
+        rooms=[],
+        courses=courses,
+        curriculums=[
+            CurriculumDto(
+                homeroom_id=h,
+                blocks=[
+                    BlockDto(id=str(n), lanes=[LaneDto(course_ids=lane) for lane in block])
+                    for n, block in enumerate(curriculum_dict[h])
+                ]
+            )
+            for h in H
+        ],
+    )